@@ -5,22 +5,62 @@ from .head_object import (
     head_object,
     is_object_exists,
 )
+from .copy_object import (
+    iter_copy_ranges,
+    multipart_copy_object,
+    stream_copy_object,
+)
+from .stat_objects import (
+    stat_objects,
+)
 from .tagging import (
     update_bucket_tagging,
     update_object_tagging,
 )
 from .upload import (
+    UploadFileResult,
+    UploadReport,
+    upload_files,
     upload_dir,
 )
+from .sync import (
+    CompareEnum,
+    SyncActionEnum,
+    SyncAction,
+    SyncReport,
+    sync_local_to_s3,
+    sync_s3_to_local,
+    sync_s3_to_s3,
+)
 from .list_objects import (
     ObjectTypeDefIterproxy,
     CommonPrefixTypeDefIterproxy,
     ListObjectsV2OutputTypeDefIterproxy,
     paginate_list_objects_v2,
+    fan_out_list_objects_v2,
     is_content_an_object,
     calculate_total_size,
     count_objects,
 )
+from .list_objects_columnar import (
+    ObjectColumns,
+    list_objects_columnar,
+)
+from .list_objects_snapshot import (
+    ListingSnapshot,
+)
+from .list_objects_partitioned import (
+    sample_keyspace,
+    split_keyspace,
+    partitioned_list_objects_v2,
+)
+from .inventory import (
+    S3Inventory,
+)
+from .disk_usage import (
+    DiskUsage,
+    disk_usage,
+)
 from .list_object_versions import (
     ObjectVersionTypeDefIterproxy,
     DeleteMarkerEntryTypeDefIterproxy,
@@ -0,0 +1,446 @@
+# -*- coding: utf-8 -*-
+
+"""
+Server side copy of the large s3 object with multipart upload.
+
+The copy_object_ API can only copy object up to 5 GB, and the whole object
+is copied by one request. The multipart copy splits the object into byte
+ranges, and copies the ranges concurrently with upload_part_copy_.
+
+If no single credential can read the source and write the target, for example
+cross account copy, the server side copy is not possible.
+:func:`stream_copy_object` streams the byte ranges from the source with
+get_object_ into a multipart upload with the other credential, through
+a bounded in-memory buffer pool.
+
+.. _copy_object: https://boto3.amazonaws.com/v1/documentation/api/latest/reference/services/s3/client/copy_object.html
+.. _create_multipart_upload: https://boto3.amazonaws.com/v1/documentation/api/latest/reference/services/s3/client/create_multipart_upload.html
+.. _upload_part_copy: https://boto3.amazonaws.com/v1/documentation/api/latest/reference/services/s3/client/upload_part_copy.html
+.. _complete_multipart_upload: https://boto3.amazonaws.com/v1/documentation/api/latest/reference/services/s3/client/complete_multipart_upload.html
+.. _get_object: https://boto3.amazonaws.com/v1/documentation/api/latest/reference/services/s3/client/get_object.html
+.. _upload_part: https://boto3.amazonaws.com/v1/documentation/api/latest/reference/services/s3/client/upload_part.html
+.. _put_object: https://boto3.amazonaws.com/v1/documentation/api/latest/reference/services/s3/client/put_object.html
+"""
+
+import typing as T
+import queue
+
+from func_args import NOTHING, resolve_kwargs
+
+from ..etag import adjust_part_size, get_part_count
+from ..utils import DEFAULT_CHUNK_SIZE, iter_map_concurrently
+
+if T.TYPE_CHECKING:  # pragma: no cover
+    from mypy_boto3_s3 import S3Client
+
+#: objects larger than this size are copied with multipart copy by default
+DEFAULT_MULTIPART_COPY_THRESHOLD = 256 * 1024 * 1024
+#: the default part size of the multipart copy
+DEFAULT_MULTIPART_COPY_PART_SIZE = 64 * 1024 * 1024
+#: the max object size that copy_object can copy
+MAX_COPY_OBJECT_SIZE = 5 * 1024 * 1024 * 1024
+
+#: the head_object response fields that copy_object copies from the source
+#: when ``MetadataDirective="COPY"``
+COPIED_HEADERS = [
+    "Metadata",
+    "ContentType",
+    "CacheControl",
+    "ContentDisposition",
+    "ContentEncoding",
+    "ContentLanguage",
+    "Expires",
+    "WebsiteRedirectLocation",
+]
+
+
+CREATE_MULTIPART_UPLOAD_KEYS = [
+    "ACL",
+    "CacheControl",
+    "ContentDisposition",
+    "ContentEncoding",
+    "ContentLanguage",
+    "ContentType",
+    "Expires",
+    "GrantFullControl",
+    "GrantRead",
+    "GrantReadACP",
+    "GrantWriteACP",
+    "Metadata",
+    "ServerSideEncryption",
+    "StorageClass",
+    "WebsiteRedirectLocation",
+    "SSECustomerAlgorithm",
+    "SSECustomerKey",
+    "SSEKMSKeyId",
+    "SSEKMSEncryptionContext",
+    "BucketKeyEnabled",
+    "RequestPayer",
+    "Tagging",
+    "ObjectLockMode",
+    "ObjectLockRetainUntilDate",
+    "ObjectLockLegalHoldStatus",
+    "ExpectedBucketOwner",
+]
+
+UPLOAD_PART_COPY_KEYS = [
+    "CopySourceIfMatch",
+    "CopySourceIfModifiedSince",
+    "CopySourceIfNoneMatch",
+    "CopySourceIfUnmodifiedSince",
+    "SSECustomerAlgorithm",
+    "SSECustomerKey",
+    "CopySourceSSECustomerAlgorithm",
+    "CopySourceSSECustomerKey",
+    "RequestPayer",
+    "ExpectedBucketOwner",
+    "ExpectedSourceBucketOwner",
+]
+
+COMPLETE_MULTIPART_UPLOAD_KEYS = [
+    "SSECustomerAlgorithm",
+    "SSECustomerKey",
+    "RequestPayer",
+    "ExpectedBucketOwner",
+]
+
+
+def split_copy_object_kwargs(kwargs: dict) -> T.Tuple[dict, dict, dict]:
+    """
+    Split the copy_object_ arguments into the arguments of
+    create_multipart_upload_, upload_part_copy_ and complete_multipart_upload_.
+    The ``Bucket``, ``Key``, ``CopySource``, ``ContentMD5`` and the
+    ``*Directive`` arguments are dropped.
+
+    .. versionadded:: 2.4.1
+    """
+    return tuple(
+        {key: kwargs[key] for key in keys if key in kwargs}
+        for keys in [
+            CREATE_MULTIPART_UPLOAD_KEYS,
+            UPLOAD_PART_COPY_KEYS,
+            COMPLETE_MULTIPART_UPLOAD_KEYS,
+        ]
+    )
+
+
+def iter_copy_ranges(
+    size: int,
+    part_size: int = DEFAULT_MULTIPART_COPY_PART_SIZE,
+) -> T.Iterable[T.Tuple[int, str]]:
+    """
+    Split the object into byte ranges for upload_part_copy_. The part size
+    is adjusted to the S3 limits, at most 10,000 parts.
+
+    Example::
+
+        >>> list(iter_copy_ranges(12 * 1024 * 1024, part_size=5 * 1024 * 1024))
+        [(1, 'bytes=0-5242879'), (2, 'bytes=5242880-10485759'), (3, 'bytes=10485760-12582911')]
+
+    :return: iterable of ``(part_number, copy_source_range)``.
+
+    .. versionadded:: 2.4.1
+    """
+    part_size = adjust_part_size(size, part_size)
+    for part_number, start in enumerate(range(0, size, part_size), start=1):
+        end = min(start + part_size, size) - 1
+        yield part_number, f"bytes={start}-{end}"
+
+
+def _abort_multipart_upload(
+    s3_client: "S3Client",
+    bucket: str,
+    key: str,
+    upload_id: str,
+    complete_multipart_upload_kwargs: dict,
+):
+    s3_client.abort_multipart_upload(
+        **resolve_kwargs(
+            Bucket=bucket,
+            Key=key,
+            UploadId=upload_id,
+            RequestPayer=complete_multipart_upload_kwargs.get("RequestPayer", NOTHING),
+            ExpectedBucketOwner=complete_multipart_upload_kwargs.get(
+                "ExpectedBucketOwner", NOTHING
+            ),
+        )
+    )
+
+
+def multipart_copy_object(
+    s3_client: "S3Client",
+    src_bucket: str,
+    src_key: str,
+    dst_bucket: str,
+    dst_key: str,
+    size: int,
+    src_version_id: str = NOTHING,
+    part_size: int = DEFAULT_MULTIPART_COPY_PART_SIZE,
+    concurrency: int = 8,
+    create_multipart_upload_kwargs: T.Optional[dict] = None,
+    upload_part_copy_kwargs: T.Optional[dict] = None,
+    complete_multipart_upload_kwargs: T.Optional[dict] = None,
+) -> dict:
+    """
+    Copy an s3 object with create_multipart_upload_ and concurrent
+    upload_part_copy_ calls. The multipart upload is aborted if any part fails.
+
+    Unlike copy_object_, the metadata and tags are NOT copied from the
+    source, they have to be in the ``create_multipart_upload_kwargs``.
+
+    Example::
+
+        >>> multipart_copy_object(
+        ...     s3_client,
+        ...     src_bucket="my-bucket", src_key="big.parquet",
+        ...     dst_bucket="my-bucket", dst_key="backup/big.parquet",
+        ...     size=20 * 1024 * 1024 * 1024,
+        ...     create_multipart_upload_kwargs={"StorageClass": "STANDARD_IA"},
+        ... )
+
+    :param s3_client: ``boto3.session.Session().client("s3")`` object.
+    :param src_bucket: the source bucket.
+    :param src_key: the source key.
+    :param dst_bucket: the target bucket.
+    :param dst_key: the target key.
+    :param size: the source object size.
+    :param src_version_id: the source version id.
+    :param part_size: See :func:`iter_copy_ranges`.
+    :param concurrency: number of threads to copy the parts.
+    :param create_multipart_upload_kwargs: additional arguments of
+        create_multipart_upload_, for example ``Metadata``, ``Tagging``,
+        ``StorageClass``, ``ServerSideEncryption``.
+    :param upload_part_copy_kwargs: additional arguments of upload_part_copy_,
+        for example ``CopySourceIfMatch``.
+    :param complete_multipart_upload_kwargs: additional arguments of
+        complete_multipart_upload_, and abort_multipart_upload when
+        the copy fails.
+
+    :return: the complete_multipart_upload_ response.
+
+    .. versionadded:: 2.4.1
+    """
+    if concurrency < 1:
+        raise ValueError("``concurrency`` has to be greater than 0.")
+    create_multipart_upload_kwargs = create_multipart_upload_kwargs or {}
+    upload_part_copy_kwargs = upload_part_copy_kwargs or {}
+    complete_multipart_upload_kwargs = complete_multipart_upload_kwargs or {}
+    response = s3_client.create_multipart_upload(
+        Bucket=dst_bucket,
+        Key=dst_key,
+        **create_multipart_upload_kwargs,
+    )
+    upload_id = response["UploadId"]
+    copy_source = resolve_kwargs(
+        Bucket=src_bucket,
+        Key=src_key,
+        VersionId=src_version_id,
+    )
+
+    def _copy_part(task: T.Tuple[int, str]) -> dict:
+        part_number, copy_source_range = task
+        res = s3_client.upload_part_copy(
+            Bucket=dst_bucket,
+            Key=dst_key,
+            UploadId=upload_id,
+            PartNumber=part_number,
+            CopySource=copy_source,
+            CopySourceRange=copy_source_range,
+            **upload_part_copy_kwargs,
+        )
+        return {"ETag": res["CopyPartResult"]["ETag"], "PartNumber": part_number}
+
+    try:
+        parts = list(
+            iter_map_concurrently(
+                _copy_part,
+                iter_copy_ranges(size, part_size),
+                max_workers=concurrency,
+                ordered=True,
+            )
+        )
+        return s3_client.complete_multipart_upload(
+            Bucket=dst_bucket,
+            Key=dst_key,
+            UploadId=upload_id,
+            MultipartUpload={"Parts": parts},
+            **complete_multipart_upload_kwargs,
+        )
+    except Exception:
+        _abort_multipart_upload(
+            s3_client, dst_bucket, dst_key, upload_id, complete_multipart_upload_kwargs
+        )
+        raise
+
+
+def _read_into(body, buffer: bytearray, chunk_size: int) -> int:
+    """
+    Read the get_object_ response body into the buffer.
+
+    :return: number of bytes read.
+    """
+    n = 0
+    with memoryview(buffer) as view:
+        for chunk in body.iter_chunks(chunk_size):
+            if n + len(chunk) > len(buffer):
+                raise ValueError("the source object is larger than expected!")
+            view[n : n + len(chunk)] = chunk
+            n += len(chunk)
+    return n
+
+
+def stream_copy_object(
+    src_s3_client: "S3Client",
+    dst_s3_client: "S3Client",
+    src_bucket: str,
+    src_key: str,
+    dst_bucket: str,
+    dst_key: str,
+    size: int,
+    src_version_id: str = NOTHING,
+    part_size: int = DEFAULT_MULTIPART_COPY_PART_SIZE,
+    concurrency: int = 8,
+    get_object_kwargs: T.Optional[dict] = None,
+    create_multipart_upload_kwargs: T.Optional[dict] = None,
+    upload_part_kwargs: T.Optional[dict] = None,
+    complete_multipart_upload_kwargs: T.Optional[dict] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> dict:
+    """
+    Copy an s3 object with two different clients, read the source with
+    ``src_s3_client`` and write the target with ``dst_s3_client``. The data
+    goes through the memory, never the local disk.
+
+    The object is split into byte ranges like :func:`multipart_copy_object`,
+    each range is downloaded by a ranged get_object_ call into a buffer, then
+    uploaded by upload_part_, the ranges are copied concurrently. The buffers
+    are reused from a pool of ``min(concurrency, number of parts)`` buffers,
+    the memory usage is bounded by ``concurrency * part_size``. The object not
+    larger than ``part_size`` is copied by one get_object_ and one put_object_.
+    The multipart upload is aborted if any part fails.
+
+    Like :func:`multipart_copy_object`, the metadata and tags are NOT copied
+    from the source, they have to be in the ``create_multipart_upload_kwargs``.
+
+    Example::
+
+        >>> stream_copy_object(
+        ...     src_s3_client=bsm_account_a.s3_client,
+        ...     dst_s3_client=bsm_account_b.s3_client,
+        ...     src_bucket="bucket-a", src_key="big.parquet",
+        ...     dst_bucket="bucket-b", dst_key="big.parquet",
+        ...     size=20 * 1024 * 1024 * 1024,
+        ... )
+
+    :param src_s3_client: the s3 client to read the source.
+    :param dst_s3_client: the s3 client to write the target.
+    :param src_bucket: the source bucket.
+    :param src_key: the source key.
+    :param dst_bucket: the target bucket.
+    :param dst_key: the target key.
+    :param size: the source object size.
+    :param src_version_id: the source version id.
+    :param part_size: See :func:`iter_copy_ranges`, it is also the buffer size.
+    :param concurrency: number of threads to copy the parts.
+    :param get_object_kwargs: additional arguments of get_object_, for example
+        ``IfMatch`` to make sure the source is not changed during the copy.
+    :param create_multipart_upload_kwargs: additional arguments of
+        create_multipart_upload_, or put_object_ for the small object.
+    :param upload_part_kwargs: additional arguments of upload_part_.
+    :param complete_multipart_upload_kwargs: additional arguments of
+        complete_multipart_upload_, and abort_multipart_upload when
+        the copy fails.
+    :param chunk_size: the chunk size to read the get_object_ response body.
+
+    :return: the complete_multipart_upload_ response, or the put_object_
+        response for the small object.
+
+    .. versionadded:: 2.4.1
+    """
+    if concurrency < 1:
+        raise ValueError("``concurrency`` has to be greater than 0.")
+    get_object_kwargs = resolve_kwargs(
+        VersionId=src_version_id, **(get_object_kwargs or {})
+    )
+    create_multipart_upload_kwargs = create_multipart_upload_kwargs or {}
+    upload_part_kwargs = upload_part_kwargs or {}
+    complete_multipart_upload_kwargs = complete_multipart_upload_kwargs or {}
+
+    if size <= part_size:
+        res = src_s3_client.get_object(
+            Bucket=src_bucket, Key=src_key, **get_object_kwargs
+        )
+        buffer = bytearray(size)
+        if _read_into(res["Body"], buffer, chunk_size) != size:
+            raise ValueError("the source object is smaller than expected!")
+        return dst_s3_client.put_object(
+            Bucket=dst_bucket,
+            Key=dst_key,
+            Body=buffer,
+            **create_multipart_upload_kwargs,
+        )
+
+    part_size = adjust_part_size(size, part_size)
+    pool = queue.Queue()
+    for _ in range(min(concurrency, get_part_count(size, part_size))):
+        pool.put(bytearray(part_size))
+
+    response = dst_s3_client.create_multipart_upload(
+        Bucket=dst_bucket,
+        Key=dst_key,
+        **create_multipart_upload_kwargs,
+    )
+    upload_id = response["UploadId"]
+
+    def _copy_part(task: T.Tuple[int, str]) -> dict:
+        part_number, byte_range = task
+        expected = min(part_size, size - (part_number - 1) * part_size)
+        buffer = pool.get()
+        try:
+            res = src_s3_client.get_object(
+                Bucket=src_bucket,
+                Key=src_key,
+                Range=byte_range,
+                **get_object_kwargs,
+            )
+            n = _read_into(res["Body"], buffer, chunk_size)
+            if n != expected:
+                raise ValueError("the source object is smaller than expected!")
+            res = dst_s3_client.upload_part(
+                Bucket=dst_bucket,
+                Key=dst_key,
+                UploadId=upload_id,
+                PartNumber=part_number,
+                # only the last part is a copy of the buffer
+                Body=buffer if n == len(buffer) else buffer[:n],
+                **upload_part_kwargs,
+            )
+        finally:
+            pool.put(buffer)
+        return {"ETag": res["ETag"], "PartNumber": part_number}
+
+    try:
+        parts = list(
+            iter_map_concurrently(
+                _copy_part,
+                iter_copy_ranges(size, part_size),
+                max_workers=concurrency,
+                ordered=True,
+            )
+        )
+        return dst_s3_client.complete_multipart_upload(
+            Bucket=dst_bucket,
+            Key=dst_key,
+            UploadId=upload_id,
+            MultipartUpload={"Parts": parts},
+            **complete_multipart_upload_kwargs,
+        )
+    except Exception:
+        _abort_multipart_upload(
+            dst_s3_client,
+            dst_bucket,
+            dst_key,
+            upload_id,
+            complete_multipart_upload_kwargs,
+        )
+        raise
@@ -14,7 +14,7 @@ import botocore.exceptions
 from func_args import NOTHING, resolve_kwargs
 
 from .. import exc
-from ..utils import grouper_list, ensure_s3_dir
+from ..utils import grouper_list, ensure_s3_dir, iter_map_concurrently
 from .list_objects import (
     paginate_list_objects_v2,
     is_content_an_object,
@@ -79,6 +79,54 @@ def delete_object(
             raise e
 
 
+def _delete_objects_concurrently(
+    s3_client: "S3Client",
+    bucket: str,
+    objects: T.Iterable[dict],
+    concurrency: int,
+    mfa: str = NOTHING,
+    request_payer: str = NOTHING,
+    bypass_governance_retention: bool = NOTHING,
+    expected_bucket_owner: str = NOTHING,
+    check_sum_algorithm: str = NOTHING,
+) -> int:
+    """
+    Delete the objects by delete_objects_ in batches of 1000, up to
+    ``concurrency`` batches are deleted at the same time in a thread pool,
+    while the ``objects`` iterable (the listing) is consumed lazily in the
+    calling thread.
+
+    :param objects: iterable of ``{"Key": ..., "VersionId": ...}``.
+
+    :return: number of deleted objects
+    """
+    if concurrency < 1:
+        raise ValueError("``concurrency`` has to be greater than 0.")
+
+    def _delete(batch: T.List[dict]) -> int:
+        s3_client.delete_objects(
+            **resolve_kwargs(
+                Bucket=bucket,
+                Delete={"Objects": batch},
+                MFA=mfa,
+                RequestPayer=request_payer,
+                BypassGovernanceRetention=bypass_governance_retention,
+                ExpectedBucketOwner=expected_bucket_owner,
+                ChecksumAlgorithm=check_sum_algorithm,
+            )
+        )
+        return len(batch)
+
+    return sum(
+        iter_map_concurrently(
+            _delete,
+            grouper_list(objects, 1000),
+            max_workers=concurrency,
+            ordered=False,
+        )
+    )
+
+
 def delete_dir(
     s3_client,
     bucket: str,
@@ -91,6 +139,8 @@ def delete_dir(
     expected_bucket_owner: str = NOTHING,
     check_sum_algorithm: str = NOTHING,
     skip_prompt: bool = False,
+    prefetch: int = 0,
+    concurrency: int = 8,
 ) -> int:
     """
     Recursively delete all objects under a s3 prefix. It is a wrapper of
@@ -110,10 +160,24 @@ def delete_dir(
     :param check_sum_algorithm: See delete_object_.
     :param skip_prompt: Default False, it will prompt you to confirm when deleting
         everything in an S3 bucket.
+    :param prefetch: Default 0, if greater than 0, list up to this many pages
+        ahead in a background thread while the current batch is being deleted.
+        See :func:`~s3pathlib.better_client.list_objects.paginate_list_objects_v2`.
+    :param concurrency: Default 8, number of delete_objects_ batches of
+        1000 objects to delete at the same time, the listing continues
+        while the batches are being deleted.
 
     :return: number of deleted objects
 
     .. versionadded:: 2.0.1
+
+    .. versionchanged:: 2.4.1
+
+        Add ``prefetch`` argument.
+
+    .. versionchanged:: 2.4.1
+
+        Add ``concurrency`` argument, delete multiple batches concurrently.
     """
     if prefix == "": # pragma: no cover
         if skip_prompt is False:
@@ -135,23 +199,20 @@ def delete_dir(
         limit=limit,
         request_payer=request_payer,
         expected_bucket_owner=expected_bucket_owner,
+        prefetch=prefetch,
     ).contents()
 
-    count = 0
-    for contents in grouper_list(contents_iterproxy, 1000):
-        kwargs = resolve_kwargs(
-            Bucket=bucket,
-            Delete={"Objects": [dict(Key=dct["Key"]) for dct in contents]},
-            MFA=mfa,
-            RequestPayer=request_payer,
-            BypassGovernanceRetention=bypass_governance_retention,
-            ExpectedBucketOwner=expected_bucket_owner,
-            ChecksumAlgorithm=check_sum_algorithm,
-        )
-        s3_client.delete_objects(**kwargs)
-        count += len(contents)
-
-    return count
+    return _delete_objects_concurrently(
+        s3_client=s3_client,
+        bucket=bucket,
+        objects=(dict(Key=dct["Key"]) for dct in contents_iterproxy),
+        concurrency=concurrency,
+        mfa=mfa,
+        request_payer=request_payer,
+        bypass_governance_retention=bypass_governance_retention,
+        expected_bucket_owner=expected_bucket_owner,
+        check_sum_algorithm=check_sum_algorithm,
+    )
 
 
 def delete_object_versions(
@@ -166,6 +227,8 @@ def delete_object_versions(
     expected_bucket_owner: str = NOTHING,
     check_sum_algorithm: str = NOTHING,
     skip_prompt: bool = False,
+    prefetch: int = 0,
+    concurrency: int = 8,
 ) -> int:
     """
     Recursively delete all objects and their versions under a s3 prefix.
@@ -186,10 +249,21 @@ def delete_object_versions(
     :param check_sum_algorithm: See delete_object_.
     :param skip_prompt: Default False, it will prompt you to confirm when deleting
         everything in an S3 bucket.
+    :param prefetch: Default 0, if greater than 0, list up to this many pages
+        ahead in a background thread while the batches are being deleted.
+        See :func:`~s3pathlib.better_client.list_object_versions.paginate_list_object_versions`.
+    :param concurrency: Default 8, number of delete_objects_ batches of
+        1000 versions to delete at the same time, the listing continues
+        while the batches are being deleted.
 
     :return: number of deleted objects
 
     .. versionadded:: 2.0.1
+
+    .. versionchanged:: 2.4.1
+
+        Add ``prefetch`` and ``concurrency`` arguments, delete multiple
+        batches concurrently.
     """
     if prefix == "": # pragma: no cover
         if skip_prompt is False:
@@ -209,26 +283,19 @@ def delete_object_versions(
         batch_size=batch_size,
         limit=limit,
         expected_bucket_owner=expected_bucket_owner,
+        prefetch=prefetch,
+    )
+    return _delete_objects_concurrently(
+        s3_client=s3_client,
+        bucket=bucket,
+        objects=(
+            dict(Key=key, VersionId=version_id)
+            for key, version_id in proxy.iterate_key_and_version()
+        ),
+        concurrency=concurrency,
+        mfa=mfa,
+        request_payer=request_payer,
+        bypass_governance_retention=bypass_governance_retention,
+        expected_bucket_owner=expected_bucket_owner,
+        check_sum_algorithm=check_sum_algorithm,
     )
-    count = 0
-    for key_and_version_id_pairs in grouper_list(
-        proxy.iterate_key_and_version(),
-        1000,
-    ):
-        kwargs = resolve_kwargs(
-            Bucket=bucket,
-            Delete={
-                "Objects": [
-                    dict(Key=key, VersionId=version_id)
-                    for key, version_id in key_and_version_id_pairs
-                ]
-            },
-            MFA=mfa,
-            RequestPayer=request_payer,
-            BypassGovernanceRetention=bypass_governance_retention,
-            ExpectedBucketOwner=expected_bucket_owner,
-            ChecksumAlgorithm=check_sum_algorithm,
-        )
-        s3_client.delete_objects(**kwargs)
-        count += len(key_and_version_id_pairs)
-    return count
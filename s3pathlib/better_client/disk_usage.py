@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+
+"""
+Single pass "du" liked disk usage breakdown of a S3 prefix.
+
+.. _ListObjectsV2: https://boto3.amazonaws.com/v1/documentation/api/latest/reference/services/s3/paginator/ListObjectsV2.html
+"""
+
+import typing as T
+
+from func_args import NOTHING
+
+from ..utils import repr_data_size
+from .list_objects import (
+    paginate_list_objects_v2,
+    fan_out_list_objects_v2,
+    is_content_an_object,
+)
+
+if T.TYPE_CHECKING:  # pragma: no cover
+    from mypy_boto3_s3 import S3Client
+
+
+class DiskUsage:
+    """
+    A node in the disk usage tree, the statistics of all objects under
+    a prefix, including the objects in the sub folders.
+
+    :param prefix: the s3 prefix of this node.
+
+    .. versionadded:: 2.4.1
+    """
+
+    def __init__(self, prefix: str):
+        self.prefix = prefix
+        self.count: int = 0
+        self.size: int = 0
+        self.size_by_storage_class: T.Dict[str, int] = dict()
+        self.children: T.Dict[str, "DiskUsage"] = dict()
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__name__}("
+            f"prefix={self.prefix!r}, count={self.count}, size={self.size})"
+        )
+
+    def add(self, size: int, storage_class: str):
+        """
+        Add one object to the statistics of this node.
+        """
+        self.count += 1
+        self.size += size
+        self.size_by_storage_class[storage_class] = (
+            self.size_by_storage_class.get(storage_class, 0) + size
+        )
+
+    def get_child(self, name: str) -> "DiskUsage":
+        """
+        Get or create the child node of the sub folder ``name``.
+        """
+        try:
+            return self.children[name]
+        except KeyError:
+            child = self.__class__(prefix=f"{self.prefix}{name}/")
+            self.children[name] = child
+            return child
+
+    def walk(self) -> T.Iterable["DiskUsage"]:
+        """
+        Iterate this node and all descendants in prefix order.
+        """
+        yield self
+        for name in sorted(self.children):
+            yield from self.children[name].walk()
+
+    def to_dict(self) -> dict:
+        return {
+            "prefix": self.prefix,
+            "count": self.count,
+            "size": self.size,
+            "size_by_storage_class": dict(sorted(self.size_by_storage_class.items())),
+            "children": [
+                self.children[name].to_dict() for name in sorted(self.children)
+            ],
+        }
+
+    def render(self, for_human: bool = True) -> str:
+        """
+        Render the tree as text, one line per node, like the ``du`` command.
+
+        Example::
+
+            data/  10 objects  1.50 MB
+                data/2024/  4 objects  500.00 KB
+                data/2025/  6 objects  1.00 MB
+        """
+        lines = list()
+
+        def _render(node: "DiskUsage", level: int):
+            size = repr_data_size(node.size) if for_human else str(node.size)
+            lines.append(f"{'    ' * level}{node.prefix}  {node.count} objects  {size}")
+            for name in sorted(node.children):
+                _render(node.children[name], level + 1)
+
+        _render(self, 0)
+        return "\n".join(lines)
+
+
+def disk_usage(
+    s3_client: "S3Client",
+    bucket: str,
+    prefix: str,
+    depth: int = 1,
+    concurrency: int = 8,
+    include_folder: bool = False,
+    prefetch: int = 0,
+    request_payer: str = NOTHING,
+    expected_bucket_owner: str = NOTHING,
+) -> DiskUsage:
+    """
+    Calculate the count, total size and size by storage class of all objects
+    under the prefix, and the breakdown for each sub folder up to ``depth``
+    levels, in one listing pass. The sub folders are listed in a thread pool.
+
+    Example::
+
+        >>> du = disk_usage(s3_client, "my-bucket", "data/", depth=2)
+        >>> du.count, du.size
+        (10, 1572864)
+        >>> du.children["2024"].size_by_storage_class
+        {'STANDARD': 409600, 'GLACIER': 102400}
+        >>> print(du.render())
+
+    :param s3_client: ``boto3.session.Session().client("s3")`` object.
+    :param bucket: S3 bucket name.
+    :param prefix: The s3 prefix (logic directory) you want to calculate.
+    :param depth: number of sub folder levels in the breakdown tree,
+        0 means no breakdown.
+    :param concurrency: number of thread to list the sub folders, see
+        :func:`~s3pathlib.better_client.list_objects.fan_out_list_objects_v2`.
+    :param include_folder: Default False, whether counting the hard folder
+        (an empty "/" object).
+    :param prefetch: See
+        :func:`~s3pathlib.better_client.list_objects.paginate_list_objects_v2`.
+    :param request_payer: See ListObjectsV2_.
+    :param expected_bucket_owner: See ListObjectsV2_.
+
+    :return: the root :class:`DiskUsage` node.
+
+    .. versionadded:: 2.4.1
+    """
+    if depth < 0:
+        raise ValueError("``depth`` cannot be negative!")
+    kwargs = dict(
+        s3_client=s3_client,
+        bucket=bucket,
+        prefix=prefix,
+        prefetch=prefetch,
+        request_payer=request_payer,
+        expected_bucket_owner=expected_bucket_owner,
+    )
+    if concurrency > 1:
+        contents = fan_out_list_objects_v2(
+            concurrency=concurrency,
+            ordered=False,
+            **kwargs,
+        )
+    else:
+        contents = paginate_list_objects_v2(**kwargs).contents()
+    if include_folder is False:
+        contents = contents.filter(is_content_an_object)
+
+    root = DiskUsage(prefix=prefix)
+    n = len(prefix)
+    for content in contents:
+        size = content["Size"]
+        storage_class = content.get("StorageClass", "STANDARD")
+        node = root
+        node.add(size, storage_class)
+        if depth:
+            for name in content["Key"][n:].split("/")[:-1][:depth]:
+                node = node.get_child(name)
+                node.add(size, storage_class)
+    return root
@@ -0,0 +1,398 @@
+# -*- coding: utf-8 -*-
+
+"""
+Read S3 Inventory report as an alternative listing backend.
+
+For buckets with hundreds of millions of objects, reading the S3 Inventory
+report (a ``manifest.json`` plus CSV / ORC / Parquet data files stored as
+S3 objects) is far cheaper and faster than the ListObjectsV2_ API.
+
+.. _ListObjectsV2: https://boto3.amazonaws.com/v1/documentation/api/latest/reference/services/s3/paginator/ListObjectsV2.html
+.. _S3Inventory: https://docs.aws.amazon.com/AmazonS3/latest/userguide/storage-inventory.html
+"""
+
+import typing as T
+import io
+import csv
+import gzip
+import json
+from datetime import datetime, timezone
+from urllib.parse import unquote_plus
+
+from ..utils import iter_chain_concurrently
+from .list_objects import is_content_an_object
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    import pyarrow.orc as orc
+except ImportError:  # pragma: no cover
+    pa = None
+    pq = None
+    orc = None
+except:  # pragma: no cover
+    raise
+
+if T.TYPE_CHECKING:  # pragma: no cover
+    from mypy_boto3_s3 import S3Client
+
+
+# CSV field name -> ORC / Parquet column name
+_COLUMN_NAMES = {
+    "Bucket": "bucket",
+    "Key": "key",
+    "VersionId": "version_id",
+    "IsLatest": "is_latest",
+    "IsDeleteMarker": "is_delete_marker",
+    "Size": "size",
+    "LastModifiedDate": "last_modified_date",
+    "ETag": "e_tag",
+    "StorageClass": "storage_class",
+}
+
+_CHUNK_SIZE = 1000
+# the read buffer of the Parquet / ORC data file, small reads are coalesced
+# into one ranged get_object call
+_READ_BUFFER_SIZE = 8 * 1024 * 1024
+
+
+class _S3RangeReader(io.RawIOBase):
+    """
+    A read only, seekable file object of an S3 object, each read is a ranged
+    get_object call. Wrap it with :class:`io.BufferedReader` to coalesce
+    the small reads.
+    """
+
+    def __init__(self, s3_client: "S3Client", bucket: str, key: str):
+        super().__init__()
+        self._s3_client = s3_client
+        self._bucket = bucket
+        self._key = key
+        self._size = s3_client.head_object(Bucket=bucket, Key=key)["ContentLength"]
+        self._pos = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._pos
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            pos = offset
+        elif whence == io.SEEK_CUR:
+            pos = self._pos + offset
+        elif whence == io.SEEK_END:
+            pos = self._size + offset
+        else:  # pragma: no cover
+            raise ValueError(f"invalid whence {whence!r}")
+        if pos < 0:  # pragma: no cover
+            raise ValueError(f"negative seek position {pos}")
+        self._pos = pos
+        return pos
+
+    def readinto(self, b) -> int:
+        if (self._pos >= self._size) or (len(b) == 0):
+            return 0
+        end = min(self._pos + len(b), self._size) - 1
+        response = self._s3_client.get_object(
+            Bucket=self._bucket,
+            Key=self._key,
+            Range=f"bytes={self._pos}-{end}",
+        )
+        n = 0
+        with memoryview(b) as view:
+            for chunk in response["Body"].iter_chunks():
+                view[n : n + len(chunk)] = chunk
+                n += len(chunk)
+        self._pos += n
+        return n
+
+
+def parse_last_modified_date(value: str) -> datetime:
+    """
+    Parse the ``LastModifiedDate`` field in the CSV inventory report,
+    for example ``2024-01-01T00:00:00.000Z``.
+    """
+    return datetime.strptime(value, "%Y-%m-%dT%H:%M:%S.%fZ").replace(
+        tzinfo=timezone.utc
+    )
+
+
+def _to_content(row: T.Dict[str, T.Any]) -> dict:
+    """
+    Convert an inventory record to the ``response["Contents"]`` item
+    dictionary of ListObjectsV2_.
+    """
+    etag = row.get("ETag") or ""
+    return {
+        "Key": row["Key"],
+        "LastModified": row["LastModifiedDate"],
+        "ETag": f'"{etag}"',
+        "Size": row["Size"] or 0,
+        "StorageClass": row.get("StorageClass") or "STANDARD",
+    }
+
+
+def _is_current(row: T.Dict[str, T.Any]) -> bool:
+    """
+    For the inventory with all object versions, only keep the latest
+    version that is not a delete marker.
+    """
+    return (row.get("IsLatest", True) in (True, "true")) and (
+        row.get("IsDeleteMarker", False) not in (True, "true")
+    )
+
+
+class S3Inventory:
+    """
+    An S3Inventory_ report, identified by the S3 location of its
+    ``manifest.json`` file.
+
+    Example:
+
+        >>> inventory = S3Inventory(
+        ...     bucket="my-inventory-bucket",
+        ...     manifest_key="inventory/my-bucket/daily/2024-01-01T01-00Z/manifest.json",
+        ... )
+        >>> for content in inventory.iter_contents(s3_client, prefix="data/"):
+        ...     print(content["Key"], content["Size"])
+        >>> S3Path("s3://my-bucket/data/").count_objects(inventory=inventory)
+
+    :param bucket: the bucket where the manifest file is stored, it is
+        the inventory destination bucket.
+    :param manifest_key: the key of the ``manifest.json`` file.
+    :param concurrency: number of data files to read in parallel.
+    :param buffer_size: max number of record chunks (1000 records per chunk)
+        buffered in memory, default is ``concurrency * 2``.
+
+    .. versionadded:: 2.4.1
+    """
+
+    def __init__(
+        self,
+        bucket: str,
+        manifest_key: str,
+        concurrency: int = 4,
+        buffer_size: T.Optional[int] = None,
+    ):
+        self.bucket = bucket
+        self.manifest_key = manifest_key
+        self.concurrency = concurrency
+        if buffer_size is None:
+            buffer_size = concurrency * 2
+        self.buffer_size = buffer_size
+        self._manifest: T.Optional[dict] = None
+
+    @classmethod
+    def find_latest(
+        cls,
+        s3_client: "S3Client",
+        bucket: str,
+        prefix: str,
+        **kwargs,
+    ) -> "S3Inventory":
+        """
+        Find the latest inventory report under the
+        ``{destination-prefix}/{source-bucket}/{config-id}/`` prefix.
+
+        :param kwargs: other arguments for the constructor.
+        """
+        if not prefix.endswith("/"):
+            prefix = prefix + "/"
+        paginator = s3_client.get_paginator("list_objects_v2")
+        latest = None
+        for response in paginator.paginate(
+            Bucket=bucket,
+            Prefix=prefix,
+            Delimiter="/",
+        ):
+            for dct in response.get("CommonPrefixes", []):
+                # the report folder name is a timestamp like 2024-01-01T01-00Z
+                # the other folder is "data/" or "hive/"
+                folder = dct["Prefix"]
+                if folder[len(prefix) : len(prefix) + 1].isdigit():
+                    if latest is None or folder > latest:
+                        latest = folder
+        if latest is None:
+            raise FileNotFoundError(
+                f"no inventory report found at s3://{bucket}/{prefix}"
+            )
+        return cls(bucket=bucket, manifest_key=f"{latest}manifest.json", **kwargs)
+
+    def get_manifest(self, s3_client: "S3Client") -> dict:
+        """
+        Read the ``manifest.json`` file, the result is cached.
+        """
+        if self._manifest is None:
+            response = s3_client.get_object(Bucket=self.bucket, Key=self.manifest_key)
+            self._manifest = json.loads(response["Body"].read())
+        return self._manifest
+
+    def get_source_bucket(self, s3_client: "S3Client") -> str:
+        return self.get_manifest(s3_client)["sourceBucket"]
+
+    def _get_file_bucket(self, manifest: dict) -> str:
+        destination_bucket = manifest.get("destinationBucket")
+        if destination_bucket:
+            return destination_bucket.split(":::")[-1]
+        return self.bucket  # pragma: no cover
+
+    def _iter_csv_records(
+        self,
+        s3_client: "S3Client",
+        bucket: str,
+        key: str,
+        fields: T.List[str],
+    ) -> T.Iterable[T.Dict[str, T.Any]]:
+        response = s3_client.get_object(Bucket=bucket, Key=key)
+        with gzip.GzipFile(fileobj=response["Body"]) as f_gzip:
+            f_text = io.TextIOWrapper(f_gzip, encoding="utf-8", newline="")
+            for values in csv.reader(f_text):
+                row = dict(zip(fields, values))
+                row["Key"] = unquote_plus(row["Key"])
+                row["Size"] = int(row["Size"]) if row.get("Size") else 0
+                if row.get("LastModifiedDate"):
+                    row["LastModifiedDate"] = parse_last_modified_date(
+                        row["LastModifiedDate"]
+                    )
+                yield row
+
+    def _iter_columnar_records(
+        self,
+        s3_client: "S3Client",
+        bucket: str,
+        key: str,
+        file_format: str,
+    ) -> T.Iterable[T.Dict[str, T.Any]]:
+        """
+        Stream a Parquet or ORC data file with ranged get_object calls, only the
+        inventory columns of one row group (Parquet) or one stripe (ORC) are
+        held in memory at a time.
+        """
+        if pa is None:  # pragma: no cover
+            raise ImportError("You don't have pyarrow installed")
+        columns = {value: name for name, value in _COLUMN_NAMES.items()}
+        with io.BufferedReader(
+            _S3RangeReader(s3_client, bucket, key),
+            buffer_size=_READ_BUFFER_SIZE,
+        ) as f:
+            if file_format == "parquet":
+                parquet_file = pq.ParquetFile(f)
+                names = [
+                    name for name in parquet_file.schema_arrow.names if name in columns
+                ]
+                batches = parquet_file.iter_batches(
+                    batch_size=_CHUNK_SIZE, columns=names
+                )
+            else:
+                orc_file = orc.ORCFile(f)
+                names = [name for name in orc_file.schema.names if name in columns]
+                batches = (
+                    orc_file.read_stripe(i, columns=names)
+                    for i in range(orc_file.nstripes)
+                )
+            for batch in batches:
+                for record in batch.to_pylist():
+                    yield {columns[name]: value for name, value in record.items()}
+
+    def _iter_file_contents(
+        self,
+        s3_client: "S3Client",
+        manifest: dict,
+        key: str,
+        prefix: str,
+    ) -> T.Iterable[T.List[dict]]:
+        """
+        Stream one data file, yield chunks of the content dictionaries
+        under the prefix.
+        """
+        bucket = self._get_file_bucket(manifest)
+        file_format = manifest["fileFormat"].lower()
+        if file_format == "csv":
+            fields = [field.strip() for field in manifest["fileSchema"].split(",")]
+            records = self._iter_csv_records(s3_client, bucket, key, fields)
+        elif file_format in ("parquet", "orc"):
+            records = self._iter_columnar_records(s3_client, bucket, key, file_format)
+        else:  # pragma: no cover
+            raise NotImplementedError(
+                f"unsupported inventory file format {manifest['fileFormat']!r}"
+            )
+        chunk = list()
+        for row in records:
+            if row["Key"].startswith(prefix) and _is_current(row):
+                chunk.append(_to_content(row))
+                if len(chunk) == _CHUNK_SIZE:
+                    yield chunk
+                    chunk = list()
+        if chunk:
+            yield chunk
+
+    def iter_contents(
+        self,
+        s3_client: "S3Client",
+        prefix: str = "",
+        include_folder: bool = True,
+    ) -> T.Iterable[dict]:
+        """
+        Iterate all objects under the prefix in the inventory report,
+        yield the ``response["Contents"]`` item dictionary of ListObjectsV2_.
+
+        The data files are streamed in parallel, and the records are NOT
+        in key order. At most ``buffer_size`` chunks of records plus one
+        chunk per worker thread are held in memory.
+
+        :param s3_client: ``boto3.session.Session().client("s3")`` object.
+        :param prefix: only yield the objects under this prefix.
+        :param include_folder: Default True, whether including the hard folder
+            (an empty "/" object).
+        """
+        manifest = self.get_manifest(s3_client)
+        keys = [dct["key"] for dct in manifest["files"]]
+        for chunk in iter_chain_concurrently(
+            lambda key: self._iter_file_contents(s3_client, manifest, key, prefix),
+            keys,
+            max_workers=self.concurrency,
+            buffer_size=self.buffer_size,
+        ):
+            for content in chunk:
+                if include_folder or is_content_an_object(content):
+                    yield content
+
+    def calculate_total_size(
+        self,
+        s3_client: "S3Client",
+        prefix: str = "",
+        include_folder: bool = False,
+    ) -> T.Tuple[int, int]:
+        """
+        See :func:`~s3pathlib.better_client.list_objects.calculate_total_size`.
+        """
+        count = 0
+        total_size = 0
+        for content in self.iter_contents(
+            s3_client,
+            prefix=prefix,
+            include_folder=include_folder,
+        ):
+            count += 1
+            total_size += content["Size"]
+        return count, total_size
+
+    def count_objects(
+        self,
+        s3_client: "S3Client",
+        prefix: str = "",
+        include_folder: bool = False,
+    ) -> int:
+        """
+        See :func:`~s3pathlib.better_client.list_objects.count_objects`.
+        """
+        return self.calculate_total_size(
+            s3_client,
+            prefix=prefix,
+            include_folder=include_folder,
+        )[0]
@@ -14,6 +14,8 @@ import typing as T
 from func_args import NOTHING, resolve_kwargs
 from iterproxy import IterProxy
 
+from ..utils import iter_prefetch
+
 
 if T.TYPE_CHECKING:  # pragma: no cover
     from mypy_boto3_s3 import S3Client
@@ -159,6 +161,7 @@ def paginate_list_object_versions(
     delimiter: str = NOTHING,
     encoding_type: str = NOTHING,
     expected_bucket_owner: str = NOTHING,
+    prefetch: int = 0,
 ) -> ListObjectVersionsOutputTypeDefIterproxy:
     """
     Wrapper of list_object_versions_ and ListObjectVersions_. However, it returns
@@ -181,10 +184,17 @@ def paginate_list_object_versions(
     :param delimiter: See ListObjectVersions_.
     :param encoding_type: See ListObjectVersions_.
     :param expected_bucket_owner: See ListObjectVersions_.
+    :param prefetch: Default 0, if greater than 0, fetch up to this many pages
+        ahead of the consumer in a background thread. See
+        :func:`~s3pathlib.better_client.list_objects.paginate_list_objects_v2`.
 
     :return: a :class:`ListObjectVersionsOutputTypeDefIterproxy` object.
 
     .. versionadded:: 2.0.1
+
+    .. versionchanged:: 2.4.1
+
+        Add ``prefetch`` argument.
     """
     # validate arguments
     if batch_size < 1 or batch_size > 1000:  # pragma: no cover
@@ -208,4 +218,9 @@ def paginate_list_object_versions(
         for response in paginator.paginate(**kwargs):
             yield response
 
-    return ListObjectVersionsOutputTypeDefIterproxy(_paginate_list_objects_v2())
+    if prefetch:
+        return ListObjectVersionsOutputTypeDefIterproxy(
+            iter_prefetch(_paginate_list_objects_v2(), prefetch=prefetch)
+        )
+    else:
+        return ListObjectVersionsOutputTypeDefIterproxy(_paginate_list_objects_v2())
@@ -0,0 +1,492 @@
+# -*- coding: utf-8 -*-
+
+"""
+Columnar representation of the list_objects_v2 result.
+
+Building an ``S3Path`` and a metadata dict for every object takes hundreds
+of bytes per key. For a prefix with tens of millions of objects, this module
+accumulates the keys, sizes, last modified epochs, ETags and storage classes
+into compact, typed arrays from the :mod:`array` standard library instead.
+You can filter and aggregate on the columns, and only convert the objects you
+need to ``S3Path``. The columns can be converted to numpy arrays or pyarrow
+table if you have them installed.
+
+.. _ListObjectsV2: https://boto3.amazonaws.com/v1/documentation/api/latest/reference/services/s3/paginator/ListObjectsV2.html
+"""
+
+import typing as T
+from array import array
+from datetime import datetime, timezone
+
+from func_args import NOTHING
+
+from .list_objects import (
+    paginate_list_objects_v2,
+    fan_out_list_objects_v2,
+    is_content_an_object,
+)
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+except:  # pragma: no cover
+    raise
+
+try:
+    import pyarrow as pa
+except ImportError:  # pragma: no cover
+    pa = None
+except:  # pragma: no cover
+    raise
+
+if T.TYPE_CHECKING:  # pragma: no cover
+    from mypy_boto3_s3 import S3Client
+    from mypy_boto3_s3.type_defs import ObjectTypeDef
+    from ..core.iter_objects import S3PathIterProxy
+
+
+def _count_and_sum(
+    codes: T.Sequence[int],
+    sizes: T.Sequence[int],
+    n_groups: int,
+) -> T.Tuple[T.List[int], T.List[int]]:
+    """
+    Count the objects and sum their sizes by the group code.
+    """
+    if np is not None:
+        codes = np.asarray(codes)
+        counts = np.bincount(codes, minlength=n_groups)
+        # the float64 weights are exact for totals up to 2 ** 53 bytes
+        totals = np.bincount(codes, weights=np.asarray(sizes), minlength=n_groups)
+        return counts.tolist(), [int(total) for total in totals]
+    else:
+        counts = [0] * n_groups
+        totals = [0] * n_groups
+        for code, size in zip(codes, sizes):
+            counts[code] += 1
+            totals[code] += size
+        return counts, totals
+
+
+class ObjectColumns:
+    """
+    Store many S3 objects' metadata in columns.
+
+    - keys and ETags are utf-8 encoded and concatenated into one ``bytearray``,
+        with an ``int64`` offset array.
+    - sizes are stored in an ``int64`` array.
+    - last modified are stored in a ``float64`` array of epoch seconds.
+    - storage classes are dictionary encoded into an ``uint8`` array.
+
+    Example:
+
+        >>> columns = list_objects_columnar(s3_client, "my-bucket", "data/")
+        >>> len(columns)
+        20000000
+        >>> columns.total_size()
+        123456789012
+        >>> big = columns.filter(min_size=1000_000_000, storage_classes=["STANDARD"])
+        >>> big.size_by_prefix(prefix="data/", depth=1)
+        {'data/2024/': (12, 123456789), 'data/2025/': (98, 987654321)}
+        >>> big.iter_s3path().all()
+        [S3Path('s3://my-bucket/data/2024/...'), ...]
+
+    :param bucket: S3 bucket name of the objects.
+
+    .. versionadded:: 2.4.1
+    """
+
+    def __init__(self, bucket: T.Optional[str]):
+        self.bucket = bucket
+        self.key_data = bytearray()
+        self.key_offsets = array("q", [0])
+        self.sizes = array("q")
+        self.last_modified = array("d")
+        self.etag_data = bytearray()
+        self.etag_offsets = array("q", [0])
+        self.storage_class_codes = array("B")
+        self.storage_class_names: T.List[str] = list()
+        self._storage_class_lookup: T.Dict[str, int] = dict()
+
+    def __len__(self) -> int:
+        return len(self.sizes)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(bucket={self.bucket!r}, n_objects={len(self)})"
+
+    def _encode_storage_class(self, storage_class: str) -> int:
+        try:
+            return self._storage_class_lookup[storage_class]
+        except KeyError:
+            code = len(self.storage_class_names)
+            self.storage_class_names.append(storage_class)
+            self._storage_class_lookup[storage_class] = code
+            return code
+
+    def append(self, content: "ObjectTypeDef"):
+        """
+        Append one ``response["Contents"]`` item.
+        """
+        self.key_data.extend(content["Key"].encode("utf-8"))
+        self.key_offsets.append(len(self.key_data))
+        self.sizes.append(content["Size"])
+        self.last_modified.append(content["LastModified"].timestamp())
+        self.etag_data.extend(content.get("ETag", "").encode("utf-8"))
+        self.etag_offsets.append(len(self.etag_data))
+        self.storage_class_codes.append(
+            self._encode_storage_class(content.get("StorageClass", "STANDARD"))
+        )
+
+    def extend(self, contents: T.Iterable["ObjectTypeDef"]):
+        """
+        Append many ``response["Contents"]`` items.
+        """
+        for content in contents:
+            self.append(content)
+
+    def get_key(self, i: int) -> str:
+        return self.key_data[self.key_offsets[i] : self.key_offsets[i + 1]].decode(
+            "utf-8"
+        )
+
+    def get_etag(self, i: int) -> str:
+        return self.etag_data[
+            self.etag_offsets[i] : self.etag_offsets[i + 1]
+        ].decode("utf-8")
+
+    def get_storage_class(self, i: int) -> str:
+        return self.storage_class_names[self.storage_class_codes[i]]
+
+    def iter_keys(self) -> T.Iterable[str]:
+        key_data, key_offsets = self.key_data, self.key_offsets
+        for i in range(len(self)):
+            yield key_data[key_offsets[i] : key_offsets[i + 1]].decode("utf-8")
+
+    def get_content(self, i: int) -> dict:
+        """
+        Get the i-th object as the ``response["Contents"]`` item dictionary.
+        """
+        return {
+            "Key": self.get_key(i),
+            "LastModified": datetime.fromtimestamp(
+                self.last_modified[i], tz=timezone.utc
+            ),
+            "ETag": self.get_etag(i),
+            "Size": self.sizes[i],
+            "StorageClass": self.get_storage_class(i),
+        }
+
+    def iter_contents(
+        self,
+        indices: T.Optional[T.Iterable[int]] = None,
+    ) -> T.Iterable[dict]:
+        if indices is None:
+            indices = range(len(self))
+        for i in indices:
+            yield self.get_content(i)
+
+    def iter_s3path(
+        self,
+        indices: T.Optional[T.Iterable[int]] = None,
+    ) -> "S3PathIterProxy":
+        """
+        Convert the objects to :class:`~s3pathlib.core.s3path.S3Path` on demand.
+        """
+        from ..core.s3path import S3Path
+        from ..core.iter_objects import S3PathIterProxy
+
+        bucket = self.bucket
+        return S3PathIterProxy(
+            (
+                S3Path._from_content_dict(bucket, content)
+                for content in self.iter_contents(indices)
+            )
+        )
+
+    def take(self, indices: T.Iterable[int]) -> "ObjectColumns":
+        """
+        Create a new :class:`ObjectColumns` with the objects at the given indices.
+        """
+        new = self.__class__(bucket=self.bucket)
+        new.storage_class_names = list(self.storage_class_names)
+        new._storage_class_lookup = dict(self._storage_class_lookup)
+        key_data, key_offsets = self.key_data, self.key_offsets
+        etag_data, etag_offsets = self.etag_data, self.etag_offsets
+        for i in indices:
+            new.key_data.extend(key_data[key_offsets[i] : key_offsets[i + 1]])
+            new.key_offsets.append(len(new.key_data))
+            new.etag_data.extend(etag_data[etag_offsets[i] : etag_offsets[i + 1]])
+            new.etag_offsets.append(len(new.etag_data))
+            new.sizes.append(self.sizes[i])
+            new.last_modified.append(self.last_modified[i])
+            new.storage_class_codes.append(self.storage_class_codes[i])
+        return new
+
+    def where(
+        self,
+        key_prefix: T.Optional[str] = None,
+        key_suffix: T.Optional[str] = None,
+        min_size: T.Optional[int] = None,
+        max_size: T.Optional[int] = None,
+        modified_after: T.Optional[datetime] = None,
+        modified_before: T.Optional[datetime] = None,
+        storage_classes: T.Optional[T.Iterable[str]] = None,
+    ) -> T.List[int]:
+        """
+        Find the indices of the objects that match all the given criteria.
+        Each criteria is evaluated on one column, the key column is only
+        scanned when ``key_prefix`` or ``key_suffix`` is given. If numpy is
+        installed, the numeric and storage class criteria are evaluated as
+        vectorized boolean masks.
+
+        :param key_prefix: key starts with this prefix.
+        :param key_suffix: key ends with this suffix.
+        :param min_size: size >= min_size.
+        :param max_size: size <= max_size.
+        :param modified_after: last modified >= modified_after.
+        :param modified_before: last modified < modified_before.
+        :param storage_classes: storage class is one of these.
+        """
+        codes = None
+        if storage_classes is not None:
+            codes = {
+                self._storage_class_lookup[storage_class]
+                for storage_class in storage_classes
+                if storage_class in self._storage_class_lookup
+            }
+        indices: T.Iterable[int]
+        if np is not None:
+            # the views are released when this method returns
+            mask = np.ones(len(self), dtype=bool)
+            if min_size is not None:
+                mask &= np.frombuffer(self.sizes, dtype=np.int64) >= min_size
+            if max_size is not None:
+                mask &= np.frombuffer(self.sizes, dtype=np.int64) <= max_size
+            if modified_after is not None:
+                mask &= (
+                    np.frombuffer(self.last_modified, dtype=np.float64)
+                    >= modified_after.timestamp()
+                )
+            if modified_before is not None:
+                mask &= (
+                    np.frombuffer(self.last_modified, dtype=np.float64)
+                    < modified_before.timestamp()
+                )
+            if codes is not None:
+                mask &= np.isin(
+                    np.frombuffer(self.storage_class_codes, dtype=np.uint8),
+                    np.array(sorted(codes), dtype=np.uint8),
+                )
+            indices = np.flatnonzero(mask).tolist()
+        else:
+            indices = range(len(self))
+            if min_size is not None:
+                sizes = self.sizes
+                indices = [i for i in indices if sizes[i] >= min_size]
+            if max_size is not None:
+                sizes = self.sizes
+                indices = [i for i in indices if sizes[i] <= max_size]
+            if modified_after is not None:
+                epoch = modified_after.timestamp()
+                last_modified = self.last_modified
+                indices = [i for i in indices if last_modified[i] >= epoch]
+            if modified_before is not None:
+                epoch = modified_before.timestamp()
+                last_modified = self.last_modified
+                indices = [i for i in indices if last_modified[i] < epoch]
+            if codes is not None:
+                storage_class_codes = self.storage_class_codes
+                indices = [i for i in indices if storage_class_codes[i] in codes]
+        if key_prefix is not None or key_suffix is not None:
+            key_data, key_offsets = self.key_data, self.key_offsets
+            prefix = (key_prefix or "").encode("utf-8")
+            suffix = (key_suffix or "").encode("utf-8")
+            indices = [
+                i
+                for i in indices
+                if key_data.startswith(prefix, key_offsets[i], key_offsets[i + 1])
+                and key_data.endswith(suffix, key_offsets[i], key_offsets[i + 1])
+            ]
+        return list(indices)
+
+    def filter(self, **kwargs) -> "ObjectColumns":
+        """
+        Create a new :class:`ObjectColumns` with the objects that match all
+        the given criteria. See :meth:`ObjectColumns.where` for the arguments.
+        """
+        return self.take(self.where(**kwargs))
+
+    def total_size(self) -> int:
+        if np is not None:
+            return int(np.asarray(self.sizes).sum())
+        else:
+            return sum(self.sizes)
+
+    def size_by_storage_class(self) -> T.Dict[str, T.Tuple[int, int]]:
+        """
+        :return: storage class -> (count, total size) mapping.
+        """
+        counts, totals = _count_and_sum(
+            self.storage_class_codes,
+            self.sizes,
+            len(self.storage_class_names),
+        )
+        return {
+            name: (counts[code], totals[code])
+            for code, name in enumerate(self.storage_class_names)
+            if counts[code]
+        }
+
+    def size_by_prefix(
+        self,
+        prefix: str = "",
+        depth: int = 1,
+    ) -> T.Dict[str, T.Tuple[int, int]]:
+        """
+        Group the objects by the first ``depth`` folders under ``prefix``.
+        Objects directly under the group level are grouped by ``prefix`` itself.
+        The group of each key is found on the encoded key column without
+        decoding it, the counts and sizes are summed with numpy if installed.
+
+        :param prefix: the common prefix of the keys, usually the listed prefix.
+        :param depth: number of folder levels under the prefix.
+
+        :return: folder prefix -> (count, total size) mapping, sorted by prefix.
+        """
+        key_data, key_offsets, sizes = self.key_data, self.key_offsets, self.sizes
+        prefix_bytes = prefix.encode("utf-8")
+        n = len(prefix_bytes)
+        lookup: T.Dict[bytes, int] = dict()
+        codes = array("q")
+        group_sizes = array("q")
+        for i in range(len(self)):
+            start, end = key_offsets[i], key_offsets[i + 1]
+            if not key_data.startswith(prefix_bytes, start, end):
+                continue
+            stop = start + n
+            for _ in range(depth):
+                j = key_data.find(b"/", stop, end)
+                if j == -1:
+                    break
+                stop = j + 1
+            group = bytes(key_data[start:stop])
+            try:
+                codes.append(lookup[group])
+            except KeyError:
+                lookup[group] = len(lookup)
+                codes.append(lookup[group])
+            group_sizes.append(sizes[i])
+        counts, totals = _count_and_sum(codes, group_sizes, len(lookup))
+        result = {
+            group.decode("utf-8"): (counts[code], totals[code])
+            for group, code in lookup.items()
+        }
+        return {group: result[group] for group in sorted(result)}
+
+    def to_numpy(self) -> T.Dict[str, "np.ndarray"]:
+        """
+        Convert the columns to a dict of numpy arrays. The numeric columns
+        are copied, so the returned arrays don't lock the underlying buffers,
+        and you can still append objects to the columns.
+        """
+        if np is None:  # pragma: no cover
+            raise ImportError("You don't have numpy installed")
+        return {
+            "key": np.array(list(self.iter_keys()), dtype=object),
+            "size": np.array(self.sizes, dtype=np.int64),
+            "last_modified": np.array(self.last_modified, dtype=np.float64),
+            "etag": np.array(
+                [self.get_etag(i) for i in range(len(self))], dtype=object
+            ),
+            "storage_class": np.array(self.storage_class_names, dtype=object)[
+                np.frombuffer(self.storage_class_codes, dtype=np.uint8)
+            ],
+        }
+
+    def to_arrow(self) -> "pa.Table":
+        """
+        Convert the columns to a pyarrow Table. The key and ETag columns are
+        built from copies of the underlying buffers without decoding to
+        Python str, so you can still append objects to the columns.
+        """
+        if pa is None:  # pragma: no cover
+            raise ImportError("You don't have pyarrow installed")
+        n = len(self)
+        return pa.table(
+            {
+                "key": pa.LargeStringArray.from_buffers(
+                    n,
+                    pa.py_buffer(self.key_offsets.tobytes()),
+                    pa.py_buffer(bytes(self.key_data)),
+                ),
+                "size": pa.array(self.sizes, type=pa.int64()),
+                "last_modified": pa.array(self.last_modified, type=pa.float64()),
+                "etag": pa.LargeStringArray.from_buffers(
+                    n,
+                    pa.py_buffer(self.etag_offsets.tobytes()),
+                    pa.py_buffer(bytes(self.etag_data)),
+                ),
+                "storage_class": pa.DictionaryArray.from_arrays(
+                    pa.array(self.storage_class_codes, type=pa.uint8()),
+                    pa.array(self.storage_class_names, type=pa.string()),
+                ),
+            }
+        )
+
+
+def list_objects_columnar(
+    s3_client: "S3Client",
+    bucket: str,
+    prefix: str,
+    batch_size: int = 1000,
+    limit: int = NOTHING,
+    include_folder: bool = False,
+    concurrency: int = 1,
+    prefetch: int = 0,
+    request_payer: str = NOTHING,
+    expected_bucket_owner: str = NOTHING,
+) -> ObjectColumns:
+    """
+    Recursively list all objects under the prefix into an :class:`ObjectColumns`,
+    without creating an ``S3Path`` object for each object.
+
+    :param s3_client: ``boto3.session.Session().client("s3")`` object.
+    :param bucket: S3 bucket name.
+    :param prefix: The s3 prefix (logic directory) you want to list.
+    :param batch_size: Number of s3 object returned per paginator,
+        valid value is from 1 ~ 1000. large number can reduce IO.
+    :param limit: Total number of s3 object to return.
+    :param include_folder: Default False, whether including the hard folder
+        (an empty "/" object).
+    :param concurrency: Default 1, if greater than 1, list the sub folders
+        in a thread pool, see
+        :func:`~s3pathlib.better_client.list_objects.fan_out_list_objects_v2`.
+    :param prefetch: See
+        :func:`~s3pathlib.better_client.list_objects.paginate_list_objects_v2`.
+    :param request_payer: See ListObjectsV2_.
+    :param expected_bucket_owner: See ListObjectsV2_.
+
+    :return: a :class:`ObjectColumns` object.
+
+    .. versionadded:: 2.4.1
+    """
+    kwargs = dict(
+        s3_client=s3_client,
+        bucket=bucket,
+        prefix=prefix,
+        batch_size=batch_size,
+        limit=limit,
+        prefetch=prefetch,
+        request_payer=request_payer,
+        expected_bucket_owner=expected_bucket_owner,
+    )
+    if concurrency > 1:
+        contents = fan_out_list_objects_v2(concurrency=concurrency, **kwargs)
+    else:
+        contents = paginate_list_objects_v2(**kwargs).contents()
+    if include_folder is False:
+        contents = contents.filter(is_content_an_object)
+    columns = ObjectColumns(bucket=bucket)
+    columns.extend(contents)
+    return columns
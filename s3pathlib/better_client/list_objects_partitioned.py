@@ -0,0 +1,533 @@
+# -*- coding: utf-8 -*-
+
+"""
+List a flat keyspace, such as millions of hashed keys under one "folder",
+by splitting it into lexicographic key ranges and listing each range in
+a worker thread or process.
+
+Fan-out by delimiter (see
+:func:`~s3pathlib.better_client.list_objects.fan_out_list_objects_v2`) is no
+help when there is no sub folder. Instead, we sample the keyspace with
+``StartAfter`` probes of the ListObjectsV2_ API, and use the sampled keys
+as the boundaries of the key ranges.
+
+.. _ListObjectsV2: https://boto3.amazonaws.com/v1/documentation/api/latest/reference/services/s3/paginator/ListObjectsV2.html
+"""
+
+import typing as T
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+from func_args import NOTHING, resolve_kwargs
+
+from ..utils import iter_map_concurrently, iter_chain_concurrently
+from .list_objects import (
+    ObjectTypeDefIterproxy,
+    paginate_list_objects_v2,
+)
+
+if T.TYPE_CHECKING:  # pragma: no cover
+    from mypy_boto3_s3 import S3Client
+    from mypy_boto3_s3.type_defs import ObjectTypeDef
+
+
+# S3 sorts keys by UTF-8 bytes, which is the same as sorting by unicode code point.
+_MAX_CODE_POINT = 0x10FFFF
+_BASE = _MAX_CODE_POINT + 1
+_SURROGATE_START = 0xD800
+_SURROGATE_END = 0xDFFF
+# number of code points after the common prefix used for interpolation
+_WIDTH = 3
+
+
+def _to_valid_code_point(digit: int) -> int:
+    """
+    Round up the code point to the next one that is safe to be sent as
+    ``StartAfter``. Control characters, surrogates and non-characters are
+    not allowed in XML.
+    """
+    if 0 < digit < 0x20:
+        return 0x20
+    if _SURROGATE_START <= digit <= _SURROGATE_END:
+        return _SURROGATE_END + 1
+    if 0xFDD0 <= digit <= 0xFDEF:
+        return 0xFDF0
+    if (digit & 0xFFFE) == 0xFFFE and digit < _MAX_CODE_POINT - 1:
+        return digit - (digit & 0xFFFF) + 0x10000
+    return digit
+
+
+def key_midpoint(lower: str, upper: str) -> T.Optional[str]:
+    """
+    Find a string that is lexicographically between ``lower`` and ``upper``
+    by interpolating the code points after their common prefix.
+
+    Example::
+
+        >>> key_midpoint("a", "c")
+        'b'
+        >>> key_midpoint("2024-01", "2024-03")
+        '2024-02'
+        >>> key_midpoint("a", "a") is None
+        True
+
+    :return: the midpoint string, or None if it cannot find one.
+
+    .. versionadded:: 2.4.1
+    """
+    n = 0
+    for c1, c2 in zip(lower, upper):
+        if c1 != c2:
+            break
+        n += 1
+    head = lower[:n]
+    lo_digits = [ord(c) for c in lower[n : n + _WIDTH]]
+    hi_digits = [ord(c) for c in upper[n : n + _WIDTH]]
+    lo_digits.extend([0] * (_WIDTH - len(lo_digits)))
+    hi_digits.extend([0] * (_WIDTH - len(hi_digits)))
+
+    lo_int, hi_int = 0, 0
+    for lo_digit, hi_digit in zip(lo_digits, hi_digits):
+        lo_int = lo_int * _BASE + lo_digit
+        hi_int = hi_int * _BASE + hi_digit
+    mid_int = (lo_int + hi_int) // 2
+
+    digits = list()
+    for _ in range(_WIDTH):
+        mid_int, digit = divmod(mid_int, _BASE)
+        digits.append(_to_valid_code_point(digit))
+    digits.reverse()
+    while digits and digits[-1] == 0:
+        digits.pop()
+
+    mid = head + "".join([chr(digit) for digit in digits])
+    if lower < mid < upper:
+        return mid
+    else:
+        return None
+
+
+def _next_key(
+    s3_client: "S3Client",
+    bucket: str,
+    prefix: str,
+    start_after: str = NOTHING,
+    request_payer: str = NOTHING,
+    expected_bucket_owner: str = NOTHING,
+) -> T.Optional[str]:
+    """
+    Return the first key after ``start_after``, or None if no more key.
+    """
+    response = s3_client.list_objects_v2(
+        **resolve_kwargs(
+            Bucket=bucket,
+            Prefix=prefix,
+            MaxKeys=1,
+            StartAfter=start_after,
+            RequestPayer=request_payer,
+            ExpectedBucketOwner=expected_bucket_owner,
+        )
+    )
+    contents = response.get("Contents", [])
+    if contents:
+        return contents[0]["Key"]
+    else:
+        return None
+
+
+def sample_keyspace(
+    s3_client: "S3Client",
+    bucket: str,
+    prefix: str,
+    n_samples: int = 64,
+    max_probes: int = 512,
+    concurrency: int = 8,
+    start_after: str = NOTHING,
+    request_payer: str = NOTHING,
+    expected_bucket_owner: str = NOTHING,
+) -> T.List[str]:
+    """
+    Sample existing keys under the prefix using ``StartAfter`` probes.
+
+    It keeps a list of unexplored key intervals. For each interval, it probes
+    the first key after the midpoint of the interval. If the key falls in the
+    interval, it becomes a new sample and splits the interval, otherwise the
+    upper half of the interval is known to be empty. All intervals in a round
+    are probed concurrently.
+
+    :param s3_client: ``boto3.session.Session().client("s3")`` object.
+    :param bucket: S3 bucket name.
+    :param prefix: The s3 prefix to sample.
+    :param n_samples: stop when we have this many samples.
+    :param max_probes: stop when we have sent this many probe requests.
+    :param concurrency: number of probes to send at the same time.
+    :param start_after: only sample keys after this key.
+    :param request_payer: See ListObjectsV2_.
+    :param expected_bucket_owner: See ListObjectsV2_.
+
+    :return: sorted list of unique sampled keys. It is empty if there's no
+        object under the prefix.
+
+    .. versionadded:: 2.4.1
+    """
+    kwargs = dict(
+        s3_client=s3_client,
+        bucket=bucket,
+        prefix=prefix,
+        request_payer=request_payer,
+        expected_bucket_owner=expected_bucket_owner,
+    )
+    first_key = _next_key(start_after=start_after, **kwargs)
+    if first_key is None:
+        return []
+
+    samples = {first_key}
+    # list of (lower, upper) open interval that is not explored yet
+    intervals = [(first_key, prefix + chr(_MAX_CODE_POINT - 2))]
+    n_probes = 1
+    while intervals and (len(samples) < n_samples) and (n_probes < max_probes):
+        todo = list()
+        for lower, upper in intervals[: max_probes - n_probes]:
+            mid = key_midpoint(lower, upper)
+            if mid is not None:
+                todo.append((lower, upper, mid))
+        keys = list(
+            iter_map_concurrently(
+                func=lambda args: _next_key(start_after=args[2], **kwargs),
+                iterable=todo,
+                max_workers=concurrency,
+            )
+        )
+        n_probes += len(todo)
+
+        intervals = list()
+        for (lower, upper, mid), key in zip(todo, keys):
+            intervals.append((lower, mid))
+            if (key is not None) and (key < upper):
+                samples.add(key)
+                intervals.append((key, upper))
+    return list(sorted(samples))
+
+
+def split_keyspace(
+    samples: T.List[str],
+    n_partitions: int,
+    start_after: T.Optional[str] = None,
+) -> T.List[T.Tuple[T.Optional[str], T.Optional[str]]]:
+    """
+    Split the keyspace into at most ``n_partitions`` lexicographic key ranges
+    using the sampled keys as boundaries.
+
+    Example::
+
+        >>> split_keyspace(["a", "b", "c", "d"], n_partitions=2)
+        [(None, 'c'), ('c', None)]
+
+    :param samples: sorted sampled keys, see :func:`sample_keyspace`.
+    :param n_partitions: number of partitions.
+    :param start_after: the lower bound of the first key range.
+
+    :return: list of ``(start_after, end_key)`` tuple. ``start_after`` is
+        exclusive, ``end_key`` is inclusive, None means unbounded.
+
+    .. versionadded:: 2.4.1
+    """
+    if n_partitions < 1:
+        raise ValueError("``n_partitions`` has to be greater than 0.")
+    boundaries = list()
+    for i in range(1, n_partitions):
+        index = i * len(samples) // n_partitions
+        if index < len(samples):
+            boundary = samples[index]
+            if (not boundaries) or (boundary > boundaries[-1]):
+                boundaries.append(boundary)
+    lowers = [start_after] + boundaries
+    uppers = boundaries + [None]
+    return list(zip(lowers, uppers))
+
+
+def _iter_key_range(
+    s3_client: "S3Client",
+    bucket: str,
+    prefix: str,
+    start_after: T.Optional[str],
+    end_key: T.Optional[str],
+    batch_size: int = 1000,
+    limit: int = NOTHING,
+    fetch_owner: bool = NOTHING,
+    request_payer: str = NOTHING,
+    expected_bucket_owner: str = NOTHING,
+) -> T.Iterator[T.List["ObjectTypeDef"]]:
+    """
+    List all objects in the ``(start_after, end_key]`` key range, yield the
+    contents page by page. It stops sending request once it passes the
+    ``end_key``.
+    """
+    for response in paginate_list_objects_v2(
+        s3_client=s3_client,
+        bucket=bucket,
+        prefix=prefix,
+        batch_size=batch_size,
+        limit=limit,
+        fetch_owner=fetch_owner,
+        start_after=NOTHING if start_after is None else start_after,
+        request_payer=request_payer,
+        expected_bucket_owner=expected_bucket_owner,
+    ):
+        contents = response.get("Contents", [])
+        if (end_key is not None) and contents and (contents[-1]["Key"] > end_key):
+            yield [dct for dct in contents if dct["Key"] <= end_key]
+            return
+        yield contents
+
+
+# the pages listed by one process pool task, it bounds the size of the result
+# sent back to the main process
+_PAGES_PER_BATCH = 10
+# the finished batches buffered per key range in the main process
+_MAX_BUFFERED_BATCHES = 2
+
+_process_s3_clients: T.Dict[str, "S3Client"] = dict()
+
+
+def _list_key_range_batch_with_new_client(
+    kwargs: T.Dict[str, T.Any],
+) -> T.Tuple[T.List["ObjectTypeDef"], T.Optional[str]]:
+    """
+    The worker function for process pool, it lists up to ``max_items`` objects
+    of the key range. boto3 client cannot be pickled, so each worker process
+    creates its own client, and reuses it for the following batches.
+
+    :return: the contents, and the ``start_after`` of the next batch, None if
+        the key range is done.
+    """
+    import boto3
+
+    kwargs = dict(kwargs)
+    s3_client_kwargs = kwargs.pop("s3_client_kwargs")
+    max_items = kwargs.pop("max_items")
+    cache_key = repr(sorted(s3_client_kwargs.items()))
+    try:
+        s3_client = _process_s3_clients[cache_key]
+    except KeyError:
+        s3_client = boto3.session.Session().client("s3", **s3_client_kwargs)
+        _process_s3_clients[cache_key] = s3_client
+    contents = list()
+    for page in _iter_key_range(s3_client=s3_client, limit=max_items, **kwargs):
+        contents.extend(page)
+    if len(contents) < max_items:
+        return contents, None
+    last_key = contents[-1]["Key"]
+    if (kwargs["end_key"] is not None) and (last_key >= kwargs["end_key"]):
+        return contents, None
+    return contents, last_key
+
+
+def _iter_key_ranges_in_process_pool(
+    kwargs_list: T.List[T.Dict[str, T.Any]],
+    concurrency: int,
+) -> T.Iterator[T.List["ObjectTypeDef"]]:
+    """
+    List the key ranges in a process pool, yield the contents in key order.
+
+    Each task lists a bounded batch of a key range. Only ``concurrency`` key
+    ranges are in progress, each of them has at most one task in flight and
+    ``_MAX_BUFFERED_BATCHES`` finished batches waiting for the consumer.
+    """
+    executor = ProcessPoolExecutor(max_workers=concurrency)
+    kwargs_iterator = iter(kwargs_list)
+    # each state is a dict of kwargs, future, buffer and is_done
+    states = deque()
+
+    def _add_key_range():
+        for kwargs in kwargs_iterator:
+            states.append(
+                dict(
+                    kwargs=kwargs,
+                    future=executor.submit(
+                        _list_key_range_batch_with_new_client, kwargs
+                    ),
+                    buffer=deque(),
+                    is_done=False,
+                )
+            )
+            return
+
+    def _collect(state: dict):
+        contents, next_start_after = state["future"].result()
+        state["future"] = None
+        state["buffer"].append(contents)
+        if next_start_after is None:
+            state["is_done"] = True
+        else:
+            state["kwargs"] = {**state["kwargs"], "start_after": next_start_after}
+
+    def _resubmit(state: dict):
+        if (
+            (state["future"] is None)
+            and (state["is_done"] is False)
+            and (len(state["buffer"]) < _MAX_BUFFERED_BATCHES)
+        ):
+            state["future"] = executor.submit(
+                _list_key_range_batch_with_new_client, state["kwargs"]
+            )
+
+    try:
+        for _ in range(concurrency):
+            _add_key_range()
+        while states:
+            head = states[0]
+            if head["buffer"]:
+                contents = head["buffer"].popleft()
+                _resubmit(head)
+                yield contents
+            elif head["is_done"]:
+                states.popleft()
+                _add_key_range()
+            else:
+                wait(
+                    [state["future"] for state in states if state["future"]],
+                    return_when=FIRST_COMPLETED,
+                )
+                for state in states:
+                    if (state["future"] is not None) and state["future"].done():
+                        _collect(state)
+                        _resubmit(state)
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def partitioned_list_objects_v2(
+    s3_client: "S3Client",
+    bucket: str,
+    prefix: str,
+    concurrency: int = 8,
+    n_partitions: int = NOTHING,
+    use_process_pool: bool = False,
+    s3_client_kwargs: T.Optional[T.Dict[str, T.Any]] = None,
+    batch_size: int = 1000,
+    limit: int = NOTHING,
+    fetch_owner: bool = NOTHING,
+    start_after: str = NOTHING,
+    request_payer: str = NOTHING,
+    expected_bucket_owner: str = NOTHING,
+) -> ObjectTypeDefIterproxy:
+    """
+    Recursively list all objects under the prefix by splitting the keyspace
+    into lexicographic key ranges and listing them concurrently. The output
+    is concatenated in lexicographic order, it is the same as
+    :func:`~s3pathlib.better_client.list_objects.paginate_list_objects_v2`.
+
+    Each key range is streamed page by page, only ``concurrency`` key ranges
+    are in progress, and each of them buffers at most a few pages ahead of
+    the consumer, so the memory usage stays flat no matter how large the key
+    ranges are.
+
+    Example::
+
+        >>> for content in partitioned_list_objects_v2(
+        ...     s3_client=s3_client,
+        ...     bucket="my-bucket",
+        ...     prefix="hashed-keys/",
+        ...     concurrency=16,
+        ... ):
+        ...     print(content["Key"])
+
+    :param s3_client: ``boto3.session.Session().client("s3")`` object. If
+        ``use_process_pool`` is True, it is only used to sample the keyspace.
+    :param bucket: See ListObjectsV2_.
+    :param prefix: See ListObjectsV2_.
+    :param concurrency: number of key ranges to list at the same time.
+    :param n_partitions: number of key ranges, default is ``concurrency * 4``.
+        More partitions means better load balance, but more sampling requests.
+    :param use_process_pool: if True, list key ranges in worker processes
+        instead of threads. Since boto3 client cannot be pickled, each worker
+        creates its own client using ``s3_client_kwargs``, the ``s3_client``
+        is NOT used by the workers. Each task lists a batch of up to 10 pages
+        of a key range, so the result sent back to the main process is bounded.
+    :param s3_client_kwargs: keyword arguments for
+        ``boto3.session.Session().client("s3", **s3_client_kwargs)``, such as
+        ``region_name``, the credentials and ``endpoint_url``. It is required
+        when ``use_process_pool`` is True, so the workers don't silently list
+        with the default credentials.
+    :param batch_size: See ListObjectsV2_.
+    :param limit: See ListObjectsV2_.
+    :param fetch_owner: See ListObjectsV2_.
+    :param start_after: See ListObjectsV2_.
+    :param request_payer: See ListObjectsV2_.
+    :param expected_bucket_owner: See ListObjectsV2_.
+
+    :return: a :class:`~s3pathlib.better_client.list_objects.ObjectTypeDefIterproxy`
+        object, it also includes the hard folder objects (key ends with "/").
+
+    .. versionadded:: 2.4.1
+    """
+    if concurrency < 1:
+        raise ValueError("``concurrency`` has to be greater than 0.")
+    if use_process_pool and (s3_client_kwargs is None):
+        raise ValueError(
+            "``s3_client_kwargs`` is required when ``use_process_pool`` is True, "
+            "the worker processes cannot use the ``s3_client``."
+        )
+    if n_partitions is NOTHING:
+        n_partitions = concurrency * 4
+
+    def _partitioned_list_objects_v2():
+        samples = sample_keyspace(
+            s3_client=s3_client,
+            bucket=bucket,
+            prefix=prefix,
+            n_samples=n_partitions * 4,
+            max_probes=n_partitions * 16,
+            concurrency=concurrency,
+            start_after=start_after,
+            request_payer=request_payer,
+            expected_bucket_owner=expected_bucket_owner,
+        )
+        if not samples:
+            return
+        key_ranges = split_keyspace(
+            samples=samples,
+            n_partitions=n_partitions,
+            start_after=None if start_after is NOTHING else start_after,
+        )
+        kwargs_list = [
+            dict(
+                bucket=bucket,
+                prefix=prefix,
+                start_after=lower,
+                end_key=upper,
+                batch_size=batch_size,
+                limit=limit,
+                fetch_owner=fetch_owner,
+                request_payer=request_payer,
+                expected_bucket_owner=expected_bucket_owner,
+            )
+            for lower, upper in key_ranges
+        ]
+        if use_process_pool:
+            for kwargs in kwargs_list:
+                kwargs.pop("limit")
+                kwargs["s3_client_kwargs"] = s3_client_kwargs
+                kwargs["max_items"] = batch_size * _PAGES_PER_BATCH
+            results = _iter_key_ranges_in_process_pool(
+                kwargs_list=kwargs_list,
+                concurrency=concurrency,
+            )
+        else:
+            results = iter_chain_concurrently(
+                func=lambda kwargs: _iter_key_range(s3_client=s3_client, **kwargs),
+                iterable=kwargs_list,
+                max_workers=concurrency,
+                ordered=True,
+            )
+
+        count = 0
+        for contents in results:
+            for content in contents:
+                if (limit is not NOTHING) and (count >= limit):
+                    return
+                count += 1
+                yield content
+
+    return ObjectTypeDefIterproxy(_partitioned_list_objects_v2())
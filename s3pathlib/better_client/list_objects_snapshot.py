@@ -0,0 +1,527 @@
+# -*- coding: utf-8 -*-
+
+"""
+A local SQLite snapshot of the list_objects_v2 result of a prefix, that can
+be refreshed incrementally and queried without hitting S3.
+
+Many jobs re-list the same, mostly immutable prefixes again and again.
+With a snapshot, the first run does a full listing, and the later runs only
+list the keys after the last known key (append only prefixes, such as time
+ordered keys), or only the new / changed sub folders.
+
+.. _ListObjectsV2: https://boto3.amazonaws.com/v1/documentation/api/latest/reference/services/s3/paginator/ListObjectsV2.html
+"""
+
+import typing as T
+import sqlite3
+from datetime import datetime, timezone
+
+from func_args import NOTHING
+
+from .list_objects import (
+    paginate_list_objects_v2,
+    is_content_an_object,
+)
+
+if T.TYPE_CHECKING:  # pragma: no cover
+    from mypy_boto3_s3 import S3Client
+    from mypy_boto3_s3.type_defs import ObjectTypeDef
+    from ..core.iter_objects import S3PathIterProxy
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshot_meta (
+    name TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS objects (
+    key TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    last_modified REAL NOT NULL,
+    etag TEXT NOT NULL,
+    storage_class TEXT NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS objects_last_modified ON objects (last_modified);
+CREATE INDEX IF NOT EXISTS objects_etag ON objects (etag);
+"""
+
+
+def get_prefix_upper_bound(prefix: str) -> T.Optional[str]:
+    """
+    Get the smallest string that is greater than all strings starting with
+    ``prefix``. SQLite compares TEXT by UTF-8 bytes, the same as S3 key order.
+
+    Example::
+
+        >>> get_prefix_upper_bound("a/")
+        'a0'
+
+    The surrogates can't be encoded in UTF-8, they are skipped. The last
+    character ``U+10FFFF`` has no successor, it is dropped and the previous
+    character is increased instead.
+
+    :return: None if there's no upper bound (empty prefix, or all characters
+        are ``U+10FFFF``).
+    """
+    for i in range(len(prefix) - 1, -1, -1):
+        code = ord(prefix[i]) + 1
+        if code > 0x10FFFF:
+            continue
+        if 0xD800 <= code <= 0xDFFF:
+            code = 0xE000
+        return prefix[:i] + chr(code)
+    return None
+
+
+class ListingSnapshot:
+    """
+    A SQLite backed snapshot of all objects (exclude the hard folder) under
+    a S3 prefix.
+
+    Example:
+
+        >>> with ListingSnapshot("/tmp/logs.sqlite", "my-bucket", "logs/") as snapshot:
+        ...     # full listing on the first run, append only listing later
+        ...     snapshot.refresh(s3_client)
+        ...     snapshot.size_by_prefix(depth=1)
+        ...     snapshot.iter_keys_newer_than(datetime(2024, 1, 1, tzinfo=timezone.utc))
+        ...     snapshot.iter_s3path(prefix="logs/2024-01-01/").all()
+
+    :param path: the SQLite database file path, use ``":memory:"`` for
+        an in-memory snapshot.
+    :param bucket: S3 bucket name.
+    :param prefix: The s3 prefix (logic directory) of the snapshot.
+
+    .. versionadded:: 2.4.1
+    """
+
+    def __init__(
+        self,
+        path: str,
+        bucket: str,
+        prefix: str,
+    ):
+        self.path = path
+        self.bucket = bucket
+        self.prefix = prefix
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript(_SCHEMA)
+        self._validate_meta()
+
+    def _validate_meta(self):
+        meta = self.get_meta()
+        if meta:
+            if (meta["bucket"], meta["prefix"]) != (self.bucket, self.prefix):
+                raise ValueError(
+                    f"snapshot {self.path!r} is for "
+                    f"s3://{meta['bucket']}/{meta['prefix']}, "
+                    f"not s3://{self.bucket}/{self.prefix}!"
+                )
+        else:
+            with self.conn:
+                self._set_meta(bucket=self.bucket, prefix=self.prefix)
+
+    def get_meta(self) -> T.Dict[str, str]:
+        return dict(self.conn.execute("SELECT name, value FROM snapshot_meta"))
+
+    def _set_meta(self, **kwargs: str):
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO snapshot_meta (name, value) VALUES (?, ?)",
+            list(kwargs.items()),
+        )
+
+    @property
+    def refreshed_at(self) -> T.Optional[datetime]:
+        """
+        The time of the last successful refresh, None if never refreshed.
+        """
+        value = self.get_meta().get("refreshed_at")
+        if value is None:
+            return None
+        return datetime.fromtimestamp(float(value), tz=timezone.utc)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self) -> "ListingSnapshot":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    # --------------------------------------------------------------------------
+    # Refresh
+    # --------------------------------------------------------------------------
+    def _insert(self, contents: T.Iterable["ObjectTypeDef"]) -> int:
+        count = 0
+        rows = list()
+        for content in contents:
+            if is_content_an_object(content) is False:
+                continue
+            rows.append(
+                (
+                    content["Key"],
+                    content["Size"],
+                    content["LastModified"].timestamp(),
+                    content.get("ETag", ""),
+                    content.get("StorageClass", "STANDARD"),
+                )
+            )
+            if len(rows) == 1000:
+                count += self._insert_rows(rows)
+                rows = list()
+        if rows:
+            count += self._insert_rows(rows)
+        return count
+
+    def _insert_rows(self, rows: T.List[tuple]) -> int:
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO objects "
+            "(key, size, last_modified, etag, storage_class) "
+            "VALUES (?, ?, ?, ?, ?)",
+            rows,
+        )
+        return len(rows)
+
+    def _delete_prefix(self, prefix: str):
+        upper = get_prefix_upper_bound(prefix)
+        if upper is None:
+            self.conn.execute("DELETE FROM objects WHERE key >= ?", (prefix,))
+        else:
+            self.conn.execute(
+                "DELETE FROM objects WHERE key >= ? AND key < ?",
+                (prefix, upper),
+            )
+
+    def _list(
+        self,
+        s3_client: "S3Client",
+        prefix: str,
+        start_after: str = NOTHING,
+        batch_size: int = 1000,
+        prefetch: int = 0,
+        request_payer: str = NOTHING,
+        expected_bucket_owner: str = NOTHING,
+    ):
+        return paginate_list_objects_v2(
+            s3_client=s3_client,
+            bucket=self.bucket,
+            prefix=prefix,
+            batch_size=batch_size,
+            start_after=start_after,
+            prefetch=prefetch,
+            request_payer=request_payer,
+            expected_bucket_owner=expected_bucket_owner,
+        ).contents()
+
+    def _mark_refreshed(self):
+        self._set_meta(refreshed_at=str(datetime.now(timezone.utc).timestamp()))
+
+    def full_refresh(
+        self,
+        s3_client: "S3Client",
+        batch_size: int = 1000,
+        prefetch: int = 0,
+        request_payer: str = NOTHING,
+        expected_bucket_owner: str = NOTHING,
+    ) -> int:
+        """
+        Replace the snapshot with a full listing of the prefix. It is atomic,
+        the old snapshot is kept if the listing fails.
+
+        :return: number of objects in the snapshot.
+        """
+        with self.conn:
+            self._delete_prefix(self.prefix)
+            count = self._insert(
+                self._list(
+                    s3_client,
+                    prefix=self.prefix,
+                    batch_size=batch_size,
+                    prefetch=prefetch,
+                    request_payer=request_payer,
+                    expected_bucket_owner=expected_bucket_owner,
+                )
+            )
+            self._mark_refreshed()
+        return count
+
+    def append_refresh(
+        self,
+        s3_client: "S3Client",
+        batch_size: int = 1000,
+        prefetch: int = 0,
+        request_payer: str = NOTHING,
+        expected_bucket_owner: str = NOTHING,
+    ) -> int:
+        """
+        Only list the keys after the last key in the snapshot, using the
+        ``StartAfter`` parameter. It is for the append only prefixes, for
+        example, the keys are time ordered, and existing objects never change.
+
+        :return: number of new objects.
+        """
+        last_key = self.get_last_key()
+        with self.conn:
+            count = self._insert(
+                self._list(
+                    s3_client,
+                    prefix=self.prefix,
+                    start_after=NOTHING if last_key is None else last_key,
+                    batch_size=batch_size,
+                    prefetch=prefetch,
+                    request_payer=request_payer,
+                    expected_bucket_owner=expected_bucket_owner,
+                )
+            )
+            self._mark_refreshed()
+        return count
+
+    def refresh_prefixes(
+        self,
+        s3_client: "S3Client",
+        sub_prefixes: T.Iterable[str],
+        batch_size: int = 1000,
+        prefetch: int = 0,
+        request_payer: str = NOTHING,
+        expected_bucket_owner: str = NOTHING,
+    ) -> int:
+        """
+        Re-scan the given sub prefixes only, and replace their part of
+        the snapshot. Other parts of the snapshot are not touched.
+
+        :param sub_prefixes: the sub prefixes to re-scan, they have to start
+            with the snapshot prefix.
+
+        :return: number of objects under the re-scanned sub prefixes.
+        """
+        sub_prefixes = list(sub_prefixes)
+        for sub_prefix in sub_prefixes:
+            if not sub_prefix.startswith(self.prefix):
+                raise ValueError(
+                    f"{sub_prefix!r} is not under the snapshot prefix {self.prefix!r}!"
+                )
+        count = 0
+        with self.conn:
+            for sub_prefix in sub_prefixes:
+                self._delete_prefix(sub_prefix)
+                count += self._insert(
+                    self._list(
+                        s3_client,
+                        prefix=sub_prefix,
+                        batch_size=batch_size,
+                        prefetch=prefetch,
+                        request_payer=request_payer,
+                        expected_bucket_owner=expected_bucket_owner,
+                    )
+                )
+            self._mark_refreshed()
+        return count
+
+    def refresh_new_prefixes(
+        self,
+        s3_client: "S3Client",
+        batch_size: int = 1000,
+        prefetch: int = 0,
+        request_payer: str = NOTHING,
+        expected_bucket_owner: str = NOTHING,
+    ) -> T.List[str]:
+        """
+        Discover the direct sub folders of the prefix with one delimiter
+        listing, and only scan the sub folders that are not in the snapshot yet.
+        It is for the prefixes partitioned by immutable sub folders,
+        such as ``logs/dt=2024-01-01/``. Objects directly under the prefix
+        are always re-scanned.
+
+        :return: list of the newly scanned sub prefixes.
+        """
+        proxy = paginate_list_objects_v2(
+            s3_client=s3_client,
+            bucket=self.bucket,
+            prefix=self.prefix,
+            delimiter="/",
+            request_payer=request_payer,
+            expected_bucket_owner=expected_bucket_owner,
+        )
+        new_prefixes = list()
+        direct_contents = list()
+        for response in proxy:
+            direct_contents.extend(response.get("Contents", []))
+            for dct in response.get("CommonPrefixes", []):
+                sub_prefix = dct["Prefix"]
+                if self.count(prefix=sub_prefix) == 0:
+                    new_prefixes.append(sub_prefix)
+        with self.conn:
+            upper = get_prefix_upper_bound(self.prefix)
+            sql = "DELETE FROM objects WHERE instr(substr(key, ?), '/') = 0"
+            params = [len(self.prefix) + 1]
+            if upper is None:
+                sql += " AND key >= ?"
+                params.append(self.prefix)
+            else:
+                sql += " AND key >= ? AND key < ?"
+                params.extend([self.prefix, upper])
+            self.conn.execute(sql, params)
+            self._insert(direct_contents)
+            for sub_prefix in new_prefixes:
+                self._insert(
+                    self._list(
+                        s3_client,
+                        prefix=sub_prefix,
+                        batch_size=batch_size,
+                        prefetch=prefetch,
+                        request_payer=request_payer,
+                        expected_bucket_owner=expected_bucket_owner,
+                    )
+                )
+            self._mark_refreshed()
+        return new_prefixes
+
+    def refresh(
+        self,
+        s3_client: "S3Client",
+        batch_size: int = 1000,
+        prefetch: int = 0,
+        request_payer: str = NOTHING,
+        expected_bucket_owner: str = NOTHING,
+    ) -> int:
+        """
+        Do a full refresh if the snapshot has never been refreshed,
+        otherwise, do an append only refresh.
+
+        :return: number of inserted objects.
+        """
+        kwargs = dict(
+            s3_client=s3_client,
+            batch_size=batch_size,
+            prefetch=prefetch,
+            request_payer=request_payer,
+            expected_bucket_owner=expected_bucket_owner,
+        )
+        if self.refreshed_at is None:
+            return self.full_refresh(**kwargs)
+        else:
+            return self.append_refresh(**kwargs)
+
+    # --------------------------------------------------------------------------
+    # Query
+    # --------------------------------------------------------------------------
+    def _where_prefix(self, prefix: T.Optional[str]) -> T.Tuple[str, list]:
+        if not prefix:
+            return "", []
+        upper = get_prefix_upper_bound(prefix)
+        if upper is None:
+            return " WHERE key >= ?", [prefix]
+        return " WHERE key >= ? AND key < ?", [prefix, upper]
+
+    def get_last_key(self) -> T.Optional[str]:
+        return self.conn.execute("SELECT MAX(key) FROM objects").fetchone()[0]
+
+    def count(self, prefix: T.Optional[str] = None) -> int:
+        where, params = self._where_prefix(prefix)
+        return self.conn.execute(
+            f"SELECT COUNT(*) FROM objects{where}", params
+        ).fetchone()[0]
+
+    def total_size(self, prefix: T.Optional[str] = None) -> int:
+        where, params = self._where_prefix(prefix)
+        return self.conn.execute(
+            f"SELECT COALESCE(SUM(size), 0) FROM objects{where}", params
+        ).fetchone()[0]
+
+    def size_by_prefix(
+        self,
+        prefix: T.Optional[str] = None,
+        depth: int = 1,
+    ) -> T.Dict[str, T.Tuple[int, int]]:
+        """
+        Group the objects by the first ``depth`` folders under ``prefix``.
+        Objects directly under the group level are grouped by ``prefix`` itself.
+
+        :param prefix: default is the snapshot prefix.
+        :param depth: number of folder levels under the prefix.
+
+        :return: folder prefix -> (count, total size) mapping, sorted by prefix.
+        """
+        if prefix is None:
+            prefix = self.prefix
+        where, params = self._where_prefix(prefix)
+        result: T.Dict[str, T.List[int]] = dict()
+        n = len(prefix)
+        for key, size in self.conn.execute(
+            f"SELECT key, size FROM objects{where} ORDER BY key", params
+        ):
+            parts = key[n:].split("/")[:-1][:depth]
+            group = prefix + "".join(part + "/" for part in parts)
+            try:
+                stat = result[group]
+                stat[0] += 1
+                stat[1] += size
+            except KeyError:
+                result[group] = [1, size]
+        return {group: tuple(stat) for group, stat in result.items()}
+
+    def iter_keys_newer_than(self, dt: datetime) -> T.Iterable[str]:
+        """
+        Iterate the keys that are last modified after the given time, in key order.
+        """
+        for (key,) in self.conn.execute(
+            "SELECT key FROM objects WHERE last_modified > ? ORDER BY key",
+            (dt.timestamp(),),
+        ):
+            yield key
+
+    def get_etag(self, key: str) -> T.Optional[str]:
+        """
+        Get the ETag of the object, None if not in the snapshot.
+        """
+        row = self.conn.execute(
+            "SELECT etag FROM objects WHERE key = ?", (key,)
+        ).fetchone()
+        return None if row is None else row[0]
+
+    def find_keys_by_etag(self, etag: str) -> T.List[str]:
+        """
+        Find all keys with the given ETag, useful to find duplicate content.
+        """
+        return [
+            key
+            for (key,) in self.conn.execute(
+                "SELECT key FROM objects WHERE etag = ? ORDER BY key", (etag,)
+            )
+        ]
+
+    def iter_contents(self, prefix: T.Optional[str] = None) -> T.Iterable[dict]:
+        """
+        Iterate the objects as ``response["Contents"]`` item dictionary,
+        in key order.
+        """
+        where, params = self._where_prefix(prefix)
+        for key, size, last_modified, etag, storage_class in self.conn.execute(
+            "SELECT key, size, last_modified, etag, storage_class "
+            f"FROM objects{where} ORDER BY key",
+            params,
+        ):
+            yield {
+                "Key": key,
+                "LastModified": datetime.fromtimestamp(last_modified, tz=timezone.utc),
+                "ETag": etag,
+                "Size": size,
+                "StorageClass": storage_class,
+            }
+
+    def iter_s3path(self, prefix: T.Optional[str] = None) -> "S3PathIterProxy":
+        """
+        Iterate the objects as :class:`~s3pathlib.core.s3path.S3Path` from
+        the snapshot, without hitting S3.
+        """
+        from ..core.s3path import S3Path
+        from ..core.iter_objects import S3PathIterProxy
+
+        bucket = self.bucket
+        return S3PathIterProxy(
+            (
+                S3Path._from_content_dict(bucket, content)
+                for content in self.iter_contents(prefix=prefix)
+            )
+        )
@@ -0,0 +1,348 @@
+# -*- coding: utf-8 -*-
+
+"""
+Batch "stat" of many s3 objects, pick the cheaper one between the
+head_object_ API and the ListObjectsV2_ API for each group of keys.
+
+.. _head_object: https://boto3.amazonaws.com/v1/documentation/api/latest/reference/services/s3.html#S3.Client.head_object
+.. _ListObjectsV2: https://boto3.amazonaws.com/v1/documentation/api/latest/reference/services/s3/paginator/ListObjectsV2.html
+"""
+
+import typing as T
+import math
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from func_args import NOTHING
+
+from ..utils import get_key_predecessor
+from .head_object import head_object
+from .list_objects import paginate_list_objects_v2
+
+if T.TYPE_CHECKING:  # pragma: no cover
+    from mypy_boto3_s3 import S3Client
+
+
+def group_keys_by_parent(keys: T.Iterable[str]) -> T.Dict[str, T.List[str]]:
+    """
+    Group the s3 keys by the parent folder, the keys in each group are sorted.
+
+    Example::
+
+        >>> group_keys_by_parent(["a/2.txt", "a/1.txt", "b/1.txt", "README.txt"])
+        {'a/': ['a/1.txt', 'a/2.txt'], 'b/': ['b/1.txt'], '': ['README.txt']}
+    """
+    groups = dict()
+    for key in keys:
+        # the parent of a hard folder "a/b/" is "a/"
+        parent = key[: key.rstrip("/").rfind("/") + 1]
+        groups.setdefault(parent, set()).add(key)
+    return {parent: sorted(group) for parent, group in groups.items()}
+
+
+def estimate_list_pages(n_keys: int, batch_size: int = 1000) -> int:
+    """
+    The minimal number of ListObjectsV2_ pages to cover ``n_keys`` keys,
+    assuming there's no other object in the key range.
+    """
+    return math.ceil(n_keys / batch_size)
+
+
+def plan_stat_objects(
+    keys_by_parent: T.Dict[str, T.List[str]],
+    batch_size: int = 1000,
+    list_cost: float = 1.0,
+) -> T.Tuple[T.List[T.Tuple[str, T.List[str]]], T.List[str]]:
+    """
+    Decide which groups of keys to list and which keys to head.
+
+    The cost of a head_object call is 1, and the cost of a ListObjectsV2_
+    page is ``list_cost``. A group is listed if the estimated listing cost
+    is less than calling head_object for each key. The hard folder keys
+    are always headed.
+
+    :return: a tuple of the list of ``(parent, keys)`` groups to list,
+        and the list of keys to head.
+    """
+    list_groups = list()
+    head_keys = list()
+    for parent, keys in keys_by_parent.items():
+        # the hard folder is returned as a common prefix in the listing
+        folder_keys = [key for key in keys if key.endswith("/")]
+        if folder_keys:
+            head_keys.extend(folder_keys)
+            keys = [key for key in keys if not key.endswith("/")]
+        if list_cost * estimate_list_pages(len(keys), batch_size) < len(keys):
+            list_groups.append((parent, keys))
+        else:
+            head_keys.extend(keys)
+    return list_groups, head_keys
+
+
+def _head_response_to_content(key: str, response: dict) -> dict:
+    """
+    Convert the head_object_ response to the ``response["Contents"]`` item
+    dictionary of ListObjectsV2_.
+    """
+    return {
+        "Key": key,
+        "LastModified": response["LastModified"],
+        "ETag": response["ETag"],
+        "Size": response["ContentLength"],
+        "StorageClass": response.get("StorageClass", "STANDARD"),
+    }
+
+
+def stat_objects(
+    s3_client: "S3Client",
+    bucket: str,
+    keys: T.Iterable[str],
+    concurrency: int = 8,
+    batch_size: int = 1000,
+    list_cost: float = 1.0,
+    request_payer: str = NOTHING,
+    expected_bucket_owner: str = NOTHING,
+) -> T.Dict[str, T.Optional[dict]]:
+    """
+    Get the size, ETag, last modified and storage class of many s3 objects.
+
+    The keys are grouped by the parent folder. For the group that has many
+    keys, the key range is listed with ``Delimiter="/"`` instead of calling
+    head_object_ for each key. The listing has a page budget, the number of
+    pages that costs the same as calling head_object for every key in the
+    group. If the budget runs out because there are many other objects in
+    the key range, the remaining keys fall back to head_object. So the cost
+    is at most twice of the head_object only strategy.
+
+    All the listing and head_object calls run in a thread pool.
+
+    Example::
+
+        >>> stat_objects(s3_client, "my-bucket", ["a/1.txt", "a/2.txt", "a/3.txt"])
+        {
+            'a/1.txt': {'Key': 'a/1.txt', 'Size': 1, 'ETag': '"..."', ...},
+            'a/2.txt': None, # not exists
+            'a/3.txt': {'Key': 'a/3.txt', 'Size': 3, 'ETag': '"..."', ...},
+        }
+
+    :param s3_client: ``boto3.session.Session().client("s3")`` object.
+    :param bucket: S3 bucket name.
+    :param keys: the s3 object keys.
+    :param concurrency: number of threads.
+    :param batch_size: number of keys per ListObjectsV2_ page.
+    :param list_cost: the cost of one ListObjectsV2_ page relative to
+        one head_object_ call. Default 1.0, minimize the number of requests.
+        By the S3 request pricing, use 12.5 to minimize the dollar cost.
+    :param request_payer: See ListObjectsV2_ and head_object_.
+    :param expected_bucket_owner: See ListObjectsV2_ and head_object_.
+
+    :return: a dictionary, the key is the s3 key, the value is the
+        ``response["Contents"]`` item dictionary of ListObjectsV2_, or None
+        if the object doesn't exist.
+
+    .. versionadded:: 2.4.1
+    """
+    if concurrency < 1:
+        raise ValueError("``concurrency`` has to be greater than 0.")
+    list_groups, head_keys = plan_stat_objects(
+        group_keys_by_parent(keys),
+        batch_size=batch_size,
+        list_cost=list_cost,
+    )
+
+    def _head(key: str) -> T.Tuple[T.Dict[str, T.Optional[dict]], T.List[str]]:
+        response = head_object(
+            s3_client=s3_client,
+            bucket=bucket,
+            key=key,
+            request_payer=request_payer,
+            expected_bucket_owner=expected_bucket_owner,
+            ignore_not_found=True,
+        )
+        if response is None:
+            return {key: None}, []
+        return {key: _head_response_to_content(key, response)}, []
+
+    def _list(
+        parent: str,
+        group: T.List[str],
+    ) -> T.Tuple[T.Dict[str, T.Optional[dict]], T.List[str]]:
+        """
+        :return: the stat of the resolved keys, and the unresolved keys
+            after the page budget runs out.
+        """
+        wanted = set(group)
+        max_key = group[-1]
+        budget = max(1, math.floor(len(group) / list_cost))
+        result = dict()
+        last_key = None
+        n_page = 0
+        for response in paginate_list_objects_v2(
+            s3_client=s3_client,
+            bucket=bucket,
+            prefix=parent,
+            batch_size=batch_size,
+            delimiter="/",
+            start_after=get_key_predecessor(group[0]),
+            request_payer=request_payer,
+            expected_bucket_owner=expected_bucket_owner,
+        ):
+            n_page += 1
+            for content in response.get("Contents", []):
+                key = content["Key"]
+                if key in wanted:
+                    result[key] = content
+            # ListObjectsV2 returns the objects and sub folders in key order
+            candidates = [dct["Key"] for dct in response.get("Contents", [])]
+            candidates.extend(
+                dct["Prefix"] for dct in response.get("CommonPrefixes", [])
+            )
+            if candidates:
+                last_key = max(candidates)
+            if last_key is not None and last_key >= max_key:
+                break
+            if n_page >= budget:
+                break
+        else:
+            # the listing is exhausted, all unresolved keys don't exist
+            last_key = max_key
+        unresolved = list()
+        for key in group:
+            if key not in result:
+                if (last_key is not None) and (key <= last_key):
+                    result[key] = None
+                else:
+                    unresolved.append(key)
+        return result, unresolved
+
+    stats = dict()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = set()
+        for parent, group in list_groups:
+            futures.add(executor.submit(_list, parent, group))
+        for key in head_keys:
+            futures.add(executor.submit(_head, key))
+        while futures:
+            done, futures = wait(futures, return_when=FIRST_COMPLETED)
+            for future in done:
+                result, unresolved = future.result()
+                stats.update(result)
+                for key in unresolved:
+                    futures.add(executor.submit(_head, key))
+    return stats
+
+
+def estimate_stat_cost(
+    keys_by_parent: T.Dict[str, T.List[str]],
+    batch_size: int = 1000,
+    list_cost: float = 1.0,
+) -> float:
+    """
+    The minimal cost of :func:`stat_objects`, in the unit of head_object_ call.
+    """
+    list_groups, head_keys = plan_stat_objects(
+        keys_by_parent,
+        batch_size=batch_size,
+        list_cost=list_cost,
+    )
+    return len(head_keys) + sum(
+        list_cost * estimate_list_pages(len(group), batch_size)
+        for _, group in list_groups
+    )
+
+
+def find_existing_keys(
+    s3_client: "S3Client",
+    bucket: str,
+    prefix: str,
+    keys: T.Iterable[str],
+    concurrency: int = 8,
+    batch_size: int = 1000,
+    list_cost: float = 1.0,
+    request_payer: str = NOTHING,
+    expected_bucket_owner: str = NOTHING,
+) -> T.Set[str]:
+    """
+    Find the keys that already exist, all keys has to be under the ``prefix``.
+
+    It starts with one recursive listing of the key range under ``prefix``,
+    it is the cheapest when the keys spread over many folders and there
+    are not many other objects under the prefix. The listing has a page budget
+    equal to the estimated cost of :func:`stat_objects`, if the budget runs
+    out, the remaining keys are checked by :func:`stat_objects`.
+
+    Example::
+
+        >>> find_existing_keys(
+        ...     s3_client, "my-bucket", "build/",
+        ...     keys=["build/a/1.js", "build/b/2.js", "build/c/3.js"],
+        ... )
+        {'build/b/2.js'}
+
+    :param s3_client: ``boto3.session.Session().client("s3")`` object.
+    :param bucket: S3 bucket name.
+    :param prefix: the common prefix of all keys.
+    :param keys: the s3 object keys.
+    :param concurrency: See :func:`stat_objects`.
+    :param batch_size: See :func:`stat_objects`.
+    :param list_cost: See :func:`stat_objects`.
+    :param request_payer: See ListObjectsV2_ and head_object_.
+    :param expected_bucket_owner: See ListObjectsV2_ and head_object_.
+
+    :return: the set of existing keys.
+
+    .. versionadded:: 2.4.1
+    """
+    keys = sorted(set(keys))
+    if len(keys) == 0:
+        return set()
+    for key in keys:
+        if not key.startswith(prefix):
+            raise ValueError(f"key {key!r} is not under the prefix {prefix!r}!")
+    budget = estimate_stat_cost(
+        group_keys_by_parent(keys),
+        batch_size=batch_size,
+        list_cost=list_cost,
+    ) / list_cost
+    wanted = set(keys)
+    max_key = keys[-1]
+    existing = set()
+    last_key = None
+    n_page = 0
+    is_done = False
+    if budget >= 1:
+        for response in paginate_list_objects_v2(
+            s3_client=s3_client,
+            bucket=bucket,
+            prefix=prefix,
+            batch_size=batch_size,
+            start_after=get_key_predecessor(keys[0]),
+            request_payer=request_payer,
+            expected_bucket_owner=expected_bucket_owner,
+        ):
+            n_page += 1
+            for content in response.get("Contents", []):
+                last_key = content["Key"]
+                if last_key in wanted:
+                    existing.add(last_key)
+            if (last_key is not None) and (last_key >= max_key):
+                is_done = True
+                break
+            if n_page >= budget:
+                break
+        else:
+            is_done = True
+    if is_done:
+        return existing
+    unresolved = [key for key in keys if (last_key is None) or (key > last_key)]
+    stats = stat_objects(
+        s3_client=s3_client,
+        bucket=bucket,
+        keys=unresolved,
+        concurrency=concurrency,
+        batch_size=batch_size,
+        list_cost=list_cost,
+        request_payer=request_payer,
+        expected_bucket_owner=expected_bucket_owner,
+    )
+    existing.update(key for key, stat in stats.items() if stat is not None)
+    return existing
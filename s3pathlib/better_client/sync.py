@@ -0,0 +1,752 @@
+# -*- coding: utf-8 -*-
+
+"""
+A native Python implementation of the `aws s3 sync <https://docs.aws.amazon.com/cli/latest/reference/s3/sync.html>`_
+command, for local to s3, s3 to local and s3 to s3.
+
+The source and target file listings are both sorted by the relative key,
+the engine walks them with a streaming merge and decides which file to
+transfer or delete, then run the actions in a thread pool.
+
+.. _ListObjectsV2: https://boto3.amazonaws.com/v1/documentation/api/latest/reference/services/s3/paginator/ListObjectsV2.html
+.. _delete_objects: https://boto3.amazonaws.com/v1/documentation/api/latest/reference/services/s3/client/delete_objects.html
+"""
+
+import typing as T
+import os
+import time
+import fnmatch
+from datetime import datetime, timezone
+
+from ..utils import iter_map_concurrently
+from ..etag import calculate_etag, is_etag_match
+from .list_objects import paginate_list_objects_v2, is_content_an_object
+
+if T.TYPE_CHECKING:  # pragma: no cover
+    from boto3.s3.transfer import TransferConfig
+    from mypy_boto3_s3 import S3Client
+
+
+class CompareEnum:
+    """
+    How to decide whether a file in the source has to be transferred.
+
+    - ``size_and_mtime``: the default behavior of ``aws s3 sync``,
+      transfer if the size is different or the source is newer.
+    - ``size``: the ``--size-only`` behavior of ``aws s3 sync``,
+      transfer if the size is different.
+    - ``etag``: transfer if the size or the ETag is different. For local
+      file, the ETag is calculated by :mod:`s3pathlib.etag`, the part size
+      of the multipart upload ETag is inferred from the number of parts.
+      Between two s3 objects, if the multipart upload ETags are different,
+      it falls back to ``size_and_mtime``.
+
+    .. versionadded:: 2.4.1
+    """
+
+    size_and_mtime = "size_and_mtime"
+    size = "size"
+    etag = "etag"
+
+
+class SyncActionEnum:
+    upload = "upload"
+    download = "download"
+    copy = "copy"
+    delete = "delete"
+
+
+class FileInfo:
+    """
+    A file in the local directory or an object under the s3 prefix.
+
+    :param key: the relative key to the root directory, use "/" as separator.
+    :param size: the file size in bytes.
+    :param last_modified: the timezone aware last modified time.
+    :param etag: the ETag of the s3 object, without the double quote.
+        None for local file, it is calculated on demand.
+    :param path: the absolute path of the local file, None for s3 object.
+
+    .. versionadded:: 2.4.1
+    """
+
+    def __init__(
+        self,
+        key: str,
+        size: int,
+        last_modified: datetime,
+        etag: T.Optional[str] = None,
+        path: T.Optional[str] = None,
+    ):
+        self.key = key
+        self.size = size
+        self.last_modified = last_modified
+        self._etag = etag
+        self.path = path
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__name__}("
+            f"key={self.key!r}, size={self.size}, "
+            f"last_modified={self.last_modified!r})"
+        )
+
+    @property
+    def etag(self) -> str:
+        if self._etag is None:
+            self._etag = calculate_etag(self.path)
+        return self._etag
+
+    def is_etag_match(self, etag: str) -> bool:
+        """
+        Check if this file has the same content as the object with the given
+        ETag. For local file, the part size of the multipart upload ETag is
+        inferred, see :func:`s3pathlib.etag.is_etag_match`.
+        """
+        if self.path is None:
+            return self.etag == etag
+        return is_etag_match(self.path, etag, size=self.size)
+
+
+class SyncAction:
+    """
+    A planned action, and its execution result.
+
+    :param action: one of ``upload``, ``download``, ``copy`` and ``delete``.
+    :param key: the relative key.
+    :param size: the number of bytes to transfer, 0 for delete.
+    :param error: the exception if the action failed, otherwise None.
+
+    .. versionadded:: 2.4.1
+    """
+
+    def __init__(
+        self,
+        action: str,
+        key: str,
+        size: int = 0,
+    ):
+        self.action = action
+        self.key = key
+        self.size = size
+        self.error: T.Optional[Exception] = None
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__name__}("
+            f"action={self.action!r}, key={self.key!r}, size={self.size}, "
+            f"error={self.error!r})"
+        )
+
+
+class SyncReport:
+    """
+    The result of a sync.
+
+    :param actions: all executed (or planned, in dry run mode) actions.
+    :param n_skipped: number of source files that are already in sync.
+    :param elapsed: wall time seconds of the sync.
+
+    .. versionadded:: 2.4.1
+    """
+
+    def __init__(
+        self,
+        actions: T.List[SyncAction],
+        n_skipped: int,
+        elapsed: float,
+    ):
+        self.actions = actions
+        self.n_skipped = n_skipped
+        self.elapsed = elapsed
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__name__}("
+            f"n_transferred={len(self.transferred)}, "
+            f"n_deleted={len(self.deleted)}, "
+            f"n_skipped={self.n_skipped}, "
+            f"n_failed={len(self.failed)}, "
+            f"elapsed={self.elapsed:.3f})"
+        )
+
+    @property
+    def transferred(self) -> T.List[SyncAction]:
+        return [
+            action
+            for action in self.actions
+            if (action.action != SyncActionEnum.delete) and (action.error is None)
+        ]
+
+    @property
+    def deleted(self) -> T.List[SyncAction]:
+        return [
+            action
+            for action in self.actions
+            if (action.action == SyncActionEnum.delete) and (action.error is None)
+        ]
+
+    @property
+    def failed(self) -> T.List[SyncAction]:
+        return [action for action in self.actions if action.error is not None]
+
+    @property
+    def total_size(self) -> int:
+        """
+        Total bytes transferred.
+        """
+        return sum(action.size for action in self.transferred)
+
+    @property
+    def throughput(self) -> float:
+        """
+        Aggregate throughput in bytes per second.
+        """
+        if self.elapsed <= 0:
+            return 0.0
+        return self.total_size / self.elapsed
+
+    def raise_for_error(self):
+        """
+        Raise the error of the first failed action, if any.
+        """
+        for action in self.actions:
+            if action.error is not None:
+                raise action.error
+
+
+FilterType = T.List[T.Tuple[bool, str]]
+
+
+def make_filters(
+    include: T.Optional[T.Union[str, T.List[str]]] = None,
+    exclude: T.Optional[T.Union[str, T.List[str]]] = None,
+) -> FilterType:
+    """
+    Convert the ``include`` and ``exclude`` patterns to the filter list,
+    in the same order of the ``aws s3 sync --include ... --exclude ...``
+    command. Each item is a tuple of (is_include, pattern).
+    """
+    filters = list()
+    for is_include, patterns in [(True, include), (False, exclude)]:
+        if patterns is None:
+            continue
+        if isinstance(patterns, str):
+            patterns = [patterns]
+        filters.extend([(is_include, pattern) for pattern in patterns])
+    return filters
+
+
+def is_included(key: str, filters: FilterType) -> bool:
+    """
+    All files are included by default, the last matched filter wins, the
+    same as the ``aws s3 sync`` command. The pattern is matched against the
+    relative key, ``*`` also matches ``/``.
+
+    Example::
+
+        >>> is_included("a/1.txt", make_filters(exclude="*.txt"))
+        False
+        >>> is_included("a/1.txt", [(False, "*"), (True, "a/*")])
+        True
+    """
+    flag = True
+    for is_include, pattern in filters:
+        if fnmatch.fnmatchcase(key, pattern):
+            flag = is_include
+    return flag
+
+
+def iter_local_files(root: str) -> T.Iterable[FileInfo]:
+    """
+    Iterate all files in the local directory, sorted by the relative key.
+    """
+    infos = list()
+    for dirpath, dirnames, filenames in os.walk(root, followlinks=True):
+        rel_dir = os.path.relpath(dirpath, root)
+        if rel_dir == ".":
+            parts = []
+        else:
+            parts = rel_dir.split(os.sep)
+        for filename in filenames:
+            path = os.path.join(dirpath, filename)
+            stat = os.stat(path)
+            infos.append(
+                FileInfo(
+                    key="/".join(parts + [filename]),
+                    size=stat.st_size,
+                    last_modified=datetime.fromtimestamp(
+                        stat.st_mtime, tz=timezone.utc
+                    ),
+                    path=path,
+                )
+            )
+    infos.sort(key=lambda info: info.key)
+    return infos
+
+
+def iter_s3_files(
+    s3_client: "S3Client",
+    bucket: str,
+    prefix: str,
+    batch_size: int = 1000,
+) -> T.Iterable[FileInfo]:
+    """
+    Iterate all objects under the s3 prefix, sorted by the relative key.
+    The hard folder objects are excluded.
+    """
+    n = len(prefix)
+    contents = paginate_list_objects_v2(
+        s3_client=s3_client,
+        bucket=bucket,
+        prefix=prefix,
+        batch_size=batch_size,
+    ).contents()
+    for content in contents.filter(is_content_an_object):
+        yield FileInfo(
+            key=content["Key"][n:],
+            size=content["Size"],
+            last_modified=content["LastModified"],
+            etag=content["ETag"].strip('"'),
+        )
+
+
+def is_different(
+    src: FileInfo,
+    dst: FileInfo,
+    compare: str = CompareEnum.size_and_mtime,
+) -> bool:
+    """
+    Check if the source file has to be transferred to the target.
+    """
+    if src.size != dst.size:
+        return True
+    if compare == CompareEnum.size:
+        return False
+    if compare == CompareEnum.etag:
+        if (src.path is not None) and (dst.path is None):
+            return not src.is_etag_match(dst.etag)
+        if (src.path is None) and (dst.path is not None):
+            return not dst.is_etag_match(src.etag)
+        # the multipart upload ETag depends on the part size
+        if ("-" not in src.etag) and ("-" not in dst.etag):
+            return src.etag != dst.etag
+        if src.etag == dst.etag:
+            return False
+    elif compare != CompareEnum.size_and_mtime:
+        raise ValueError(f"invalid compare {compare!r}!")
+    # the s3 last modified time only has the second precision
+    return int(src.last_modified.timestamp()) > int(dst.last_modified.timestamp())
+
+
+def _is_hash_needed(src: FileInfo, dst: FileInfo, compare: str) -> bool:
+    """
+    Check if :func:`is_different` has to hash a local file to compare them.
+    """
+    return (
+        (compare == CompareEnum.etag)
+        and (src.size == dst.size)
+        and ((src.path is None) != (dst.path is None))
+    )
+
+
+def diff_files(
+    src_files: T.Iterable[FileInfo],
+    dst_files: T.Iterable[FileInfo],
+    compare: str = CompareEnum.size_and_mtime,
+    delete: bool = False,
+    filters: T.Optional[FilterType] = None,
+    verify: bool = True,
+) -> T.Iterable[T.Tuple[T.Optional[FileInfo], T.Optional[FileInfo]]]:
+    """
+    Merge the two sorted file listings, only hold one file from each side in
+    memory. Yield ``(src, dst)`` tuples:
+
+    - ``(src, dst)`` or ``(src, None)``: the source file has to be transferred.
+    - ``(None, dst)``: the target file has to be deleted, only if ``delete``
+      is True.
+    - the files already in sync are yielded as ``(None, None)``, so the
+      caller can count them.
+
+    The excluded files are ignored on both sides.
+
+    If ``verify`` is False, the local file is not hashed here, the pair of
+    the same size is yielded as ``(src, dst)`` and the caller has to check it
+    with :func:`is_different`, so the hashing can run concurrently.
+    """
+    if filters is None:
+        filters = list()
+    if filters:
+        src_files = (info for info in src_files if is_included(info.key, filters))
+        dst_files = (info for info in dst_files if is_included(info.key, filters))
+    src_iter = iter(src_files)
+    dst_iter = iter(dst_files)
+    src = next(src_iter, None)
+    dst = next(dst_iter, None)
+    while (src is not None) or (dst is not None):
+        if (dst is None) or ((src is not None) and (src.key < dst.key)):
+            yield src, None
+            src = next(src_iter, None)
+        elif (src is None) or (dst.key < src.key):
+            if delete:
+                yield None, dst
+            dst = next(dst_iter, None)
+        else:
+            if (verify is False) and _is_hash_needed(src, dst, compare):
+                yield src, dst
+            elif is_different(src, dst, compare=compare):
+                yield src, dst
+            else:
+                yield None, None
+            src = next(src_iter, None)
+            dst = next(dst_iter, None)
+
+
+def _join_key(prefix: str, key: str) -> str:
+    return f"{prefix}{key}"
+
+
+def _join_path(root: str, key: str) -> str:
+    return os.path.join(root, *key.split("/"))
+
+
+def _ensure_prefix(prefix: str) -> str:
+    if prefix and (not prefix.endswith("/")):
+        return prefix + "/"
+    return prefix
+
+
+class _SyncRunner:
+    """
+    Execute the sync actions concurrently. The s3 deletes are batched,
+    up to 1000 keys per delete_objects_ call.
+
+    The pairs that need the local file to be hashed are verified in the
+    worker right before the transfer, see ``verify`` of :func:`diff_files`.
+    """
+
+    def __init__(
+        self,
+        transfer: T.Callable[[FileInfo], None],
+        delete: T.Callable[[T.List[FileInfo]], T.Dict[str, Exception]],
+        transfer_action: str,
+        delete_batch_size: int,
+        concurrency: int,
+        dryrun: bool,
+        compare: str = CompareEnum.size_and_mtime,
+    ):
+        self.transfer = transfer
+        self.delete = delete
+        self.transfer_action = transfer_action
+        self.delete_batch_size = delete_batch_size
+        self.concurrency = concurrency
+        self.dryrun = dryrun
+        self.compare = compare
+
+    def _iter_tasks(
+        self,
+        diffs: T.Iterable[T.Tuple[T.Optional[FileInfo], T.Optional[FileInfo]]],
+        counter: T.Dict[str, int],
+    ) -> T.Iterable[T.Tuple[str, T.List[FileInfo]]]:
+        to_delete = list()
+        for src, dst in diffs:
+            if src is not None:
+                if (dst is not None) and _is_hash_needed(src, dst, self.compare):
+                    yield self.transfer_action, [src, dst]
+                else:
+                    yield self.transfer_action, [src]
+            elif dst is not None:
+                to_delete.append(dst)
+                if len(to_delete) == self.delete_batch_size:
+                    yield SyncActionEnum.delete, to_delete
+                    to_delete = list()
+            else:
+                counter["n_skipped"] += 1
+        if to_delete:
+            yield SyncActionEnum.delete, to_delete
+
+    def _run_task(
+        self,
+        task: T.Tuple[str, T.List[FileInfo]],
+    ) -> T.Optional[T.List[SyncAction]]:
+        """
+        Return None if the files turn out to be in sync.
+        """
+        action, infos = task
+        if action == SyncActionEnum.delete:
+            actions = [SyncAction(action, info.key) for info in infos]
+            if not self.dryrun:
+                try:
+                    errors = self.delete(infos)
+                except Exception as e:
+                    errors = {info.key: e for info in infos}
+                for sync_action in actions:
+                    sync_action.error = errors.get(sync_action.key)
+        else:
+            info = infos[0]
+            sync_action = SyncAction(action, info.key, size=info.size)
+            actions = [sync_action]
+            if len(infos) == 2:
+                try:
+                    if is_different(info, infos[1], compare=self.compare) is False:
+                        return None
+                except Exception as e:
+                    sync_action.error = e
+                    return actions
+            if not self.dryrun:
+                try:
+                    self.transfer(info)
+                except Exception as e:
+                    sync_action.error = e
+        return actions
+
+    def run(
+        self,
+        diffs: T.Iterable[T.Tuple[T.Optional[FileInfo], T.Optional[FileInfo]]],
+    ) -> SyncReport:
+        start = time.perf_counter()
+        counter = {"n_skipped": 0}
+        actions = list()
+        for task_actions in iter_map_concurrently(
+            self._run_task,
+            self._iter_tasks(diffs, counter),
+            max_workers=self.concurrency,
+            ordered=False,
+        ):
+            if task_actions is None:
+                counter["n_skipped"] += 1
+            else:
+                actions.extend(task_actions)
+        return SyncReport(
+            actions=actions,
+            n_skipped=counter["n_skipped"],
+            elapsed=time.perf_counter() - start,
+        )
+
+
+def _make_s3_delete(
+    s3_client: "S3Client",
+    bucket: str,
+    prefix: str,
+) -> T.Callable[[T.List[FileInfo]], T.Dict[str, Exception]]:
+    def delete(infos: T.List[FileInfo]) -> T.Dict[str, Exception]:
+        response = s3_client.delete_objects(
+            Bucket=bucket,
+            Delete={
+                "Objects": [{"Key": _join_key(prefix, info.key)} for info in infos],
+                "Quiet": True,
+            },
+        )
+        n = len(prefix)
+        return {
+            dct["Key"][n:]: PermissionError(f"{dct['Code']}: {dct['Message']}")
+            for dct in response.get("Errors", [])
+        }
+
+    return delete
+
+
+def sync_local_to_s3(
+    s3_client: "S3Client",
+    local_dir: str,
+    bucket: str,
+    prefix: str,
+    include: T.Optional[T.Union[str, T.List[str]]] = None,
+    exclude: T.Optional[T.Union[str, T.List[str]]] = None,
+    delete: bool = False,
+    compare: str = CompareEnum.size_and_mtime,
+    concurrency: int = 8,
+    batch_size: int = 1000,
+    extra_args: T.Optional[dict] = None,
+    config: T.Optional["TransferConfig"] = None,
+    dryrun: bool = False,
+) -> SyncReport:
+    """
+    Sync a local directory to an s3 prefix.
+
+    Example::
+
+        >>> report = sync_local_to_s3(
+        ...     s3_client, "/tmp/site", "my-bucket", "site/",
+        ...     exclude="*.tmp", delete=True, concurrency=16,
+        ... )
+        >>> report.raise_for_error()
+        >>> len(report.transferred), len(report.deleted), report.n_skipped
+
+    :param s3_client: ``boto3.session.Session().client("s3")`` object.
+    :param local_dir: the source local directory.
+    :param bucket: the target S3 bucket name.
+    :param prefix: the target s3 prefix (logic directory).
+    :param include: the ``--include`` patterns, see :func:`is_included`.
+    :param exclude: the ``--exclude`` patterns, see :func:`is_included`.
+    :param delete: delete the target files that don't exist in the source.
+    :param compare: See :class:`CompareEnum`.
+    :param concurrency: number of threads to run the actions.
+    :param batch_size: number of keys per ListObjectsV2_ page, also the
+        number of keys per delete_objects_ call.
+    :param extra_args: the ``ExtraArgs`` of ``upload_file``,
+        for example ``{"ACL": "bucket-owner-full-control"}``.
+    :param config: the ``boto3.s3.transfer.TransferConfig``.
+    :param dryrun: only plan the actions, don't execute them.
+
+    .. versionadded:: 2.4.1
+    """
+    if os.path.isdir(local_dir) is False:
+        raise FileNotFoundError(f"'{local_dir}' is not a directory!")
+    prefix = _ensure_prefix(prefix)
+
+    def transfer(info: FileInfo):
+        s3_client.upload_file(
+            info.path,
+            bucket,
+            _join_key(prefix, info.key),
+            ExtraArgs=extra_args,
+            Config=config,
+        )
+
+    runner = _SyncRunner(
+        transfer=transfer,
+        delete=_make_s3_delete(s3_client, bucket, prefix),
+        transfer_action=SyncActionEnum.upload,
+        delete_batch_size=batch_size,
+        concurrency=concurrency,
+        dryrun=dryrun,
+        compare=compare,
+    )
+    return runner.run(
+        diff_files(
+            iter_local_files(local_dir),
+            iter_s3_files(s3_client, bucket, prefix, batch_size=batch_size),
+            compare=compare,
+            delete=delete,
+            filters=make_filters(include, exclude),
+            verify=False,
+        )
+    )
+
+
+def sync_s3_to_local(
+    s3_client: "S3Client",
+    bucket: str,
+    prefix: str,
+    local_dir: str,
+    include: T.Optional[T.Union[str, T.List[str]]] = None,
+    exclude: T.Optional[T.Union[str, T.List[str]]] = None,
+    delete: bool = False,
+    compare: str = CompareEnum.size_and_mtime,
+    concurrency: int = 8,
+    batch_size: int = 1000,
+    extra_args: T.Optional[dict] = None,
+    config: T.Optional["TransferConfig"] = None,
+    dryrun: bool = False,
+) -> SyncReport:
+    """
+    Sync an s3 prefix to a local directory. The last modified time of the
+    downloaded file is set to the s3 object's last modified time.
+
+    See :func:`sync_local_to_s3` for the arguments, the ``extra_args`` is
+    the ``ExtraArgs`` of ``download_file``.
+
+    .. versionadded:: 2.4.1
+    """
+    prefix = _ensure_prefix(prefix)
+
+    def transfer(info: FileInfo):
+        path = _join_path(local_dir, info.key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        s3_client.download_file(
+            bucket,
+            _join_key(prefix, info.key),
+            path,
+            ExtraArgs=extra_args,
+            Config=config,
+        )
+        timestamp = info.last_modified.timestamp()
+        os.utime(path, (timestamp, timestamp))
+
+    def delete(infos: T.List[FileInfo]) -> T.Dict[str, Exception]:
+        errors = dict()
+        for info in infos:
+            try:
+                os.remove(info.path)
+            except Exception as e:
+                errors[info.key] = e
+        return errors
+
+    runner = _SyncRunner(
+        transfer=transfer,
+        delete=delete,
+        transfer_action=SyncActionEnum.download,
+        delete_batch_size=1,
+        concurrency=concurrency,
+        dryrun=dryrun,
+        compare=compare,
+    )
+    return runner.run(
+        diff_files(
+            iter_s3_files(s3_client, bucket, prefix, batch_size=batch_size),
+            iter_local_files(local_dir) if os.path.exists(local_dir) else [],
+            compare=compare,
+            delete=delete,
+            filters=make_filters(include, exclude),
+            verify=False,
+        )
+    )
+
+
+def sync_s3_to_s3(
+    s3_client: "S3Client",
+    src_bucket: str,
+    src_prefix: str,
+    dst_bucket: str,
+    dst_prefix: str,
+    include: T.Optional[T.Union[str, T.List[str]]] = None,
+    exclude: T.Optional[T.Union[str, T.List[str]]] = None,
+    delete: bool = False,
+    compare: str = CompareEnum.size_and_mtime,
+    concurrency: int = 8,
+    batch_size: int = 1000,
+    extra_args: T.Optional[dict] = None,
+    config: T.Optional["TransferConfig"] = None,
+    dryrun: bool = False,
+) -> SyncReport:
+    """
+    Sync an s3 prefix to another s3 prefix, the objects are copied on the
+    server side with the managed ``copy`` API.
+
+    See :func:`sync_local_to_s3` for the arguments, the ``extra_args`` is
+    the ``ExtraArgs`` of ``copy``.
+
+    .. versionadded:: 2.4.1
+    """
+    src_prefix = _ensure_prefix(src_prefix)
+    dst_prefix = _ensure_prefix(dst_prefix)
+
+    def transfer(info: FileInfo):
+        s3_client.copy(
+            {"Bucket": src_bucket, "Key": _join_key(src_prefix, info.key)},
+            dst_bucket,
+            _join_key(dst_prefix, info.key),
+            ExtraArgs=extra_args,
+            Config=config,
+        )
+
+    runner = _SyncRunner(
+        transfer=transfer,
+        delete=_make_s3_delete(s3_client, dst_bucket, dst_prefix),
+        transfer_action=SyncActionEnum.copy,
+        delete_batch_size=batch_size,
+        concurrency=concurrency,
+        dryrun=dryrun,
+        compare=compare,
+    )
+    return runner.run(
+        diff_files(
+            iter_s3_files(s3_client, src_bucket, src_prefix, batch_size=batch_size),
+            iter_s3_files(s3_client, dst_bucket, dst_prefix, batch_size=batch_size),
+            compare=compare,
+            delete=delete,
+            filters=make_filters(include, exclude),
+            verify=False,
+        )
+    )
@@ -2,22 +2,239 @@
 
 """
 .. _upload_file: https://boto3.amazonaws.com/v1/documentation/api/latest/reference/services/s3/client/upload_file.html#
+.. _put_object: https://boto3.amazonaws.com/v1/documentation/api/latest/reference/services/s3/client/put_object.html
 """
 
 import typing as T
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 from pathlib_mate import Path
+from boto3.s3.transfer import TransferConfig, create_transfer_manager
+from s3transfer.subscribers import BaseSubscriber
 
 from .. import exc
 from ..type import PathType
 from ..utils import join_s3_uri
-from .head_object import is_object_exists
+from .stat_objects import find_existing_keys
 
 
 if T.TYPE_CHECKING:  # pragma: no cover
     from mypy_boto3_s3 import S3Client
 
 
+class UploadFileResult:
+    """
+    The result of uploading one file.
+
+    :param path: the absolute path of the local file.
+    :param key: the target s3 key.
+    :param size: the file size in bytes.
+    :param method: ``"put_object"`` or ``"upload_file"``.
+    :param elapsed: seconds from the upload started to finished.
+    :param error: the exception if the upload failed, otherwise None.
+
+    .. versionadded:: 2.4.1
+    """
+
+    def __init__(
+        self,
+        path: str,
+        key: str,
+        size: int,
+        method: str,
+        elapsed: float = 0.0,
+        error: T.Optional[Exception] = None,
+    ):
+        self.path = path
+        self.key = key
+        self.size = size
+        self.method = method
+        self.elapsed = elapsed
+        self.error = error
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__name__}("
+            f"key={self.key!r}, size={self.size}, method={self.method!r}, "
+            f"error={self.error!r})"
+        )
+
+    @property
+    def is_succeeded(self) -> bool:
+        return self.error is None
+
+
+class _ElapsedSubscriber(BaseSubscriber):
+    """
+    Record the elapsed time of the upload as soon as it is done.
+    """
+
+    def __init__(self, result: UploadFileResult):
+        self.result = result
+        self.start = time.perf_counter()
+
+    def on_done(self, future, **kwargs):
+        self.result.elapsed = time.perf_counter() - self.start
+
+
+class UploadReport:
+    """
+    The report of :func:`upload_files`.
+
+    :param results: per file results, in the input order.
+    :param elapsed: wall time seconds of the entire upload.
+
+    .. versionadded:: 2.4.1
+    """
+
+    def __init__(self, results: T.List[UploadFileResult], elapsed: float):
+        self.results = results
+        self.elapsed = elapsed
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__name__}("
+            f"n_succeeded={len(self.succeeded)}, n_failed={len(self.failed)}, "
+            f"total_size={self.total_size}, elapsed={self.elapsed:.3f})"
+        )
+
+    @property
+    def succeeded(self) -> T.List[UploadFileResult]:
+        return [result for result in self.results if result.error is None]
+
+    @property
+    def failed(self) -> T.List[UploadFileResult]:
+        return [result for result in self.results if result.error is not None]
+
+    @property
+    def total_size(self) -> int:
+        """
+        Total bytes of the succeeded files.
+        """
+        return sum(result.size for result in self.succeeded)
+
+    @property
+    def throughput(self) -> float:
+        """
+        Aggregate throughput in bytes per second.
+        """
+        if self.elapsed <= 0:
+            return 0.0
+        return self.total_size / self.elapsed
+
+    def raise_for_error(self):
+        """
+        Raise the error of the first failed file, if any.
+        """
+        for result in self.results:
+            if result.error is not None:
+                raise result.error
+
+
+def upload_files(
+    s3_client: "S3Client",
+    bucket: str,
+    files: T.Iterable[T.Tuple[PathType, str]],
+    concurrency: int = 8,
+    config: T.Optional[TransferConfig] = None,
+    small_file_threshold: int = 8 * 1024 * 1024,
+    extra_args: T.Optional[dict] = None,
+) -> UploadReport:
+    """
+    Upload many local files to S3 concurrently.
+
+    The files are sorted by size so the large files start first. The file
+    smaller than ``small_file_threshold`` is uploaded with a single put_object_
+    call in a thread pool. The large file is scheduled on a shared s3transfer
+    ``TransferManager``, it is uploaded with multipart upload if it is larger
+    than ``config.multipart_threshold``.
+
+    Example::
+
+        >>> report = upload_files(
+        ...     s3_client, "my-bucket",
+        ...     files=[("/tmp/1.txt", "data/1.txt"), ("/tmp/big.parquet", "data/big.parquet")],
+        ...     concurrency=16,
+        ... )
+        >>> report.throughput
+        >>> report.raise_for_error()
+
+    :param s3_client: A ``boto3.session.Session().client("s3")`` object.
+    :param bucket: S3 bucket name.
+    :param files: list of (local file path, target s3 key).
+    :param concurrency: number of small files uploaded at the same time.
+        It is also the ``max_concurrency`` of the default ``config``.
+    :param config: the ``boto3.s3.transfer.TransferConfig`` for the large files.
+    :param small_file_threshold: the file smaller than this size in bytes is
+        uploaded with put_object_.
+    :param extra_args: the extra arguments for put_object_ and upload_file_,
+        for example ``{"ContentType": "text/plain"}``.
+
+    :return: a :class:`UploadReport`, the failed files don't raise error.
+
+    .. versionadded:: 2.4.1
+    """
+    if concurrency < 1:
+        raise ValueError("``concurrency`` has to be greater than 0.")
+    if config is None:
+        config = TransferConfig(max_concurrency=concurrency)
+    if extra_args is None:
+        extra_args = dict()
+    results = list()
+    for path, key in files:
+        result = UploadFileResult(path=str(path), key=key, size=0, method="put_object")
+        try:
+            result.size = os.path.getsize(path)
+        except Exception as e:
+            result.error = e
+        if result.size >= small_file_threshold:
+            result.method = "upload_file"
+        results.append(result)
+    # start the large files first
+    ordered_results = sorted(results, key=lambda result: result.size, reverse=True)
+
+    def _put_object(result: UploadFileResult):
+        start = time.perf_counter()
+        try:
+            with open(result.path, "rb") as f:
+                s3_client.put_object(
+                    Bucket=bucket,
+                    Key=result.key,
+                    Body=f,
+                    **extra_args,
+                )
+        except Exception as e:
+            result.error = e
+        result.elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    with create_transfer_manager(s3_client, config) as manager:
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            transfer_futures = list()
+            for result in ordered_results:
+                if result.error is not None:
+                    continue
+                if result.method == "upload_file":
+                    future = manager.upload(
+                        result.path,
+                        bucket,
+                        result.key,
+                        extra_args=extra_args or None,
+                        subscribers=[_ElapsedSubscriber(result)],
+                    )
+                    transfer_futures.append((result, future))
+                else:
+                    executor.submit(_put_object, result)
+            for result, future in transfer_futures:
+                try:
+                    future.result()
+                except Exception as e:
+                    result.error = e
+    return UploadReport(results=results, elapsed=time.perf_counter() - start)
+
+
 def upload_dir(
     s3_client: "S3Client",
     bucket: str,
@@ -25,6 +242,9 @@ def upload_dir(
     local_dir: PathType,
     pattern: str = "**/*",
     overwrite: bool = False,
+    concurrency: int = 8,
+    config: T.Optional[TransferConfig] = None,
+    small_file_threshold: int = 8 * 1024 * 1024,
 ) -> int:
     """
     Recursively upload a local directory and files in its subdirectory to S3.
@@ -38,11 +258,24 @@ def upload_dir(
         guide https://docs.python.org/3/library/pathlib.html#pathlib.Path.glob
         for more details.
     :param overwrite: If False, none of the file will be uploaded / overwritten
-        if any of target s3 location already taken.
+        if any of target s3 location already taken. The target s3 locations
+        are checked in batch with
+        :func:`~s3pathlib.better_client.stat_objects.find_existing_keys`.
+    :param concurrency: number of threads to check the target s3 locations
+        when ``overwrite`` is False, and to upload the files.
+        See :func:`upload_files`.
+    :param config: See :func:`upload_files`.
+    :param small_file_threshold: See :func:`upload_files`.
 
     :return: number of files uploaded
 
     .. versionadded:: 1.0.1
+
+    .. versionchanged:: 2.4.1
+
+        Check the target s3 locations with a listing instead of one
+        head_object call per file. Upload the files concurrently.
+        Add ``concurrency``, ``config`` and ``small_file_threshold`` arguments.
     """
     # preprocess input arguments
     if prefix.endswith("/"):
@@ -71,13 +304,27 @@ def upload_dir(
 
     # make sure all target s3 location not exists
     if overwrite is False:
+        existing_keys = find_existing_keys(
+            s3_client=s3_client,
+            bucket=bucket,
+            prefix=final_prefix,
+            keys=[key for _, key in todo],
+            concurrency=concurrency,
+        )
         for abspath, key in todo:
-            if is_object_exists(s3_client, bucket, key) is True:
+            if key in existing_keys:
                 s3_uri = join_s3_uri(bucket, key)
                 raise exc.S3FileAlreadyExist.make(s3_uri)
 
     # execute upload
-    for abspath, key in todo:
-        s3_client.upload_file(abspath, bucket, key)
+    report = upload_files(
+        s3_client=s3_client,
+        bucket=bucket,
+        files=todo,
+        concurrency=concurrency,
+        config=config,
+        small_file_threshold=small_file_threshold,
+    )
+    report.raise_for_error()
 
     return len(todo)
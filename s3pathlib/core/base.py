@@ -98,7 +98,8 @@ class BaseS3Path:
 
     __slots__ = (
         "_bucket",
-        "_parts",
+        "_raw_parts",  # path parts, lazily split from ``_raw_key`` if not given
+        "_raw_key",  # trusted s3 key from the S3 API response, could be None
         "_is_dir",
         "_cached_cparts",  # cached comparison parts
         "_hash",  # cached hash value
@@ -202,13 +203,62 @@ class BaseS3Path:
     ) -> "S3Path":
         self = object.__new__(cls)
         self._bucket = bucket
-        self._parts = parts
+        self._raw_parts = parts
+        self._raw_key = None
         self._is_dir = is_dir
         self._meta = None
         if init:
             self._init()
         return self
 
+    @classmethod
+    def _from_trusted_key(
+        cls: T.Type["S3Path"],
+        bucket: str,
+        key: str,
+        init: bool = True,
+    ) -> "S3Path":
+        """
+        Fast constructor for the bucket and key that come straight from the
+        S3 API response (for example, the list_objects_v2 result). It skips
+        the validation, and the path parts are lazily split from the key
+        only when they are needed.
+
+        If the key is not in normalized form (has leading or consecutive "/"),
+        it falls back to the regular split, so that the result is always
+        the same as ``S3Path(bucket, key)``.
+
+        .. versionadded:: 2.4.1
+        """
+        if (not key) or (key[0] == "/") or ("//" in key):
+            parts = utils.split_parts(key)
+            return cls._from_parsed_parts(
+                bucket=bucket,
+                parts=parts,
+                is_dir=key.endswith("/") or (len(parts) == 0),
+                init=init,
+            )
+        self = object.__new__(cls)
+        self._bucket = bucket
+        self._raw_key = key
+        self._is_dir = key[-1] == "/"
+        self._meta = None
+        if init:
+            self._init()
+        return self
+
+    @property
+    def _parts(self: "S3Path") -> T.List[str]:
+        """
+        The path parts of the S3 key, lazily split from the trusted key if
+        this object is created by :meth:`BaseS3Path._from_trusted_key`.
+        """
+        try:
+            return self._raw_parts
+        except AttributeError:
+            self._raw_parts = utils.split_parts(self._raw_key)
+            return self._raw_parts
+
     def _init(self: "S3Path") -> None:
         """
         Additional instance initialization
@@ -8,21 +8,95 @@ Copy file from s3 to s3.
 
 import typing as T
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, Future
 
 from func_args import NOTHING, resolve_kwargs
 
+from .. import exc
 from ..type import TagType, MetadataType
-from ..tag import encode_url_query
+from ..tag import encode_url_query, parse_tags
+from ..utils import iter_map_concurrently
+from ..better_client.list_objects import (
+    paginate_list_objects_v2,
+    is_content_an_object,
+)
+from ..better_client.copy_object import (
+    DEFAULT_MULTIPART_COPY_THRESHOLD,
+    DEFAULT_MULTIPART_COPY_PART_SIZE,
+    MAX_COPY_OBJECT_SIZE,
+    COPIED_HEADERS,
+    split_copy_object_kwargs,
+    multipart_copy_object,
+    stream_copy_object,
+)
 
 from .resolve_s3_client import resolve_s3_client
 from ..aws import context
 
 if T.TYPE_CHECKING:  # pragma: no cover
     from .s3path import S3Path
+    from ..journal import Journal
     from boto_session_manager import BotoSesManager
     from mypy_boto3_s3 import S3Client
 
 
+def _prepare_copy_dir_todo(
+    src: "S3Path",
+    dst: "S3Path",
+    todo: T.Iterable[T.Tuple["S3Path", T.Optional["S3Path"]]],
+    s3_client: "S3Client",
+    overwrite: bool,
+    expected_bucket_owner: str = NOTHING,
+    since: T.Optional[datetime] = None,
+) -> T.Iterable[T.Tuple["S3Path", T.Optional["S3Path"]]]:
+    """
+    Prepare the lazy ``(p_src, p_dst)`` to do list of the directory copy.
+    ``p_dst`` is None if the source object doesn't need to be copied.
+
+    The to do list is only materialized when it is necessary:
+
+    - the target is inside the source directory, the listing should not
+      see the new copies.
+    - ``overwrite`` is False and the target directory is not empty, none
+      of the objects should be copied if any target exists. The target
+      directory is listed once instead of calling head_object for each object.
+
+    :param since: only the target objects last modified before this time are
+        conflicts, the objects written by the interrupted run of a resumed
+        job are overwritten.
+    """
+    if (src.bucket == dst.bucket) and dst.key.startswith(src.key):
+        todo = list(todo)
+    # ensure target location not exists for ``overwrite``
+    if overwrite is False:
+        existing_keys = {
+            dct["Key"]
+            for dct in paginate_list_objects_v2(
+                s3_client=s3_client,
+                bucket=dst.bucket,
+                prefix=dst.key,
+                expected_bucket_owner=expected_bucket_owner,
+            ).contents()
+            if (since is None) or (dct["LastModified"] < since)
+        }
+        if existing_keys:
+            todo = list(todo)
+            for p_src, p_dst in todo:
+                if (p_dst is not None) and (p_dst.key in existing_keys):
+                    p_dst.ensure_not_exists(bsm=s3_client)
+    return todo
+
+
+def _get_journal_since(journal: T.Optional["Journal"]) -> T.Optional[datetime]:
+    """
+    The S3 ``LastModified`` has second precision, the objects written after
+    the job is created may have a ``LastModified`` in the same second.
+    """
+    if journal is None:
+        return None
+    return journal.created_at.replace(microsecond=0)
+
+
 class CopyAPIMixin:
     """
     A mixin class that implements copy related methods.
@@ -68,10 +142,30 @@ class CopyAPIMixin:
         object_lock_legal_hold_status: str = NOTHING,
         expected_bucket_owner: str = NOTHING,
         expected_source_bucket_owner: str = NOTHING,
+        multipart_threshold: T.Optional[int] = DEFAULT_MULTIPART_COPY_THRESHOLD,
+        part_size: int = DEFAULT_MULTIPART_COPY_PART_SIZE,
+        concurrency: int = 8,
+        dst_bsm: T.Optional[T.Union["BotoSesManager", "S3Client"]] = None,
     ) -> dict:
         """
         Copy an S3 file to a different S3 location.
 
+        If the source object is not smaller than ``multipart_threshold``, or
+        larger than 5 GB, it is copied with
+        :func:`~s3pathlib.better_client.copy_object.multipart_copy_object`,
+        the byte ranges are copied concurrently with ``upload_part_copy``.
+        The metadata and tags are copied from the source like ``copy_object``,
+        unless ``metadata`` and ``tags`` are given. The source object size is
+        taken from the cached metadata (for example, the path from
+        :meth:`~s3pathlib.core.iter_objects.IterObjectsAPIMixin.iter_objects`),
+        otherwise it costs one ``head_object`` call.
+
+        If ``dst_bsm`` is given, the source is read with ``bsm`` and the target
+        is written with ``dst_bsm``, for example to copy across accounts.
+        The server side copy is not possible, the object is streamed through
+        the memory by :func:`~s3pathlib.better_client.copy_object.stream_copy_object`,
+        the memory usage is bounded by ``concurrency * part_size``.
+
         :param dst: copy to s3 object, it has to be an object
         :param overwrite: if False, none of the file will be uploaded / overwritten
             if any of target s3 location already taken. Note that if the target
@@ -79,8 +173,16 @@ class CopyAPIMixin:
             able to put a new version to an existing file, but this if
             ``overwrite`` is True, then it won't allow you to do that. You should
             set ``overwrite`` to False if you want to put a new version.
+        :param multipart_threshold: the object size to switch to multipart copy.
+            Default 256 MB. If None, always use ``copy_object`` and skip the size
+            check, it only works for the object up to 5 GB.
+        :param part_size: the part size of the multipart copy, default 64 MB.
+        :param concurrency: number of threads to copy the parts.
+        :param dst_bsm: the boto session or s3 client to write the target,
+            default is ``bsm``.
 
-        :return: number of object are copied, 0 or 1.
+        :return: the ``copy_object`` response, or the ``complete_multipart_upload``
+            response of the multipart copy.
 
         .. versionadded:: 1.0.1
 
@@ -91,6 +193,16 @@ class CopyAPIMixin:
         .. versionchanged:: 2.0.1
 
             add ``version_id`` argument
+
+        .. versionchanged:: 2.4.1
+
+            add ``multipart_threshold``, ``part_size`` and ``concurrency``
+            arguments, copy the large object with multipart copy.
+
+        .. versionchanged:: 2.4.1
+
+            add ``dst_bsm`` argument, copy with separate source and target
+            credentials.
         """
         # preprocess input arguments
         self.ensure_object()
@@ -98,11 +210,16 @@ class CopyAPIMixin:
         self.ensure_not_relpath()
         dst.ensure_not_relpath()
 
-        if overwrite is False:
-            dst.ensure_not_exists(bsm=bsm)
-
         # prepare API kwargs
         s3_client = resolve_s3_client(context, bsm)
+        if dst_bsm is None:
+            dst_s3_client = s3_client
+        else:
+            dst_s3_client = resolve_s3_client(context, dst_bsm)
+        is_stream = dst_s3_client is not s3_client
+
+        if overwrite is False:
+            dst.ensure_not_exists(bsm=dst_s3_client)
 
         kwargs = dict(
             Bucket=dst.bucket,
@@ -151,7 +268,97 @@ class CopyAPIMixin:
         if tags is not NOTHING:
             kwargs["Tagging"] = encode_url_query(tags)
             kwargs["TaggingDirective"] = "REPLACE"
-        return s3_client.copy_object(**resolve_kwargs(**kwargs))
+        kwargs = resolve_kwargs(**kwargs)
+
+        if is_stream or (multipart_threshold is not None):
+            head_kwargs = resolve_kwargs(
+                Bucket=self.bucket,
+                Key=self.key,
+                VersionId=version_id,
+                SSECustomerAlgorithm=copy_source_sse_customer_algorithm,
+                SSECustomerKey=copy_source_sse_customer_key,
+                RequestPayer=request_payer,
+                ExpectedBucketOwner=expected_source_bucket_owner,
+            )
+            head = None
+            size = None
+            etag = None
+            if (self._meta is not None) and (
+                version_id is NOTHING or version_id == self._static_version_id
+            ):
+                size = self._meta.get("ContentLength")
+                etag = self._meta.get("ETag")
+            if size is None:
+                head = s3_client.head_object(**head_kwargs)
+                size = head["ContentLength"]
+                etag = head.get("ETag")
+            if (
+                is_stream
+                or (size >= multipart_threshold)
+                or (size > MAX_COPY_OBJECT_SIZE)
+            ):
+                # multipart upload doesn't copy the metadata and tags
+                if metadata is NOTHING:
+                    if head is None:
+                        head = s3_client.head_object(**head_kwargs)
+                    for header in COPIED_HEADERS:
+                        if header in head:
+                            kwargs.setdefault(header, head[header])
+                if tags is NOTHING:
+                    head_kwargs.pop("SSECustomerAlgorithm", None)
+                    head_kwargs.pop("SSECustomerKey", None)
+                    tag_set = s3_client.get_object_tagging(**head_kwargs)["TagSet"]
+                    if tag_set:
+                        kwargs["Tagging"] = encode_url_query(parse_tags(tag_set))
+                create_kwargs, part_kwargs, complete_kwargs = split_copy_object_kwargs(
+                    kwargs
+                )
+                if is_stream:
+                    get_object_kwargs = resolve_kwargs(
+                        IfMatch=copy_source_if_match,
+                        IfModifiedSince=copy_source_if_modified_since,
+                        IfNoneMatch=copy_source_if_none_match,
+                        IfUnmodifiedSince=copy_source_if_unmodified_since,
+                        SSECustomerAlgorithm=copy_source_sse_customer_algorithm,
+                        SSECustomerKey=copy_source_sse_customer_key,
+                        RequestPayer=request_payer,
+                        ExpectedBucketOwner=expected_source_bucket_owner,
+                    )
+                    # make sure all parts are read from the same object
+                    if etag is not None:
+                        get_object_kwargs.setdefault("IfMatch", etag)
+                    return stream_copy_object(
+                        src_s3_client=s3_client,
+                        dst_s3_client=dst_s3_client,
+                        src_bucket=self.bucket,
+                        src_key=self.key,
+                        dst_bucket=dst.bucket,
+                        dst_key=dst.key,
+                        size=size,
+                        src_version_id=version_id,
+                        part_size=part_size,
+                        concurrency=concurrency,
+                        get_object_kwargs=get_object_kwargs,
+                        create_multipart_upload_kwargs=create_kwargs,
+                        upload_part_kwargs=complete_kwargs,
+                        complete_multipart_upload_kwargs=complete_kwargs,
+                    )
+                return multipart_copy_object(
+                    s3_client=s3_client,
+                    src_bucket=self.bucket,
+                    src_key=self.key,
+                    dst_bucket=dst.bucket,
+                    dst_key=dst.key,
+                    size=size,
+                    src_version_id=version_id,
+                    part_size=part_size,
+                    concurrency=concurrency,
+                    create_multipart_upload_kwargs=create_kwargs,
+                    upload_part_copy_kwargs=part_kwargs,
+                    complete_multipart_upload_kwargs=complete_kwargs,
+                )
+
+        return s3_client.copy_object(**kwargs)
 
     def copy_dir(
         self: "S3Path",
@@ -192,6 +399,13 @@ class CopyAPIMixin:
         object_lock_legal_hold_status: str = NOTHING,
         expected_bucket_owner: str = NOTHING,
         expected_source_bucket_owner: str = NOTHING,
+        prefetch: int = 0,
+        concurrency: int = 8,
+        journal: T.Optional["Journal"] = None,
+        dst_bsm: T.Optional[T.Union["BotoSesManager", "S3Client"]] = None,
+        multipart_threshold: T.Optional[int] = DEFAULT_MULTIPART_COPY_THRESHOLD,
+        part_size: int = DEFAULT_MULTIPART_COPY_PART_SIZE,
+        file_concurrency: T.Optional[int] = None,
     ):
         """
         Copy an S3 directory to a different S3 directory, including all
@@ -202,11 +416,59 @@ class CopyAPIMixin:
             if any of target s3 location already taken. Note that if the
             source dir is a versioning enabled bucket, it will always copy
             the latest version of the object.
+        :param prefetch: Default 0, if greater than 0, list up to this many
+            pages of the source directory ahead in a background thread.
+            See :meth:`~s3pathlib.core.iter_objects.IterObjectsAPIMixin.iter_objects`.
+        :param concurrency: number of threads to copy the objects.
+        :param journal: a :class:`~s3pathlib.journal.Journal` to record the
+            copied objects. If the job is interrupted, re-run it with the same
+            journal to resume, the copied objects are skipped. With
+            ``overwrite=False``, the target objects written by the previous run
+            of the job are not conflicts.
+        :param dst_bsm: the boto session or s3 client to write the target
+            directory, default is ``bsm``. If it is different from ``bsm``, the
+            objects are streamed through the memory, see :meth:`copy_file`.
+        :param multipart_threshold: the object size to switch to multipart copy,
+            see :meth:`copy_file`.
+        :param part_size: the part size of the multipart copy, see :meth:`copy_file`.
+        :param file_concurrency: number of threads to copy the parts of each
+            large object. Default None, 8 for the server side copy, 1 for the
+            streaming copy with ``dst_bsm``.
+
+        Up to ``concurrency * file_concurrency`` threads send the copy requests
+        at the same time. With ``dst_bsm``, each thread holds one part in the
+        memory, the memory usage is bounded by
+        ``concurrency * file_concurrency * part_size``, 512 MB by default.
 
         :return: number of objects are copied
 
         .. versionadded:: 1.0.1
 
+        .. versionchanged:: 2.4.1
+
+            Add ``prefetch`` argument.
+
+        .. versionchanged:: 2.4.1
+
+            Add ``concurrency`` argument, the objects are copied in a thread pool
+            while the source directory is still being listed. When ``overwrite``
+            is False, the target directory is listed once instead of calling
+            head_object for each object.
+
+        .. versionchanged:: 2.4.1
+
+            Add ``journal`` argument to make the copy resumable.
+
+        .. versionchanged:: 2.4.1
+
+            Add ``dst_bsm`` argument, copy with separate source and target
+            credentials.
+
+        .. versionchanged:: 2.4.1
+
+            Add ``multipart_threshold``, ``part_size`` and ``file_concurrency``
+            argument.
+
         TODO: add an argument ``copy_all_history`` to copy all object and all
             history if the source bucket is versioning enabled.
         """
@@ -216,26 +478,55 @@ class CopyAPIMixin:
         self.ensure_not_relpath()
         dst.ensure_not_relpath()
 
-        # calculate to do list
-        todo: T.List[T.Tuple["S3Path", "S3Path"]] = list()
-        for p_src in self.iter_objects(bsm=bsm):
-            p_relpath = p_src.relative_to(self)
-            p_dst = dst.joinpath(p_relpath)
-            todo.append((p_src, p_dst))
+        if concurrency < 1:
+            raise ValueError("``concurrency`` has to be greater than 0.")
+        if (journal is not None) and journal.is_finished:
+            return 0
+        s3_client = resolve_s3_client(context, bsm)
+        if dst_bsm is None:
+            dst_s3_client = s3_client
+        else:
+            dst_s3_client = resolve_s3_client(context, dst_bsm)
+        if file_concurrency is None:
+            # the streaming copy of each object is single threaded to bound the memory
+            file_concurrency = 8 if dst_s3_client is s3_client else 1
+        if file_concurrency < 1:
+            raise ValueError("``file_concurrency`` has to be greater than 0.")
+        start_after = NOTHING
+        if (journal is not None) and (journal.start_after is not None):
+            start_after = journal.start_after
 
-        # ensure target location not exists for ``overwrite``
-        if overwrite is False:
-            for p_src, p_dst in todo:
-                p_dst.ensure_not_exists(bsm=bsm)
+        def _iter_todo() -> T.Iterable[T.Tuple["S3Path", "S3Path"]]:
+            for p_src in self.iter_objects(
+                prefetch=prefetch,
+                start_after=start_after,
+                bsm=s3_client,
+            ):
+                if (journal is not None) and journal.dispatch(p_src.key):
+                    continue
+                p_relpath = p_src.relative_to(self)
+                p_dst = dst.joinpath(p_relpath)
+                yield p_src, p_dst
+
+        todo = _prepare_copy_dir_todo(
+            src=self,
+            dst=dst,
+            todo=_iter_todo(),
+            s3_client=dst_s3_client,
+            overwrite=overwrite,
+            expected_bucket_owner=expected_bucket_owner,
+            since=_get_journal_since(journal),
+        )
 
         # do real copy
-        for p_src, p_dst in todo:
+        def _copy(task: T.Tuple["S3Path", "S3Path"]) -> str:
+            p_src, p_dst = task
             p_src.copy_file(
                 p_dst,
                 metadata=metadata,
                 tags=tags,
                 overwrite=True,
-                bsm=bsm,
+                bsm=s3_client,
                 acl=acl,
                 cache_control=cache_control,
                 content_disposition=content_disposition,
@@ -268,9 +559,26 @@ class CopyAPIMixin:
                 object_lock_legal_hold_status=object_lock_legal_hold_status,
                 expected_bucket_owner=expected_bucket_owner,
                 expected_source_bucket_owner=expected_source_bucket_owner,
+                multipart_threshold=multipart_threshold,
+                part_size=part_size,
+                concurrency=file_concurrency,
+                dst_bsm=dst_s3_client,
             )
+            return p_src.key
 
-        return len(todo)
+        count = 0
+        for key in iter_map_concurrently(
+            _copy,
+            todo,
+            max_workers=concurrency,
+            ordered=False,
+        ):
+            count += 1
+            if journal is not None:
+                journal.complete(key)
+        if journal is not None:
+            journal.finish()
+        return count
 
     def copy_to(
         self: "S3Path",
@@ -312,6 +620,12 @@ class CopyAPIMixin:
         object_lock_legal_hold_status: str = NOTHING,
         expected_bucket_owner: str = NOTHING,
         expected_source_bucket_owner: str = NOTHING,
+        concurrency: int = 8,
+        journal: T.Optional["Journal"] = None,
+        dst_bsm: T.Optional[T.Union["BotoSesManager", "S3Client"]] = None,
+        multipart_threshold: T.Optional[int] = DEFAULT_MULTIPART_COPY_THRESHOLD,
+        part_size: int = DEFAULT_MULTIPART_COPY_PART_SIZE,
+        file_concurrency: T.Optional[int] = None,
     ) -> int:
         """
         Copy s3 object or s3 directory from one place to another place.
@@ -323,6 +637,18 @@ class CopyAPIMixin:
             able to put a new version to an existing file, but this if
             ``overwrite`` is True, then it won't allow you to do that. You should
             set ``overwrite`` to False if you want to put a new version.
+        :param concurrency: number of threads to copy the objects of a directory,
+            see :meth:`copy_dir`, or the parts of a large object, see :meth:`copy_file`.
+        :param journal: a :class:`~s3pathlib.journal.Journal` to make the
+            directory copy resumable, see :meth:`copy_dir`.
+        :param dst_bsm: the boto session or s3 client to write the target,
+            see :meth:`copy_file`.
+        :param multipart_threshold: the object size to switch to multipart copy,
+            see :meth:`copy_file`.
+        :param part_size: the part size of the multipart copy, see :meth:`copy_file`.
+        :param file_concurrency: number of threads to copy the parts of each
+            large object of a directory, see :meth:`copy_dir`. It is not used
+            for an object, the parts are copied by ``concurrency`` threads.
 
         .. versionadded:: 1.0.1
 
@@ -333,6 +659,15 @@ class CopyAPIMixin:
         .. versionchanged:: 2.0.1
 
             add ``version_id`` argument
+
+        .. versionchanged:: 2.4.1
+
+            add ``concurrency``, ``journal`` and ``dst_bsm`` argument
+
+        .. versionchanged:: 2.4.1
+
+            add ``multipart_threshold``, ``part_size`` and ``file_concurrency``
+            argument
         """
         if self.is_dir():
             return self.copy_dir(
@@ -373,6 +708,12 @@ class CopyAPIMixin:
                 object_lock_legal_hold_status=object_lock_legal_hold_status,
                 expected_bucket_owner=expected_bucket_owner,
                 expected_source_bucket_owner=expected_source_bucket_owner,
+                concurrency=concurrency,
+                journal=journal,
+                dst_bsm=dst_bsm,
+                multipart_threshold=multipart_threshold,
+                part_size=part_size,
+                file_concurrency=file_concurrency,
             )
         elif self.is_file():
             self.copy_file(
@@ -414,6 +755,10 @@ class CopyAPIMixin:
                 object_lock_legal_hold_status=object_lock_legal_hold_status,
                 expected_bucket_owner=expected_bucket_owner,
                 expected_source_bucket_owner=expected_source_bucket_owner,
+                multipart_threshold=multipart_threshold,
+                part_size=part_size,
+                concurrency=concurrency,
+                dst_bsm=dst_bsm,
             )
             return 1
         else:  # pragma: no cover
@@ -458,10 +803,28 @@ class CopyAPIMixin:
         object_lock_legal_hold_status: str = NOTHING,
         expected_bucket_owner: str = NOTHING,
         expected_source_bucket_owner: str = NOTHING,
+        concurrency: int = 8,
+        prefetch: int = 0,
+        journal: T.Optional["Journal"] = None,
+        multipart_threshold: T.Optional[int] = DEFAULT_MULTIPART_COPY_THRESHOLD,
+        part_size: int = DEFAULT_MULTIPART_COPY_PART_SIZE,
+        file_concurrency: T.Optional[int] = None,
     ) -> int:
         """
-        Move s3 object or s3 directory from one place to another place. It is
-        firstly :meth:`S3Path.copy_to` then :meth:`S3Path.delete_if_exists`
+        Move s3 object or s3 directory from one place to another place.
+
+        For an object, it is firstly :meth:`S3Path.copy_to` then
+        :meth:`S3Path.delete`.
+
+        For a directory, the source directory is listed only once, the objects
+        are copied in a thread pool, and the copied source objects are deleted
+        by ``delete_objects`` in batches of 1000 while the other objects are
+        still being copied. If it fails in the middle, only the objects in the
+        current copy and delete batches exist in both places. If some source
+        objects can't be deleted, for example access denied or object lock, the
+        other objects are still moved, then
+        :class:`~s3pathlib.exc.S3PermissionDenied` is raised, the failed objects
+        are not counted nor recorded in the ``journal``.
 
         :param dst: copy to s3 path
         :param overwrite: if False, none of the file will be uploaded / overwritten
@@ -470,19 +833,46 @@ class CopyAPIMixin:
             able to put a new version to an existing file, but this if
             ``overwrite`` is True, then it won't allow you to do that. You should
             set ``overwrite`` to False if you want to put a new version.
+        :param concurrency: number of threads to copy the objects of a directory,
+            or the parts of a large object. See :meth:`copy_to`.
+        :param prefetch: Default 0, if greater than 0, list up to this many
+            pages of the source directory ahead in a background thread.
+        :param journal: a :class:`~s3pathlib.journal.Journal` to record the
+            moved objects of a directory, an object is recorded after the
+            source is deleted. If the job is interrupted, re-run it with the
+            same journal to resume, see :meth:`copy_dir`.
+        :param multipart_threshold: the object size to switch to multipart copy,
+            see :meth:`copy_file`.
+        :param part_size: the part size of the multipart copy, see :meth:`copy_file`.
+        :param file_concurrency: number of threads to copy the parts of each
+            large object of a directory, default 8. Up to
+            ``concurrency * file_concurrency`` threads send the copy requests
+            at the same time. It is not used for an object, the parts are
+            copied by ``concurrency`` threads.
 
         .. versionadded:: 1.0.1
 
         .. versionchanged:: 1.3.1
 
             add ``metadata`` and ``tags`` argument
+
+        .. versionchanged:: 2.4.1
+
+            add ``concurrency`` and ``prefetch`` argument, move the directory
+            with a pipeline of concurrent copies and batched deletes.
+
+        .. versionchanged:: 2.4.1
+
+            add ``journal`` argument to make the directory move resumable.
+
+        .. versionchanged:: 2.4.1
+
+            add ``multipart_threshold``, ``part_size`` and ``file_concurrency``
+            argument.
         """
-        count = self.copy_to(
-            dst=dst,
+        copy_kwargs = dict(
             metadata=metadata,
             tags=tags,
-            overwrite=overwrite,
-            bsm=bsm,
             acl=acl,
             cache_control=cache_control,
             content_disposition=content_disposition,
@@ -515,6 +905,180 @@ class CopyAPIMixin:
             object_lock_legal_hold_status=object_lock_legal_hold_status,
             expected_bucket_owner=expected_bucket_owner,
             expected_source_bucket_owner=expected_source_bucket_owner,
+            multipart_threshold=multipart_threshold,
+            part_size=part_size,
+        )
+        if self.is_dir():
+            return self._move_dir(
+                dst=dst,
+                overwrite=overwrite,
+                bsm=bsm,
+                concurrency=concurrency,
+                prefetch=prefetch,
+                copy_kwargs=copy_kwargs,
+                journal=journal,
+                file_concurrency=file_concurrency,
+            )
+        count = self.copy_to(
+            dst=dst,
+            overwrite=overwrite,
+            bsm=bsm,
+            concurrency=concurrency,
+            **copy_kwargs,
         )
         self.delete(bsm=bsm)
         return count
+
+    def _move_dir(
+        self: "S3Path",
+        dst: "S3Path",
+        overwrite: bool,
+        bsm: T.Optional[T.Union["BotoSesManager", "S3Client"]],
+        concurrency: int,
+        prefetch: int,
+        copy_kwargs: dict,
+        journal: T.Optional["Journal"] = None,
+        delete_batch_size: int = 1000,
+        file_concurrency: T.Optional[int] = None,
+    ) -> int:
+        """
+        The pipelined directory move, see :meth:`move_to`.
+
+        :return: number of objects are moved.
+        """
+        self.ensure_dir()
+        dst.ensure_dir()
+        self.ensure_not_relpath()
+        dst.ensure_not_relpath()
+        if concurrency < 1:
+            raise ValueError("``concurrency`` has to be greater than 0.")
+        if file_concurrency is None:
+            file_concurrency = 8
+        if file_concurrency < 1:
+            raise ValueError("``file_concurrency`` has to be greater than 0.")
+        if (journal is not None) and journal.is_finished:
+            return 0
+        s3_client = resolve_s3_client(context, bsm)
+        bucket = self.bucket
+        start_after = NOTHING
+        if (journal is not None) and (journal.start_after is not None):
+            start_after = journal.start_after
+
+        def _iter_todo() -> T.Iterable[T.Tuple["S3Path", T.Optional["S3Path"]]]:
+            for dct in paginate_list_objects_v2(
+                s3_client=s3_client,
+                bucket=bucket,
+                prefix=self.key,
+                start_after=start_after,
+                request_payer=copy_kwargs["request_payer"],
+                expected_bucket_owner=copy_kwargs["expected_source_bucket_owner"],
+                prefetch=prefetch,
+            ).contents():
+                if (journal is not None) and journal.dispatch(dct["Key"]):
+                    continue
+                p_src = self._from_content_dict(bucket, dct)
+                # the hard folder is not copied, but it is deleted
+                if is_content_an_object(dct):
+                    yield p_src, dst.joinpath(p_src.relative_to(self))
+                else:
+                    yield p_src, None
+
+        todo = _prepare_copy_dir_todo(
+            src=self,
+            dst=dst,
+            todo=_iter_todo(),
+            s3_client=s3_client,
+            overwrite=overwrite,
+            expected_bucket_owner=copy_kwargs["expected_bucket_owner"],
+            since=_get_journal_since(journal),
+        )
+
+        def _copy(
+            task: T.Tuple["S3Path", T.Optional["S3Path"]],
+        ) -> T.Tuple["S3Path", T.Optional["S3Path"]]:
+            p_src, p_dst = task
+            if p_dst is not None:
+                p_src.copy_file(
+                    p_dst,
+                    overwrite=True,
+                    bsm=s3_client,
+                    concurrency=file_concurrency,
+                    **copy_kwargs,
+                )
+            return p_src, p_dst
+
+        errors: T.List[dict] = list()
+
+        def _delete(
+            batch: T.List[T.Tuple[str, bool]],
+        ) -> T.Tuple[T.List[T.Tuple[str, bool]], T.List[dict]]:
+            """
+            :param batch: list of ``(key, is_copied)``.
+
+            :return: the deleted ``(key, is_copied)`` and the delete_objects errors.
+            """
+            response = s3_client.delete_objects(
+                **resolve_kwargs(
+                    Bucket=bucket,
+                    Delete={
+                        "Objects": [dict(Key=key) for key, _ in batch],
+                        "Quiet": True,
+                    },
+                    RequestPayer=copy_kwargs["request_payer"],
+                    ExpectedBucketOwner=copy_kwargs["expected_source_bucket_owner"],
+                )
+            )
+            batch_errors = response.get("Errors", [])
+            failed_keys = {dct["Key"] for dct in batch_errors}
+            deleted = [
+                (key, is_copied) for key, is_copied in batch if key not in failed_keys
+            ]
+            return deleted, batch_errors
+
+        def _complete(
+            result: T.Tuple[T.List[T.Tuple[str, bool]], T.List[dict]],
+        ) -> int:
+            """
+            Record the moved objects, the object is moved only if the source
+            is deleted.
+
+            :return: number of moved objects.
+            """
+            deleted, batch_errors = result
+            errors.extend(batch_errors)
+            if journal is not None:
+                for key, _ in deleted:
+                    journal.complete(key)
+            return sum(is_copied for _, is_copied in deleted)
+
+        count = 0
+        batch = list()
+        # the single thread delete stage, at most one batch in flight
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            future: T.Optional[Future] = None
+            for p_src, p_dst in iter_map_concurrently(
+                _copy,
+                todo,
+                max_workers=concurrency,
+                ordered=False,
+            ):
+                batch.append((p_src.key, p_dst is not None))
+                if len(batch) >= delete_batch_size:
+                    if future is not None:
+                        count += _complete(future.result())
+                    future = executor.submit(_delete, batch)
+                    batch = list()
+            if future is not None:
+                count += _complete(future.result())
+            if batch:
+                count += _complete(_delete(batch))
+        if errors:
+            error = errors[0]
+            raise exc.S3PermissionDenied(
+                f"failed to delete {len(errors)} source objects after copy, "
+                f"they exist in both places, for example "
+                f"{error.get('Key')!r}: {error.get('Code')} {error.get('Message')}"
+            )
+        if journal is not None:
+            journal.finish()
+        return count
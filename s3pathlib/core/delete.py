@@ -40,6 +40,8 @@ class DeleteAPIMixin:
         check_sum_algorithm: str = NOTHING,
         is_hard_delete: bool = False,
         skip_prompt: bool = False,
+        prefetch: int = 0,
+        concurrency: int = 8,
         bsm: T.Optional[T.Union["BotoSesManager", "S3Client"]] = None,
     ) -> "S3Path":
         """
@@ -80,6 +82,13 @@ class DeleteAPIMixin:
             of the object, then the data is permanently deleted.
         :param skip_prompt: Default False, it will prompt you to confirm when deleting
             everything in an S3 bucket.
+        :param prefetch: Default 0, only used when deleting a directory, or
+            all versions of an object. See
+            :func:`~s3pathlib.better_client.delete_object.delete_dir`.
+        :param concurrency: Default 8, number of ``delete_objects`` batches to
+            delete at the same time, only used when deleting a directory, or
+            all versions of an object. See
+            :func:`~s3pathlib.better_client.delete_object.delete_dir`.
         :param bsm: See bsm_.
 
         :return: a new ``S3Path`` object representing the deleted object
@@ -96,6 +105,14 @@ class DeleteAPIMixin:
         .. versionadded:: 2.0.1
 
             Use this method to replace the :meth:`DeleteAPIMixin.delete_if_exists` method.
+
+        .. versionchanged:: 2.4.1
+
+            Add ``prefetch`` argument.
+
+        .. versionchanged:: 2.4.1
+
+            Add ``concurrency`` argument.
         """
         s3_client = resolve_s3_client(context, bsm)
         bucket = self.bucket
@@ -110,6 +127,8 @@ class DeleteAPIMixin:
                     bypass_governance_retention=bypass_governance_retention,
                     expected_bucket_owner=expected_bucket_owner,
                     check_sum_algorithm=check_sum_algorithm,
+                    prefetch=prefetch,
+                    concurrency=concurrency,
                 )
                 self.clear_cache()
                 return self
@@ -153,6 +172,8 @@ class DeleteAPIMixin:
                     expected_bucket_owner=expected_bucket_owner,
                     check_sum_algorithm=check_sum_algorithm,
                     skip_prompt=skip_prompt,
+                    prefetch=prefetch,
+                    concurrency=concurrency,
                 )
                 return self
 
@@ -165,6 +186,8 @@ class DeleteAPIMixin:
                 bypass_governance_retention=bypass_governance_retention,
                 expected_bucket_owner=expected_bucket_owner,
                 skip_prompt=skip_prompt,
+                prefetch=prefetch,
+                concurrency=concurrency,
             )
             return self
         else:  # pragma: no cover
@@ -2,6 +2,8 @@
 
 """
 Tagging related API.
+
+.. _bsm: https://github.com/aws-samples/boto-session-manager-project
 """
 
 import typing as T
@@ -10,6 +12,7 @@ from func_args import NOTHING
 from .. import exc
 from ..better_client.head_bucket import is_bucket_exists
 from ..better_client.head_object import head_object
+from ..better_client.stat_objects import stat_objects
 from ..aws import context
 
 from .resolve_s3_client import resolve_s3_client
@@ -109,3 +112,94 @@ class ExistsAPIMixin:
                     "open console for more details {}."
                 ).format(self.uri, self.console_url)
             )
+
+    @classmethod
+    def stat_many(
+        cls: T.Type["S3Path"],
+        paths: T.Iterable["S3Path"],
+        concurrency: int = 8,
+        batch_size: int = 1000,
+        list_cost: float = 1.0,
+        bsm: T.Optional[T.Union["BotoSesManager", "S3Client"]] = None,
+    ) -> T.List["S3Path"]:
+        """
+        Check if many s3 objects exist, and fill the size, ETag, last modified
+        and storage class metadata for the existing ones. The paths sharing
+        the same parent folder are checked with a few ListObjectsV2 calls
+        instead of one head_object call per object.
+        See :func:`~s3pathlib.better_client.stat_objects.stat_objects`.
+
+        Example:
+
+            >>> paths = [S3Path(f"bucket/data/{i}.json") for i in range(100000)]
+            >>> existing = S3Path.stat_many(paths, concurrency=16)
+            >>> sum(p.size for p in existing)
+
+        :param paths: the s3 object paths, they can be in different buckets.
+        :param concurrency: number of threads.
+        :param batch_size: number of keys per ListObjectsV2 page.
+        :param list_cost: the cost of one ListObjectsV2 page relative to
+            one head_object call.
+        :param bsm: See bsm_.
+
+        :return: the existing paths, in the input order.
+
+        .. versionadded:: 2.4.1
+        """
+        paths = list(paths)
+        for path in paths:
+            path.ensure_object()
+        s3_client = resolve_s3_client(context, bsm)
+        keys_by_bucket = dict()
+        for path in paths:
+            keys_by_bucket.setdefault(path.bucket, set()).add(path.key)
+        stats = {
+            bucket: stat_objects(
+                s3_client=s3_client,
+                bucket=bucket,
+                keys=keys,
+                concurrency=concurrency,
+                batch_size=batch_size,
+                list_cost=list_cost,
+            )
+            for bucket, keys in keys_by_bucket.items()
+        }
+        existing = list()
+        for path in paths:
+            dct = stats[path.bucket][path.key]
+            if dct is not None:
+                path._meta = cls._from_content_dict(path.bucket, dct)._meta
+                existing.append(path)
+        return existing
+
+    @classmethod
+    def exists_many(
+        cls: T.Type["S3Path"],
+        paths: T.Iterable["S3Path"],
+        concurrency: int = 8,
+        batch_size: int = 1000,
+        list_cost: float = 1.0,
+        bsm: T.Optional[T.Union["BotoSesManager", "S3Client"]] = None,
+    ) -> T.List[bool]:
+        """
+        The batch version of :meth:`exists` for s3 objects, see :meth:`stat_many`.
+
+        Example:
+
+            >>> S3Path.exists_many([S3Path("bucket/1.txt"), S3Path("bucket/2.txt")])
+            [True, False]
+
+        :return: a list of boolean, in the input order.
+
+        .. versionadded:: 2.4.1
+        """
+        paths = list(paths)
+        existing = cls.stat_many(
+            paths,
+            concurrency=concurrency,
+            batch_size=batch_size,
+            list_cost=list_cost,
+            bsm=bsm,
+        )
+        existing_ids = set(id(path) for path in existing)
+        return [id(path) in existing_ids for path in paths]
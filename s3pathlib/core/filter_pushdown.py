@@ -0,0 +1,216 @@
+# -*- coding: utf-8 -*-
+
+"""
+Push the :class:`~s3pathlib.core.filterable_property.Predicate` on the
+``S3Path.key`` down to the ListObjectsV2_ request.
+
+The S3 objects are listed in key order, so the key range predicates can be
+converted to:
+
+- ``S3Path.key > "x"``, ``S3Path.key >= "x"``: the ``StartAfter`` parameter.
+- ``S3Path.key < "x"``, ``S3Path.key <= "x"``: stop the listing once the key
+  is out of the range.
+- ``S3Path.key.startswith("x")``, ``S3Path.key == "x"``: a narrower ``Prefix``.
+- ``S3Path.key.between("x", "y")``: both ``StartAfter`` and stop.
+
+All filters are still applied on the client side, the pushdown only
+reduces the number of keys to list.
+
+.. _ListObjectsV2: https://boto3.amazonaws.com/v1/documentation/api/latest/reference/services/s3/paginator/ListObjectsV2.html
+"""
+
+import typing as T
+
+from ..utils import get_key_predecessor
+from .filterable_property import Predicate
+
+if T.TYPE_CHECKING:  # pragma: no cover
+    from .s3path import S3Path
+
+
+class KeyRange:
+    """
+    The range of s3 key to list, planned from the filters.
+
+    :param prefix: the ``Prefix`` of the listing.
+    :param start_after: the ``StartAfter`` of the listing, exclusive.
+    :param stop: stop the listing once the key is greater than this value.
+    :param stop_inclusive: whether the ``stop`` key itself is in the range.
+    :param is_empty: True if no key can match, the listing can be skipped.
+
+    .. versionadded:: 2.4.1
+    """
+
+    def __init__(
+        self,
+        prefix: str,
+        start_after: T.Optional[str] = None,
+        stop: T.Optional[str] = None,
+        stop_inclusive: bool = True,
+        is_empty: bool = False,
+    ):
+        self.prefix = prefix
+        self.start_after = start_after
+        self.stop = stop
+        self.stop_inclusive = stop_inclusive
+        self.is_empty = is_empty
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__name__}("
+            f"prefix={self.prefix!r}, "
+            f"start_after={self.start_after!r}, "
+            f"stop={self.stop!r}, "
+            f"stop_inclusive={self.stop_inclusive!r}, "
+            f"is_empty={self.is_empty!r})"
+        )
+
+    def is_past(self, key: str) -> bool:
+        """
+        Return True if the ``key`` and all keys after it are out of the range.
+        """
+        if self.stop is None:
+            return False
+        if self.stop_inclusive:
+            return key > self.stop
+        else:
+            return key >= self.stop
+
+    def _set_start_after(self, start_after: str):
+        if (self.start_after is None) or (start_after > self.start_after):
+            self.start_after = start_after
+
+    def _set_stop(self, stop: str, inclusive: bool):
+        if (
+            (self.stop is None)
+            or (stop < self.stop)
+            or (stop == self.stop and inclusive is False)
+        ):
+            self.stop = stop
+            self.stop_inclusive = inclusive
+
+    def _set_prefix(self, prefix: str, delimiter: bool):
+        if prefix.startswith(self.prefix):
+            # the objects in the sub folders are not listed with delimiter
+            if delimiter and ("/" in prefix[len(self.prefix) :]):
+                self.is_empty = True
+            else:
+                self.prefix = prefix
+        elif not self.prefix.startswith(prefix):
+            self.is_empty = True
+
+
+def _is_str(value: T.Any) -> bool:
+    return isinstance(value, str)
+
+
+def plan_key_range(
+    filters: T.Iterable[T.Callable],
+    prefix: str,
+    start_after: T.Optional[str] = None,
+    delimiter: bool = False,
+) -> KeyRange:
+    """
+    Plan the key range to list from the filters. Only the top level
+    :class:`~s3pathlib.core.filterable_property.Predicate` on ``key``
+    are used, the others are ignored.
+
+    Example::
+
+        >>> plan_key_range(
+        ...     [S3Path.key >= "data/dt=2024-01-15", S3Path.key < "data/dt=2024-02"],
+        ...     prefix="data/",
+        ... )
+        KeyRange(prefix='data/', start_after='data/dt=2024-01-14\\U0010ffff', stop='data/dt=2024-02', stop_inclusive=False, is_empty=False)
+
+    :param filters: the filter functions.
+    :param prefix: the prefix of the listing.
+    :param start_after: the original ``StartAfter`` of the listing.
+    :param delimiter: whether the listing uses ``Delimiter="/"``.
+
+    .. versionadded:: 2.4.1
+    """
+    key_range = KeyRange(prefix=prefix, start_after=start_after)
+    for f in filters:
+        if not (isinstance(f, Predicate) and f.name == "key"):
+            continue
+        op, value = f.op, f.value
+        if op == "between":
+            if not (isinstance(value, tuple) and all(map(_is_str, value))):
+                continue
+            lower, upper = value
+            key_range._set_start_after(get_key_predecessor(lower))
+            key_range._set_stop(upper, inclusive=True)
+            continue
+        if not _is_str(value):
+            continue
+        if op == ">":
+            key_range._set_start_after(value)
+        elif op == ">=":
+            key_range._set_start_after(get_key_predecessor(value))
+        elif op == "<":
+            key_range._set_stop(value, inclusive=False)
+        elif op == "<=":
+            key_range._set_stop(value, inclusive=True)
+        elif op == "==":
+            key_range._set_prefix(value, delimiter=delimiter)
+            key_range._set_start_after(get_key_predecessor(value))
+            key_range._set_stop(value, inclusive=True)
+        elif op == "startswith":
+            key_range._set_prefix(value, delimiter=delimiter)
+
+    if key_range.stop is not None:
+        # the range is (start_after, stop]
+        if (key_range.start_after is not None) and (
+            key_range.start_after >= key_range.stop
+        ):
+            key_range.is_empty = True
+        if key_range.is_past(key_range.prefix):
+            key_range.is_empty = True
+    return key_range
+
+
+class PushdownListing:
+    """
+    A lazy listing, the key range is planned with the filters of the
+    :class:`~s3pathlib.core.iter_objects.S3PathIterProxy` right before
+    the iteration begins.
+
+    :param list_func: a function that takes ``prefix`` and ``start_after``
+        (None if not set) and iterates the :class:`~s3pathlib.core.s3path.S3Path`
+        in key order.
+    :param prefix: the prefix of the listing.
+    :param start_after: the original ``StartAfter`` of the listing.
+    :param delimiter: whether the listing uses ``Delimiter="/"``.
+
+    .. versionadded:: 2.4.1
+    """
+
+    def __init__(
+        self,
+        list_func: T.Callable[[str, T.Optional[str]], T.Iterable["S3Path"]],
+        prefix: str,
+        start_after: T.Optional[str] = None,
+        delimiter: bool = False,
+    ):
+        self.list_func = list_func
+        self.prefix = prefix
+        self.start_after = start_after
+        self.delimiter = delimiter
+
+    def plan(self, filters: T.Iterable[T.Callable]) -> KeyRange:
+        return plan_key_range(
+            filters,
+            prefix=self.prefix,
+            start_after=self.start_after,
+            delimiter=self.delimiter,
+        )
+
+    def iter(self, filters: T.Iterable[T.Callable]) -> T.Iterable["S3Path"]:
+        key_range = self.plan(filters)
+        if key_range.is_empty:
+            return
+        for s3path in self.list_func(key_range.prefix, key_range.start_after):
+            if key_range.is_past(s3path.key):
+                return
+            yield s3path
@@ -22,6 +22,43 @@ import functools
 FilterableType = T.TypeVar("FilterableType")
 
 
+class Predicate:
+    """
+    The filter function returned by the comparison of a
+    :class:`FilterableProperty`. It is a regular callable, and it also
+    remembers the property name, the operator and the value, so the iterator
+    can inspect it, for example, to push the filter down to the server side.
+
+    .. code-block:: python
+
+        >>> predicate = User.username == "alice"
+        >>> predicate.name, predicate.op, predicate.value
+        ('username', '==', 'alice')
+        >>> predicate(User(name="alice"))
+        True
+
+    .. versionadded:: 2.4.1
+    """
+
+    def __init__(
+        self,
+        name: str,
+        op: str,
+        value: T.Any,
+        func: T.Callable[[T.Any], bool],
+    ):
+        self.name = name
+        self.op = op
+        self.value = value
+        self._func = func
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.name} {self.op} {self.value!r})"
+
+    def __call__(self, obj) -> bool:
+        return self._func(obj)
+
+
 class FilterableProperty(T.Generic[FilterableType]):
     """
     A descriptor decorator that convert a method to a property method.
@@ -59,37 +96,37 @@ class FilterableProperty(T.Generic[FilterableType]):
         def filter_(obj):
             return self._func(obj) == other
 
-        return filter_
+        return Predicate(self.__name__, "==", other, filter_)
 
     def __ne__(self, other):
         def filter_(obj):
             return self._func(obj) != other
 
-        return filter_
+        return Predicate(self.__name__, "!=", other, filter_)
 
     def __gt__(self, other):
         def filter_(obj):
             return self._func(obj) > other
 
-        return filter_
+        return Predicate(self.__name__, ">", other, filter_)
 
     def __lt__(self, other):
         def filter_(obj):
             return self._func(obj) < other
 
-        return filter_
+        return Predicate(self.__name__, "<", other, filter_)
 
     def __ge__(self, other):
         def filter_(obj):
             return self._func(obj) >= other
 
-        return filter_
+        return Predicate(self.__name__, ">=", other, filter_)
 
     def __le__(self, other):
         def filter_(obj):
             return self._func(obj) <= other
 
-        return filter_
+        return Predicate(self.__name__, "<=", other, filter_)
 
     def equal_to(self, other):  # pragma: no cover
         """
@@ -134,7 +171,7 @@ class FilterableProperty(T.Generic[FilterableType]):
 
         .. versionadded:: 1.0.4
         """
-        return self.__eq__(other)
+        return self.__ge__(other)
 
     def less_equal(self, other):  # pragma: no cover
         """
@@ -143,7 +180,7 @@ class FilterableProperty(T.Generic[FilterableType]):
 
         .. versionadded:: 1.0.4
         """
-        return self.__eq__(other)
+        return self.__le__(other)
 
     def between(self, lower, upper):
         """
@@ -156,7 +193,7 @@ class FilterableProperty(T.Generic[FilterableType]):
         def filter_(obj):
             return lower <= self._func(obj) <= upper
 
-        return filter_
+        return Predicate(self.__name__, "between", (lower, upper), filter_)
 
     def startswith(self, other: str):
         """
@@ -170,7 +207,7 @@ class FilterableProperty(T.Generic[FilterableType]):
         def filter_(obj):
             return self._func(obj).startswith(other)
 
-        return filter_
+        return Predicate(self.__name__, "startswith", other, filter_)
 
     def endswith(self, other: str):
         """
@@ -184,7 +221,7 @@ class FilterableProperty(T.Generic[FilterableType]):
         def filter_(obj):
             return self._func(obj).endswith(other)
 
-        return filter_
+        return Predicate(self.__name__, "endswith", other, filter_)
 
     def contains(self, other):
         """
@@ -197,4 +234,4 @@ class FilterableProperty(T.Generic[FilterableType]):
         def filter_(obj):
             return other in self._func(obj)
 
-        return filter_
+        return Predicate(self.__name__, "contains", other, filter_)
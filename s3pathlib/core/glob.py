@@ -0,0 +1,257 @@
+# -*- coding: utf-8 -*-
+
+"""
+Unix shell style glob API.
+
+.. _bsm: https://github.com/aws-samples/boto-session-manager-project
+.. _ListObjectsV2: https://boto3.amazonaws.com/v1/documentation/api/latest/reference/services/s3/paginator/ListObjectsV2.html
+"""
+
+import typing as T
+import re
+import fnmatch
+
+from func_args import NOTHING
+
+from ..aws import context
+from ..better_client.list_objects import (
+    paginate_list_objects_v2,
+    is_content_an_object,
+)
+from .resolve_s3_client import resolve_s3_client
+from .iter_objects import S3PathIterProxy
+
+if T.TYPE_CHECKING:  # pragma: no cover
+    from .s3path import S3Path
+    from boto_session_manager import BotoSesManager
+    from mypy_boto3_s3 import S3Client
+
+
+_MAGIC_CHARS = "*?["
+
+
+def has_magic(segment: str) -> bool:
+    """
+    Test if a path segment has any glob wildcard character.
+    """
+    return any(char in segment for char in _MAGIC_CHARS)
+
+
+def get_literal_prefix(segment: str) -> str:
+    """
+    Get the leading part of a path segment before the first wildcard character.
+
+    Example::
+
+        >>> get_literal_prefix("host-1*.gz")
+        'host-1'
+    """
+    for i, char in enumerate(segment):
+        if char in _MAGIC_CHARS:
+            return segment[:i]
+    return segment
+
+
+def translate_segment(segment: str) -> str:
+    """
+    Translate a single path segment glob pattern to a regular expression.
+    Unlike :func:`fnmatch.translate`, the wildcard never matches ``"/"``.
+    """
+    i, n = 0, len(segment)
+    parts = list()
+    while i < n:
+        char = segment[i]
+        i += 1
+        if char == "*":
+            parts.append("[^/]*")
+        elif char == "?":
+            parts.append("[^/]")
+        elif char == "[":
+            j = i
+            if j < n and segment[j] == "!":
+                j += 1
+            if j < n and segment[j] == "]":
+                j += 1
+            while j < n and segment[j] != "]":
+                j += 1
+            if j >= n:  # no closing bracket, treat it as a literal
+                parts.append(re.escape(char))
+            else:
+                body = segment[i:j].replace("\\", "\\\\")
+                if body.startswith("!"):
+                    body = "^" + body[1:]
+                elif body.startswith("^"):
+                    body = "\\" + body
+                parts.append(f"(?!/)[{body}]")
+                i = j + 1
+        else:
+            parts.append(re.escape(char))
+    return "".join(parts)
+
+
+def translate(segments: T.List[str]) -> str:
+    """
+    Translate a list of path segment glob patterns to a regular expression
+    that matches the relative key. ``"**"`` matches zero or more directories.
+    """
+    parts = list()
+    for i, segment in enumerate(segments):
+        if segment == "**":
+            if i == len(segments) - 1:
+                parts.append(".*")
+            else:
+                parts.append("(?:[^/]+/)*")
+        else:
+            parts.append(translate_segment(segment))
+            if i != len(segments) - 1:
+                parts.append("/")
+    return "".join(parts)
+
+
+def split_pattern(pattern: str) -> T.List[str]:
+    """
+    Validate the glob pattern and split it into path segments.
+    """
+    if not pattern:
+        raise ValueError("glob pattern cannot be empty!")
+    if pattern.startswith("/"):
+        raise ValueError(f"glob pattern has to be relative, got {pattern!r}!")
+    if pattern.endswith("/"):
+        raise ValueError(
+            f"glob pattern can only match objects, "
+            f"it cannot end with '/', got {pattern!r}!"
+        )
+    return pattern.split("/")
+
+
+class GlobAPIMixin:
+    """
+    A mixin class that implements the unix shell style glob methods.
+    """
+
+    def glob(
+        self: "S3Path",
+        pattern: str,
+        batch_size: int = 1000,
+        request_payer: str = NOTHING,
+        expected_bucket_owner: str = NOTHING,
+        bsm: T.Optional[T.Union["BotoSesManager", "S3Client"]] = None,
+    ) -> S3PathIterProxy:
+        """
+        Iterate objects under this directory that match the given relative
+        unix shell style pattern, yield :class:`S3Path`. It works like
+        :meth:`pathlib.Path.glob`, but only yields objects (not folders).
+
+        Instead of listing the entire directory then filtering, it uses the
+        literal parts of the pattern as the list prefix and descends level
+        by level with ``Delimiter="/"``, only into the sub folders that can
+        match. A full recursive listing only happens below a ``"**"`` segment.
+
+        Example:
+
+            >>> s3dir = S3Path("s3://my-bucket/")
+            >>> s3dir.glob("logs/2024-*/host-1*/**/*.gz").all()
+            [
+                S3Path('s3://my-bucket/logs/2024-01-01/host-1a/app.log.gz'),
+                S3Path('s3://my-bucket/logs/2024-01-01/host-1a/2/app.log.gz'),
+                ...
+            ]
+
+        :param pattern: relative glob pattern. ``*``, ``?``, ``[seq]``
+            and ``[!seq]`` match within a single path segment, ``**`` matches
+            zero or more folders.
+        :param batch_size: Number of s3 object returned per paginator,
+            valid value is from 1 ~ 1000. large number can reduce IO.
+        :param request_payer: See ListObjectsV2_.
+        :param expected_bucket_owner: See ListObjectsV2_.
+        :param bsm: See bsm_.
+
+        .. versionadded:: 2.4.1
+        """
+        self.ensure_dir()
+        segments = split_pattern(pattern)
+        s3_client = resolve_s3_client(context, bsm)
+        bucket = self.bucket
+
+        def _paginate(prefix: str, **kwargs):
+            return paginate_list_objects_v2(
+                s3_client=s3_client,
+                bucket=bucket,
+                prefix=prefix,
+                batch_size=batch_size,
+                request_payer=request_payer,
+                expected_bucket_owner=expected_bucket_owner,
+                **kwargs,
+            )
+
+        def _glob(
+            prefix: str,
+            segments: T.List[str],
+        ) -> T.Iterable["S3Path"]:
+            segment, rest = segments[0], segments[1:]
+            # everything below is a full recursive listing
+            if segment == "**":
+                regex = re.compile(translate(segments))
+                for content in _paginate(prefix).contents():
+                    key = content["Key"]
+                    if is_content_an_object(content) and regex.fullmatch(
+                        key[len(prefix) :]
+                    ):
+                        yield self._from_content_dict(bucket, content)
+            # literal folder, no need to list
+            elif rest and (not has_magic(segment)):
+                yield from _glob(f"{prefix}{segment}/", rest)
+            else:
+                proxy = _paginate(
+                    f"{prefix}{get_literal_prefix(segment)}",
+                    delimiter="/",
+                )
+                if rest:
+                    for dct in proxy.common_prefixs():
+                        sub_prefix = dct["Prefix"]
+                        if fnmatch.fnmatchcase(sub_prefix[len(prefix) : -1], segment):
+                            yield from _glob(sub_prefix, rest)
+                else:
+                    for content in proxy.contents():
+                        key = content["Key"]
+                        if is_content_an_object(content) and fnmatch.fnmatchcase(
+                            key[len(prefix) :], segment
+                        ):
+                            yield self._from_content_dict(bucket, content)
+
+        return S3PathIterProxy(_glob(self.key, segments))
+
+    def rglob(
+        self: "S3Path",
+        pattern: str,
+        batch_size: int = 1000,
+        request_payer: str = NOTHING,
+        expected_bucket_owner: str = NOTHING,
+        bsm: T.Optional[T.Union["BotoSesManager", "S3Client"]] = None,
+    ) -> S3PathIterProxy:
+        """
+        Like :meth:`GlobAPIMixin.glob`, but ``"**/"`` is added in front of
+        the pattern, so it matches in this directory and all sub folders.
+
+        Example:
+
+            >>> s3dir = S3Path("s3://my-bucket/")
+            >>> s3dir.rglob("*.gz").all()
+
+        :param pattern: relative glob pattern, see :meth:`GlobAPIMixin.glob`.
+        :param batch_size: Number of s3 object returned per paginator,
+            valid value is from 1 ~ 1000. large number can reduce IO.
+        :param request_payer: See ListObjectsV2_.
+        :param expected_bucket_owner: See ListObjectsV2_.
+        :param bsm: See bsm_.
+
+        .. versionadded:: 2.4.1
+        """
+        split_pattern(pattern)
+        return self.glob(
+            pattern=f"**/{pattern}",
+            batch_size=batch_size,
+            request_payer=request_payer,
+            expected_bucket_owner=expected_bucket_owner,
+            bsm=bsm,
+        )
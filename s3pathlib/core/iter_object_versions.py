@@ -12,6 +12,7 @@ import typing as T
 from func_args import NOTHING
 
 from ..aws import context
+from ..utils import iter_sorted_external
 from ..better_client.list_object_versions import paginate_list_object_versions
 from .iter_objects import S3PathIterProxy
 from .resolve_s3_client import resolve_s3_client
@@ -34,25 +35,44 @@ class IterObjectVersionsAPIMixin:
         delimiter: str = NOTHING,
         encoding_type: str = NOTHING,
         expected_bucket_owner: str = NOTHING,
+        sort_by_last_modified: bool = False,
+        run_size: int = 100000,
         bsm: T.Optional[T.Union["BotoSesManager", "S3Client"]] = None,
     ) -> S3PathIterProxy:
         """
         Recursively iterate objects under this prefix, yield :class:`S3Path`.
 
+        By default, the result is streamed page by page in ListObjectVersions_
+        order: key ascending, and for each key, the versions and delete markers
+        are ordered from the newest to the oldest. Each version is yielded
+        exactly once, and only one page is held in memory.
+
         :param batch_size: Number of s3 object returned per paginator,
             valid value is from 1 ~ 1000. large number can reduce IO.
         :param limit: Total number of s3 object to return.
         :param delimiter: See ListObjectVersions_.
         :param encoding_type: See ListObjectVersions_.
         :param expected_bucket_owner: See ListObjectVersions_.
+        :param sort_by_last_modified: if True, yield all versions of all keys
+            ordered by last modified time, from the newest to the oldest.
+            The listing is sorted with an external merge sort, see
+            :func:`~s3pathlib.utils.iter_sorted_external`.
+        :param run_size: only used when ``sort_by_last_modified`` is True,
+            the number of versions held in memory, the rest are spilled to
+            temp files.
         :param bsm: See bsm_.
 
         .. versionadded:: 2.0.1
+
+        .. versionchanged:: 2.4.1
+
+            Stream the result, each version is yielded only once.
+            Add ``sort_by_last_modified`` and ``run_size`` arguments.
         """
         s3_client = resolve_s3_client(context, bsm)
         bucket = self.bucket
 
-        def _iter_s3path() -> T.Iterable["S3Path"]:
+        def _iter_page_items() -> T.Iterable[T.List[T.Tuple[bool, dict]]]:
             proxy = paginate_list_object_versions(
                 s3_client=s3_client,
                 bucket=bucket,
@@ -63,7 +83,6 @@ class IterObjectVersionsAPIMixin:
                 encoding_type=encoding_type,
                 expected_bucket_owner=expected_bucket_owner,
             )
-            s3path_list = list()
             for response in proxy:
                 (
                     versions,
@@ -72,19 +91,38 @@ class IterObjectVersionsAPIMixin:
                 ) = proxy.extract_versions_and_delete_markers_and_common_prefixes(
                     response
                 )
+                # S3 returns versions and delete markers of a key in one
+                # stream, newest first, split into two lists. Merge them back,
+                # a key spanning two pages continues with older versions.
+                items = [(False, dct) for dct in versions]
+                items.extend([(True, dct) for dct in delete_markers])
+                items.sort(key=lambda x: x[1]["LastModified"], reverse=True)
+                items.sort(key=lambda x: x[1]["Key"])
+                yield items
 
-                s3path_list.extend(
-                    [self._from_version_dict(bucket, dct=dct) for dct in versions]
-                )
-                s3path_list.extend(
-                    [
-                        self._from_delete_marker(bucket, dct=dct)
-                        for dct in delete_markers
-                    ]
-                )
-                for s3path in sorted(
-                    s3path_list, key=lambda x: x.last_modified_at, reverse=True
-                ):
-                    yield s3path
+        def _to_s3path(item: T.Tuple[bool, dict]) -> "S3Path":
+            is_delete_marker, dct = item
+            if is_delete_marker:
+                return self._from_delete_marker(bucket, dct=dct)
+            else:
+                return self._from_version_dict(bucket, dct=dct)
+
+        def _iter_s3path() -> T.Iterable["S3Path"]:
+            for items in _iter_page_items():
+                for item in items:
+                    yield _to_s3path(item)
+
+        def _iter_s3path_by_last_modified() -> T.Iterable["S3Path"]:
+            items = (item for items in _iter_page_items() for item in items)
+            for item in iter_sorted_external(
+                items,
+                key=lambda x: x[1]["LastModified"],
+                reverse=True,
+                run_size=run_size,
+            ):
+                yield _to_s3path(item)
 
-        return S3PathIterProxy(_iter_s3path())
+        if sort_by_last_modified:
+            return S3PathIterProxy(_iter_s3path_by_last_modified())
+        else:
+            return S3PathIterProxy(_iter_s3path())
@@ -8,24 +8,32 @@ List objects related API.
 """
 
 import typing as T
+import itertools
 
 from iterproxy import IterProxy
 from func_args import NOTHING
 
 from .. import utils
 from ..aws import context
+from ..constants import IS_DELETE_MARKER
+from ..better_client.head_object import head_object
 from ..better_client.list_objects import (
     paginate_list_objects_v2,
+    fan_out_list_objects_v2,
     is_content_an_object,
     calculate_total_size,
     count_objects,
 )
+from ..better_client.list_objects_columnar import ObjectColumns
+from ..better_client.disk_usage import DiskUsage, disk_usage
+from .filter_pushdown import KeyRange, PushdownListing
 from .resolve_s3_client import resolve_s3_client
 
 if T.TYPE_CHECKING:  # pragma: no cover
     from .s3path import S3Path
     from boto_session_manager import BotoSesManager
     from mypy_boto3_s3 import S3Client
+    from ..better_client.inventory import S3Inventory
 
 
 class S3PathIterProxy(IterProxy["S3Path"]):
@@ -38,9 +46,44 @@ class S3PathIterProxy(IterProxy["S3Path"]):
     It is a special variation of :class:`s3pathlib.iterproxy.IterProxy`,
     See :class:`s3pathlib.iterproxy.IterProxy` for more details.
 
+    If the proxy is created from a listing that supports filter pushdown,
+    such as :meth:`IterObjectsAPIMixin.iter_objects`, the
+    :class:`~s3pathlib.core.filterable_property.Predicate` on ``S3Path.key``
+    are pushed down to the ListObjectsV2 request when the iteration begins.
+    See :mod:`s3pathlib.core.filter_pushdown`.
+
     .. versionadded:: 1.0.3
+
+    .. versionchanged:: 2.4.1
+
+        Support filter pushdown.
     """
 
+    def _to_iterator(self):
+        if (not self._is_frozen) and isinstance(self._iterable, PushdownListing):
+            self._iterable = self._iterable.iter(tuple(self._filters))
+        super(S3PathIterProxy, self)._to_iterator()
+
+    def plan(self) -> T.Optional[KeyRange]:
+        """
+        Return the key range planned from the current filters, or None if
+        this proxy doesn't support filter pushdown. It doesn't start
+        the iteration.
+
+        Example::
+
+            >>> S3Path("bucket/data/").iter_objects().filter(
+            ...     S3Path.key.startswith("data/2024-"),
+            ...     S3Path.key < "data/2024-07",
+            ... ).plan()
+            KeyRange(prefix='data/2024-', start_after=None, stop='data/2024-07', stop_inclusive=False, is_empty=False)
+
+        .. versionadded:: 2.4.1
+        """
+        if isinstance(self._iterable, PushdownListing):
+            return self._iterable.plan(self._filters)
+        return None
+
     def __next__(self) -> "S3Path":
         return super(S3PathIterProxy, self).__next__()
 
@@ -87,6 +130,107 @@ class S3PathIterProxy(IterProxy["S3Path"]):
 
             return self.filter(f)
 
+    def hydrate(
+        self,
+        concurrency: int = 8,
+        fields: T.Optional[T.Iterable[str]] = None,
+        bsm: T.Optional[T.Union["BotoSesManager", "S3Client"]] = None,
+    ) -> "S3PathIterProxy":
+        """
+        Fill the full metadata of each ``S3Path`` with the head_object API
+        in a thread pool, so accessing ``.metadata``, ``.expire_at`` etc
+        won't trigger one serial head_object call per object.
+
+        The result is in the same order, and at most ``concurrency``
+        head_object calls are in flight, so the memory usage stays flat.
+        The metadata from the listing result is kept, and updated with
+        the head_object response.
+
+        Example::
+
+            >>> for p in S3Path("bucket/data/").iter_objects().hydrate(concurrency=16):
+            ...     print(p.metadata)
+
+        :param concurrency: number of threads to call head_object.
+        :param fields: the head_object response fields you need, such as
+            ``["Metadata", "ContentType"]``. If all of them are already
+            available, the head_object call is skipped. Default None,
+            always call head_object.
+        :param bsm: See bsm_.
+
+        :return: a new :class:`S3PathIterProxy` that yields the hydrated
+            ``S3Path``. The filters added before ``hydrate`` are applied
+            before calling head_object.
+
+        .. versionadded:: 2.4.1
+        """
+        s3_client = resolve_s3_client(context, bsm)
+        if fields is not None:
+            fields = tuple(fields)
+
+        def _hydrate(s3path: "S3Path") -> "S3Path":
+            meta = s3path._meta
+            version_id = NOTHING
+            if meta is not None:
+                if meta.get(IS_DELETE_MARKER):
+                    return s3path
+                if (fields is not None) and all(field in meta for field in fields):
+                    return s3path
+                if meta.get("VersionId", "null") != "null":
+                    version_id = meta["VersionId"]
+            response = head_object(
+                s3_client,
+                bucket=s3path.bucket,
+                key=s3path.key,
+                version_id=version_id,
+            )
+            new_meta = dict() if meta is None else dict(meta)
+            new_meta.update(response)
+            s3path._meta = new_meta
+            return s3path
+
+        return S3PathIterProxy(
+            utils.iter_map_concurrently(_hydrate, self, max_workers=concurrency)
+        )
+
+    def to_columns(self) -> ObjectColumns:
+        """
+        Consume the iterator and accumulate the objects' key, size,
+        last modified, ETag and storage class into an
+        :class:`~s3pathlib.better_client.list_objects_columnar.ObjectColumns`.
+        Each ``S3Path`` is discarded right after it is added, so the memory
+        usage is only the compact columns.
+
+        Example::
+
+            >>> columns = S3Path("bucket/data/").iter_objects().to_columns()
+            >>> columns.total_size()
+            123456789012
+
+        It only works for the ``S3Path`` with the metadata from the listing
+        result, such as the ones returned by
+        :meth:`IterObjectsAPIMixin.iter_objects`.
+
+        .. versionadded:: 2.4.1
+        """
+        columns = None
+        for p in self:
+            if columns is None:
+                columns = ObjectColumns(bucket=p.bucket)
+            meta = p._meta
+            columns.append(
+                {
+                    "Key": p.key,
+                    "Size": meta["ContentLength"],
+                    "LastModified": meta["LastModified"],
+                    "ETag": meta["ETag"],
+                    "StorageClass": meta["StorageClass"],
+                }
+            )
+        if columns is None:
+            columns = ObjectColumns(bucket=None)
+        return columns
+
 
 class IterObjectsAPIMixin:
     """
@@ -103,6 +247,10 @@ class IterObjectsAPIMixin:
         request_payer: str = NOTHING,
         expected_bucket_owner: str = NOTHING,
         recursive: bool = True,
+        concurrency: int = 1,
+        ordered: bool = True,
+        prefetch: int = 0,
+        inventory: T.Optional["S3Inventory"] = None,
         bsm: T.Optional[T.Union["BotoSesManager", "S3Client"]] = None,
     ) -> S3PathIterProxy:
         """
@@ -137,8 +285,36 @@ class IterObjectsAPIMixin:
         :param request_payer: See ListObjectsV2_.
         :param expected_bucket_owner: See ListObjectsV2_.
         :param recursive: if True, it won't include files in sub folders.
+        :param concurrency: Default 1, if greater than 1, discover the sub folders
+            first, then list them in a thread pool with this many workers.
+            Only works when ``recursive`` is True.
+            See :func:`~s3pathlib.better_client.list_objects.fan_out_list_objects_v2`.
+        :param ordered: Only used when ``concurrency`` is greater than 1.
+            If True, yield objects in lexicographic order, otherwise yield
+            objects in the order they arrive.
+        :param prefetch: Default 0, if greater than 0, fetch up to this many
+            pages ahead in a background thread while you are processing the
+            current page. See
+            :func:`~s3pathlib.better_client.list_objects.paginate_list_objects_v2`.
+        :param inventory: Default None, if given, read the objects from this
+            :class:`~s3pathlib.better_client.inventory.S3Inventory` report
+            instead of calling the ListObjectsV2_ API. Only ``limit``,
+            ``start_after`` and ``recursive`` are honored, and the objects
+            are NOT in key order.
         :param bsm: See bsm_.
 
+        The :class:`~s3pathlib.core.filterable_property.Predicate` on
+        ``S3Path.key`` added by :meth:`S3PathIterProxy.filter` are pushed down
+        to the request, unless ``limit`` is set or ``concurrency`` is greater
+        than 1 in recursive mode::
+
+            >>> s3dir = S3Path("s3://my-bucket/logs/")
+            >>> # only list the keys between the two dates, then stop
+            >>> s3dir.iter_objects().filter(
+            ...     S3Path.key >= "logs/dt=2024-01-15",
+            ...     S3Path.key < "logs/dt=2024-02-01",
+            ... ).all()
+
         .. versionadded:: 1.0.1
 
         .. versionchanged:: 2.0.1
@@ -146,34 +322,115 @@ class IterObjectsAPIMixin:
             Remove ``include_folder`` argument. Support all list_objects_v2
             arguments.
 
-        TODO: add unix glob liked syntax for pattern matching
+        .. versionchanged:: 2.4.1
+
+            Add ``concurrency``, ``ordered``, ``prefetch`` and ``inventory`` arguments.
+            Support filter pushdown.
+
+        .. seealso::
+
+            :meth:`~s3pathlib.core.glob.GlobAPIMixin.glob` for unix glob liked
+            syntax for pattern matching.
         """
         s3_client = resolve_s3_client(context, bsm)
         bucket = self.bucket
 
-        def _iter_s3path() -> T.Iterable["S3Path"]:
+        if inventory is not None:
+            return S3PathIterProxy(
+                self._iter_inventory_s3path(
+                    inventory=inventory,
+                    s3_client=s3_client,
+                    limit=limit,
+                    start_after=start_after,
+                    recursive=recursive,
+                )
+            )
+
+        def _iter_s3path(
+            prefix: str,
+            start_after: T.Optional[str],
+        ) -> T.Iterable["S3Path"]:
             kwargs = dict(
                 s3_client=s3_client,
                 bucket=bucket,
-                prefix=self.key,
+                prefix=prefix,
                 batch_size=batch_size,
                 limit=limit,
                 encoding_type=encoding_type,
                 fetch_owner=fetch_owner,
-                start_after=start_after,
+                start_after=NOTHING if start_after is None else start_after,
                 request_payer=request_payer,
                 expected_bucket_owner=expected_bucket_owner,
+                prefetch=prefetch,
             )
             if recursive is False:
                 kwargs["delimiter"] = "/"
-            for content in (
-                paginate_list_objects_v2(**kwargs)
-                .contents()
-                .filter(is_content_an_object)
-            ):
+                contents = paginate_list_objects_v2(**kwargs).contents()
+            elif concurrency > 1:
+                contents = fan_out_list_objects_v2(
+                    concurrency=concurrency,
+                    ordered=ordered,
+                    **kwargs,
+                )
+            else:
+                contents = paginate_list_objects_v2(**kwargs).contents()
+            for content in contents.filter(is_content_an_object):
                 yield self._from_content_dict(bucket, dct=content)
 
-        return S3PathIterProxy(_iter_s3path())
+        _start_after = None if start_after is NOTHING else start_after
+        # the filter pushdown only works when the objects are listed in
+        # key order, and the limit is not set
+        if (limit is NOTHING) and ((recursive is False) or (concurrency <= 1)):
+            return S3PathIterProxy(
+                PushdownListing(
+                    _iter_s3path,
+                    prefix=self.key,
+                    start_after=_start_after,
+                    delimiter=recursive is False,
+                )
+            )
+        else:
+            return S3PathIterProxy(_iter_s3path(self.key, _start_after))
+
+    def _ensure_inventory_bucket(
+        self: "S3Path",
+        inventory: "S3Inventory",
+        s3_client: "S3Client",
+    ):
+        source_bucket = inventory.get_source_bucket(s3_client)
+        if source_bucket != self.bucket:
+            raise ValueError(
+                f"the inventory is for bucket {source_bucket!r}, not {self.bucket!r}!"
+            )
+
+    def _iter_inventory_s3path(
+        self: "S3Path",
+        inventory: "S3Inventory",
+        s3_client: "S3Client",
+        limit: int = NOTHING,
+        start_after: str = NOTHING,
+        recursive: bool = True,
+    ) -> T.Iterable["S3Path"]:
+        """
+        Iterate objects under this prefix from the inventory report.
+        """
+        bucket = self.bucket
+        self._ensure_inventory_bucket(inventory, s3_client)
+        prefix = self.key
+        n = len(prefix)
+        contents = inventory.iter_contents(
+            s3_client,
+            prefix=prefix,
+            include_folder=False,
+        )
+        if recursive is False:
+            contents = (dct for dct in contents if "/" not in dct["Key"][n:])
+        if start_after is not NOTHING:
+            contents = (dct for dct in contents if dct["Key"] > start_after)
+        if limit is not NOTHING:
+            contents = itertools.islice(contents, limit)
+        for content in contents:
+            yield self._from_content_dict(bucket, dct=content)
 
     def iterdir(
         self: "S3Path",
@@ -246,7 +503,7 @@ class IterObjectsAPIMixin:
             )
             for res in proxy:
                 for dct in res.get("CommonPrefixes", list()):
-                    yield root.joinpath(dct["Prefix"])
+                    yield self._from_trusted_key(bucket, dct["Prefix"])
 
                 for dct in res.get("Contents", list()):
                     yield self._from_content_dict(self.bucket, dct)
@@ -257,6 +514,8 @@ class IterObjectsAPIMixin:
         self: "S3Path",
         for_human: bool = False,
         include_folder: bool = False,
+        prefetch: int = 0,
+        inventory: T.Optional["S3Inventory"] = None,
         bsm: T.Optional[T.Union["BotoSesManager", "S3Client"]] = None,
     ) -> T.Tuple[int, T.Union[int, str]]:
         """
@@ -284,21 +543,39 @@ class IterObjectsAPIMixin:
         :param for_human: Default False. If true, returns human readable string for "size".
         :param include_folder: Default False, whether counting the hard folder
         (an empty "/" object).
+        :param prefetch: Default 0, if greater than 0, fetch up to this many
+            pages ahead in a background thread.
+        :param inventory: Default None, if given, read the objects from this
+            :class:`~s3pathlib.better_client.inventory.S3Inventory` report
+            instead of calling the ListObjectsV2_ API.
         :param bsm: See bsm_.
 
         :return: a tuple, first value is number of objects,
             second value is total size in bytes
 
         .. versionadded:: 1.0.1
+
+        .. versionchanged:: 2.4.1
+
+            Add ``prefetch`` and ``inventory`` arguments.
         """
         self.ensure_dir()
         s3_client = resolve_s3_client(context, bsm)
-        count, size = calculate_total_size(
-            s3_client=s3_client,
-            bucket=self.bucket,
-            prefix=self.key,
-            include_folder=include_folder,
-        )
+        if inventory is None:
+            count, size = calculate_total_size(
+                s3_client=s3_client,
+                bucket=self.bucket,
+                prefix=self.key,
+                include_folder=include_folder,
+                prefetch=prefetch,
+            )
+        else:
+            self._ensure_inventory_bucket(inventory, s3_client)
+            count, size = inventory.calculate_total_size(
+                s3_client,
+                prefix=self.key,
+                include_folder=include_folder,
+            )
         if for_human:
             size = utils.repr_data_size(size)
         return count, size
@@ -306,6 +583,8 @@ class IterObjectsAPIMixin:
     def count_objects(
         self: "S3Path",
         include_folder: bool = False,
+        prefetch: int = 0,
+        inventory: T.Optional["S3Inventory"] = None,
         bsm: T.Optional[T.Union["BotoSesManager", "S3Client"]] = None,
     ) -> int:
         """
@@ -330,17 +609,87 @@ class IterObjectsAPIMixin:
 
         :param include_folder: Default False, whether counting the hard folder
         (an empty "/" object).
+        :param prefetch: Default 0, if greater than 0, fetch up to this many
+            pages ahead in a background thread.
+        :param inventory: Default None, if given, read the objects from this
+            :class:`~s3pathlib.better_client.inventory.S3Inventory` report
+            instead of calling the ListObjectsV2_ API.
         :param bsm: See bsm_.
 
         :return: an integer represents the number of objects
 
         .. versionadded:: 1.0.1
+
+        .. versionchanged:: 2.4.1
+
+            Add ``prefetch`` and ``inventory`` arguments.
+        """
+        self.ensure_dir()
+        s3_client = resolve_s3_client(context, bsm)
+        if inventory is None:
+            return count_objects(
+                s3_client=s3_client,
+                bucket=self.bucket,
+                prefix=self.key,
+                include_folder=include_folder,
+                prefetch=prefetch,
+            )
+        else:
+            self._ensure_inventory_bucket(inventory, s3_client)
+            return inventory.count_objects(
+                s3_client,
+                prefix=self.key,
+                include_folder=include_folder,
+            )
+
+    def disk_usage(
+        self: "S3Path",
+        depth: int = 1,
+        concurrency: int = 8,
+        include_folder: bool = False,
+        prefetch: int = 0,
+        bsm: T.Optional[T.Union["BotoSesManager", "S3Client"]] = None,
+    ) -> DiskUsage:
+        """
+        Calculate the count, total size and size by storage class of this
+        s3 directory, and the breakdown for each sub folder, in one
+        concurrent listing pass.
+
+        Example:
+
+            >>> s3dir = S3Path("s3://my-bucket/data/")
+            >>> du = s3dir.disk_usage(depth=1)
+            >>> print(du.render())
+            data/  3 objects  15.00 KB
+                data/hard-folder/  1 objects  5.00 KB
+                data/soft-folder/  1 objects  5.00 KB
+            >>> du.children["hard-folder"].count
+            1
+            >>> du.to_dict()
+            {'prefix': 'data/', 'count': 3, 'size': 15360, ...}
+
+        :param depth: number of sub folder levels in the breakdown tree,
+            0 means no breakdown.
+        :param concurrency: number of thread to list the sub folders.
+        :param include_folder: Default False, whether counting the hard folder
+            (an empty "/" object).
+        :param prefetch: Default 0, if greater than 0, fetch up to this many
+            pages ahead in a background thread.
+        :param bsm: See bsm_.
+
+        :return: the root :class:`~s3pathlib.better_client.disk_usage.DiskUsage`
+            node of the breakdown tree.
+
+        .. versionadded:: 2.4.1
         """
         self.ensure_dir()
         s3_client = resolve_s3_client(context, bsm)
-        return count_objects(
+        return disk_usage(
             s3_client=s3_client,
             bucket=self.bucket,
             prefix=self.key,
+            depth=depth,
+            concurrency=concurrency,
             include_folder=include_folder,
+            prefetch=prefetch,
         )
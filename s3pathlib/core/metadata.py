@@ -220,8 +220,12 @@ class MetadataAPIMixin:
         - https://boto3.amazonaws.com/v1/documentation/api/latest/reference/services/s3.html#S3.Client.list_objects_v2
 
         :return: a new S3Path object.
+
+        .. versionchanged:: 2.4.1
+
+            Use the trusted key constructor, skip the validation.
         """
-        p = cls(bucket, dct["Key"])
+        p = cls._from_trusted_key(bucket, dct["Key"])
         p._meta = {
             "Key": dct["Key"],
             "LastModified": dct["LastModified"],
@@ -235,7 +239,7 @@ class MetadataAPIMixin:
 
     @classmethod
     def _from_version_dict(cls: T.Type["S3Path"], bucket: str, dct: dict) -> "S3Path":
-        p = cls(bucket, dct["Key"])
+        p = cls._from_trusted_key(bucket, dct["Key"])
         p._meta = {
             "Key": dct["Key"],
             "VersionId": dct["VersionId"],
@@ -251,7 +255,7 @@ class MetadataAPIMixin:
 
     @classmethod
     def _from_delete_marker(cls: T.Type["S3Path"], bucket: str, dct: dict) -> "S3Path":
-        p = cls(bucket, dct["Key"])
+        p = cls._from_trusted_key(bucket, dct["Key"])
         p._meta = {
             "Key": dct["Key"],
             "VersionId": dct["VersionId"],
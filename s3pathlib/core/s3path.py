@@ -18,6 +18,8 @@ from .metadata import MetadataAPIMixin
 from .bucket import BucketAPIMixin
 from .tagging import TaggingAPIMixin
 from .iter_objects import IterObjectsAPIMixin
+from .glob import GlobAPIMixin
+from .walk import WalkAPIMixin
 from .iter_object_versions import IterObjectVersionsAPIMixin
 from .exists import ExistsAPIMixin
 from .rw import ReadAndWriteAPIMixin
@@ -42,6 +44,8 @@ class S3Path(
     BucketAPIMixin,
     TaggingAPIMixin,
     IterObjectsAPIMixin,
+    GlobAPIMixin,
+    WalkAPIMixin,
     IterObjectVersionsAPIMixin,
     ExistsAPIMixin,
     ReadAndWriteAPIMixin,
@@ -2,19 +2,30 @@
 
 """
 Sync file, folder between s3-to-s3, s3-to-local, local-to-s3.
+
+.. _bsm: https://github.com/aws-samples/boto-session-manager-project
 """
 
 import typing as T
-
+import os
 import subprocess
 
 from boto_session_manager import BotoSesManager
 
 from ..aws import context
 from ..type import PathType
+from ..better_client.sync import (
+    CompareEnum,
+    SyncReport,
+    sync_local_to_s3,
+    sync_s3_to_local,
+    sync_s3_to_s3,
+)
+from .resolve_s3_client import resolve_s3_client
 
 if T.TYPE_CHECKING:  # pragma: no cover
     from .s3path import S3Path
+    from mypy_boto3_s3 import S3Client
 
 
 def _preprocess(path: T.Union["S3Path", PathType]) -> T.Union["S3Path", str]:
@@ -24,6 +35,22 @@ def _preprocess(path: T.Union["S3Path", PathType]) -> T.Union["S3Path", str]:
         return str(path)
 
 
+def _to_s3path_or_str(
+    cls: T.Type["S3Path"],
+    path: T.Union["S3Path", PathType],
+) -> T.Union["S3Path", str]:
+    """
+    Convert the ``s3://`` uri string to :class:`S3Path`, and the local path
+    to absolute path string.
+    """
+    path = _preprocess(path)
+    if isinstance(path, str):
+        if path.startswith("s3://"):
+            return cls.from_s3_uri(path)
+        return os.path.abspath(path)
+    return path
+
+
 class SyncAPIMixin:
     """
     A mixin class that implements aws s3 sync feature.
@@ -34,7 +61,7 @@ class SyncAPIMixin:
         cls: T.Type["S3Path"],
         src: T.Union["S3Path", PathType],
         dst: T.Union["S3Path", PathType],
-        bsm: T.Optional["BotoSesManager"] = None,
+        bsm: T.Optional[T.Union["BotoSesManager", "S3Client"]] = None,
         quite: bool = True,
         include: T.Optional[str] = None,
         exclude: T.Optional[str] = None,
@@ -44,27 +71,153 @@ class SyncAPIMixin:
         page_size: T.Optional[str] = None,
         delete: bool = False,
         verbose: bool = True,
-    ):
+        concurrency: int = 8,
+        compare: str = CompareEnum.size_and_mtime,
+        dryrun: bool = False,
+        use_cli: bool = False,
+        raise_on_error: bool = True,
+    ) -> T.Optional[SyncReport]:
         """
         Implement the `aws s3 sync <https://docs.aws.amazon.com/cli/latest/reference/s3/sync.html>`_
-        CLI behavior.
-
-        :param src:
-        :param dst:
-        :param bsm:
-        :param quite:
-        :param include:
-        :param exclude:
-        :param acl:
-        :param only_show_errors:
-        :param no_progress:
-        :param page_size:
-        :param delete:
-        :param verbose:
+        CLI behavior, local to s3, s3 to local and s3 to s3, with the native
+        sync engine in :mod:`s3pathlib.better_client.sync`. It doesn't need
+        the ``aws`` CLI.
+
+        Example::
+
+            >>> report = S3Path.sync("/tmp/site", S3Path("s3://my-bucket/site/"), delete=True)
+            >>> len(report.transferred), len(report.deleted), report.n_skipped
+
+        :param src: the source, a local directory path or a :class:`S3Path`
+            or a ``s3://`` uri string.
+        :param dst: the target, a local directory path or a :class:`S3Path`
+            or a ``s3://`` uri string.
+        :param bsm: See bsm_. It has to be a ``BotoSesManager`` when
+            ``use_cli`` is True.
+        :param quite: if False, print one line for each action.
+        :param include: the ``--include`` pattern (or list of patterns).
+        :param exclude: the ``--exclude`` pattern (or list of patterns).
+        :param acl: the canned ACL for the uploaded / copied objects.
+        :param only_show_errors: only print the failed actions.
+        :param no_progress: not used by the native sync engine.
+        :param page_size: number of keys per ListObjectsV2 page.
+        :param delete: delete the target files that don't exist in the source.
+        :param verbose: print the summary of the sync.
+        :param concurrency: number of threads to run the actions.
+        :param compare: See :class:`~s3pathlib.better_client.sync.CompareEnum`.
+        :param dryrun: only plan the actions, don't execute them.
+        :param use_cli: use the ``aws s3 sync`` CLI subprocess instead of the
+            native sync engine, the CLI has to be installed, and it returns None.
+        :param raise_on_error: Default True, raise the error of the first failed
+            action after all actions are done, like the failed ``aws s3 sync``
+            command. If False, the errors are only recorded in the
+            :attr:`~s3pathlib.better_client.sync.SyncReport.actions`.
+
+        :return: a :class:`~s3pathlib.better_client.sync.SyncReport`.
 
         .. versionadded:: 1.2.1
 
-        TODO: add support for all aws s3 sync supported arguments
+        .. versionchanged:: 2.4.1
+
+            Use the native sync engine, return a
+            :class:`~s3pathlib.better_client.sync.SyncReport`. Add
+            ``concurrency``, ``compare``, ``dryrun``, ``use_cli`` and
+            ``raise_on_error`` arguments.
+        """
+        if use_cli and (bsm is not None) and (isinstance(bsm, BotoSesManager) is False):
+            raise TypeError(
+                "``use_cli=True`` needs a BotoSesManager as ``bsm`` to set up "
+                "the credential of the 'aws' CLI, an S3Client is not supported!"
+            )
+        if use_cli:  # pragma: no cover
+            return cls._sync_with_cli(
+                src=src,
+                dst=dst,
+                bsm=bsm,
+                quite=quite,
+                include=include,
+                exclude=exclude,
+                acl=acl,
+                only_show_errors=only_show_errors,
+                no_progress=no_progress,
+                page_size=page_size,
+                delete=delete,
+                verbose=verbose,
+            )
+
+        src = _to_s3path_or_str(cls, src)
+        dst = _to_s3path_or_str(cls, dst)
+        src_is_s3 = not isinstance(src, str)
+        dst_is_s3 = not isinstance(dst, str)
+        if src_is_s3 is False and dst_is_s3 is False:
+            raise ValueError("at least one of the src and dst has to be S3!")
+
+        s3_client = resolve_s3_client(context, bsm)
+        kwargs = dict(
+            s3_client=s3_client,
+            include=include,
+            exclude=exclude,
+            delete=delete,
+            compare=compare,
+            concurrency=concurrency,
+            batch_size=int(page_size) if page_size else 1000,
+            dryrun=dryrun,
+        )
+        if src_is_s3 and dst_is_s3:
+            report = sync_s3_to_s3(
+                src_bucket=src.bucket,
+                src_prefix=src.key,
+                dst_bucket=dst.bucket,
+                dst_prefix=dst.key,
+                extra_args={"ACL": acl} if acl else None,
+                **kwargs,
+            )
+        elif src_is_s3:
+            report = sync_s3_to_local(
+                bucket=src.bucket,
+                prefix=src.key,
+                local_dir=dst,
+                **kwargs,
+            )
+        else:
+            report = sync_local_to_s3(
+                local_dir=src,
+                bucket=dst.bucket,
+                prefix=dst.key,
+                extra_args={"ACL": acl} if acl else None,
+                **kwargs,
+            )
+
+        for action in report.actions:
+            if action.error is not None:
+                if (quite is False) or only_show_errors:  # pragma: no cover
+                    print(f"{action.action} failed: {action.key}, {action.error!r}")
+            elif (quite is False) and (only_show_errors is False):  # pragma: no cover
+                print(f"{action.action}: {action.key}")
+        if verbose:  # pragma: no cover
+            print(report)
+        if raise_on_error:
+            report.raise_for_error()
+        return report
+
+    @classmethod
+    def _sync_with_cli(
+        cls: T.Type["S3Path"],
+        src: T.Union["S3Path", PathType],
+        dst: T.Union["S3Path", PathType],
+        bsm: T.Optional["BotoSesManager"] = None,
+        quite: bool = True,
+        include: T.Optional[str] = None,
+        exclude: T.Optional[str] = None,
+        acl: T.Optional[str] = None,
+        only_show_errors: bool = False,
+        no_progress: bool = False,
+        page_size: T.Optional[str] = None,
+        delete: bool = False,
+        verbose: bool = True,
+    ):  # pragma: no cover
+        """
+        Run the ``aws s3 sync`` CLI in a subprocess.
         """
         args = [
             "aws",
@@ -133,7 +286,7 @@ class SyncAPIMixin:
     def sync_from(
         self: "S3Path",
         src: T.Union["S3Path", PathType],
-        bsm: T.Optional["BotoSesManager"] = None,
+        bsm: T.Optional[T.Union["BotoSesManager", "S3Client"]] = None,
         quite: bool = True,
         include: T.Optional[str] = None,
         exclude: T.Optional[str] = None,
@@ -143,7 +296,12 @@ class SyncAPIMixin:
         page_size: T.Optional[str] = None,
         delete: bool = False,
         verbose: bool = True,
-    ):
+        concurrency: int = 8,
+        compare: str = CompareEnum.size_and_mtime,
+        dryrun: bool = False,
+        use_cli: bool = False,
+        raise_on_error: bool = True,
+    ) -> T.Optional[SyncReport]:
         """
         Sync data from external place to this S3 location.
         """
@@ -160,12 +318,17 @@ class SyncAPIMixin:
             page_size=page_size,
             delete=delete,
             verbose=verbose,
+            concurrency=concurrency,
+            compare=compare,
+            dryrun=dryrun,
+            use_cli=use_cli,
+            raise_on_error=raise_on_error,
         )
 
     def sync_to(
         self: "S3Path",
         dst: T.Union["S3Path", PathType],
-        bsm: T.Optional["BotoSesManager"] = None,
+        bsm: T.Optional[T.Union["BotoSesManager", "S3Client"]] = None,
         quite: bool = True,
         include: T.Optional[str] = None,
         exclude: T.Optional[str] = None,
@@ -175,7 +338,12 @@ class SyncAPIMixin:
         page_size: T.Optional[str] = None,
         delete: bool = False,
         verbose: bool = True,
-    ):
+        concurrency: int = 8,
+        compare: str = CompareEnum.size_and_mtime,
+        dryrun: bool = False,
+        use_cli: bool = False,
+        raise_on_error: bool = True,
+    ) -> T.Optional[SyncReport]:
         """
         Sync the data at this S3 location to external place.
         """
@@ -192,4 +360,9 @@ class SyncAPIMixin:
             page_size=page_size,
             delete=delete,
             verbose=verbose,
+            concurrency=concurrency,
+            compare=compare,
+            dryrun=dryrun,
+            use_cli=use_cli,
+            raise_on_error=raise_on_error,
         )
@@ -72,6 +72,8 @@ class UploadAPIMixin:
         local_dir: PathType,
         pattern: str = "**/*",
         overwrite: bool = False,
+        concurrency: int = 8,
+        config: T.Optional["TransferConfig"] = None,
         bsm: T.Optional[T.Union["BotoSesManager", "S3Client"]] = None,
     ) -> int:
         """
@@ -91,10 +93,19 @@ class UploadAPIMixin:
             for more details
         :param overwrite: if False, non of the file will be upload / overwritten
             if any of target s3 location already taken.
+        :param concurrency: number of threads to check the target s3 locations
+            when ``overwrite`` is False, and to upload the files.
+        :param config: the ``boto3.s3.transfer.TransferConfig`` for the large
+            files, see :func:`~s3pathlib.better_client.upload.upload_files`.
 
         :return: number of files uploaded
 
         .. versionadded:: 1.0.1
+
+        .. versionchanged:: 2.4.1
+
+            Add ``concurrency`` and ``config`` arguments. Upload the files
+            concurrently.
         """
         self.ensure_dir()
         s3_client = resolve_s3_client(context, bsm)
@@ -105,4 +116,6 @@ class UploadAPIMixin:
             local_dir=local_dir,
             pattern=pattern,
             overwrite=overwrite,
+            concurrency=concurrency,
+            config=config,
         )
@@ -61,6 +61,8 @@ class UriAPIMixin:
 
         .. versionadded:: 1.0.1
         """
+        if self._raw_key is not None:
+            return self._raw_key
         if len(self._parts):
             return "{}{}".format("/".join(self._parts), "/" if self._is_dir else "")
         else:
@@ -101,6 +103,8 @@ class UriAPIMixin:
         """
         if self._bucket is None:
             return None
+        if self._raw_key is not None:
+            return "s3://{}/{}".format(self._bucket, self._raw_key)
         if len(self._parts):
             return "s3://{}/{}".format(
                 self.bucket,
@@ -0,0 +1,303 @@
+# -*- coding: utf-8 -*-
+
+"""
+os.walk style directory tree walk API.
+
+.. _bsm: https://github.com/aws-samples/boto-session-manager-project
+.. _ListObjectsV2: https://boto3.amazonaws.com/v1/documentation/api/latest/reference/services/s3/paginator/ListObjectsV2.html
+"""
+
+import typing as T
+import heapq
+import threading
+from concurrent.futures import ThreadPoolExecutor, Future
+
+from func_args import NOTHING
+
+from ..aws import context
+from ..better_client.list_objects import paginate_list_objects_v2
+from .resolve_s3_client import resolve_s3_client
+
+if T.TYPE_CHECKING:  # pragma: no cover
+    from .s3path import S3Path
+    from boto_session_manager import BotoSesManager
+    from mypy_boto3_s3 import S3Client
+
+
+WalkResult = T.Tuple["S3Path", T.List["S3Path"], T.List["S3Path"]]
+ListDirResult = T.Tuple[T.List["S3Path"], T.List["S3Path"]]
+
+
+class _WalkScheduler:
+    """
+    The shared work queue of the directory listings of :meth:`WalkAPIMixin.walk`.
+
+    The sub directories are pushed into the queue as soon as their parent
+    is listed, so up to ``concurrency`` listings are in flight no matter how
+    deep or narrow the tree is. The queue is ordered by key, which is the
+    depth-first order of the walk, so the directory the walk needs next is
+    listed first.
+
+    At most ``buffer_size`` listings are in flight or waiting for the walk.
+    The directory the walk needs is always submitted, even if the buffer
+    is full, so the walk never blocks.
+
+    :param list_dir: the function to list one directory.
+    :param can_descend: the function to tell if the sub directories of
+        a directory at the given depth should be listed.
+    :param root_key: the key of the directory the walk starts from.
+    """
+
+    def __init__(
+        self,
+        list_dir: T.Callable[["S3Path"], ListDirResult],
+        can_descend: T.Callable[[int], bool],
+        root_key: str,
+        concurrency: int,
+        buffer_size: int,
+    ):
+        self._list_dir = list_dir
+        self._can_descend = can_descend
+        self._root_key = root_key
+        self._concurrency = concurrency
+        self._buffer_size = buffer_size
+        self._executor = ThreadPoolExecutor(max_workers=concurrency)
+        # the done callback may run in the thread that submits the listing
+        self._lock = threading.RLock()
+        # the discovered directories not yet submitted, (key, depth, s3dir)
+        self._heap: T.List[T.Tuple[str, int, "S3Path"]] = list()
+        self._submitted: T.Set[str] = set()
+        # the listings in flight or waiting for the walk
+        self._futures: T.Dict[str, Future] = dict()
+        self._n_in_flight = 0
+        # the listings done but not yet taken by the walk
+        self._buffered: T.Set[str] = set()
+        # the listings taken by the walk before they are done
+        self._claimed: T.Set[str] = set()
+        # the sub directories removed from ``subdirs`` by the caller
+        self._dropped: T.Set[str] = set()
+        self._closed = False
+
+    def _is_dropped(self, key: str) -> bool:
+        """
+        Return True if the directory or any of its parent is dropped.
+        """
+        if not self._dropped:
+            return False
+        i = len(self._root_key)
+        while True:
+            j = key.find("/", i)
+            if j == -1:
+                return False
+            if key[: j + 1] in self._dropped:
+                return True
+            i = j + 1
+
+    def _submit(self, s3dir: "S3Path", depth: int):
+        key = s3dir.key
+        self._submitted.add(key)
+        self._n_in_flight += 1
+        future = self._executor.submit(self._list_dir, s3dir)
+        self._futures[key] = future
+        future.add_done_callback(lambda f: self._on_done(key, depth, f))
+
+    def _fill(self):
+        while (
+            self._heap
+            and (self._closed is False)
+            and (self._n_in_flight < self._concurrency)
+            and (self._n_in_flight + len(self._buffered) < self._buffer_size)
+        ):
+            key, depth, s3dir = heapq.heappop(self._heap)
+            if (key in self._submitted) or self._is_dropped(key):
+                continue
+            self._submit(s3dir, depth)
+
+    def _on_done(self, key: str, depth: int, future: Future):
+        with self._lock:
+            self._n_in_flight -= 1
+            if self._closed:
+                return
+            if self._is_dropped(key):
+                self._futures.pop(key, None)
+            else:
+                if key in self._claimed:
+                    self._claimed.discard(key)
+                else:
+                    self._buffered.add(key)
+                if (future.exception() is None) and self._can_descend(depth):
+                    subdirs, _ = future.result()
+                    for subdir in subdirs:
+                        heapq.heappush(self._heap, (subdir.key, depth + 1, subdir))
+            self._fill()
+
+    def get(self, s3dir: "S3Path", depth: int) -> ListDirResult:
+        """
+        Get the listing result of a directory, wait if it is not done yet.
+        """
+        key = s3dir.key
+        with self._lock:
+            if key not in self._submitted:
+                self._submit(s3dir, depth)
+            future = self._futures.pop(key)
+            # the future may be done before its done callback runs
+            if key in self._buffered:
+                self._buffered.discard(key)
+            else:
+                self._claimed.add(key)
+            self._fill()
+        return future.result()
+
+    def drop(self, s3dir: "S3Path"):
+        """
+        Drop the directory and its sub directories, their listing results
+        are discarded, and the queued ones are never listed.
+        """
+        with self._lock:
+            self._dropped.add(s3dir.key)
+            for key in list(self._buffered):
+                if self._is_dropped(key):
+                    self._buffered.discard(key)
+                    self._futures.pop(key, None)
+            self._fill()
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+
+class WalkAPIMixin:
+    """
+    A mixin class that implements the os.walk style tree walk method.
+    """
+
+    def walk(
+        self: "S3Path",
+        top_down: bool = True,
+        concurrency: int = 8,
+        max_depth: T.Optional[int] = None,
+        prune: T.Optional[T.Callable[["S3Path"], bool]] = None,
+        batch_size: int = 1000,
+        request_payer: str = NOTHING,
+        expected_bucket_owner: str = NOTHING,
+        bsm: T.Optional[T.Union["BotoSesManager", "S3Client"]] = None,
+    ) -> T.Iterable[WalkResult]:
+        """
+        Walk the directory tree, like :func:`os.walk`. For each directory
+        in the tree rooted at this directory (including this directory itself),
+        it yields a 3-tuple ``(dir, subdirs, files)``, all of them are
+        :class:`S3Path`.
+
+        Each directory is listed with a ``Delimiter="/"`` ListObjectsV2_ call
+        in a thread pool. The sub directories are queued as soon as their
+        parent is listed, so ``concurrency`` listings stay in flight even for
+        a deep and narrow tree, and the directories the walk needs next are
+        listed first. Directories are yielded in depth-first order.
+
+        Example:
+
+            >>> s3dir = S3Path("s3://my-bucket/data/")
+            >>> for s3dir, subdirs, files in s3dir.walk():
+            ...     # don't visit the "tmp" folders
+            ...     subdirs[:] = [p for p in subdirs if p.basename != "tmp"]
+            ...     print(s3dir.uri, len(files))
+
+        :param top_down: if True, the parent directory is yielded before its
+            sub directories, and you can modify the ``subdirs`` list in place
+            to prune the walk. The sub directories may be listed ahead of
+            the walk, the listing results of the removed sub directories are
+            discarded. If False, the parent directory is yielded after all
+            its sub directories.
+        :param concurrency: number of threads to list the directories, up to
+            ``concurrency * 4`` listing results are buffered ahead of the walk.
+        :param max_depth: Default None, no limit. The depth of this directory
+            is 0, the directories deeper than ``max_depth`` are not listed,
+            but they still show up in the ``subdirs`` of their parent.
+        :param prune: a callable that takes the sub directory :class:`S3Path`
+            and returns True if the sub directory should be cut off. The pruned
+            sub directories are removed from ``subdirs`` and never listed.
+        :param batch_size: Number of s3 object returned per paginator,
+            valid value is from 1 ~ 1000. large number can reduce IO.
+        :param request_payer: See ListObjectsV2_.
+        :param expected_bucket_owner: See ListObjectsV2_.
+        :param bsm: See bsm_.
+
+        .. versionadded:: 2.4.1
+        """
+        self.ensure_dir()
+        if concurrency < 1:
+            raise ValueError("``concurrency`` has to be greater than 0.")
+        s3_client = resolve_s3_client(context, bsm)
+        bucket = self.bucket
+
+        def _list_dir(s3dir: "S3Path") -> ListDirResult:
+            subdirs = list()
+            files = list()
+            prefix = s3dir.key
+            for response in paginate_list_objects_v2(
+                s3_client=s3_client,
+                bucket=bucket,
+                prefix=prefix,
+                batch_size=batch_size,
+                delimiter="/",
+                request_payer=request_payer,
+                expected_bucket_owner=expected_bucket_owner,
+            ):
+                for dct in response.get("CommonPrefixes", []):
+                    subdir = self._from_trusted_key(bucket, dct["Prefix"])
+                    if (prune is None) or (prune(subdir) is False):
+                        subdirs.append(subdir)
+                for dct in response.get("Contents", []):
+                    # the hard folder itself
+                    if dct["Key"] != prefix:
+                        files.append(self._from_content_dict(bucket, dct))
+            return subdirs, files
+
+        def _can_descend(depth: int) -> bool:
+            return (max_depth is None) or (depth < max_depth)
+
+        def _walk_top_down(scheduler: _WalkScheduler) -> T.Iterable[WalkResult]:
+            stack = [(self, 0)]
+            while stack:
+                s3dir, depth = stack.pop()
+                subdirs, files = scheduler.get(s3dir, depth)
+                listed = list(subdirs)
+                yield s3dir, subdirs, files
+                if _can_descend(depth):
+                    # subdirs may be modified in place by the caller
+                    keys = {subdir.key for subdir in subdirs}
+                    for subdir in listed:
+                        if subdir.key not in keys:
+                            scheduler.drop(subdir)
+                    for subdir in reversed(subdirs):
+                        stack.append((subdir, depth + 1))
+
+        def _walk_bottom_up(
+            scheduler: _WalkScheduler,
+            s3dir: "S3Path",
+            depth: int,
+        ) -> T.Iterable[WalkResult]:
+            subdirs, files = scheduler.get(s3dir, depth)
+            if _can_descend(depth):
+                for subdir in subdirs:
+                    yield from _walk_bottom_up(scheduler, subdir, depth + 1)
+            yield s3dir, subdirs, files
+
+        def _walk() -> T.Iterable[WalkResult]:
+            scheduler = _WalkScheduler(
+                list_dir=_list_dir,
+                can_descend=_can_descend,
+                root_key=self.key,
+                concurrency=concurrency,
+                buffer_size=concurrency * 4,
+            )
+            try:
+                if top_down:
+                    yield from _walk_top_down(scheduler)
+                else:
+                    yield from _walk_bottom_up(scheduler, self, 0)
+            finally:
+                scheduler.close()
+
+        return _walk()
@@ -0,0 +1,350 @@
+# -*- coding: utf-8 -*-
+
+"""
+Calculate the S3 ETag of a local file, including the ``md5-of-md5s-N``
+ETag of the object uploaded with multipart upload.
+
+For a single part upload, the ETag is the md5 of the content. For a
+multipart upload, the ETag is the md5 of the concatenated binary md5 digest
+of each part, followed by ``-`` and the number of parts. So the part size
+used by the uploader has to be known, or inferred from the number of parts
+and the object size.
+
+Ref:
+
+- https://docs.aws.amazon.com/AmazonS3/latest/API/API_Object.html
+- https://docs.aws.amazon.com/AmazonS3/latest/userguide/qfacts.html
+"""
+
+import typing as T
+import os
+import math
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+
+from .utils import DEFAULT_CHUNK_SIZE, iter_map_concurrently, _hash_stream
+
+MIB = 1024 * 1024
+
+#: the default ``multipart_threshold`` and ``multipart_chunksize``
+#: of boto3 and the aws CLI.
+DEFAULT_PART_SIZE = 8 * MIB
+MIN_PART_SIZE = 5 * MIB
+MAX_PART_SIZE = 5 * 1024 * MIB
+MAX_PARTS = 10000
+
+#: part sizes commonly used by the other S3 clients and tools.
+COMMON_PART_SIZES = [
+    5 * MIB,
+    8 * MIB,
+    15 * MIB,
+    16 * MIB,
+    32 * MIB,
+    64 * MIB,
+    100 * MIB,
+    128 * MIB,
+    256 * MIB,
+    512 * MIB,
+    1024 * MIB,
+]
+
+
+
+def parse_etag(etag: str) -> T.Tuple[str, int]:
+    """
+    Split the ETag into the md5 hex digest and the number of parts.
+    The number of parts is 0 if it is not a multipart upload ETag.
+
+    Example::
+
+        >>> parse_etag('"9b2cf535f27731c974343645a3985328-3"')
+        ('9b2cf535f27731c974343645a3985328', 3)
+        >>> parse_etag("9b2cf535f27731c974343645a3985328")
+        ('9b2cf535f27731c974343645a3985328', 0)
+
+    .. versionadded:: 2.4.1
+    """
+    etag = etag.strip('"')
+    if "-" in etag:
+        md5, n_parts = etag.split("-", 1)
+        return md5, int(n_parts)
+    return etag, 0
+
+
+def get_part_count(size: int, part_size: int) -> int:
+    """
+    Number of parts to upload ``size`` bytes with the given part size.
+
+    .. versionadded:: 2.4.1
+    """
+    return max(1, math.ceil(size / part_size))
+
+
+def adjust_part_size(size: int, part_size: int = DEFAULT_PART_SIZE) -> int:
+    """
+    Adjust the part size the same way as the ``s3transfer.utils.ChunksizeAdjuster``
+    used by boto3 and the aws CLI. The part size is clamped to the
+    S3 limits, and doubled until there are at most 10,000 parts.
+
+    .. versionadded:: 2.4.1
+    """
+    part_size = min(max(part_size, MIN_PART_SIZE), MAX_PART_SIZE)
+    while get_part_count(size, part_size) > MAX_PARTS:
+        part_size *= 2
+    return part_size
+
+
+def infer_part_sizes(
+    size: int,
+    n_parts: int,
+    max_candidates: int = 16,
+) -> T.List[int]:
+    """
+    Infer the candidate part sizes from the object size and the number of
+    parts in the ETag. Any part size ``p`` with ``ceil(size / p) == n_parts``
+    is possible, the candidates are ordered by how likely they are used:
+
+    1. the boto3 / aws CLI default part size, after adjustment.
+    2. the common part sizes, see :data:`COMMON_PART_SIZES`.
+    3. the other multiples of 1 MiB, from small to large.
+    4. the other multiples of 1 MB, from small to large.
+
+    Example::
+
+        >>> infer_part_sizes(20 * MIB, 3)
+        [8388608, 7340032, 9437184, 7000000, 8000000, 9000000, 10000000]
+
+    :param size: the object size in bytes.
+    :param n_parts: the number of parts in the ETag.
+    :param max_candidates: the max number of candidates to return.
+
+    :return: the list of candidate part sizes.
+
+    .. versionadded:: 2.4.1
+    """
+    if n_parts < 1:
+        raise ValueError("``n_parts`` has to be greater than 0.")
+    if n_parts == 1:
+        # all part sizes that are not smaller than the object produce the same ETag
+        return [max(size, 1)]
+    # the valid part size is in the range of [lower, upper]
+    lower = math.ceil(size / n_parts)
+    upper = math.ceil(size / (n_parts - 1)) - 1
+    if lower > upper:
+        return []
+
+    candidates = list()
+    seen = set()
+
+    def add(part_size: int) -> bool:
+        if (lower <= part_size <= upper) and (part_size not in seen):
+            seen.add(part_size)
+            candidates.append(part_size)
+        return len(candidates) >= max_candidates
+
+    if add(adjust_part_size(size)):
+        return candidates
+    for part_size in COMMON_PART_SIZES:
+        if add(part_size):
+            return candidates
+    for unit in [MIB, 1000000]:
+        part_size = math.ceil(lower / unit) * unit
+        while part_size <= upper:
+            if add(part_size):
+                return candidates
+            part_size += unit
+    if not candidates:
+        # no round number fits, try the largest possible part size
+        add(upper)
+    return candidates
+
+
+def calculate_etag_from_md5s(md5_digests: T.List[bytes]) -> str:
+    """
+    Calculate the multipart upload ETag from the binary md5 digest of
+    each part, without the double quote.
+
+    .. versionadded:: 2.4.1
+    """
+    md5 = hashlib.md5(b"".join(md5_digests)).hexdigest()
+    return f"{md5}-{len(md5_digests)}"
+
+
+def _md5_range(
+    abspath: str,
+    offset: int,
+    length: int,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> bytes:
+    """
+    Get the binary md5 digest of the ``length`` bytes starting at ``offset``.
+    """
+    m = hashlib.md5()
+    if length > 0:
+        with open(abspath, "rb", buffering=0) as f:
+            f.seek(offset)
+            _hash_stream(f, [m], nbytes=length, chunk_size=chunk_size)
+    return m.digest()
+
+
+def calculate_etag(
+    abspath: str,
+    part_size: int = DEFAULT_PART_SIZE,
+    multipart_threshold: T.Optional[int] = None,
+    concurrency: int = 4,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> str:
+    """
+    Calculate the S3 ETag of a local file, without the double quote.
+
+    Each part is hashed in a thread pool, and each thread opens its own file
+    handle. hashlib releases the GIL on large data, so the parts are hashed
+    in parallel, a multi GB file can be verified without re-downloading.
+
+    Example::
+
+        >>> calculate_etag("/tmp/big.bin", part_size=8 * 1024 * 1024)
+        '9b2cf535f27731c974343645a3985328-3'
+
+    :param abspath: absolute path of the file.
+    :param part_size: the multipart upload part size, the boto3 and
+        aws CLI default is 8 MiB.
+    :param multipart_threshold: the file that is smaller than this size is
+        uploaded in a single part, default equals to ``part_size``.
+    :param concurrency: number of threads to hash the parts.
+    :param chunk_size: stream chunk_size of the data for hash each time,
+        avoid high memory usage.
+
+    .. versionadded:: 2.4.1
+    """
+    if part_size < 1:
+        raise ValueError("``part_size`` has to be greater than 0.")
+    if multipart_threshold is None:
+        multipart_threshold = part_size
+    size = os.path.getsize(abspath)
+    if size < multipart_threshold:
+        return _md5_range(abspath, 0, size, chunk_size=chunk_size).hex()
+    md5_digests = list(
+        iter_map_concurrently(
+            lambda offset: _md5_range(abspath, offset, part_size, chunk_size),
+            range(0, max(size, 1), part_size),
+            max_workers=concurrency,
+            ordered=True,
+        )
+    )
+    return calculate_etag_from_md5s(md5_digests)
+
+
+def calculate_etags(
+    abspath: str,
+    part_sizes: T.List[int],
+    concurrency: int = 4,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> T.List[str]:
+    """
+    Calculate the multipart upload ETag of a local file with several part
+    sizes, without the double quote. The file is read only once, each chunk
+    is fed to the md5 of the current part of every part size. The part sizes
+    are hashed in a thread pool, hashlib releases the GIL on large data.
+
+    Example::
+
+        >>> calculate_etags("/tmp/big.bin", part_sizes=[5 * MIB, 8 * MIB])
+        ['6e7b4e2b4e47d9d1e8f9f5bd4b2c2a6b-4', '9b2cf535f27731c974343645a3985328-3']
+
+    :param abspath: absolute path of the file.
+    :param part_sizes: the multipart upload part sizes.
+    :param concurrency: number of threads to hash the part sizes.
+    :param chunk_size: stream chunk_size of the data for hash each time,
+        avoid high memory usage.
+
+    :return: the ETag of each part size, in the same order.
+
+    .. versionadded:: 2.4.1
+    """
+    if any(part_size < 1 for part_size in part_sizes):
+        raise ValueError("``part_size`` has to be greater than 0.")
+    hashers = [hashlib.md5() for _ in part_sizes]
+    md5_digests_list: T.List[T.List[bytes]] = [list() for _ in part_sizes]
+    # number of bytes hashed into the current part of each part size
+    filled = [0] * len(part_sizes)
+
+    def _update(i: int, chunk: memoryview):
+        part_size = part_sizes[i]
+        m = hashers[i]
+        pos = 0
+        while pos < len(chunk):
+            n = min(part_size - filled[i], len(chunk) - pos)
+            m.update(chunk[pos : pos + n])
+            filled[i] += n
+            pos += n
+            if filled[i] == part_size:
+                md5_digests_list[i].append(m.digest())
+                m = hashers[i] = hashlib.md5()
+                filled[i] = 0
+
+    with open(abspath, "rb") as f:
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            while True:
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    break
+                view = memoryview(chunk)
+                for _ in executor.map(
+                    lambda i: _update(i, view), range(len(part_sizes))
+                ):
+                    pass
+    etags = list()
+    for i, md5_digests in enumerate(md5_digests_list):
+        # the last partial part, or the only part of an empty file
+        if filled[i] or (not md5_digests):
+            md5_digests.append(hashers[i].digest())
+        etags.append(calculate_etag_from_md5s(md5_digests))
+    return etags
+
+
+def is_etag_match(
+    abspath: str,
+    etag: str,
+    size: T.Optional[int] = None,
+    concurrency: int = 4,
+    max_candidates: int = 16,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> bool:
+    """
+    Check if the local file has the same content as the s3 object with
+    the given ETag. For the multipart upload ETag, the part size is
+    inferred by :func:`infer_part_sizes`, and the ETags of all candidate
+    part sizes are calculated in one pass of the file by
+    :func:`calculate_etags`. The file is read once no matter how many
+    candidates there are, but each candidate costs one more md5 of the data.
+
+    .. note::
+
+        The ETag of the object encrypted by SSE-KMS or SSE-C is not the md5
+        of the content, it never matches.
+
+    :param abspath: absolute path of the file.
+    :param etag: the ETag of the s3 object, with or without the double quote.
+    :param size: the file size, if already known.
+    :param concurrency: See :func:`calculate_etags`.
+    :param max_candidates: See :func:`infer_part_sizes`.
+    :param chunk_size: See :func:`calculate_etag`.
+
+    .. versionadded:: 2.4.1
+    """
+    md5, n_parts = parse_etag(etag)
+    if size is None:
+        size = os.path.getsize(abspath)
+    if n_parts == 0:
+        return _md5_range(abspath, 0, size, chunk_size=chunk_size).hex() == md5
+    part_sizes = infer_part_sizes(size, n_parts, max_candidates=max_candidates)
+    if not part_sizes:
+        return False
+    etags = calculate_etags(
+        abspath,
+        part_sizes=part_sizes,
+        concurrency=concurrency,
+        chunk_size=chunk_size,
+    )
+    return f"{md5}-{n_parts}" in etags
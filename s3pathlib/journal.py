@@ -0,0 +1,224 @@
+# -*- coding: utf-8 -*-
+
+"""
+A local job journal to make the long running bulk operation resumable,
+for example :meth:`~s3pathlib.core.copy.CopyAPIMixin.copy_dir` and
+:meth:`~s3pathlib.core.copy.CopyAPIMixin.move_to` over millions of keys.
+
+The source objects are listed in key order, and the tasks complete out of
+order. The journal tracks:
+
+- the cursor, all keys before and equal to it are completed. The re-run
+  lists the source with ``StartAfter=cursor``.
+- the completed keys after the cursor, they are skipped by the re-run.
+
+The journal is stored in a SQLite database, the completed keys are written
+in batches, one transaction per ``flush_size`` keys or ``flush_interval``
+seconds. Only the keys completed after the last flush are lost if the
+process crashes, they are processed again by the re-run.
+
+Example::
+
+    >>> with Journal("/tmp/s3-jobs.sqlite", job_id="copy-2024-backup") as journal:
+    ...     s3dir_src.copy_dir(s3dir_dst, journal=journal)
+"""
+
+import typing as T
+import time
+import sqlite3
+from collections import deque
+from datetime import datetime, timezone
+
+
+class Journal:
+    """
+    The SQLite job journal.
+
+    :param path: the SQLite database file path, multiple jobs can share
+        the same file.
+    :param job_id: the unique id of the job, the re-run has to use
+        the same job id to resume.
+    :param flush_size: write the completed keys to the database
+        every ``flush_size`` keys.
+    :param flush_interval: write the completed keys to the database
+        at least every ``flush_interval`` seconds.
+
+    .. versionadded:: 2.4.1
+    """
+
+    def __init__(
+        self,
+        path: str,
+        job_id: str,
+        flush_size: int = 1000,
+        flush_interval: float = 5.0,
+    ):
+        self.path = str(path)
+        self.job_id = job_id
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self._conn = sqlite3.connect(self.path)
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                job_id TEXT PRIMARY KEY,
+                created_at TEXT NOT NULL,
+                cursor TEXT,
+                is_finished INTEGER NOT NULL DEFAULT 0
+            );
+            CREATE TABLE IF NOT EXISTS done_keys (
+                job_id TEXT NOT NULL,
+                key TEXT NOT NULL,
+                PRIMARY KEY (job_id, key)
+            );
+            """
+        )
+        row = self._conn.execute(
+            "SELECT created_at, cursor, is_finished FROM jobs WHERE job_id = ?",
+            (job_id,),
+        ).fetchone()
+        if row is None:
+            self.created_at = datetime.now(timezone.utc)
+            self.cursor: T.Optional[str] = None
+            self.is_finished = False
+            with self._conn:
+                self._conn.execute(
+                    "INSERT INTO jobs (job_id, created_at) VALUES (?, ?)",
+                    (job_id, self.created_at.isoformat()),
+                )
+        else:
+            self.created_at = datetime.fromisoformat(row[0])
+            self.cursor = row[1]
+            self.is_finished = bool(row[2])
+        # the completed keys after the cursor
+        self._done: T.Set[str] = {
+            key
+            for (key,) in self._conn.execute(
+                "SELECT key FROM done_keys WHERE job_id = ?", (job_id,)
+            )
+        }
+        # the dispatched keys in the listing order, not yet passed by the cursor
+        self._pending: T.Deque[str] = deque()
+        self._unflushed: T.List[str] = list()
+        self._last_flush = time.monotonic()
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__name__}("
+            f"path={self.path!r}, job_id={self.job_id!r}, "
+            f"cursor={self.cursor!r}, is_finished={self.is_finished!r})"
+        )
+
+    def __enter__(self) -> "Journal":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    @property
+    def start_after(self) -> T.Optional[str]:
+        """
+        The ``StartAfter`` of the source listing of the re-run.
+        """
+        return self.cursor
+
+    def is_done(self, key: str) -> bool:
+        """
+        Return True if the key is completed by the previous run.
+        """
+        if (self.cursor is not None) and (key <= self.cursor):
+            return True
+        return key in self._done
+
+    def _advance(self):
+        """
+        Move the cursor forward over the contiguous completed keys.
+        """
+        while self._pending and (self._pending[0] in self._done):
+            self.cursor = self._pending.popleft()
+            self._done.discard(self.cursor)
+
+    def dispatch(self, key: str) -> bool:
+        """
+        Record a key is listed, it has to be called for every listed key
+        in the listing order, including the completed ones.
+
+        :return: True if the key is completed by the previous run,
+            the caller should skip it.
+        """
+        if self.is_done(key):
+            if key in self._done:
+                self._pending.append(key)
+                self._advance()
+            return True
+        self._pending.append(key)
+        return False
+
+    def complete(self, key: str):
+        """
+        Record a key is completed, the completion can be out of order.
+        """
+        self._done.add(key)
+        self._unflushed.append(key)
+        self._advance()
+        if (len(self._unflushed) >= self.flush_size) or (
+            time.monotonic() - self._last_flush >= self.flush_interval
+        ):
+            self.flush()
+
+    def flush(self):
+        """
+        Write the cursor and the completed keys to the database in one
+        transaction. The completed keys before the cursor are removed.
+        """
+        with self._conn:
+            self._conn.execute(
+                "UPDATE jobs SET cursor = ?, is_finished = ? WHERE job_id = ?",
+                (self.cursor, int(self.is_finished), self.job_id),
+            )
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO done_keys (job_id, key) VALUES (?, ?)",
+                [(self.job_id, key) for key in self._unflushed if key in self._done],
+            )
+            if self.cursor is not None:
+                self._conn.execute(
+                    "DELETE FROM done_keys WHERE job_id = ? AND key <= ?",
+                    (self.job_id, self.cursor),
+                )
+        self._unflushed = list()
+        self._last_flush = time.monotonic()
+
+    def finish(self):
+        """
+        Mark the job as finished, the re-run of a finished job does nothing.
+        """
+        self.is_finished = True
+        self.flush()
+
+    def reset(self):
+        """
+        Remove the progress of the job, the next run starts from scratch.
+        """
+        with self._conn:
+            self._conn.execute("DELETE FROM jobs WHERE job_id = ?", (self.job_id,))
+            self._conn.execute(
+                "DELETE FROM done_keys WHERE job_id = ?", (self.job_id,)
+            )
+        self.created_at = datetime.now(timezone.utc)
+        self.cursor = None
+        self.is_finished = False
+        self._done = set()
+        self._pending = deque()
+        self._unflushed = list()
+        with self._conn:
+            self._conn.execute(
+                "INSERT INTO jobs (job_id, created_at) VALUES (?, ?)",
+                (self.job_id, self.created_at.isoformat()),
+            )
+
+    def close(self):
+        """
+        Flush the completed keys and close the database connection.
+        """
+        self.flush()
+        self._conn.close()
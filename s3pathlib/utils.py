@@ -1,7 +1,21 @@
 # -*- coding: utf-8 -*-
 
 import typing as T
+import queue
+import heapq
+import pickle
 import hashlib
+import tempfile
+import threading
+import functools
+from collections import deque
+from concurrent.futures import (
+    ThreadPoolExecutor,
+    ProcessPoolExecutor,
+    wait,
+    as_completed,
+    FIRST_COMPLETED,
+)
 
 try:
     import botocore.exceptions
@@ -89,6 +103,28 @@ def smart_join_s3_key(
         return key
 
 
+def get_key_predecessor(key: str) -> str:
+    """
+    Get a string that is less than the ``key``, and there's practically no
+    s3 key in between. It is used as the ``StartAfter`` of an inclusive
+    lower bound.
+
+    Example::
+
+        >>> get_key_predecessor("dt=2024-01-15")
+        'dt=2024-01-14\\U0010ffff'
+
+    .. versionadded:: 2.4.1
+    """
+    if not key:
+        return key
+    code = ord(key[-1]) - 1
+    # not a valid unicode character to encode
+    if code < 0 or 0xD800 <= code <= 0xDFFF:
+        return key[:-1]
+    return key[:-1] + chr(code) + chr(0x10FFFF)
+
+
 def make_s3_console_url(
     bucket: T.Optional[str] = None,
     prefix: T.Optional[str] = None,
@@ -369,7 +405,41 @@ def sha256_binary(
     return hash_binary(b, hashlib.sha256)
 
 
-DEFAULT_CHUNK_SIZE = 1 << 6
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+
+def _hash_stream(
+    f: T.BinaryIO,
+    hashers: T.List,
+    nbytes: int = 0,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+):
+    """
+    Feed the data of a binary stream to all hash objects in one pass.
+    The data is read with ``readinto`` into one reusable buffer, there's no
+    new bytes object per read.
+
+    :param f: a binary file object, opened with ``buffering=0`` is recommended.
+    :param hashers: the hash objects, example: ``[hashlib.md5(), hashlib.sha256()]``.
+    :param nbytes: only hash first nbytes of the stream, 0 means all.
+    :param chunk_size: the buffer size.
+    """
+    if (nbytes > 0) and (nbytes < chunk_size):
+        chunk_size = nbytes
+    buffer = bytearray(chunk_size)
+    view = memoryview(buffer)
+    remaining = nbytes if nbytes else -1
+    while remaining:
+        if 0 < remaining < chunk_size:
+            n = f.readinto(view[:remaining])
+        else:
+            n = f.readinto(buffer)
+        if not n:
+            break
+        for hasher in hashers:
+            hasher.update(view[:n])
+        if remaining > 0:
+            remaining -= n
 
 
 def hash_file(
@@ -377,7 +447,7 @@ def hash_file(
     hash_meth: callable,
     nbytes: int = 0,
     chunk_size: int = DEFAULT_CHUNK_SIZE,
-) -> str:  # pragma: no cover
+) -> str:
     """
     Get the hash of a file on local drive.
 
@@ -390,39 +460,98 @@ def hash_file(
     :return: hash value in hex digits.
 
     .. versionadded:: 1.0.1
+
+    .. versionchanged:: 2.4.1
+
+        The default ``chunk_size`` is 1 MB instead of 64 bytes, the data is
+        read into a reusable buffer.
     """
     if nbytes < 0:
         raise ValueError("nbytes cannot smaller than 0")
     if chunk_size < 1:
-        raise ValueError("nbytes cannot smaller than 1")
-    if (nbytes > 0) and (nbytes < chunk_size):
-        chunk_size = nbytes
-
+        raise ValueError("chunk_size cannot smaller than 1")
     m = hash_meth()
-    with open(abspath, "rb") as f:
-        if nbytes:  # use first n bytes
-            have_reads = 0
-            while True:
-                have_reads += chunk_size
-                if have_reads > nbytes:
-                    n = nbytes - (have_reads - chunk_size)
-                    if n:
-                        data = f.read(n)
-                        m.update(data)
-                    break
-                else:
-                    data = f.read(chunk_size)
-                    m.update(data)
-        else:  # use entire content
-            while True:
-                data = f.read(chunk_size)
-                if not data:
-                    break
-                m.update(data)
-
+    with open(abspath, "rb", buffering=0) as f:
+        _hash_stream(f, [m], nbytes=nbytes, chunk_size=chunk_size)
     return m.hexdigest()
 
 
+def hash_file_multi(
+    abspath: str,
+    algorithms: T.Iterable[str] = ("md5",),
+    nbytes: int = 0,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> T.Dict[str, str]:
+    """
+    Get the hash of a file on local drive with multiple algorithms,
+    the file is only read once.
+
+    Example::
+
+        >>> hash_file_multi("/tmp/data.bin", ["md5", "sha256"])
+        {'md5': '...', 'sha256': '...'}
+
+    :param abspath: absolute path of the file
+    :param algorithms: the hashlib algorithm names, example: ``["md5", "sha256"]``.
+    :param nbytes: only hash first nbytes of the file
+    :param chunk_size: See :func:`hash_file`.
+
+    :return: a dictionary, the key is the algorithm name, the value is the
+        hash value in hex digits.
+
+    .. versionadded:: 2.4.1
+    """
+    if nbytes < 0:
+        raise ValueError("nbytes cannot smaller than 0")
+    if chunk_size < 1:
+        raise ValueError("chunk_size cannot smaller than 1")
+    hashers = {algorithm: hashlib.new(algorithm) for algorithm in algorithms}
+    with open(abspath, "rb", buffering=0) as f:
+        _hash_stream(f, list(hashers.values()), nbytes=nbytes, chunk_size=chunk_size)
+    return {algorithm: m.hexdigest() for algorithm, m in hashers.items()}
+
+
+def hash_files(
+    abspaths: T.Iterable[str],
+    algorithms: T.Iterable[str] = ("md5",),
+    concurrency: int = 8,
+    use_process: bool = False,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> T.Dict[str, T.Dict[str, str]]:
+    """
+    Hash many files concurrently, each file is hashed by :func:`hash_file_multi`.
+
+    hashlib releases the GIL while hashing large data, so the thread pool
+    scales well for the large files. The process pool is better for many
+    small files, where the per read Python overhead dominates.
+
+    :param abspaths: absolute paths of the files.
+    :param algorithms: See :func:`hash_file_multi`.
+    :param concurrency: number of threads or processes.
+    :param use_process: use a process pool instead of a thread pool.
+    :param chunk_size: See :func:`hash_file`.
+
+    :return: a dictionary, the key is the file path, the value is the
+        return value of :func:`hash_file_multi`.
+
+    .. versionadded:: 2.4.1
+    """
+    if concurrency < 1:
+        raise ValueError("``concurrency`` has to be greater than 0.")
+    abspaths = [str(abspath) for abspath in abspaths]
+    func = functools.partial(
+        hash_file_multi,
+        algorithms=tuple(algorithms),
+        chunk_size=chunk_size,
+    )
+    if use_process:
+        with ProcessPoolExecutor(max_workers=concurrency) as executor:
+            results = list(executor.map(func, abspaths))
+    else:
+        results = list(iter_map_concurrently(func, abspaths, max_workers=concurrency))
+    return dict(zip(abspaths, results))
+
+
 def grouper_list(
     l: T.Iterable,
     n: int,
@@ -452,3 +581,300 @@ def grouper_list(
             counter = 0
     if len(chunk) > 0:
         yield chunk
+
+
+def iter_map_concurrently(
+    func: T.Callable,
+    iterable: T.Iterable,
+    max_workers: int,
+    ordered: bool = True,
+) -> T.Iterator:
+    """
+    Apply ``func`` to each item of ``iterable`` in a thread pool and yield the
+    results. Unlike ``ThreadPoolExecutor.map``, the ``iterable`` is consumed
+    lazily, only ``max_workers`` tasks are in flight at the same time, so the
+    memory usage stays flat no matter how long the iterable is.
+
+    Example::
+
+        >>> list(iter_map_concurrently(lambda x: x * 2, range(5), max_workers=2))
+        [0, 2, 4, 6, 8]
+
+    :param func: a callable that takes one item and returns the result.
+    :param iterable: an iterable object, it could be a lazy generator.
+    :param max_workers: number of worker threads, also the number of
+        in flight tasks.
+    :param ordered: if True, yield results in the same order as the input,
+        otherwise yield results as soon as they are completed.
+
+    .. versionadded:: 2.4.1
+    """
+    if max_workers < 1:
+        raise ValueError("``max_workers`` has to be greater than 0.")
+    iterator = iter(iterable)
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        if ordered:
+            futures = deque()
+            for item in iterator:
+                futures.append(executor.submit(func, item))
+                if len(futures) >= max_workers:
+                    yield futures.popleft().result()
+            while futures:
+                yield futures.popleft().result()
+        else:
+            futures = set()
+            for item in iterator:
+                futures.add(executor.submit(func, item))
+                if len(futures) >= max_workers:
+                    done, futures = wait(futures, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield future.result()
+            for future in as_completed(futures):
+                yield future.result()
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+_END_OF_ITERATION = object()
+
+
+class _PrefetchError:
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+def iter_prefetch(
+    iterable: T.Iterable,
+    prefetch: int,
+) -> T.Iterator:
+    """
+    Consume the ``iterable`` in a background thread and fetch up to
+    ``prefetch`` items ahead of the consumer. It is useful to overlap the
+    network latency of the producer (e.g. a paginator) with the processing
+    time of the consumer.
+
+    Example::
+
+        >>> for response in iter_prefetch(paginator.paginate(...), prefetch=2):
+        ...     process(response)
+
+    :param iterable: an iterable object, it will be iterated in a background thread.
+    :param prefetch: the maximum number of items buffered in the queue.
+
+    .. versionadded:: 2.4.1
+    """
+    if prefetch < 1:
+        raise ValueError("``prefetch`` has to be greater than 0.")
+    buffer = queue.Queue(maxsize=prefetch)
+    stop_event = threading.Event()
+
+    def _put(item) -> bool:
+        while not stop_event.is_set():
+            try:
+                buffer.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def _produce():
+        try:
+            for item in iterable:
+                if not _put(item):
+                    return
+        except BaseException as e:
+            _put(_PrefetchError(e))
+        else:
+            _put(_END_OF_ITERATION)
+
+    thread = threading.Thread(target=_produce, daemon=True)
+    thread.start()
+    try:
+        while True:
+            item = buffer.get()
+            if item is _END_OF_ITERATION:
+                return
+            if isinstance(item, _PrefetchError):
+                raise item.error
+            yield item
+    finally:
+        stop_event.set()
+        thread.join()
+
+
+def iter_chain_concurrently(
+    func: T.Callable[[T.Any], T.Iterable],
+    iterable: T.Iterable,
+    max_workers: int,
+    buffer_size: T.Optional[int] = None,
+    ordered: bool = False,
+) -> T.Iterator:
+    """
+    Apply ``func`` to each item of ``iterable`` in a thread pool, where
+    ``func`` returns an iterable, and yield the elements of all of them
+    in the order they arrive. The workers put the elements into a bounded
+    queue, so the memory usage stays flat no matter how many elements each
+    ``func`` call produces. The ``iterable`` is consumed lazily, only
+    ``max_workers`` items are in flight at the same time.
+
+    Example::
+
+        >>> sorted(iter_chain_concurrently(range, [1, 2, 3], max_workers=2))
+        [0, 0, 0, 1, 1, 2]
+        >>> list(iter_chain_concurrently(range, [1, 2, 3], max_workers=2, ordered=True))
+        [0, 0, 1, 0, 1, 2]
+
+    :param func: a callable that takes one item and returns an iterable.
+    :param iterable: an iterable object, it could be a lazy generator.
+    :param max_workers: number of worker threads.
+    :param buffer_size: the maximum number of elements buffered in the queue,
+        default is ``max_workers``. In ordered mode, each running item has
+        its own queue of this size, default is 2.
+    :param ordered: if True, yield all elements of the first item, then all
+        elements of the second item, and so on. The following items are
+        still produced concurrently, up to ``buffer_size`` elements ahead.
+
+    .. versionadded:: 2.4.1
+
+    .. versionchanged:: 2.4.1
+
+        Add ``ordered`` argument.
+    """
+    if max_workers < 1:
+        raise ValueError("``max_workers`` has to be greater than 0.")
+    iterator = iter(iterable)
+    if buffer_size is None:
+        buffer_size = 2 if ordered else max_workers
+    stop_event = threading.Event()
+
+    def _put(buffer: queue.Queue, item) -> bool:
+        while not stop_event.is_set():
+            try:
+                buffer.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def _produce(buffer: queue.Queue, item):
+        try:
+            for element in func(item):
+                if not _put(buffer, element):
+                    return
+        except BaseException as e:
+            _put(buffer, _PrefetchError(e))
+        else:
+            _put(buffer, _END_OF_ITERATION)
+
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        if ordered:
+            # the items start in order, so the item being consumed always
+            # has a worker thread
+            buffers = deque()
+
+            def _submit_next() -> bool:
+                for item in iterator:
+                    buffer = queue.Queue(maxsize=buffer_size)
+                    executor.submit(_produce, buffer, item)
+                    buffers.append(buffer)
+                    return True
+                return False
+
+            while (len(buffers) < max_workers) and _submit_next():
+                pass
+            while buffers:
+                element = buffers[0].get()
+                if element is _END_OF_ITERATION:
+                    buffers.popleft()
+                    _submit_next()
+                elif isinstance(element, _PrefetchError):
+                    raise element.error
+                else:
+                    yield element
+        else:
+            buffer = queue.Queue(maxsize=buffer_size)
+            n_running = 0
+
+            def _submit_next() -> bool:
+                nonlocal n_running
+                for item in iterator:
+                    executor.submit(_produce, buffer, item)
+                    n_running += 1
+                    return True
+                return False
+
+            while (n_running < max_workers) and _submit_next():
+                pass
+            while n_running:
+                element = buffer.get()
+                if element is _END_OF_ITERATION:
+                    n_running -= 1
+                    _submit_next()
+                elif isinstance(element, _PrefetchError):
+                    raise element.error
+                else:
+                    yield element
+    finally:
+        stop_event.set()
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def _iter_run(f: T.IO[bytes]) -> T.Iterator:
+    f.seek(0)
+    while True:
+        try:
+            yield pickle.load(f)
+        except EOFError:
+            return
+
+
+def iter_sorted_external(
+    iterable: T.Iterable,
+    key: T.Callable[[T.Any], T.Any],
+    reverse: bool = False,
+    run_size: int = 100000,
+) -> T.Iterator:
+    """
+    Sort an iterable that may not fit in memory. Items are buffered into
+    sorted runs of ``run_size``, every full run is spilled to a temp file,
+    then all runs are combined with a k-way merge. At most one run is held
+    in memory. The sort is stable. Items has to be picklable.
+
+    Example::
+
+        >>> list(iter_sorted_external(range(10), key=lambda x: x % 3, run_size=4))
+        [0, 3, 6, 9, 1, 4, 7, 2, 5, 8]
+
+    :param iterable: the items to sort.
+    :param key: the sort key function, same as :func:`sorted`.
+    :param reverse: same as :func:`sorted`.
+    :param run_size: number of items per sorted run.
+
+    .. versionadded:: 2.4.1
+    """
+    if run_size < 1:
+        raise ValueError("``run_size`` has to be greater than 0.")
+    files = list()
+    run = list()
+    try:
+        for item in iterable:
+            run.append(item)
+            if len(run) == run_size:
+                run.sort(key=key, reverse=reverse)
+                f = tempfile.TemporaryFile()
+                files.append(f)
+                for item_ in run:
+                    pickle.dump(item_, f, protocol=pickle.HIGHEST_PROTOCOL)
+                run = list()
+        run.sort(key=key, reverse=reverse)
+        if not files:
+            yield from run
+            return
+        runs = [_iter_run(f) for f in files]
+        runs.append(iter(run))
+        yield from heapq.merge(*runs, key=key, reverse=reverse)
+    finally:
+        for f in files:
+            f.close()
@@ -0,0 +1,200 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+
+from s3pathlib.better_client.copy_object import (
+    split_copy_object_kwargs,
+    iter_copy_ranges,
+    multipart_copy_object,
+    stream_copy_object,
+)
+from s3pathlib.utils import smart_join_s3_key
+from s3pathlib.tests import run_cov_test
+from s3pathlib.tests.mock import BaseTest
+
+MB = 1024 * 1024
+
+
+def test_split_copy_object_kwargs():
+    create, part, complete = split_copy_object_kwargs(
+        dict(
+            Bucket="b",
+            Key="k",
+            CopySource={"Bucket": "b", "Key": "k"},
+            MetadataDirective="REPLACE",
+            Metadata={"k": "v"},
+            StorageClass="STANDARD_IA",
+            CopySourceIfMatch="e",
+            RequestPayer="requester",
+        )
+    )
+    assert create == {
+        "Metadata": {"k": "v"},
+        "StorageClass": "STANDARD_IA",
+        "RequestPayer": "requester",
+    }
+    assert part == {"CopySourceIfMatch": "e", "RequestPayer": "requester"}
+    assert complete == {"RequestPayer": "requester"}
+
+
+def test_iter_copy_ranges():
+    assert list(iter_copy_ranges(12 * MB, part_size=5 * MB)) == [
+        (1, "bytes=0-5242879"),
+        (2, "bytes=5242880-10485759"),
+        (3, "bytes=10485760-12582911"),
+    ]
+    # the part size is at least 5 MB
+    assert list(iter_copy_ranges(6 * MB, part_size=1)) == [
+        (1, "bytes=0-5242879"),
+        (2, "bytes=5242880-6291455"),
+    ]
+    # at most 10,000 parts
+    assert len(list(iter_copy_ranges(100000 * MB, part_size=5 * MB))) == 10000
+
+
+class BetterCopyObject(BaseTest):
+    module = "better_client.copy_object"
+
+    def _test_multipart_copy_object(self):
+        s3_client = self.s3_client
+        bucket = self.bucket
+        prefix = smart_join_s3_key(parts=[self.prefix, "copy_object"], is_dir=True)
+        src_key = f"{prefix}src.bin"
+        dst_key = f"{prefix}dst.bin"
+        body = b"".join(bytes([i]) * MB for i in range(11))
+        s3_client.put_object(Bucket=bucket, Key=src_key, Body=body)
+
+        response = multipart_copy_object(
+            s3_client,
+            src_bucket=bucket,
+            src_key=src_key,
+            dst_bucket=bucket,
+            dst_key=dst_key,
+            size=len(body),
+            part_size=5 * MB,
+            concurrency=2,
+            create_multipart_upload_kwargs={"Metadata": {"name": "dst"}},
+        )
+        assert response["ETag"].strip('"').endswith("-3")
+        res = s3_client.get_object(Bucket=bucket, Key=dst_key)
+        assert res["Body"].read() == body
+        assert res["Metadata"] == {"name": "dst"}
+
+        # the multipart upload is aborted on error
+        with pytest.raises(Exception):
+            multipart_copy_object(
+                s3_client,
+                src_bucket=bucket,
+                src_key=f"{prefix}not-exists.bin",
+                dst_bucket=bucket,
+                dst_key=f"{prefix}failed.bin",
+                size=len(body),
+                part_size=5 * MB,
+            )
+        res = s3_client.list_multipart_uploads(Bucket=bucket, Prefix=prefix)
+        assert len(res.get("Uploads", [])) == 0
+
+        with pytest.raises(ValueError):
+            multipart_copy_object(
+                s3_client, bucket, src_key, bucket, dst_key, len(body), concurrency=0
+            )
+
+    def _test_stream_copy_object(self):
+        src_s3_client = self.s3_client
+        dst_s3_client = self.bsm.boto_ses.client("s3")
+        bucket = self.bucket
+        prefix = smart_join_s3_key(parts=[self.prefix, "stream_copy"], is_dir=True)
+        src_key = f"{prefix}src.bin"
+        body = b"".join(bytes([i]) * MB for i in range(11))
+        s3_client = self.s3_client
+        s3_client.put_object(Bucket=bucket, Key=src_key, Body=body)
+
+        # the source is only read by the source client,
+        # the target is only written by the target client
+        src_operations = list()
+        dst_operations = list()
+
+        def src_handler(model, **kwargs):
+            src_operations.append(model.name)
+
+        def dst_handler(model, **kwargs):
+            dst_operations.append(model.name)
+
+        src_s3_client.meta.events.register("before-call.s3", src_handler)
+        dst_s3_client.meta.events.register("before-call.s3", dst_handler)
+        try:
+            response = stream_copy_object(
+                src_s3_client,
+                dst_s3_client,
+                src_bucket=bucket,
+                src_key=src_key,
+                dst_bucket=bucket,
+                dst_key=f"{prefix}dst.bin",
+                size=len(body),
+                part_size=5 * MB,
+                concurrency=2,
+                create_multipart_upload_kwargs={"Metadata": {"name": "dst"}},
+                chunk_size=MB // 3,
+            )
+            # the small object is copied by one get_object and one put_object
+            stream_copy_object(
+                src_s3_client,
+                dst_s3_client,
+                src_bucket=bucket,
+                src_key=src_key,
+                dst_bucket=bucket,
+                dst_key=f"{prefix}small.bin",
+                size=len(body),
+                part_size=len(body),
+            )
+        finally:
+            src_s3_client.meta.events.unregister("before-call.s3", src_handler)
+            dst_s3_client.meta.events.unregister("before-call.s3", dst_handler)
+
+        assert response["ETag"].strip('"').endswith("-3")
+        assert set(src_operations) == {"GetObject"}
+        assert src_operations.count("GetObject") == 4
+        assert dst_operations == [
+            "CreateMultipartUpload",
+            "UploadPart",
+            "UploadPart",
+            "UploadPart",
+            "CompleteMultipartUpload",
+            "PutObject",
+        ]
+        res = s3_client.get_object(Bucket=bucket, Key=f"{prefix}dst.bin")
+        assert res["Body"].read() == body
+        assert res["Metadata"] == {"name": "dst"}
+        res = s3_client.get_object(Bucket=bucket, Key=f"{prefix}small.bin")
+        assert res["Body"].read() == body
+
+        # the multipart upload is aborted if the source is smaller than expected
+        with pytest.raises(ValueError):
+            stream_copy_object(
+                src_s3_client,
+                dst_s3_client,
+                src_bucket=bucket,
+                src_key=src_key,
+                dst_bucket=bucket,
+                dst_key=f"{prefix}failed.bin",
+                size=len(body) + 1,
+                part_size=5 * MB,
+            )
+        res = s3_client.list_multipart_uploads(Bucket=bucket, Prefix=prefix)
+        assert len(res.get("Uploads", [])) == 0
+
+    def test(self):
+        self._test_multipart_copy_object()
+        self._test_stream_copy_object()
+
+
+class Test(BetterCopyObject):
+    use_mock = False
+
+
+class TestUseMock(BetterCopyObject):
+    use_mock = True
+
+
+if __name__ == "__main__":
+    run_cov_test(__file__, "s3pathlib.better_client.copy_object", preview=False)
@@ -1,5 +1,8 @@
 # -*- coding: utf-8 -*-
 
+import time
+import threading
+
 from s3pathlib.better_client.head_object import is_object_exists
 from s3pathlib.better_client.list_objects import (
     calculate_total_size,
@@ -9,6 +12,7 @@ from s3pathlib.better_client.delete_object import (
     delete_object,
     delete_dir,
     delete_object_versions,
+    _delete_objects_concurrently,
 )
 from s3pathlib.utils import smart_join_s3_key
 from s3pathlib.tests import run_cov_test
@@ -81,8 +85,52 @@ class BetterDeleteObject(DummyData):
             s3_client=s3_client,
             bucket=bucket,
             prefix=prefix,
+            batch_size=5,
+            prefetch=1,
+            concurrency=2,
         )
         assert count == 12
+        res = s3_client.list_object_versions(Bucket=bucket, Prefix=prefix)
+        assert "Versions" not in res
+        assert "DeleteMarkers" not in res
+
+    def _test_delete_objects_concurrently(self):
+        s3_client = self.s3_client
+        bucket = self.bucket
+        prefix = smart_join_s3_key([self.prefix, "delete_objects"], is_dir=True)
+
+        # the batches are deleted at the same time
+        lock = threading.Lock()
+        in_flight = [0]
+        max_in_flight = [0]
+
+        def before_call(model, **kwargs):
+            if model.name == "DeleteObjects":
+                with lock:
+                    in_flight[0] += 1
+                    max_in_flight[0] = max(max_in_flight[0], in_flight[0])
+                time.sleep(0.1)
+
+        def after_call(model, **kwargs):
+            if model.name == "DeleteObjects":
+                with lock:
+                    in_flight[0] -= 1
+
+        s3_client.meta.events.register("before-call.s3", before_call)
+        s3_client.meta.events.register("after-call.s3", after_call)
+        try:
+            # deleting the not exists object is not an error
+            count = _delete_objects_concurrently(
+                s3_client=s3_client,
+                bucket=bucket,
+                objects=(dict(Key=f"{prefix}{i}.txt") for i in range(2001)),
+                concurrency=3,
+            )
+        finally:
+            s3_client.meta.events.unregister("before-call.s3", before_call)
+            s3_client.meta.events.unregister("after-call.s3", after_call)
+        assert count == 2001
+        assert max_in_flight[0] == 3
 
     def _test_with_list_objects_folder(self):
         s3_client = self.s3_client
@@ -169,6 +217,8 @@ class BetterDeleteObject(DummyData):
                 s3_client=s3_client,
                 bucket=bucket,
                 prefix=self.prefix_soft_folder,
+                batch_size=1,
+                prefetch=2,
             )
             == 1
         )
@@ -184,6 +234,7 @@ class BetterDeleteObject(DummyData):
     def test(self):
         self._test_delete_object()
         self._test_delete_object_versions()
+        self._test_delete_objects_concurrently()
         self._test_with_list_objects_folder()
         self._test_with_dummy_data()
 
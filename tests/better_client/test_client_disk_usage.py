@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+
+from s3pathlib.better_client.delete_object import delete_dir
+from s3pathlib.better_client.disk_usage import disk_usage
+from s3pathlib.utils import smart_join_s3_key
+from s3pathlib.tests import run_cov_test
+from s3pathlib.tests.mock import BaseTest
+
+
+class BetterDiskUsage(BaseTest):
+    module = "better_client.disk_usage"
+    prefix_du: str
+
+    @classmethod
+    def custom_setup_class(cls):
+        s3_client = cls.bsm.s3_client
+        bucket = cls.get_bucket()
+        cls.prefix_du = smart_join_s3_key(
+            parts=[cls.get_prefix(), "du"],
+            is_dir=True,
+        )
+        delete_dir(s3_client=s3_client, bucket=bucket, prefix=cls.prefix_du)
+        for key, body, storage_class in [
+            ("README.txt", b"a", "STANDARD"),
+            ("a/", b"", "STANDARD"),
+            ("a/1.txt", b"aa", "STANDARD"),
+            ("a/b/1.txt", b"aaa", "GLACIER"),
+            ("a/b/c/1.txt", b"aaaa", "STANDARD"),
+            ("d/1.txt", b"aaaaa", "STANDARD_IA"),
+        ]:
+            s3_client.put_object(
+                Bucket=bucket,
+                Key=cls.prefix_du + key,
+                Body=body,
+                StorageClass=storage_class,
+            )
+
+    def _test_disk_usage(self):
+        prefix = self.prefix_du
+        for concurrency in [1, 4]:
+            du = disk_usage(
+                s3_client=self.s3_client,
+                bucket=self.bucket,
+                prefix=prefix,
+                depth=2,
+                concurrency=concurrency,
+            )
+            assert du.to_dict() == {
+                "prefix": prefix,
+                "count": 5,
+                "size": 15,
+                "size_by_storage_class": {
+                    "GLACIER": 3,
+                    "STANDARD": 7,
+                    "STANDARD_IA": 5,
+                },
+                "children": [
+                    {
+                        "prefix": f"{prefix}a/",
+                        "count": 3,
+                        "size": 9,
+                        "size_by_storage_class": {"GLACIER": 3, "STANDARD": 6},
+                        "children": [
+                            {
+                                "prefix": f"{prefix}a/b/",
+                                "count": 2,
+                                "size": 7,
+                                "size_by_storage_class": {
+                                    "GLACIER": 3,
+                                    "STANDARD": 4,
+                                },
+                                "children": [],
+                            }
+                        ],
+                    },
+                    {
+                        "prefix": f"{prefix}d/",
+                        "count": 1,
+                        "size": 5,
+                        "size_by_storage_class": {"STANDARD_IA": 5},
+                        "children": [],
+                    },
+                ],
+            }
+            assert [node.prefix for node in du.walk()] == [
+                prefix,
+                f"{prefix}a/",
+                f"{prefix}a/b/",
+                f"{prefix}d/",
+            ]
+            assert du.render(for_human=False).splitlines() == [
+                f"{prefix}  5 objects  15",
+                f"    {prefix}a/  3 objects  9",
+                f"        {prefix}a/b/  2 objects  7",
+                f"    {prefix}d/  1 objects  5",
+            ]
+
+        du = disk_usage(
+            s3_client=self.s3_client,
+            bucket=self.bucket,
+            prefix=prefix,
+            include_folder=True,
+        )
+        assert du.count == 6
+        assert du.children["a"].count == 4
+
+        with pytest.raises(ValueError):
+            disk_usage(
+                s3_client=self.s3_client,
+                bucket=self.bucket,
+                prefix=prefix,
+                depth=-1,
+            )
+
+    def test(self):
+        self._test_disk_usage()
+
+
+class Test(BetterDiskUsage):
+    use_mock = False
+
+
+class TestUseMock(BetterDiskUsage):
+    use_mock = True
+
+
+if __name__ == "__main__":
+    run_cov_test(__file__, "s3pathlib.better_client.disk_usage", preview=False)
@@ -0,0 +1,252 @@
+# -*- coding: utf-8 -*-
+
+import io
+import csv
+import gzip
+import json
+from datetime import datetime, timezone
+
+import pytest
+
+from s3pathlib.core import S3Path
+from s3pathlib.better_client.inventory import (
+    parse_last_modified_date,
+    S3Inventory,
+)
+from s3pathlib.utils import smart_join_s3_key
+from s3pathlib.tests import run_cov_test
+from s3pathlib.tests.mock import BaseTest
+
+
+def test_parse_last_modified_date():
+    assert parse_last_modified_date("2024-01-02T03:04:05.000Z") == datetime(
+        2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc
+    )
+
+
+def make_csv_gz(rows: list) -> bytes:
+    buffer = io.StringIO()
+    csv.writer(buffer, quoting=csv.QUOTE_ALL).writerows(rows)
+    return gzip.compress(buffer.getvalue().encode("utf-8"))
+
+
+class BetterInventory(BaseTest):
+    module = "better_client.inventory"
+    prefix_inventory: str
+
+    @classmethod
+    def custom_setup_class(cls):
+        s3_client = cls.bsm.s3_client
+        bucket = cls.get_bucket()
+        cls.prefix_inventory = smart_join_s3_key(
+            parts=[cls.get_prefix(), "inventory", bucket, "daily"],
+            is_dir=True,
+        )
+        # the objects are NOT in the bucket, we only have the inventory report
+        lmd = "2024-01-01T00:00:00.000Z"
+        file_rows = [
+            [
+                [bucket, "data/", "", "true", "false", "0", lmd, "e0", "STANDARD"],
+                [bucket, "data/a+b.txt", "", "true", "false", "1", lmd, "e1", "STANDARD"],
+                [bucket, "data/sub/1.txt", "v1", "false", "false", "9", lmd, "e2", "STANDARD"],
+                [bucket, "data/sub/1.txt", "v2", "true", "false", "2", lmd, "e2", "GLACIER"],
+            ],
+            [
+                [bucket, "data/sub/2.txt", "", "true", "false", "3", lmd, "e3", "STANDARD"],
+                [bucket, "data/sub/3.txt", "v1", "true", "true", "", "", "", ""],
+                [bucket, "other/1.txt", "", "true", "false", "4", lmd, "e4", "STANDARD"],
+            ],
+        ]
+        files = list()
+        for i, rows in enumerate(file_rows):
+            key = f"{cls.prefix_inventory}data/{i}.csv.gz"
+            s3_client.put_object(Bucket=bucket, Key=key, Body=make_csv_gz(rows))
+            files.append({"key": key, "size": 0, "MD5checksum": ""})
+        for folder, source_bucket in [
+            ("2024-01-01T01-00Z", "old"),
+            ("2024-01-02T01-00Z", bucket),
+        ]:
+            manifest = {
+                "sourceBucket": source_bucket,
+                "destinationBucket": f"arn:aws:s3:::{bucket}",
+                "version": "2016-11-30",
+                "fileFormat": "CSV",
+                "fileSchema": "Bucket, Key, VersionId, IsLatest, IsDeleteMarker, "
+                "Size, LastModifiedDate, ETag, StorageClass",
+                "files": files,
+            }
+            s3_client.put_object(
+                Bucket=bucket,
+                Key=f"{cls.prefix_inventory}{folder}/manifest.json",
+                Body=json.dumps(manifest),
+            )
+
+    def _test_inventory(self):
+        inventory = S3Inventory.find_latest(
+            self.s3_client,
+            bucket=self.bucket,
+            prefix=self.prefix_inventory,
+            concurrency=2,
+            buffer_size=1,
+        )
+        assert inventory.manifest_key.endswith("2024-01-02T01-00Z/manifest.json")
+        assert inventory.get_source_bucket(self.s3_client) == self.bucket
+
+        contents = sorted(
+            inventory.iter_contents(self.s3_client, prefix="data/"),
+            key=lambda dct: dct["Key"],
+        )
+        assert [dct["Key"] for dct in contents] == [
+            "data/",
+            "data/a b.txt",
+            "data/sub/1.txt",
+            "data/sub/2.txt",
+        ]
+        assert contents[2] == {
+            "Key": "data/sub/1.txt",
+            "LastModified": datetime(2024, 1, 1, tzinfo=timezone.utc),
+            "ETag": '"e2"',
+            "Size": 2,
+            "StorageClass": "GLACIER",
+        }
+        assert inventory.count_objects(self.s3_client, prefix="data/") == 3
+        assert inventory.calculate_total_size(self.s3_client) == (4, 10)
+
+        with pytest.raises(FileNotFoundError):
+            S3Inventory.find_latest(
+                self.s3_client, bucket=self.bucket, prefix="not-exists"
+            )
+
+    def _test_s3path_with_inventory(self):
+        inventory = S3Inventory.find_latest(
+            self.s3_client,
+            bucket=self.bucket,
+            prefix=self.prefix_inventory,
+        )
+        s3dir = S3Path(self.bucket, "data/")
+        assert sorted(
+            p.key for p in s3dir.iter_objects(inventory=inventory)
+        ) == ["data/a b.txt", "data/sub/1.txt", "data/sub/2.txt"]
+        assert [
+            p.key for p in s3dir.iter_objects(recursive=False, inventory=inventory)
+        ] == ["data/a b.txt"]
+        assert sorted(
+            p.key
+            for p in s3dir.iter_objects(start_after="data/sub/", inventory=inventory)
+        ) == ["data/sub/1.txt", "data/sub/2.txt"]
+        assert len(s3dir.iter_objects(limit=2, inventory=inventory).all()) == 2
+        p = s3dir.joinpath("sub", "1.txt")
+        p = [x for x in s3dir.iter_objects(inventory=inventory) if x == p][0]
+        assert p.size == 2
+        assert p.etag == "e2"
+
+        assert s3dir.count_objects(inventory=inventory) == 3
+        assert s3dir.count_objects(include_folder=True, inventory=inventory) == 4
+        assert s3dir.calculate_total_size(inventory=inventory) == (3, 6)
+
+        with pytest.raises(ValueError):
+            S3Path("another-bucket", "data/").count_objects(inventory=inventory)
+
+    def _test_columnar_inventory(self):
+        pa = pytest.importorskip("pyarrow")
+        import pyarrow.parquet as pq
+        import pyarrow.orc as orc
+
+        s3_client = self.s3_client
+        bucket = self.bucket
+        lmd = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        table = pa.table(
+            {
+                "bucket": [bucket] * 5,
+                "key": [
+                    "data/",
+                    "data/1.txt",
+                    "data/2.txt",
+                    "data/3.txt",
+                    "other/1.txt",
+                ],
+                "version_id": ["", "", "v1", "v2", ""],
+                "is_latest": [True, True, True, False, True],
+                "is_delete_marker": [False, False, False, False, False],
+                "size": [0, 1, 2, 3, 4],
+                "last_modified_date": pa.array([lmd] * 5, pa.timestamp("ms", "UTC")),
+                "e_tag": ["e0", "e1", "e2", "e3", "e4"],
+                "storage_class": ["STANDARD"] * 5,
+                # the column not used by the inventory reader
+                "replication_status": [""] * 5,
+            }
+        )
+        for file_format in ["Parquet", "ORC"]:
+            prefix = smart_join_s3_key(
+                parts=[self.prefix, "inventory-columnar", file_format, "daily"],
+                is_dir=True,
+            )
+            buffer = io.BytesIO()
+            if file_format == "Parquet":
+                # multiple row groups, one row group is read at a time
+                pq.write_table(table, buffer, row_group_size=2)
+            else:
+                orc.write_table(table, buffer)
+            key = f"{prefix}data/0.{file_format.lower()}"
+            s3_client.put_object(Bucket=bucket, Key=key, Body=buffer.getvalue())
+            manifest = {
+                "sourceBucket": bucket,
+                "destinationBucket": f"arn:aws:s3:::{bucket}",
+                "fileFormat": file_format,
+                "files": [{"key": key, "size": len(buffer.getvalue())}],
+            }
+            s3_client.put_object(
+                Bucket=bucket,
+                Key=f"{prefix}2024-01-02T01-00Z/manifest.json",
+                Body=json.dumps(manifest),
+            )
+            inventory = S3Inventory.find_latest(s3_client, bucket=bucket, prefix=prefix)
+
+            # the data file is read by ranged get_object calls
+            ranges = list()
+
+            def handler(model, params, **kwargs):
+                if model.name == "GetObject" and params["Key"] == key:
+                    ranges.append(params.get("Range"))
+
+            s3_client.meta.events.register("provide-client-params.s3", handler)
+            try:
+                contents = sorted(
+                    inventory.iter_contents(s3_client, prefix="data/"),
+                    key=lambda dct: dct["Key"],
+                )
+            finally:
+                s3_client.meta.events.unregister("provide-client-params.s3", handler)
+            assert len(ranges) >= 1
+            assert None not in ranges
+            assert [dct["Key"] for dct in contents] == [
+                "data/",
+                "data/1.txt",
+                "data/2.txt",
+            ]
+            assert contents[2] == {
+                "Key": "data/2.txt",
+                "LastModified": lmd,
+                "ETag": '"e2"',
+                "Size": 2,
+                "StorageClass": "STANDARD",
+            }
+
+    def test(self):
+        self._test_inventory()
+        self._test_s3path_with_inventory()
+
+    def test_columnar(self):
+        self._test_columnar_inventory()
+
+
+class Test(BetterInventory):
+    use_mock = False
+
+
+class TestUseMock(BetterInventory):
+    use_mock = True
+
+
+if __name__ == "__main__":
+    run_cov_test(__file__, "s3pathlib.better_client.inventory", preview=False)
@@ -3,6 +3,7 @@
 import pytest
 from s3pathlib.better_client.list_objects import (
     paginate_list_objects_v2,
+    fan_out_list_objects_v2,
     calculate_total_size,
     count_objects,
 )
@@ -61,6 +62,23 @@ class BetterListObjects(DummyData):
         )
         assert len(result.contents().all()) == 11
 
+        # prefetch pages in background thread
+        result = paginate_list_objects_v2(
+            s3_client=self.s3_client,
+            bucket=self.bucket,
+            prefix=self.prefix_test_list_objects,
+            batch_size=2,
+            prefetch=2,
+        )
+        assert [dct["Key"] for dct in result.contents()] == [
+            dct["Key"]
+            for dct in paginate_list_objects_v2(
+                s3_client=self.s3_client,
+                bucket=self.bucket,
+                prefix=self.prefix_test_list_objects,
+            ).contents()
+        ]
+
     def _test_paginate_list_objects_v2_common_prefixs(self):
         contents, common_prefixes = paginate_list_objects_v2(
             s3_client=self.s3_client,
@@ -113,6 +131,146 @@ class BetterListObjects(DummyData):
         assert len(contents) == 2  # hard_folder/, hard_folder/file.txt
         assert len(common_prefixes) == 0
 
+    def _test_fan_out_list_objects_v2(self):
+        expected = [
+            dct["Key"]
+            for dct in paginate_list_objects_v2(
+                s3_client=self.s3_client,
+                bucket=self.bucket,
+                prefix=self.prefix_test_list_objects,
+            ).contents()
+        ]
+        assert len(expected) == 11
+
+        # ordered
+        keys = [
+            dct["Key"]
+            for dct in fan_out_list_objects_v2(
+                s3_client=self.s3_client,
+                bucket=self.bucket,
+                prefix=self.prefix_test_list_objects,
+                concurrency=2,
+            )
+        ]
+        assert keys == expected
+
+        # arrival order
+        keys = [
+            dct["Key"]
+            for dct in fan_out_list_objects_v2(
+                s3_client=self.s3_client,
+                bucket=self.bucket,
+                prefix=self.prefix_test_list_objects,
+                concurrency=3,
+                ordered=False,
+            )
+        ]
+        assert sorted(keys) == expected
+
+        # limit
+        contents = fan_out_list_objects_v2(
+            s3_client=self.s3_client,
+            bucket=self.bucket,
+            prefix=self.prefix_test_list_objects,
+            concurrency=2,
+            limit=4,
+        ).all()
+        assert [dct["Key"] for dct in contents] == expected[:4]
+
+        # start after
+        for start_after in [expected[0], expected[3], expected[-1]]:
+            keys = [
+                dct["Key"]
+                for dct in fan_out_list_objects_v2(
+                    s3_client=self.s3_client,
+                    bucket=self.bucket,
+                    prefix=self.prefix_test_list_objects,
+                    concurrency=2,
+                    start_after=start_after,
+                )
+            ]
+            assert keys == [key for key in expected if key > start_after]
+
+        with pytest.raises(ValueError):
+            fan_out_list_objects_v2(
+                s3_client=self.s3_client,
+                bucket=self.bucket,
+                prefix=self.prefix_test_list_objects,
+                concurrency=0,
+            )
+
+        # the sub prefixes are split until there are enough of them
+        calls = list()
+
+        def before_call(model, params, **kwargs):
+            if model.name == "ListObjectsV2":
+                calls.append(params)
+
+        self.s3_client.meta.events.register("before-call.s3", before_call)
+        try:
+            for ordered in [True, False]:
+                calls.clear()
+                keys = [
+                    dct["Key"]
+                    for dct in fan_out_list_objects_v2(
+                        s3_client=self.s3_client,
+                        bucket=self.bucket,
+                        prefix=self.prefix_test_list_objects,
+                        concurrency=4,
+                        ordered=ordered,
+                    )
+                ]
+                assert (keys if ordered else sorted(keys)) == expected
+                # the prefix and its 3 sub folders, all listed with delimiter
+                assert len(calls) == 4
+                assert all(
+                    params["query_string"].get("delimiter") == "/" for params in calls
+                )
+
+            # the objects of a sub prefix are streamed page by page
+            prefix = f"{self.prefix}fan_out_stream/"
+            for i in range(10):
+                self.s3_client.put_object(
+                    Bucket=self.bucket, Key=f"{prefix}sub/{i}.txt", Body=b""
+                )
+            calls.clear()
+            iterator = iter(
+                fan_out_list_objects_v2(
+                    s3_client=self.s3_client,
+                    bucket=self.bucket,
+                    prefix=prefix,
+                    concurrency=1,
+                    batch_size=1,
+                )
+            )
+            assert next(iterator)["Key"] == f"{prefix}sub/0.txt"
+            assert len(calls) < 10
+            assert len(list(iterator)) == 9
+
+            # a flat prefix over many pages is not split, it is streamed
+            prefix = f"{self.prefix}fan_out_flat/"
+            for i in range(20):
+                self.s3_client.put_object(
+                    Bucket=self.bucket, Key=f"{prefix}{i:02d}.txt", Body=b""
+                )
+            calls.clear()
+            iterator = iter(
+                fan_out_list_objects_v2(
+                    s3_client=self.s3_client,
+                    bucket=self.bucket,
+                    prefix=prefix,
+                    concurrency=2,
+                    batch_size=2,
+                )
+            )
+            assert next(iterator)["Key"] == f"{prefix}00.txt"
+            assert len(calls) < 10
+            assert [dct["Key"] for dct in iterator] == [
+                f"{prefix}{i:02d}.txt" for i in range(1, 20)
+            ]
+        finally:
+            self.s3_client.meta.events.unregister("before-call.s3", before_call)
+
     def _test_calculate_total_size(self):
         s3_client = self.s3_client
         bucket = self.bucket
@@ -253,6 +411,7 @@ class BetterListObjects(DummyData):
         self._test_paginate_list_objects_v2_contents()
         self._test_paginate_list_objects_v2_common_prefixs()
         self._test_paginate_list_objects_v2_hard_and_soft_folder()
+        self._test_fan_out_list_objects_v2()
         self._test_calculate_total_size()
         self._test_count_objects()
 
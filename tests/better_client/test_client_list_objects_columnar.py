@@ -0,0 +1,211 @@
+# -*- coding: utf-8 -*-
+
+from datetime import datetime, timezone
+
+import pytest
+
+from s3pathlib.better_client import list_objects_columnar as columnar
+from s3pathlib.better_client.list_objects import paginate_list_objects_v2
+from s3pathlib.better_client.list_objects_columnar import (
+    ObjectColumns,
+    list_objects_columnar,
+)
+from s3pathlib.utils import smart_join_s3_key
+from s3pathlib.tests import run_cov_test
+from s3pathlib.tests.mock import BaseTest
+
+
+def _make_columns() -> ObjectColumns:
+    columns = ObjectColumns(bucket="bucket")
+    columns.extend(
+        [
+            {
+                "Key": f"data/{folder}/{i}.txt",
+                "Size": i,
+                "LastModified": datetime(2024, 1, 1 + i, tzinfo=timezone.utc),
+                "ETag": f'"etag-{i}"',
+                "StorageClass": storage_class,
+            }
+            for folder, storage_class in [
+                ("a", "STANDARD"),
+                ("b", "GLACIER"),
+            ]
+            for i in range(1, 1 + 5)
+        ]
+    )
+    return columns
+
+
+def _test_where(columns: ObjectColumns):
+    assert columns.where(min_size=4) == [3, 4, 8, 9]
+    assert columns.where(max_size=1) == [0, 5]
+    assert columns.where(
+        modified_after=datetime(2024, 1, 3, tzinfo=timezone.utc),
+        modified_before=datetime(2024, 1, 5, tzinfo=timezone.utc),
+    ) == [1, 2, 6, 7]
+    assert columns.where(storage_classes=["GLACIER", "DEEP_ARCHIVE"]) == [
+        5,
+        6,
+        7,
+        8,
+        9,
+    ]
+    assert columns.where(storage_classes=["DEEP_ARCHIVE"]) == []
+    assert columns.where(key_prefix="data/b/", key_suffix="5.txt") == [9]
+    assert columns.where(min_size=2, key_prefix="data/a/") == [1, 2, 3, 4]
+
+
+def _test_aggregate(columns: ObjectColumns):
+    assert columns.total_size() == 30
+    assert columns.size_by_storage_class() == {
+        "STANDARD": (5, 15),
+        "GLACIER": (5, 15),
+    }
+    assert columns.size_by_prefix(prefix="data/") == {
+        "data/a/": (5, 15),
+        "data/b/": (5, 15),
+    }
+    assert columns.size_by_prefix(prefix="data/", depth=0) == {"data/": (10, 30)}
+    assert columns.size_by_prefix(prefix="data/b/", depth=2) == {"data/b/": (5, 15)}
+    assert columns.size_by_prefix(prefix="", depth=2) == {
+        "data/a/": (5, 15),
+        "data/b/": (5, 15),
+    }
+    assert columns.size_by_prefix(prefix="x/") == {}
+
+    empty = ObjectColumns(bucket="bucket")
+    assert empty.total_size() == 0
+    assert empty.size_by_storage_class() == {}
+    assert empty.size_by_prefix() == {}
+
+
+def test_object_columns():
+    columns = _make_columns()
+    assert len(columns) == 10
+    assert columns.get_key(0) == "data/a/1.txt"
+    assert columns.get_etag(9) == '"etag-5"'
+    assert columns.get_storage_class(9) == "GLACIER"
+    assert list(columns.iter_keys())[5] == "data/b/1.txt"
+    content = columns.get_content(1)
+    assert content["Key"] == "data/a/2.txt"
+    assert content["LastModified"] == datetime(2024, 1, 3, tzinfo=timezone.utc)
+
+    _test_aggregate(columns)
+    _test_where(columns)
+
+    subset = columns.filter(storage_classes=["GLACIER"], min_size=4)
+    assert len(subset) == 2
+    assert list(subset.iter_keys()) == ["data/b/4.txt", "data/b/5.txt"]
+    assert subset.size_by_storage_class() == {"GLACIER": (2, 9)}
+    assert [p.uri for p in subset.iter_s3path()] == [
+        "s3://bucket/data/b/4.txt",
+        "s3://bucket/data/b/5.txt",
+    ]
+    assert subset.iter_s3path().one().size == 4
+
+
+def test_without_numpy(monkeypatch):
+    monkeypatch.setattr(columnar, "np", None)
+    _test_aggregate(_make_columns())
+    _test_where(_make_columns())
+
+
+def test_to_numpy():
+    np = pytest.importorskip("numpy")
+    columns = _make_columns()
+    arrays = columns.to_numpy()
+    assert arrays["key"][9] == "data/b/5.txt"
+    assert arrays["size"].tolist() == [1, 2, 3, 4, 5] * 2
+    assert arrays["storage_class"][5] == "GLACIER"
+    assert arrays["last_modified"].dtype == np.float64
+    # the arrays don't lock the underlying buffers
+    columns.extend(_make_columns().iter_contents())
+    assert len(columns) == 20
+    assert len(arrays["size"]) == 10
+
+
+def test_to_arrow():
+    pytest.importorskip("pyarrow")
+    columns = _make_columns()
+    table = columns.to_arrow()
+    assert table.column("key").to_pylist()[9] == "data/b/5.txt"
+    assert table.column("etag").to_pylist()[0] == '"etag-1"'
+    assert table.column("storage_class").to_pylist()[5] == "GLACIER"
+    columns.extend(_make_columns().iter_contents())
+    assert len(columns) == 20
+    assert table.num_rows == 10
+
+
+class BetterListObjectsColumnar(BaseTest):
+    module = "better_client.list_objects_columnar"
+    prefix_columnar: str
+
+    @classmethod
+    def custom_setup_class(cls):
+        s3_client = cls.bsm.s3_client
+        bucket = cls.get_bucket()
+        cls.prefix_columnar = smart_join_s3_key(
+            parts=[cls.get_prefix(), "columnar"],
+            is_dir=True,
+        )
+        s3_client.put_object(
+            Bucket=bucket, Key=cls.prefix_columnar + "hard_folder/", Body=b""
+        )
+        for folder in ["hard_folder", "soft_folder"]:
+            for i in range(1, 1 + 5):
+                s3_client.put_object(
+                    Bucket=bucket,
+                    Key=f"{cls.prefix_columnar}{folder}/{i}.txt",
+                    Body=b"a" * i,
+                )
+
+    def _test_list_objects_columnar(self):
+        columns = list_objects_columnar(
+            s3_client=self.s3_client,
+            bucket=self.bucket,
+            prefix=self.prefix_columnar,
+            batch_size=3,
+        )
+        expected = [
+            dct["Key"]
+            for dct in paginate_list_objects_v2(
+                s3_client=self.s3_client,
+                bucket=self.bucket,
+                prefix=self.prefix_columnar,
+            ).contents()
+            if not dct["Key"].endswith("/")
+        ]
+        assert list(columns.iter_keys()) == expected
+        assert columns.total_size() == 30
+        assert columns.size_by_prefix(prefix=self.prefix_columnar) == {
+            f"{self.prefix_columnar}hard_folder/": (5, 15),
+            f"{self.prefix_columnar}soft_folder/": (5, 15),
+        }
+
+        columns = list_objects_columnar(
+            s3_client=self.s3_client,
+            bucket=self.bucket,
+            prefix=self.prefix_columnar,
+            include_folder=True,
+            concurrency=4,
+        )
+        assert len(columns) == 11
+
+    def test(self):
+        self._test_list_objects_columnar()
+
+
+class Test(BetterListObjectsColumnar):
+    use_mock = False
+
+
+class TestUseMock(BetterListObjectsColumnar):
+    use_mock = True
+
+
+if __name__ == "__main__":
+    run_cov_test(
+        __file__,
+        "s3pathlib.better_client.list_objects_columnar",
+        preview=False,
+    )
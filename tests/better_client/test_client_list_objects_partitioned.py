@@ -0,0 +1,206 @@
+# -*- coding: utf-8 -*-
+
+import hashlib
+import multiprocessing
+
+import pytest
+from s3pathlib.better_client.list_objects import paginate_list_objects_v2
+from s3pathlib.better_client import list_objects_partitioned
+from s3pathlib.better_client.list_objects_partitioned import (
+    key_midpoint,
+    sample_keyspace,
+    split_keyspace,
+    partitioned_list_objects_v2,
+)
+from s3pathlib.utils import smart_join_s3_key
+from s3pathlib.tests import run_cov_test
+from s3pathlib.tests.mock import BaseTest
+
+
+def test_key_midpoint():
+    assert key_midpoint("a", "c") == "b"
+    assert key_midpoint("2024-01", "2024-03") == "2024-02"
+    assert key_midpoint("a", "a") is None
+    assert key_midpoint("a/0", "a/1") is not None
+    assert "a/0" < key_midpoint("a/0", "a/1") < "a/1"
+    assert "a" < key_midpoint("a", "a0") < "a0"
+
+
+def test_split_keyspace():
+    samples = ["a", "b", "c", "d"]
+    assert split_keyspace(samples, n_partitions=1) == [(None, None)]
+    assert split_keyspace(samples, n_partitions=2) == [(None, "c"), ("c", None)]
+    assert split_keyspace(samples, n_partitions=2, start_after="0") == [
+        ("0", "c"),
+        ("c", None),
+    ]
+    assert len(split_keyspace(samples, n_partitions=10)) == 5
+    with pytest.raises(ValueError):
+        split_keyspace(samples, n_partitions=0)
+
+
+class BetterListObjectsPartitioned(BaseTest):
+    module = "better_client.list_objects_partitioned"
+    prefix_hashed_keys: str
+    keys: list
+
+    @classmethod
+    def custom_setup_class(cls):
+        s3_client = cls.bsm.s3_client
+        bucket = cls.get_bucket()
+        cls.prefix_hashed_keys = smart_join_s3_key(
+            parts=[cls.get_prefix(), "hashed_keys"],
+            is_dir=True,
+        )
+        for i in range(200):
+            key = cls.prefix_hashed_keys + hashlib.md5(str(i).encode()).hexdigest()
+            s3_client.put_object(Bucket=bucket, Key=key, Body=b"")
+        cls.keys = [
+            dct["Key"]
+            for dct in paginate_list_objects_v2(
+                s3_client=s3_client,
+                bucket=bucket,
+                prefix=cls.prefix_hashed_keys,
+            ).contents()
+        ]
+
+    def _test_sample_keyspace(self):
+        samples = sample_keyspace(
+            s3_client=self.s3_client,
+            bucket=self.bucket,
+            prefix=self.prefix_hashed_keys,
+            n_samples=8,
+        )
+        assert len(samples) >= 8
+        assert samples == sorted(samples)
+        assert set(samples).issubset(self.keys)
+
+        samples = sample_keyspace(
+            s3_client=self.s3_client,
+            bucket=self.bucket,
+            prefix=self.prefix + "/never_exists/",
+        )
+        assert samples == []
+
+    def _test_partitioned_list_objects_v2(self):
+        for concurrency, n_partitions in [(1, 1), (4, 3), (4, 16)]:
+            keys = [
+                dct["Key"]
+                for dct in partitioned_list_objects_v2(
+                    s3_client=self.s3_client,
+                    bucket=self.bucket,
+                    prefix=self.prefix_hashed_keys,
+                    concurrency=concurrency,
+                    n_partitions=n_partitions,
+                    batch_size=10,
+                )
+            ]
+            assert keys == self.keys
+
+        keys = [
+            dct["Key"]
+            for dct in partitioned_list_objects_v2(
+                s3_client=self.s3_client,
+                bucket=self.bucket,
+                prefix=self.prefix_hashed_keys,
+                start_after=self.keys[49],
+                limit=100,
+            )
+        ]
+        assert keys == self.keys[50:150]
+
+        contents = partitioned_list_objects_v2(
+            s3_client=self.s3_client,
+            bucket=self.bucket,
+            prefix=self.prefix + "/never_exists/",
+        ).all()
+        assert contents == []
+
+        with pytest.raises(ValueError):
+            partitioned_list_objects_v2(
+                s3_client=self.s3_client,
+                bucket=self.bucket,
+                prefix=self.prefix_hashed_keys,
+                concurrency=0,
+            )
+
+    def _test_partitioned_list_objects_v2_process_pool(self):
+        with pytest.raises(ValueError):
+            partitioned_list_objects_v2(
+                s3_client=self.s3_client,
+                bucket=self.bucket,
+                prefix=self.prefix_hashed_keys,
+                use_process_pool=True,
+            )
+
+        # the worker processes create their own clients, a forked worker
+        # inherits the moto mock and its data
+        if self.use_mock and multiprocessing.get_start_method() != "fork":
+            pytest.skip("the moto mock is only visible to the forked workers")
+        credentials = self.bsm.boto_ses.get_credentials().get_frozen_credentials()
+        s3_client_kwargs = dict(
+            region_name=self.bsm.aws_region,
+            aws_access_key_id=credentials.access_key,
+            aws_secret_access_key=credentials.secret_key,
+            aws_session_token=credentials.token,
+        )
+        keys = [
+            dct["Key"]
+            for dct in partitioned_list_objects_v2(
+                s3_client=self.s3_client,
+                bucket=self.bucket,
+                prefix=self.prefix_hashed_keys,
+                concurrency=2,
+                n_partitions=4,
+                use_process_pool=True,
+                s3_client_kwargs=s3_client_kwargs,
+                batch_size=10,
+            )
+        ]
+        assert keys == self.keys
+
+        # each key range is listed by several bounded batches
+        pages_per_batch = list_objects_partitioned._PAGES_PER_BATCH
+        list_objects_partitioned._PAGES_PER_BATCH = 1
+        try:
+            keys = [
+                dct["Key"]
+                for dct in partitioned_list_objects_v2(
+                    s3_client=self.s3_client,
+                    bucket=self.bucket,
+                    prefix=self.prefix_hashed_keys,
+                    concurrency=2,
+                    n_partitions=3,
+                    use_process_pool=True,
+                    s3_client_kwargs=s3_client_kwargs,
+                    batch_size=7,
+                    start_after=self.keys[9],
+                    limit=150,
+                )
+            ]
+        finally:
+            list_objects_partitioned._PAGES_PER_BATCH = pages_per_batch
+        assert keys == self.keys[10:160]
+
+    def test(self):
+        self._test_sample_keyspace()
+        self._test_partitioned_list_objects_v2()
+
+    def test_process_pool(self):
+        self._test_partitioned_list_objects_v2_process_pool()
+
+
+class Test(BetterListObjectsPartitioned):
+    use_mock = False
+
+
+class TestUseMock(BetterListObjectsPartitioned):
+    use_mock = True
+
+
+if __name__ == "__main__":
+    run_cov_test(
+        __file__,
+        module="s3pathlib.better_client.list_objects_partitioned",
+        preview=False,
+    )
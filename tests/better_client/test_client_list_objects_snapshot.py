@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+
+from datetime import datetime, timezone, timedelta
+
+import pytest
+
+from s3pathlib.better_client.delete_object import delete_dir
+from s3pathlib.better_client.list_objects_snapshot import (
+    get_prefix_upper_bound,
+    ListingSnapshot,
+)
+from s3pathlib.utils import smart_join_s3_key
+from s3pathlib.tests import run_cov_test
+from s3pathlib.tests.mock import BaseTest
+
+
+def test_get_prefix_upper_bound():
+    assert get_prefix_upper_bound("a/") == "a0"
+    assert get_prefix_upper_bound("a") == "b"
+    assert get_prefix_upper_bound("") is None
+    # skip the surrogates, they can't be encoded in UTF-8
+    assert get_prefix_upper_bound("a\ud7ff") == "a\ue000"
+    # carry into the previous character
+    assert get_prefix_upper_bound("a\U0010ffff") == "b"
+    assert get_prefix_upper_bound("\U0010ffff\U0010ffff") is None
+    for prefix in ["a\ud7ff", "a\U0010ffff"]:
+        upper = get_prefix_upper_bound(prefix)
+        assert (prefix + "\U0010ffff").encode("utf-8") < upper.encode("utf-8")
+
+
+def test_where_prefix_edge_characters():
+    keys = ["a\ud7ff/1.txt", "a\ue000", "a\U0010ffff/1.txt", "b"]
+    with ListingSnapshot(":memory:", bucket="bucket", prefix="") as snapshot:
+        snapshot._insert(
+            [
+                {
+                    "Key": key,
+                    "Size": 1,
+                    "LastModified": datetime(2024, 1, 1, tzinfo=timezone.utc),
+                }
+                for key in keys
+            ]
+        )
+        assert snapshot.count(prefix="a\ud7ff") == 1
+        assert snapshot.count(prefix="a\U0010ffff") == 1
+        assert snapshot.count(prefix="a") == 3
+
+
+class BetterListObjectsSnapshot(BaseTest):
+    module = "better_client.list_objects_snapshot"
+    prefix_snapshot: str
+
+    @classmethod
+    def custom_setup_class(cls):
+        cls.prefix_snapshot = smart_join_s3_key(
+            parts=[cls.get_prefix(), "snapshot"],
+            is_dir=True,
+        )
+        delete_dir(
+            s3_client=cls.bsm.s3_client,
+            bucket=cls.get_bucket(),
+            prefix=cls.prefix_snapshot,
+        )
+
+    def _put(self, key: str, body: bytes = b"a"):
+        self.s3_client.put_object(
+            Bucket=self.bucket,
+            Key=self.prefix_snapshot + key,
+            Body=body,
+        )
+
+    def _test_snapshot(self):
+        prefix = self.prefix_snapshot
+        self._put("README.txt", b"hello")
+        self._put("dt=2024-01-01/", b"")
+        self._put("dt=2024-01-01/1.txt")
+        self._put("dt=2024-01-01/2.txt", b"aa")
+        self._put("dt=2024-01-02/1.txt", b"aaa")
+
+        snapshot = ListingSnapshot(":memory:", bucket=self.bucket, prefix=prefix)
+        assert snapshot.refreshed_at is None
+        # first refresh is full refresh, hard folder is excluded
+        assert snapshot.refresh(self.s3_client) == 4
+        assert snapshot.refreshed_at is not None
+        assert snapshot.count() == 4
+        assert snapshot.total_size() == 11
+        assert snapshot.total_size(prefix=f"{prefix}dt=2024-01-01/") == 3
+        assert snapshot.size_by_prefix() == {
+            prefix: (1, 5),
+            f"{prefix}dt=2024-01-01/": (2, 3),
+            f"{prefix}dt=2024-01-02/": (1, 3),
+        }
+        assert snapshot.get_last_key() == f"{prefix}dt=2024-01-02/1.txt"
+
+        # append only refresh
+        self._put("dt=2024-01-03/1.txt")
+        assert snapshot.refresh(self.s3_client) == 1
+        assert snapshot.count() == 5
+
+        # keys newer than
+        keys = list(
+            snapshot.iter_keys_newer_than(
+                datetime.now(timezone.utc) - timedelta(days=1)
+            )
+        )
+        assert len(keys) == 5
+        assert list(
+            snapshot.iter_keys_newer_than(
+                datetime.now(timezone.utc) + timedelta(days=1)
+            )
+        ) == []
+
+        # etag lookup
+        etag = self.s3_client.head_object(
+            Bucket=self.bucket, Key=f"{prefix}dt=2024-01-01/1.txt"
+        )["ETag"]
+        assert snapshot.get_etag(f"{prefix}dt=2024-01-01/1.txt") == etag
+        assert snapshot.get_etag(f"{prefix}not-exists.txt") is None
+        assert snapshot.find_keys_by_etag(etag) == [
+            f"{prefix}dt=2024-01-01/1.txt",
+            f"{prefix}dt=2024-01-03/1.txt",
+        ]
+
+        # re-scan a changed sub prefix only
+        self.s3_client.delete_object(
+            Bucket=self.bucket, Key=f"{prefix}dt=2024-01-01/2.txt"
+        )
+        assert (
+            snapshot.refresh_prefixes(self.s3_client, [f"{prefix}dt=2024-01-01/"])
+            == 1
+        )
+        assert snapshot.count() == 4
+        with pytest.raises(ValueError):
+            snapshot.refresh_prefixes(self.s3_client, ["other/"])
+
+        # only scan the new sub folders
+        self._put("dt=2024-01-04/1.txt")
+        self._put("dt=2024-01-04/2.txt")
+        self._put("dt=2024-01-02/2.txt")  # not picked up, it is immutable
+        self._put("new.txt")
+        assert snapshot.refresh_new_prefixes(self.s3_client) == [
+            f"{prefix}dt=2024-01-04/"
+        ]
+        assert snapshot.count() == 7
+        assert snapshot.count(prefix=f"{prefix}dt=2024-01-02/") == 1
+
+        # feed S3PathIterProxy without hitting S3
+        s3path_list = snapshot.iter_s3path(prefix=f"{prefix}dt=2024-01-04/").all()
+        assert [p.basename for p in s3path_list] == ["1.txt", "2.txt"]
+        assert s3path_list[0].size == 1
+        assert s3path_list[0].etag == etag.strip('"')
+
+        # full refresh
+        assert snapshot.full_refresh(self.s3_client) == 8
+        snapshot.close()
+
+    def _test_persistent(self, tmp_path):
+        path = str(tmp_path / "snapshot.sqlite")
+        with ListingSnapshot(path, bucket=self.bucket, prefix=self.prefix_snapshot) as snapshot:
+            snapshot.refresh(self.s3_client)
+            count = snapshot.count()
+        with ListingSnapshot(path, bucket=self.bucket, prefix=self.prefix_snapshot) as snapshot:
+            assert snapshot.count() == count
+            assert snapshot.refreshed_at is not None
+        with pytest.raises(ValueError):
+            ListingSnapshot(path, bucket=self.bucket, prefix="other/")
+
+    def test(self, tmp_path):
+        self._test_snapshot()
+        self._test_persistent(tmp_path)
+
+
+class Test(BetterListObjectsSnapshot):
+    use_mock = False
+
+
+class TestUseMock(BetterListObjectsSnapshot):
+    use_mock = True
+
+
+if __name__ == "__main__":
+    run_cov_test(
+        __file__,
+        "s3pathlib.better_client.list_objects_snapshot",
+        preview=False,
+    )
@@ -0,0 +1,214 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+
+from s3pathlib.core import S3Path
+from s3pathlib.better_client.delete_object import delete_dir
+from s3pathlib.better_client.stat_objects import (
+    group_keys_by_parent,
+    estimate_list_pages,
+    plan_stat_objects,
+    estimate_stat_cost,
+    stat_objects,
+    find_existing_keys,
+)
+from s3pathlib.utils import smart_join_s3_key
+from s3pathlib.tests import run_cov_test
+from s3pathlib.tests.mock import BaseTest
+
+
+def test_group_keys_by_parent():
+    assert group_keys_by_parent(
+        ["a/2.txt", "a/1.txt", "b/1.txt", "README.txt", "a/b/", "a/1.txt"]
+    ) == {
+        "a/": ["a/1.txt", "a/2.txt", "a/b/"],
+        "b/": ["b/1.txt"],
+        "": ["README.txt"],
+    }
+
+
+def test_estimate_list_pages():
+    assert estimate_list_pages(0) == 0
+    assert estimate_list_pages(1) == 1
+    assert estimate_list_pages(1000) == 1
+    assert estimate_list_pages(1001) == 2
+
+
+def test_plan_stat_objects():
+    list_groups, head_keys = plan_stat_objects(
+        {
+            "a/": ["a/1.txt", "a/2.txt", "a/b/"],
+            "b/": ["b/1.txt"],
+        }
+    )
+    assert list_groups == [("a/", ["a/1.txt", "a/2.txt"])]
+    assert sorted(head_keys) == ["a/b/", "b/1.txt"]
+
+    # listing is expensive
+    list_groups, head_keys = plan_stat_objects(
+        {"a/": ["a/1.txt", "a/2.txt"]}, list_cost=12.5
+    )
+    assert list_groups == []
+    assert head_keys == ["a/1.txt", "a/2.txt"]
+
+
+def test_estimate_stat_cost():
+    keys_by_parent = {
+        "a/": ["a/1.txt", "a/2.txt"],
+        "b/": ["b/1.txt"],
+    }
+    assert estimate_stat_cost(keys_by_parent) == 2
+    assert estimate_stat_cost(keys_by_parent, list_cost=12.5) == 3
+
+
+class BetterStatObjects(BaseTest):
+    module = "better_client.stat_objects"
+    prefix_stat: str
+
+    @classmethod
+    def custom_setup_class(cls):
+        cls.prefix_stat = smart_join_s3_key(
+            parts=[cls.get_prefix(), "stat_objects"],
+            is_dir=True,
+        )
+        delete_dir(
+            s3_client=cls.bsm.s3_client,
+            bucket=cls.get_bucket(),
+            prefix=cls.prefix_stat,
+        )
+        for key in [
+            "a/1.txt",
+            "a/2.txt",
+            "a/4.txt",
+            "a/sub/1.txt",
+            "b/",
+            "README.txt",
+        ] + [f"c/{i:02d}.txt" for i in range(20)]:
+            cls.bsm.s3_client.put_object(
+                Bucket=cls.get_bucket(),
+                Key=cls.prefix_stat + key,
+                Body=key.encode("utf-8"),
+            )
+
+    def _count_calls(self, func) -> dict:
+        counter = {"HeadObject": 0, "ListObjectsV2": 0}
+
+        def handler(model, **kwargs):
+            if model.name in counter:
+                counter[model.name] += 1
+
+        events = self.s3_client.meta.events
+        events.register("before-call.s3", handler)
+        try:
+            counter["result"] = func()
+        finally:
+            events.unregister("before-call.s3", handler)
+        return counter
+
+    def _test_stat_objects(self):
+        prefix = self.prefix_stat
+        keys = [
+            prefix + key
+            for key in [
+                "a/1.txt",
+                "a/2.txt",
+                "a/3.txt",
+                "a/4.txt",
+                "a/sub/",
+                "b/",
+                "README.txt",
+                "not-exists.txt",
+            ]
+        ]
+        counter = self._count_calls(
+            lambda: stat_objects(self.s3_client, self.bucket, keys, concurrency=4)
+        )
+        stats = counter["result"]
+        assert sorted(stats) == sorted(keys)
+        assert stats[prefix + "a/1.txt"]["Size"] == len("a/1.txt")
+        assert stats[prefix + "a/3.txt"] is None
+        assert stats[prefix + "a/4.txt"]["Key"] == prefix + "a/4.txt"
+        assert stats[prefix + "a/sub/"] is None
+        assert stats[prefix + "b/"]["Size"] == len("b/")
+        assert stats[prefix + "README.txt"]["StorageClass"] == "STANDARD"
+        assert stats[prefix + "not-exists.txt"] is None
+        # the two groups are listed, the hard folders are headed
+        assert counter["ListObjectsV2"] == 2
+        assert counter["HeadObject"] == 2
+
+        # page budget runs out, fall back to head_object
+        keys = [
+            prefix + key for key in ["c/00.txt", "c/01.txt", "c/19.txt", "c/20.txt"]
+        ]
+        counter = self._count_calls(
+            lambda: stat_objects(self.s3_client, self.bucket, keys, batch_size=2)
+        )
+        stats = counter["result"]
+        assert stats[prefix + "c/19.txt"]["Key"] == prefix + "c/19.txt"
+        assert stats[prefix + "c/20.txt"] is None
+        assert counter["ListObjectsV2"] == 4
+        assert counter["HeadObject"] == 2
+
+        assert stat_objects(self.s3_client, self.bucket, []) == {}
+        with pytest.raises(ValueError):
+            stat_objects(self.s3_client, self.bucket, keys, concurrency=0)
+
+    def _test_find_existing_keys(self):
+        prefix = self.prefix_stat
+        keys = [prefix + key for key in ["a/1.txt", "a/3.txt", "c/05.txt", "d/1.txt"]]
+        # one listing covers everything
+        counter = self._count_calls(
+            lambda: find_existing_keys(
+                self.s3_client, self.bucket, prefix=prefix, keys=keys
+            )
+        )
+        assert counter["result"] == {prefix + "a/1.txt", prefix + "c/05.txt"}
+        assert counter["ListObjectsV2"] == 1
+        assert counter["HeadObject"] == 0
+
+        # page budget runs out, fall back to stat_objects
+        counter = self._count_calls(
+            lambda: find_existing_keys(
+                self.s3_client, self.bucket, prefix=prefix, keys=keys, batch_size=2
+            )
+        )
+        assert counter["result"] == {prefix + "a/1.txt", prefix + "c/05.txt"}
+        assert counter["HeadObject"] > 0
+
+        assert find_existing_keys(self.s3_client, self.bucket, prefix, []) == set()
+        with pytest.raises(ValueError):
+            find_existing_keys(self.s3_client, self.bucket, "other/", keys)
+
+    def _test_stat_many(self):
+        s3dir = S3Path(self.bucket, self.prefix_stat)
+        paths = [
+            s3dir.joinpath("a", "2.txt"),
+            s3dir.joinpath("a", "3.txt"),
+            s3dir.joinpath("a", "1.txt"),
+            s3dir.joinpath("README.txt"),
+        ]
+        existing = S3Path.stat_many(paths)
+        assert [p.basename for p in existing] == ["2.txt", "1.txt", "README.txt"]
+        assert existing[0].size == len("a/2.txt")
+        assert existing[0].etag is not None
+        assert S3Path.exists_many(paths) == [True, False, True, True]
+        assert S3Path.exists_many(paths) == [p.exists() for p in paths]
+        with pytest.raises(TypeError):
+            S3Path.stat_many([s3dir])
+
+    def test(self):
+        self._test_stat_objects()
+        self._test_find_existing_keys()
+        self._test_stat_many()
+
+
+class Test(BetterStatObjects):
+    use_mock = False
+
+
+class TestUseMock(BetterStatObjects):
+    use_mock = True
+
+
+if __name__ == "__main__":
+    run_cov_test(__file__, "s3pathlib.better_client.stat_objects", preview=False)
@@ -0,0 +1,310 @@
+# -*- coding: utf-8 -*-
+
+import os
+import time
+import threading
+from datetime import datetime, timezone
+
+import pytest
+
+from boto3.s3.transfer import TransferConfig
+
+from s3pathlib.better_client.sync import (
+    CompareEnum,
+    SyncActionEnum,
+    FileInfo,
+    make_filters,
+    is_included,
+    is_different,
+    diff_files,
+    sync_local_to_s3,
+    sync_s3_to_local,
+    sync_s3_to_s3,
+    _SyncRunner,
+)
+from s3pathlib.etag import calculate_etag
+from s3pathlib.utils import smart_join_s3_key
+from s3pathlib.tests import run_cov_test
+from s3pathlib.tests.mock import BaseTest
+
+t1 = datetime(2024, 1, 1, tzinfo=timezone.utc)
+t2 = datetime(2024, 1, 2, tzinfo=timezone.utc)
+
+
+def test_make_filters():
+    assert make_filters() == []
+    assert make_filters(include="*.txt", exclude=["*", "a/*"]) == [
+        (True, "*.txt"),
+        (False, "*"),
+        (False, "a/*"),
+    ]
+
+
+def test_is_included():
+    assert is_included("a/1.txt", []) is True
+    assert is_included("a/1.txt", make_filters(exclude="*.txt")) is False
+    assert is_included("a/1.txt", make_filters(exclude="a/*")) is False
+    assert is_included("b/1.txt", make_filters(exclude="a/*")) is True
+    # the last matched filter wins
+    assert is_included("a/1.txt", [(False, "*"), (True, "a/*")]) is True
+    assert is_included("a/1.txt", [(True, "a/*"), (False, "*")]) is False
+
+
+def test_is_different():
+    a = FileInfo("a", 1, t1, etag="e1")
+    assert is_different(a, FileInfo("a", 2, t1, etag="e1")) is True
+    assert is_different(a, FileInfo("a", 1, t1, etag="e2")) is False
+    assert is_different(FileInfo("a", 1, t2, etag="e1"), a) is True
+    assert is_different(a, FileInfo("a", 1, t2, etag="e1")) is False
+
+    compare = CompareEnum.size
+    assert is_different(FileInfo("a", 1, t2, etag="e1"), a, compare) is False
+
+    compare = CompareEnum.etag
+    assert is_different(a, FileInfo("a", 1, t1, etag="e2"), compare) is True
+    assert is_different(FileInfo("a", 1, t2, etag="e1"), a, compare) is False
+    # multipart etag falls back to size_and_mtime
+    b = FileInfo("a", 1, t1, etag="e1-2")
+    assert is_different(b, FileInfo("a", 1, t1, etag="e1-2"), compare) is False
+    assert is_different(FileInfo("a", 1, t2, etag="e2"), b, compare) is True
+    assert is_different(FileInfo("a", 1, t1, etag="e2"), b, compare) is False
+
+    with pytest.raises(ValueError):
+        is_different(a, FileInfo("a", 1, t1), "invalid")
+
+
+def test_diff_files():
+    src = [
+        FileInfo("a.txt", 1, t1),
+        FileInfo("b.txt", 1, t2),
+        FileInfo("c.log", 1, t1),
+        FileInfo("d.txt", 1, t1),
+    ]
+    dst = [
+        FileInfo("0.txt", 1, t1),
+        FileInfo("b.txt", 1, t1),
+        FileInfo("d.txt", 1, t1),
+        FileInfo("e.txt", 1, t1),
+    ]
+
+    def simplify(diffs):
+        return [
+            (
+                None if s is None else s.key,
+                None if d is None else d.key,
+            )
+            for s, d in diffs
+        ]
+
+    assert simplify(diff_files(src, dst)) == [
+        ("a.txt", None),
+        ("b.txt", "b.txt"),
+        ("c.log", None),
+        (None, None),
+    ]
+    assert simplify(
+        diff_files(src, dst, delete=True, filters=make_filters(exclude="*.log"))
+    ) == [
+        (None, "0.txt"),
+        ("a.txt", None),
+        ("b.txt", "b.txt"),
+        (None, None),
+        (None, "e.txt"),
+    ]
+    assert simplify(diff_files([], dst, delete=True)) == [
+        (None, "0.txt"),
+        (None, "b.txt"),
+        (None, "d.txt"),
+        (None, "e.txt"),
+    ]
+
+
+def test_diff_files_verify(tmp_path):
+    path = tmp_path.joinpath("a.txt")
+    path.write_text("a")
+    src = [FileInfo("a.txt", 1, t1, path=f"{path}")]
+    dst = [FileInfo("a.txt", 1, t1, etag=calculate_etag(f"{path}"))]
+    compare = CompareEnum.etag
+    assert list(diff_files(src, dst, compare=compare)) == [(None, None)]
+    # the local file is not hashed, the pair is left to the caller
+    path.unlink()
+    assert list(diff_files(src, dst, compare=compare, verify=False)) == [
+        (src[0], dst[0])
+    ]
+
+
+def test_sync_runner_verify(tmp_path):
+    src, dst = list(), list()
+    for i in range(8):
+        path = tmp_path.joinpath(f"{i}.txt")
+        path.write_text(f"{i}")
+        src.append(FileInfo(f"{i}.txt", 1, t1, path=f"{path}"))
+        etag = calculate_etag(f"{path}") if i % 2 else "e"
+        dst.append(FileInfo(f"{i}.txt", 1, t1, etag=etag))
+    # the file is gone before it is verified
+    tmp_path.joinpath("7.txt").unlink()
+
+    threads = set()
+    main_thread = threading.current_thread()
+
+    class Info(FileInfo):
+        def is_etag_match(self, etag: str) -> bool:
+            threads.add(threading.current_thread())
+            return super().is_etag_match(etag)
+
+    src = [
+        Info(info.key, info.size, info.last_modified, path=info.path)
+        for info in src
+    ]
+    transferred = list()
+    runner = _SyncRunner(
+        transfer=lambda info: transferred.append(info.key),
+        delete=lambda infos: dict(),
+        transfer_action=SyncActionEnum.upload,
+        delete_batch_size=1,
+        concurrency=4,
+        dryrun=False,
+        compare=CompareEnum.etag,
+    )
+    report = runner.run(diff_files(src, dst, compare=CompareEnum.etag, verify=False))
+    assert main_thread not in threads
+    assert len(threads) > 0
+    assert sorted(transferred) == ["0.txt", "2.txt", "4.txt", "6.txt"]
+    assert report.n_skipped == 3
+    assert [action.key for action in report.failed] == ["7.txt"]
+
+
+class BetterSync(BaseTest):
+    module = "better_client.sync"
+
+    def _test_sync(self, tmp_path):
+        s3_client = self.s3_client
+        bucket = self.bucket
+        prefix1 = smart_join_s3_key(parts=[self.prefix, "sync", "dir1"], is_dir=True)
+        prefix2 = smart_join_s3_key(parts=[self.prefix, "sync", "dir2"], is_dir=True)
+        dir_src = tmp_path.joinpath("src")
+        dir_dst = tmp_path.joinpath("dst")
+        dir_src.joinpath("sub").mkdir(parents=True)
+        dir_src.joinpath("1.txt").write_text("1")
+        dir_src.joinpath("2.log").write_text("2")
+        dir_src.joinpath("sub", "3.txt").write_text("3")
+
+        with pytest.raises(FileNotFoundError):
+            sync_local_to_s3(s3_client, f"{tmp_path}/not-exists", bucket, prefix1)
+
+        # local to s3
+        report = sync_local_to_s3(
+            s3_client, f"{dir_src}", bucket, prefix1, exclude="*.log"
+        )
+        report.raise_for_error()
+        assert sorted(action.key for action in report.transferred) == [
+            "1.txt",
+            "sub/3.txt",
+        ]
+        assert {action.action for action in report.actions} == {
+            SyncActionEnum.upload
+        }
+        assert report.total_size == 2
+        assert report.n_skipped == 0
+
+        # the excluded file is not synced, the others are already in sync
+        report = sync_local_to_s3(s3_client, f"{dir_src}", bucket, prefix1)
+        assert [action.key for action in report.transferred] == ["2.log"]
+        assert report.n_skipped == 2
+
+        # dry run doesn't change anything
+        dir_src.joinpath("2.log").unlink()
+        report = sync_local_to_s3(
+            s3_client, f"{dir_src}", bucket, prefix1, delete=True, dryrun=True
+        )
+        assert [action.key for action in report.deleted] == ["2.log"]
+        report = sync_local_to_s3(
+            s3_client, f"{dir_src}", bucket, prefix1, delete=True
+        )
+        assert [action.key for action in report.deleted] == ["2.log"]
+        res = s3_client.list_objects_v2(Bucket=bucket, Prefix=prefix1)
+        assert sorted(dct["Key"][len(prefix1) :] for dct in res["Contents"]) == [
+            "1.txt",
+            "sub/3.txt",
+        ]
+
+        # s3 to s3
+        s3_client.put_object(Bucket=bucket, Key=f"{prefix2}old.txt", Body=b"")
+        report = sync_s3_to_s3(
+            s3_client, bucket, prefix1, bucket, prefix2, delete=True
+        )
+        report.raise_for_error()
+        assert sorted(action.key for action in report.transferred) == [
+            "1.txt",
+            "sub/3.txt",
+        ]
+        assert [action.key for action in report.deleted] == ["old.txt"]
+        report = sync_s3_to_s3(
+            s3_client, bucket, prefix1, bucket, prefix2, compare=CompareEnum.etag
+        )
+        assert len(report.actions) == 0
+        assert report.n_skipped == 2
+
+        # s3 to local
+        dir_dst.mkdir()
+        dir_dst.joinpath("old.txt").write_text("old")
+        report = sync_s3_to_local(
+            s3_client, bucket, prefix2, f"{dir_dst}", delete=True
+        )
+        report.raise_for_error()
+        assert sorted(action.key for action in report.transferred) == [
+            "1.txt",
+            "sub/3.txt",
+        ]
+        assert [action.key for action in report.deleted] == ["old.txt"]
+        assert dir_dst.joinpath("sub", "3.txt").read_text() == "3"
+        report = sync_s3_to_local(s3_client, bucket, prefix2, f"{dir_dst}")
+        assert len(report.actions) == 0
+        assert report.n_skipped == 2
+
+        # etag compare detects the content change with the same size
+        dir_dst.joinpath("1.txt").write_text("x")
+        future = time.time() + 3600
+        os.utime(dir_dst.joinpath("1.txt"), (future, future))
+        report = sync_s3_to_local(s3_client, bucket, prefix2, f"{dir_dst}")
+        assert len(report.actions) == 0
+        report = sync_s3_to_local(
+            s3_client, bucket, prefix2, f"{dir_dst}", compare=CompareEnum.etag
+        )
+        assert [action.key for action in report.transferred] == ["1.txt"]
+        assert dir_dst.joinpath("1.txt").read_text() == "1"
+
+        # the multipart upload ETag of the local file
+        path = dir_src.joinpath("big.bin")
+        path.write_bytes(b"x" * (11 * 1024 * 1024))
+        config = TransferConfig(
+            multipart_threshold=5 * 1024 * 1024,
+            multipart_chunksize=5 * 1024 * 1024,
+        )
+        s3_client.upload_file(f"{path}", bucket, f"{prefix1}big.bin", Config=config)
+        os.utime(path, (future, future))
+        kwargs = dict(include="*", exclude="*.txt")
+        report = sync_local_to_s3(
+            s3_client, f"{dir_src}", bucket, prefix1, dryrun=True, **kwargs
+        )
+        assert [action.key for action in report.transferred] == ["big.bin"]
+        report = sync_local_to_s3(
+            s3_client, f"{dir_src}", bucket, prefix1, compare=CompareEnum.etag, **kwargs
+        )
+        assert len(report.actions) == 0
+        assert report.n_skipped == 1
+
+    def test(self, tmp_path):
+        self._test_sync(tmp_path)
+
+
+class Test(BetterSync):
+    use_mock = False
+
+
+class TestUseMock(BetterSync):
+    use_mock = True
+
+
+if __name__ == "__main__":
+    run_cov_test(__file__, "s3pathlib.better_client.sync", preview=False)
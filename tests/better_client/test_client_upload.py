@@ -2,7 +2,10 @@
 
 import pytest
 
+from boto3.s3.transfer import TransferConfig
+
 from s3pathlib.better_client.upload import (
+    upload_files,
     upload_dir,
 )
 from s3pathlib.utils import smart_join_s3_key
@@ -80,8 +83,74 @@ class BetterUpload(BaseTest):
                 overwrite=False,
             )
 
-    def test(self):
+    def _test_upload_files(self, tmp_path):
+        s3_client = self.s3_client
+        bucket = self.bucket
+        prefix = smart_join_s3_key(
+            parts=[self.prefix, "test_upload_files"],
+            is_dir=True,
+        )
+        files = list()
+        for i, size in enumerate([1, 100, 10, 2000]):
+            path = tmp_path.joinpath(f"{i}.txt")
+            path.write_bytes(b"x" * size)
+            files.append((path, f"{prefix}{i}.txt"))
+
+        report = upload_files(
+            s3_client=s3_client,
+            bucket=bucket,
+            files=files,
+            concurrency=2,
+            config=TransferConfig(multipart_threshold=5 * 1024 * 1024),
+            small_file_threshold=100,
+            extra_args={"ContentType": "text/plain"},
+        )
+        report.raise_for_error()
+        assert [result.key for result in report.results] == [key for _, key in files]
+        assert [result.method for result in report.results] == [
+            "put_object",
+            "upload_file",
+            "put_object",
+            "upload_file",
+        ]
+        assert report.total_size == 2111
+        assert report.throughput > 0
+        assert all(result.elapsed > 0 for result in report.results)
+        assert len(report.failed) == 0
+        for path, key in files:
+            response = s3_client.get_object(Bucket=bucket, Key=key)
+            assert response["Body"].read() == path.read_bytes()
+            assert response["ContentType"] == "text/plain"
+
+        # per file error doesn't stop the other files
+        report = upload_files(
+            s3_client=s3_client,
+            bucket=f"{bucket}-not-exists",
+            files=files[:2],
+            small_file_threshold=100,
+        )
+        assert len(report.failed) == 2
+        assert report.total_size == 0
+        with pytest.raises(Exception):
+            report.raise_for_error()
+
+        # the missing file doesn't stop the other files
+        report = upload_files(
+            s3_client=s3_client,
+            bucket=bucket,
+            files=[(tmp_path.joinpath("not-exists.txt"), f"{prefix}x.txt")] + files,
+            small_file_threshold=100,
+        )
+        assert [result.key for result in report.failed] == [f"{prefix}x.txt"]
+        assert isinstance(report.failed[0].error, FileNotFoundError)
+        assert report.total_size == 2111
+
+        with pytest.raises(ValueError):
+            upload_files(s3_client, bucket, files, concurrency=0)
+
+    def test(self, tmp_path):
         self._test()
+        self._test_upload_files(tmp_path)
 
 
 class Test(BetterUpload):
@@ -91,6 +91,33 @@ class BaseS3Path(BaseTest):
             assert p._parts == ["folder", "subfolder"]
             assert p._is_dir is True
 
+    def _test_from_trusted_key(self):
+        for key in [
+            "a/b/c",
+            "a/b/c/",
+            "a",
+            "a/",
+            "/a/b/c",
+            "a//b//c//",
+            "/",
+            "",
+        ]:
+            p1 = S3Path._from_trusted_key("bucket", key)
+            p2 = S3Path("bucket", key)
+            assert p1.key == p2.key
+            assert p1.uri == p2.uri
+            assert p1._is_dir is p2._is_dir
+            assert p1._parts == p2._parts
+            assert p1 == p2
+            assert hash(p1) == hash(p2)
+
+        # parts are lazily split from the key
+        p = S3Path._from_trusted_key("bucket", "a/b/c.txt")
+        assert p.key == "a/b/c.txt"
+        assert p.basename == "c.txt"
+        assert p.parent.key == "a/b/"
+        assert p.parts == ["a", "b", "c.txt"]
+
     def _test_type_error(self):
         with pytest.raises(TypeError):
             S3Path(1, "a", "b", "c")
@@ -107,6 +134,7 @@ class BaseS3Path(BaseTest):
         self._test_aws_s3_bucket()
         self._test_void_aws_s3_path()
         self._test_uri_and_arn()
+        self._test_from_trusted_key()
         self._test_type_error()
 
 
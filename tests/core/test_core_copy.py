@@ -1,8 +1,12 @@
 # -*- coding: utf-8 -*-
 
+import time
+import tempfile
+
 import pytest
 from pathlib_mate import Path
 from s3pathlib.core import S3Path
+from s3pathlib.journal import Journal
 from s3pathlib.tests import run_cov_test
 from s3pathlib.tests.mock import BaseTest
 
@@ -50,15 +54,36 @@ class CopyAPIMixin(BaseTest):
         p_dst.delete()
         assert p_dst.count_objects() == 0
 
-        # invoke api
-        count = p_src.copy_to(dst=p_dst, overwrite=False)
+        # invoke api, the empty target directory is checked by one listing
+        operations = list()
+
+        def handler(model, **kwargs):
+            operations.append(model.name)
+
+        self.s3_client.meta.events.register("before-call.s3", handler)
+        try:
+            count = p_src.copy_to(
+                dst=p_dst, overwrite=False, concurrency=3, bsm=self.s3_client
+            )
+        finally:
+            self.s3_client.meta.events.unregister("before-call.s3", handler)
 
         # validate after state
         assert count == 2
+        assert p_dst.count_objects() == 2
+        assert "HeadObject" not in operations
+        assert operations.count("CopyObject") == 2
 
-        # raise exception
+        # raise exception, nothing is copied if any target exists
+        p_dst.delete()
+        p_dst.joinpath("1.txt").write_text("exists")
         with pytest.raises(FileExistsError):
             p_src.copy_to(dst=p_dst, overwrite=False)
+        assert p_dst.count_objects() == 1
+
+        count = p_src.copy_to(dst=p_dst, overwrite=True, concurrency=1)
+        assert count == 2
+        assert p_dst.count_objects() == 2
 
     def _test_move_to(self):
         # before state
@@ -78,13 +103,144 @@ class CopyAPIMixin(BaseTest):
 
         assert p_dst.count_objects() == 0
 
+        # the hard folder is deleted, but not copied
+        p_src.joinpath("folder/").write_text("")
+
         # invoke api
-        count = p_src.move_to(dst=p_dst, overwrite=False)
+        operations = list()
+
+        def handler(model, **kwargs):
+            operations.append(model.name)
+
+        self.s3_client.meta.events.register("before-call.s3", handler)
+        try:
+            count = p_src.move_to(
+                dst=p_dst, overwrite=False, concurrency=2, bsm=self.s3_client
+            )
+        finally:
+            self.s3_client.meta.events.unregister("before-call.s3", handler)
 
         # validate after state
         assert count == 2
         assert p_src.count_objects() == 0
+        assert p_src.count_objects(include_folder=True) == 0
+        assert p_dst.count_objects() == 2
+        # one listing of the source, one listing of the target
+        assert operations.count("ListObjectsV2") == 2
+        assert operations.count("CopyObject") == 2
+        assert operations.count("DeleteObjects") == 1
+
+        # move into its own sub directory
+        p_sub = p_dst.joinpath("sub/")
+        count = p_dst.move_to(dst=p_sub, overwrite=False)
+        assert count == 2
         assert p_dst.count_objects() == 2
+        assert p_sub.count_objects() == 2
+
+        # the source object failed to delete is not moved
+        p_denied = S3Path(self.s3dir_root, "move-to", "denied/")
+        p_denied.delete()
+        denied_key = p_sub.joinpath("1.txt").key
+
+        def deny(params, **kwargs):
+            objects = params["Delete"]["Objects"]
+            params["Delete"]["Objects"] = [
+                dct for dct in objects if dct["Key"] != denied_key
+            ]
+
+        def report_denied(parsed, **kwargs):
+            parsed["Errors"] = [
+                dict(Key=denied_key, Code="AccessDenied", Message="Access Denied")
+            ]
+
+        s3_client = self.s3_client
+        s3_client.meta.events.register("before-parameter-build.s3.DeleteObjects", deny)
+        s3_client.meta.events.register("after-call.s3.DeleteObjects", report_denied)
+        try:
+            with tempfile.TemporaryDirectory() as dir_tmp:
+                with Journal(f"{dir_tmp}/journal.sqlite", job_id="move") as journal:
+                    with pytest.raises(PermissionError):
+                        p_sub.move_to(p_denied, journal=journal, bsm=s3_client)
+                    assert journal.is_finished is False
+                    assert journal.is_done(denied_key) is False
+        finally:
+            s3_client.meta.events.unregister(
+                "before-parameter-build.s3.DeleteObjects", deny
+            )
+            s3_client.meta.events.unregister(
+                "after-call.s3.DeleteObjects", report_denied
+            )
+        assert p_sub.joinpath("1.txt").exists() is True
+        assert p_sub.count_objects() == 1
+        assert p_denied.count_objects() == 2
+        p_denied.move_to(p_sub, overwrite=True)
+
+        # move a file
+        p_file = p_sub.joinpath("1.txt")
+        p_moved = p_dst.joinpath("moved.txt")
+        assert p_file.move_to(dst=p_moved) == 1
+        assert p_file.exists() is False
+        assert p_moved.exists() is True
+
+    def _test_copy_dir_with_journal(self):
+        p_src = S3Path(self.s3dir_root, "copy-dir-journal", "before").to_dir()
+        p_dst = S3Path(self.s3dir_root, "copy-dir-journal", "after").to_dir()
+        p_src.parent.delete()
+        for name in ["a.txt", "b.txt", "c.txt"]:
+            p_src.joinpath(name).write_text(name)
+
+        with tempfile.TemporaryDirectory() as dir_tmp:
+            path = f"{dir_tmp}/journal.sqlite"
+
+            # the interrupted run, "a.txt" is recorded, "b.txt" is copied
+            # but not recorded
+            with Journal(path, job_id="copy") as journal:
+                for name in ["a.txt", "b.txt"]:
+                    journal.dispatch(p_src.joinpath(name).key)
+                    p_src.joinpath(name).copy_file(p_dst.joinpath(name))
+                journal.complete(p_src.joinpath("a.txt").key)
+
+            # resume
+            operations = list()
+
+            def handler(model, **kwargs):
+                operations.append(model.name)
+
+            self.s3_client.meta.events.register("before-call.s3", handler)
+            try:
+                with Journal(path, job_id="copy") as journal:
+                    count = p_src.copy_dir(
+                        p_dst, overwrite=False, journal=journal, bsm=self.s3_client
+                    )
+                    assert journal.is_finished is True
+            finally:
+                self.s3_client.meta.events.unregister("before-call.s3", handler)
+            assert count == 2
+            assert operations.count("CopyObject") == 2
+            assert p_dst.count_objects() == 3
+
+            # the finished job does nothing
+            with Journal(path, job_id="copy") as journal:
+                assert p_src.copy_dir(p_dst, journal=journal) == 0
+
+            # the objects written before a new job are conflicts
+            time.sleep(1)
+            with Journal(path, job_id="copy-again") as journal:
+                with pytest.raises(FileExistsError):
+                    p_src.copy_dir(p_dst, overwrite=False, journal=journal)
+
+            # resumable move
+            p_moved = S3Path(self.s3dir_root, "copy-dir-journal", "moved").to_dir()
+            with Journal(path, job_id="move") as journal:
+                journal.dispatch(p_src.joinpath("a.txt").key)
+                p_src.joinpath("a.txt").move_to(p_moved.joinpath("a.txt"))
+                journal.complete(p_src.joinpath("a.txt").key)
+            with Journal(path, job_id="move") as journal:
+                count = p_src.move_to(p_moved, overwrite=False, journal=journal)
+                assert journal.start_after == p_src.joinpath("c.txt").key
+            assert count == 2
+            assert p_src.count_objects() == 0
+            assert p_moved.count_objects() == 3
 
     def _test_copy_with_metadata_and_tagging(self):
         p_src = S3Path(self.s3dir_root, "copy_object", "src.txt")
@@ -119,10 +275,175 @@ class CopyAPIMixin(BaseTest):
         assert p_dst.metadata == {"key_name": "b"}
         assert p_dst.get_tags()[1] == {"tag_name": "b"}
 
+    def _test_copy_large_file(self):
+        mb = 1024 * 1024
+        p_src = S3Path(self.s3dir_root, "copy-large-file", "src.bin")
+        p_dst = S3Path(self.s3dir_root, "copy-large-file", "dst.bin")
+        p_dst.delete()
+        body = b"".join(bytes([i]) * mb for i in range(11))
+        p_src.write_bytes(
+            body,
+            metadata=dict(name="src"),
+            tags=dict(tag="src"),
+            content_type="application/octet-stream",
+        )
+
+        operations = list()
+
+        def handler(model, **kwargs):
+            operations.append(model.name)
+
+        self.s3_client.meta.events.register("before-call.s3", handler)
+        try:
+            # the metadata and tags are copied from the source
+            p_src.copy_file(
+                p_dst,
+                multipart_threshold=5 * mb,
+                part_size=5 * mb,
+                concurrency=2,
+                bsm=self.s3_client,
+            )
+        finally:
+            self.s3_client.meta.events.unregister("before-call.s3", handler)
+        assert operations.count("UploadPartCopy") == 3
+        assert "CopyObject" not in operations
+        p_dst.clear_cache()
+        assert p_dst.read_bytes() == body
+        assert p_dst.metadata == {"name": "src"}
+        assert p_dst.get_tags()[1] == {"tag": "src"}
+        assert p_dst.response["ContentType"] == "application/octet-stream"
+
+        # explicit metadata, tags and storage class
+        p_src.copy_file(
+            p_dst,
+            metadata=dict(name="dst"),
+            tags=dict(tag="dst"),
+            storage_class="STANDARD_IA",
+            overwrite=True,
+            multipart_threshold=5 * mb,
+        )
+        p_dst.clear_cache()
+        assert p_dst.read_bytes() == body
+        assert p_dst.metadata == {"name": "dst"}
+        assert p_dst.get_tags()[1] == {"tag": "dst"}
+        assert p_dst.response["StorageClass"] == "STANDARD_IA"
+
+        # below the threshold, use copy_object
+        p_src.copy_file(p_dst, overwrite=True)
+        assert p_dst.read_bytes() == body
+
+    def _test_copy_dir_multipart(self):
+        mb = 1024 * 1024
+        s3dir = S3Path(self.s3dir_root, "copy-dir-multipart/")
+        p_src = s3dir.joinpath("src/")
+        p_dst = s3dir.joinpath("dst/")
+        p_moved = s3dir.joinpath("moved/")
+        s3dir.delete()
+        body = b"".join(bytes([i]) * mb for i in range(11))
+        p_src.joinpath("large.bin").write_bytes(body)
+        p_src.joinpath("small.txt").write_text("small")
+
+        operations = list()
+
+        def handler(model, **kwargs):
+            operations.append(model.name)
+
+        self.s3_client.meta.events.register("before-call.s3", handler)
+        try:
+            count = p_src.copy_to(
+                p_dst,
+                multipart_threshold=5 * mb,
+                part_size=5 * mb,
+                file_concurrency=2,
+                bsm=self.s3_client,
+            )
+            assert count == 2
+            assert operations.count("UploadPartCopy") == 3
+            assert operations.count("CopyObject") == 1
+
+            operations.clear()
+            count = p_dst.move_to(
+                p_moved,
+                multipart_threshold=5 * mb,
+                part_size=5 * mb,
+                file_concurrency=1,
+                bsm=self.s3_client,
+            )
+            assert count == 2
+            assert operations.count("UploadPartCopy") == 3
+        finally:
+            self.s3_client.meta.events.unregister("before-call.s3", handler)
+        assert p_moved.joinpath("large.bin").read_bytes() == body
+        assert p_moved.joinpath("small.txt").read_text() == "small"
+        assert p_dst.count_objects() == 0
+
+        with pytest.raises(ValueError):
+            p_src.copy_dir(p_dst, overwrite=True, file_concurrency=0)
+        with pytest.raises(ValueError):
+            p_src.move_to(p_dst, overwrite=True, file_concurrency=0)
+
+    def _test_copy_with_dst_bsm(self):
+        mb = 1024 * 1024
+        p_src = S3Path(self.s3dir_root, "copy-dst-bsm", "src/")
+        p_dst = S3Path(self.s3dir_root, "copy-dst-bsm", "dst/")
+        p_src.parent.delete()
+        body = b"".join(bytes([i]) * mb for i in range(11))
+        p_src.joinpath("large.bin").write_bytes(
+            body,
+            metadata=dict(name="src"),
+            tags=dict(tag="src"),
+            content_type="application/octet-stream",
+        )
+        p_src.joinpath("small.txt").write_text("small")
+
+        src_s3_client = self.s3_client
+        dst_s3_client = self.bsm.boto_ses.client("s3")
+        operations = list()
+
+        def handler(model, **kwargs):
+            operations.append(model.name)
+
+        src_s3_client.meta.events.register("before-call.s3", handler)
+        try:
+            # the large object is streamed by ranged get_object calls
+            p_src.joinpath("large.bin").copy_file(
+                p_dst.joinpath("large.bin"),
+                part_size=5 * mb,
+                concurrency=2,
+                bsm=src_s3_client,
+                dst_bsm=dst_s3_client,
+            )
+        finally:
+            src_s3_client.meta.events.unregister("before-call.s3", handler)
+        # no server side copy, and no write with the source client
+        assert set(operations) == {"HeadObject", "GetObjectTagging", "GetObject"}
+        assert operations.count("GetObject") == 3
+        p_large = p_dst.joinpath("large.bin")
+        assert p_large.read_bytes() == body
+        assert p_large.metadata == {"name": "src"}
+        assert p_large.get_tags()[1] == {"tag": "src"}
+        assert p_large.response["ContentType"] == "application/octet-stream"
+
+        # copy a directory, the existing target is checked with the target client
+        with pytest.raises(FileExistsError):
+            p_src.copy_dir(
+                p_dst, overwrite=False, bsm=src_s3_client, dst_bsm=dst_s3_client
+            )
+        count = p_src.copy_to(
+            p_dst, overwrite=True, bsm=src_s3_client, dst_bsm=dst_s3_client
+        )
+        assert count == 2
+        assert p_dst.joinpath("small.txt").read_text() == "small"
+        assert p_dst.joinpath("large.bin").read_bytes() == body
+
     def test(self):
         self._test_copy_object()
         self._test_copy_dir()
+        self._test_copy_large_file()
         self._test_move_to()
+        self._test_copy_dir_with_journal()
+        self._test_copy_with_dst_bsm()
+        self._test_copy_dir_multipart()
 
         self._test_copy_with_metadata_and_tagging()
 
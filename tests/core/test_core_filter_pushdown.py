@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+
+from s3pathlib.core import S3Path
+from s3pathlib.core.filter_pushdown import (
+    get_key_predecessor,
+    KeyRange,
+    plan_key_range,
+    PushdownListing,
+)
+from s3pathlib.tests import run_cov_test
+
+
+def test_get_key_predecessor():
+    assert get_key_predecessor("") == ""
+    assert get_key_predecessor("b") == "a\U0010ffff"
+    assert "a" < get_key_predecessor("b") < "b"
+    assert get_key_predecessor("a\x00") == "a"
+    assert get_key_predecessor("a") == "a"
+
+
+def test_key_range():
+    key_range = KeyRange(prefix="a/", stop="a/5", stop_inclusive=True)
+    assert key_range.is_past("a/4") is False
+    assert key_range.is_past("a/5") is False
+    assert key_range.is_past("a/6") is True
+    key_range = KeyRange(prefix="a/", stop="a/5", stop_inclusive=False)
+    assert key_range.is_past("a/5") is True
+    assert KeyRange(prefix="a/").is_past("z") is False
+
+
+def test_plan_key_range():
+    # no pushdown-able filter
+    key_range = plan_key_range(
+        [S3Path.size > 0, S3Path.key.endswith(".txt"), S3Path.key > 1, lambda p: True],
+        prefix="a/",
+    )
+    assert key_range.prefix == "a/"
+    assert key_range.start_after is None
+    assert key_range.stop is None
+    assert key_range.is_empty is False
+
+    # lower bound
+    key_range = plan_key_range(
+        [S3Path.key > "a/1", S3Path.key >= "a/3"], prefix="a/", start_after="a/2"
+    )
+    assert key_range.start_after == get_key_predecessor("a/3")
+
+    # upper bound, exclusive wins on tie
+    key_range = plan_key_range(
+        [S3Path.key <= "a/5", S3Path.key < "a/5", S3Path.key <= "a/7"], prefix="a/"
+    )
+    assert key_range.stop == "a/5"
+    assert key_range.stop_inclusive is False
+
+    # between
+    key_range = plan_key_range([S3Path.key.between("a/2", "a/4")], prefix="a/")
+    assert key_range.start_after == get_key_predecessor("a/2")
+    assert key_range.stop == "a/4"
+    assert key_range.stop_inclusive is True
+
+    # prefix narrowing
+    key_range = plan_key_range([S3Path.key.startswith("a/b/")], prefix="a/")
+    assert key_range.prefix == "a/b/"
+    key_range = plan_key_range([S3Path.key.startswith("a")], prefix="a/")
+    assert key_range.prefix == "a/"
+    assert plan_key_range([S3Path.key.startswith("b/")], prefix="a/").is_empty
+
+    # with delimiter, objects in sub folders are not listed
+    key_range = plan_key_range(
+        [S3Path.key.startswith("a/1")], prefix="a/", delimiter=True
+    )
+    assert key_range.prefix == "a/1"
+    assert plan_key_range(
+        [S3Path.key.startswith("a/b/")], prefix="a/", delimiter=True
+    ).is_empty
+
+    # equal
+    key_range = plan_key_range([S3Path.key == "a/1.txt"], prefix="a/")
+    assert key_range.prefix == "a/1.txt"
+    assert key_range.stop == "a/1.txt"
+
+    # empty range
+    assert plan_key_range([S3Path.key < "a/"], prefix="a/").is_empty
+    assert plan_key_range(
+        [S3Path.key > "a/5", S3Path.key <= "a/5"], prefix="a/"
+    ).is_empty
+
+
+def test_pushdown_listing():
+    keys = [f"a/{i}" for i in range(10)]
+    calls = list()
+
+    def list_func(prefix, start_after):
+        for key in keys:
+            if key.startswith(prefix) and (start_after is None or key > start_after):
+                calls.append(key)
+                yield S3Path("bucket", key)
+
+    listing = PushdownListing(list_func, prefix="a/")
+    filters = [S3Path.key > "a/2", S3Path.key < "a/5"]
+    assert [p.key for p in listing.iter(filters)] == ["a/3", "a/4"]
+    # stop right after the first key that is out of range
+    assert calls == ["a/3", "a/4", "a/5"]
+
+    assert list(listing.iter([S3Path.key.startswith("b/")])) == []
+
+
+if __name__ == "__main__":
+    run_cov_test(__file__, "s3pathlib.core.filter_pushdown", preview=False)
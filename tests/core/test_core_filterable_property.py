@@ -20,6 +20,23 @@ class TestFilterableProperty:
         assert func(user) is True
         assert func(User(name="Bob")) is False
 
+    def test_predicate(self):
+        predicate = User.username >= "bob"
+        assert (predicate.name, predicate.op, predicate.value) == (
+            "username",
+            ">=",
+            "bob",
+        )
+        assert predicate(User(name="bob")) is True
+        assert predicate(User(name="alice")) is False
+        assert repr(predicate) == "Predicate(username >= 'bob')"
+
+        predicate = User.username.greater_equal("bob")
+        assert predicate.op == ">="
+        assert User.username.less_equal("bob").op == "<="
+        assert User.username.between("a", "c").value == ("a", "c")
+        assert User.username.startswith("a").op == "startswith"
+
 
 if __name__ == "__main__":
     run_cov_test(__file__, module="s3pathlib.core.filterable_property", preview=False)
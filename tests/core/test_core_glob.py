@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+
+from s3pathlib.core import S3Path
+from s3pathlib.core.glob import (
+    get_literal_prefix,
+    translate_segment,
+    translate,
+)
+from s3pathlib.tests import run_cov_test
+from s3pathlib.tests.mock import BaseTest
+
+
+def test_get_literal_prefix():
+    assert get_literal_prefix("host-1*.gz") == "host-1"
+    assert get_literal_prefix("host-1") == "host-1"
+    assert get_literal_prefix("*") == ""
+    assert get_literal_prefix("[ab]c") == ""
+
+
+def test_translate():
+    import re
+
+    assert re.fullmatch(translate_segment("*.gz"), "a.gz")
+    assert not re.fullmatch(translate_segment("*.gz"), "a/b.gz")
+    assert re.fullmatch(translate_segment("?.txt"), "a.txt")
+    assert re.fullmatch(translate_segment("[ab].txt"), "b.txt")
+    assert not re.fullmatch(translate_segment("[!ab].txt"), "b.txt")
+    assert re.fullmatch(translate_segment("[a"), "[a")
+
+    regex = translate(["**", "*.gz"])
+    assert re.fullmatch(regex, "a.gz")
+    assert re.fullmatch(regex, "x/y/a.gz")
+    assert not re.fullmatch(regex, "x/y/a.txt")
+
+    regex = translate(["a", "**"])
+    assert re.fullmatch(regex, "a/b/c.txt")
+
+
+class GlobAPIMixin(BaseTest):
+    module = "core.glob"
+
+    s3dir_glob: S3Path
+
+    @classmethod
+    def custom_setup_class(cls):
+        cls.s3dir_glob = cls.get_s3dir_root().joinpath("glob").to_dir()
+        cls.s3dir_glob.delete()
+        keys = [
+            "README.txt",
+            "logs/",
+            "logs/2023-12-31/host-1a/app.log.gz",
+            "logs/2024-01-01/host-1a/app.log.gz",
+            "logs/2024-01-01/host-1a/2/app.log.gz",
+            "logs/2024-01-01/host-1a/2/app.log",
+            "logs/2024-01-01/host-2a/app.log.gz",
+            "logs/2024-01-02/host-1b/app.log.gz",
+            "logs/2024-01-02/host-1b/app.txt",
+        ]
+        for key in keys:
+            cls.bsm.s3_client.put_object(
+                Bucket=cls.s3dir_glob.bucket,
+                Key=cls.s3dir_glob.joinpath(key).key,
+                Body=b"",
+            )
+
+    def _relpaths(self, proxy):
+        return [p.relative_to(self.s3dir_glob).key for p in proxy]
+
+    def _test_glob(self):
+        s3dir = self.s3dir_glob
+
+        assert self._relpaths(s3dir.glob("*.txt")) == ["README.txt"]
+        assert self._relpaths(s3dir.glob("*")) == ["README.txt"]
+        assert self._relpaths(s3dir.glob("logs/*")) == []
+        assert self._relpaths(s3dir.glob("logs/2024-*/host-1*/**/*.gz")) == [
+            "logs/2024-01-01/host-1a/2/app.log.gz",
+            "logs/2024-01-01/host-1a/app.log.gz",
+            "logs/2024-01-02/host-1b/app.log.gz",
+        ]
+        assert self._relpaths(s3dir.glob("logs/2024-01-0[2]/*/app.???")) == [
+            "logs/2024-01-02/host-1b/app.txt",
+        ]
+        assert self._relpaths(s3dir.glob("logs/2024-01-01/host-1a/2/app.log")) == [
+            "logs/2024-01-01/host-1a/2/app.log",
+        ]
+        assert self._relpaths(s3dir.glob("logs/**")) == [
+            "logs/2023-12-31/host-1a/app.log.gz",
+            "logs/2024-01-01/host-1a/2/app.log",
+            "logs/2024-01-01/host-1a/2/app.log.gz",
+            "logs/2024-01-01/host-1a/app.log.gz",
+            "logs/2024-01-01/host-2a/app.log.gz",
+            "logs/2024-01-02/host-1b/app.log.gz",
+            "logs/2024-01-02/host-1b/app.txt",
+        ]
+        assert self._relpaths(s3dir.glob("not-exists/*")) == []
+
+        with pytest.raises(ValueError):
+            s3dir.glob("")
+        with pytest.raises(ValueError):
+            s3dir.glob("/logs/*")
+        with pytest.raises(ValueError):
+            s3dir.glob("logs/")
+        with pytest.raises(TypeError):
+            s3dir.joinpath("README.txt").glob("*")
+
+    def _test_glob_pruning(self):
+        # only list the sub folders that can match
+        calls = list()
+
+        def on_list_objects(params, **kwargs):
+            calls.append(params["Prefix"])
+
+        s3_client = self.bsm.boto_ses.client("s3")
+        s3_client.meta.events.register(
+            "provide-client-params.s3.ListObjectsV2", on_list_objects
+        )
+        self._relpaths(
+            self.s3dir_glob.glob("logs/2024-*/host-1*/*.gz", bsm=s3_client)
+        )
+        prefix = self.s3dir_glob.key
+        assert calls == [
+            f"{prefix}logs/2024-",
+            f"{prefix}logs/2024-01-01/host-1",
+            f"{prefix}logs/2024-01-01/host-1a/",
+            f"{prefix}logs/2024-01-02/host-1",
+            f"{prefix}logs/2024-01-02/host-1b/",
+        ]
+
+    def _test_rglob(self):
+        s3dir = self.s3dir_glob
+        assert self._relpaths(s3dir.rglob("*.txt")) == [
+            "README.txt",
+            "logs/2024-01-02/host-1b/app.txt",
+        ]
+        assert self._relpaths(s3dir.joinpath("logs/2024-01-01/").rglob("*.log")) == [
+            "logs/2024-01-01/host-1a/2/app.log",
+        ]
+
+        with pytest.raises(ValueError):
+            s3dir.rglob("")
+
+    def test(self):
+        self._test_glob()
+        self._test_glob_pruning()
+        self._test_rglob()
+
+
+class Test(GlobAPIMixin):
+    use_mock = False
+
+
+class TestUseMock(GlobAPIMixin):
+    use_mock = True
+
+
+if __name__ == "__main__":
+    run_cov_test(__file__, "s3pathlib.core.glob", preview=False)
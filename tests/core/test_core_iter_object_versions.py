@@ -45,9 +45,56 @@ class IterObjectsAPIMixin(BaseTest):
         assert s3path_list[2].etag is None
         assert s3path_list[2].size == 0
 
+    def _test_list_object_versions_multi_page(self):
+        s3dir = S3Path(
+            self.s3dir_root_with_versioning, "list_object_versions_multi_page/"
+        )
+        s3dir.delete(is_hard_delete=True)
+        s3path_a = s3dir.joinpath("a.txt")
+        s3path_b = s3dir.joinpath("b.txt")
+        expected = list()
+        for s3path in [s3path_a, s3path_b]:
+            for i in range(3):
+                expected.append((s3path.key, s3path.write_text(str(i)).version_id))
+                time.sleep(1)
+        s3path_a.delete()
+        s3path_list = s3dir.list_object_versions().all()
+        version_ids = [(p.key, p.version_id) for p in s3path_list]
+
+        # small page size, every version is yielded once, in per key order
+        for batch_size in [1, 2, 3]:
+            assert [
+                (p.key, p.version_id)
+                for p in s3dir.list_object_versions(batch_size=batch_size)
+            ] == version_ids
+        assert len(version_ids) == 7
+        assert [key for key, _ in version_ids] == [s3path_a.key] * 4 + [
+            s3path_b.key
+        ] * 3
+        assert s3path_list[0].is_delete_marker()
+        assert version_ids[1:4] == expected[:3][::-1]
+        assert version_ids[4:] == expected[3:][::-1]
+
+        # globally sorted by last modified, newest first
+        s3path_list = s3dir.list_object_versions(
+            batch_size=2, sort_by_last_modified=True, run_size=2
+        ).all()
+        assert s3path_list[0].is_delete_marker()
+        assert [(p.key, p.version_id) for p in s3path_list[1:]] == expected[::-1]
+
+        # hydrate each version, the delete marker is skipped
+        s3path_list = s3dir.list_object_versions().hydrate(concurrency=2).all()
+        assert [(p.key, p.version_id) for p in s3path_list] == version_ids
+        assert "Metadata" not in s3path_list[0]._meta
+        assert [p._meta["VersionId"] for p in s3path_list[1:]] == [
+            version_id for _, version_id in version_ids[1:]
+        ]
+        assert all("Metadata" in p._meta for p in s3path_list[1:])
+
 
     def test(self):
         self._test_list_object_versions()
+        self._test_list_object_versions_multi_page()
 
 
 class Test(IterObjectsAPIMixin):
@@ -37,6 +37,26 @@ class IterObjectsAPIMixin(BaseTest):
         proxy = self.s3dir_test_iter_objects.iter_objects(recursive=False)
         assert len(proxy.all()) == 2
 
+        expected = self.s3dir_test_iter_objects.iter_objects().all()
+        proxy = self.s3dir_test_iter_objects.iter_objects(concurrency=4)
+        assert proxy.all() == expected
+
+        proxy = self.s3dir_test_iter_objects.iter_objects(concurrency=4, ordered=False)
+        assert sorted(proxy.all()) == sorted(expected)
+
+        proxy = self.s3dir_test_iter_objects.iter_objects(batch_size=2, prefetch=2)
+        assert proxy.all() == expected
+
+        columns = self.s3dir_test_iter_objects.iter_objects().to_columns()
+        assert list(columns.iter_keys()) == [p.key for p in expected]
+        assert columns.iter_s3path().all() == expected
+        assert len(self.s3dir_test_iter_objects.iter_objects(limit=0).to_columns()) == 0
+
+        proxy = self.s3dir_test_iter_objects.iter_objects(
+            concurrency=4, recursive=False
+        )
+        assert len(proxy.all()) == 2
+
     def _test_iterproxy(self):
         """
         - one
@@ -89,6 +109,77 @@ class IterObjectsAPIMixin(BaseTest):
             "1.txt",
         ]
 
+    def _test_filter_pushdown(self):
+        s3dir = self.s3dir_test_iter_objects
+        prefix = s3dir.key
+
+        proxy = s3dir.iter_objects().filter(
+            S3Path.key >= f"{prefix}folder1/2.txt",
+            S3Path.key < f"{prefix}folder2/5.txt",
+        )
+        key_range = proxy.plan()
+        assert key_range.stop == f"{prefix}folder2/5.txt"
+        assert [p.basename for p in proxy] == ["2.txt", "3.txt", "4.txt"]
+
+        proxy = s3dir.iter_objects().filter(
+            S3Path.key.startswith(f"{prefix}folder3/"), S3Path.size > 0
+        )
+        assert proxy.plan().prefix == f"{prefix}folder3/"
+        assert [p.basename for p in proxy] == ["7.txt", "8.txt", "9.txt"]
+
+        proxy = s3dir.iter_objects().filter(S3Path.key == f"{prefix}folder2/6.txt")
+        assert [p.basename for p in proxy] == ["6.txt"]
+
+        proxy = s3dir.iter_objects(recursive=False).filter(
+            S3Path.key.startswith(f"{prefix}folder")
+        )
+        assert [p.basename for p in proxy] == ["folder-description.txt"]
+
+        proxy = s3dir.iter_objects(start_after=f"{prefix}folder3/7.txt").filter(
+            S3Path.key > f"{prefix}folder1/"
+        )
+        assert [p.basename for p in proxy] == ["8.txt", "9.txt"]
+
+        proxy = s3dir.iter_objects().filter(S3Path.key.startswith("other/"))
+        assert proxy.plan().is_empty
+        assert proxy.all() == []
+
+        # pushdown is disabled when limit is set
+        proxy = s3dir.iter_objects(limit=4).filter(
+            S3Path.key > f"{prefix}folder1/1.txt"
+        )
+        assert proxy.plan() is None
+        assert [p.basename for p in proxy] == ["2.txt"]
+
+    def _test_hydrate(self):
+        s3dir = self.get_s3dir_root().joinpath("test_hydrate").to_dir()
+        s3dir.delete()
+        for i in range(5):
+            s3dir.joinpath(f"{i}.txt").write_text(
+                str(i), metadata={"index": str(i)}
+            )
+
+        s3path_list = s3dir.iter_objects().hydrate(concurrency=2).all()
+        assert [p.basename for p in s3path_list] == [f"{i}.txt" for i in range(5)]
+        for i, p in enumerate(s3path_list):
+            assert "Metadata" in p._meta
+            assert p._meta["StorageClass"] == "STANDARD"
+            assert p.metadata == {"index": str(i)}
+
+        # filters before hydrate are applied first
+        s3path_list = (
+            s3dir.iter_objects()
+            .filter(S3Path.key > s3dir.joinpath("2.txt").key)
+            .hydrate(concurrency=2)
+            .filter(lambda p: p.metadata["index"] != "4")
+            .all()
+        )
+        assert [p.basename for p in s3path_list] == ["3.txt"]
+
+        # skip the head_object call if the fields are already available
+        s3path_list = s3dir.iter_objects().hydrate(fields=["ETag", "ContentLength"]).all()
+        assert "Metadata" not in s3path_list[0]._meta
+
     def _test_metadata_filter(self):
         # --- operator
         for p in self.s3dir_test_iter_objects.iter_objects().filter(S3Path.size > 30):
@@ -178,15 +269,30 @@ class IterObjectsAPIMixin(BaseTest):
             )
 
         assert s3dir_statistics.count_objects() == 10
+        assert s3dir_statistics.count_objects(prefetch=2) == 10
 
         count, total_size = s3dir_statistics.calculate_total_size()
         assert count == 10
         assert total_size == 210
 
+        count, total_size = s3dir_statistics.calculate_total_size(prefetch=2)
+        assert count == 10
+        assert total_size == 210
+
         count, total_size = s3dir_statistics.calculate_total_size(for_human=True)
         assert count == 10
         assert total_size == "210 B"
 
+        du = s3dir_statistics.disk_usage(depth=1, concurrency=2)
+        assert (du.count, du.size) == (10, 210)
+        assert (du.children["folder1"].count, du.children["folder1"].size) == (4, 48)
+        assert (du.children["folder2"].count, du.children["folder2"].size) == (6, 162)
+        assert du.size_by_storage_class == {"STANDARD": 210}
+        assert len(du.render().splitlines()) == 3
+
+        du = s3dir_statistics.disk_usage(depth=0, concurrency=1)
+        assert (du.count, du.size, du.children) == (10, 210, {})
+
     def _test_count_objects(self):
         s3path_soft_folder_file = self.s3dir_root.joinpath("soft_folder", "file.txt")
         self.s3_client.put_object(
@@ -225,6 +331,8 @@ class IterObjectsAPIMixin(BaseTest):
         self._test_iter_objects()
         self._test_iterproxy()
         self._test_filter()
+        self._test_filter_pushdown()
+        self._test_hydrate()
         self._test_metadata_filter()
         self._test_iterdir()
         self._test_statistics()
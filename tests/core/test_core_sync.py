@@ -45,19 +45,47 @@ class SyncAPIMixin(BaseTest):
         s3path2.sync_to(path1, verbose=False)
         assert path1.file_stat()["file"] == 2
 
+        report = s3path2.sync_to(path1, verbose=False)
+        assert len(report.actions) == 0
+        assert report.n_skipped == 2
+
+        s3path1.joinpath("extra.txt").write_text("extra")
+        s3path1.joinpath("extra.log").write_text("extra")
+        report = s3path1.sync_from(path0, exclude="*.log", delete=True, verbose=False)
+        assert [action.key for action in report.deleted] == ["extra.txt"]
+        assert report.n_skipped == 2
+        assert s3path1.count_objects() == 3
+
         with pytest.raises(ValueError):
             S3Path.sync(path1.abspath, path2.abspath, verbose=False)
 
+        # the aws CLI needs the credential from a BotoSesManager
+        with pytest.raises(TypeError):
+            S3Path.sync(path0, s3path1, bsm=self.s3_client, use_cli=True)
+
+        # one download fails, a directory is in the way of the file
+        path1.remove_if_exists()
+        path1.joinpath("1.txt").mkdir(parents=True)
+        with pytest.raises(OSError):
+            s3path2.sync_to(path1, verbose=False)
+        report = s3path2.sync_to(path1, verbose=False, raise_on_error=False)
+        failed = [action for action in report.actions if action.error is not None]
+        assert [action.key for action in failed] == ["1.txt"]
+        assert report.n_skipped == 1
+
+        path1.remove_if_exists()
+
     def test(self):
-        if self.use_mock is False:
-            self._test_sync()
+        self._test_sync()
 
 
-# NOTE: this module should ONLY be tested with MOCK
-# DO NOT USE REAL S3 BUCKET
 class Test(SyncAPIMixin):
     use_mock = False
 
 
+class TestUseMock(SyncAPIMixin):
+    use_mock = True
+
+
 if __name__ == "__main__":
     run_cov_test(__file__, module="s3pathlib.core.sync", preview=False)
@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+
+import time
+import threading
+
+import pytest
+
+from s3pathlib.core import S3Path
+from s3pathlib.tests import run_cov_test
+from s3pathlib.tests.mock import BaseTest
+
+
+class WalkAPIMixin(BaseTest):
+    module = "core.walk"
+
+    s3dir_walk: S3Path
+
+    @classmethod
+    def custom_setup_class(cls):
+        cls.s3dir_walk = cls.get_s3dir_root().joinpath("walk").to_dir()
+        cls.s3dir_walk.delete()
+        for key in [
+            "",  # hard folder of the top directory itself
+            "1.txt",
+            "a/",
+            "a/1.txt",
+            "a/b/1.txt",
+            "a/b/c/1.txt",
+            "a/tmp/1.txt",
+            "d/1.txt",
+            "d/2.txt",
+        ]:
+            cls.bsm.s3_client.put_object(
+                Bucket=cls.s3dir_walk.bucket,
+                Key=cls.s3dir_walk.key + key,
+                Body=b"",
+            )
+
+    def _summary(self, walk_results):
+        def rel(p):
+            return p.relative_to(self.s3dir_walk).key if p != self.s3dir_walk else ""
+
+        return [
+            (rel(s3dir), [rel(p) for p in subdirs], [rel(p) for p in files])
+            for s3dir, subdirs, files in walk_results
+        ]
+
+    def _test_walk(self):
+        s3dir = self.s3dir_walk
+        expected = [
+            ("", ["a/", "d/"], ["1.txt"]),
+            ("a/", ["a/b/", "a/tmp/"], ["a/1.txt"]),
+            ("a/b/", ["a/b/c/"], ["a/b/1.txt"]),
+            ("a/b/c/", [], ["a/b/c/1.txt"]),
+            ("a/tmp/", [], ["a/tmp/1.txt"]),
+            ("d/", [], ["d/1.txt", "d/2.txt"]),
+        ]
+        for concurrency in [1, 4]:
+            assert self._summary(s3dir.walk(concurrency=concurrency)) == expected
+
+        # bottom up
+        assert [
+            s3dir for s3dir, _, _ in self._summary(s3dir.walk(top_down=False))
+        ] == ["a/b/c/", "a/b/", "a/tmp/", "a/", "d/", ""]
+
+        # max depth
+        assert self._summary(s3dir.walk(max_depth=1)) == expected[:2] + expected[-1:]
+        assert self._summary(s3dir.walk(max_depth=0)) == expected[:1]
+
+        # prune by callback
+        assert [
+            s3dir
+            for s3dir, _, _ in self._summary(
+                s3dir.walk(prune=lambda p: p.basename in ("tmp", "c"))
+            )
+        ] == ["", "a/", "a/b/", "d/"]
+
+        # prune by modifying subdirs in place
+        results = list()
+        for s3dir_, subdirs, files in s3dir.walk():
+            subdirs[:] = [p for p in subdirs if p.basename != "a"]
+            results.append(s3dir_)
+        assert [p.relative_to(s3dir).key for p in results[1:]] == ["d/"]
+
+        # stop early
+        iterator = s3dir.walk(concurrency=2)
+        next(iterator)
+        iterator.close()
+
+        with pytest.raises(ValueError):
+            s3dir.walk(concurrency=0)
+        with pytest.raises(TypeError):
+            s3dir.joinpath("1.txt").walk()
+
+    def _test_walk_concurrently(self):
+        s3dir = self.get_s3dir_root().joinpath("walk_concurrently").to_dir()
+        s3dir.delete()
+        for key in ["a/1/2/3/1.txt", "b/x/1.txt", "b/y/1.txt", "b/z/1.txt"]:
+            self.s3_client.put_object(
+                Bucket=s3dir.bucket, Key=s3dir.key + key, Body=b""
+            )
+
+        # the sub directories of "b/" are listed while walking the "a/" chain
+        lock = threading.Lock()
+        in_flight = [0]
+        max_in_flight = [0]
+
+        def before_call(model, **kwargs):
+            if model.name == "ListObjectsV2":
+                with lock:
+                    in_flight[0] += 1
+                    max_in_flight[0] = max(max_in_flight[0], in_flight[0])
+                time.sleep(0.1)
+
+        def after_call(model, **kwargs):
+            if model.name == "ListObjectsV2":
+                with lock:
+                    in_flight[0] -= 1
+
+        self.s3_client.meta.events.register("before-call.s3", before_call)
+        self.s3_client.meta.events.register("after-call.s3", after_call)
+        try:
+            results = [
+                s3dir_.relative_to(s3dir).key if s3dir_ != s3dir else ""
+                for s3dir_, _, _ in s3dir.walk(concurrency=4, bsm=self.s3_client)
+            ]
+            assert max_in_flight[0] == 4
+
+            # the listed ahead sub directories of the removed "b/" are discarded
+            pruned = list()
+            for s3dir_, subdirs, _ in s3dir.walk(concurrency=4, bsm=self.s3_client):
+                subdirs[:] = [p for p in subdirs if p.basename != "b"]
+                pruned.append(s3dir_.relative_to(s3dir).key if s3dir_ != s3dir else "")
+        finally:
+            self.s3_client.meta.events.unregister("before-call.s3", before_call)
+            self.s3_client.meta.events.unregister("after-call.s3", after_call)
+        assert results == [
+            "",
+            "a/",
+            "a/1/",
+            "a/1/2/",
+            "a/1/2/3/",
+            "b/",
+            "b/x/",
+            "b/y/",
+            "b/z/",
+        ]
+        assert pruned == results[:5]
+
+    def test(self):
+        self._test_walk()
+        self._test_walk_concurrently()
+
+
+class Test(WalkAPIMixin):
+    use_mock = False
+
+
+class TestUseMock(WalkAPIMixin):
+    use_mock = True
+
+
+if __name__ == "__main__":
+    run_cov_test(__file__, "s3pathlib.core.walk", preview=False)
@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+
+import hashlib
+
+import pytest
+
+from s3pathlib.etag import (
+    MIB,
+    DEFAULT_PART_SIZE,
+    parse_etag,
+    get_part_count,
+    adjust_part_size,
+    infer_part_sizes,
+    calculate_etag_from_md5s,
+    calculate_etag,
+    calculate_etags,
+    is_etag_match,
+)
+import s3pathlib.etag as etag_module
+
+
+def test_parse_etag():
+    assert parse_etag('"abc-3"') == ("abc", 3)
+    assert parse_etag("abc") == ("abc", 0)
+
+
+def test_get_part_count():
+    assert get_part_count(0, 10) == 1
+    assert get_part_count(10, 10) == 1
+    assert get_part_count(11, 10) == 2
+
+
+def test_adjust_part_size():
+    assert adjust_part_size(1) == DEFAULT_PART_SIZE
+    assert adjust_part_size(1, part_size=1) == 5 * MIB
+    # 100,000 MiB needs 12,500 parts with 8 MiB part size
+    assert adjust_part_size(100000 * MIB) == 16 * MIB
+
+
+def test_infer_part_sizes():
+    assert infer_part_sizes(20 * MIB, 3) == [
+        8 * MIB,
+        7 * MIB,
+        9 * MIB,
+        7000000,
+        8000000,
+        9000000,
+        10000000,
+    ]
+    assert infer_part_sizes(20 * MIB, 3, max_candidates=2) == [8 * MIB, 7 * MIB]
+    assert infer_part_sizes(100, 1) == [100]
+    assert infer_part_sizes(10, 3) == [4]
+    # no part size can split 10 bytes into 6 parts
+    assert infer_part_sizes(10, 6) == []
+    for size, n_parts in [(20 * MIB, 3), (10, 3), (1000, 7)]:
+        for part_size in infer_part_sizes(size, n_parts):
+            assert get_part_count(size, part_size) == n_parts
+    with pytest.raises(ValueError):
+        infer_part_sizes(10, 0)
+
+
+def test_calculate_etag(tmp_path):
+    data = bytes(range(256)) * 40
+    path = tmp_path.joinpath("data.bin")
+    path.write_bytes(data)
+
+    # single part
+    assert calculate_etag(f"{path}") == hashlib.md5(data).hexdigest()
+    assert calculate_etag(f"{path}", part_size=len(data) + 1) == (
+        hashlib.md5(data).hexdigest()
+    )
+
+    # multipart
+    part_size = 3000
+    md5s = [
+        hashlib.md5(data[i : i + part_size]).digest()
+        for i in range(0, len(data), part_size)
+    ]
+    expected = hashlib.md5(b"".join(md5s)).hexdigest() + "-4"
+    assert calculate_etag_from_md5s(md5s) == expected
+    for concurrency in [1, 3]:
+        etag = calculate_etag(
+            f"{path}", part_size=part_size, concurrency=concurrency, chunk_size=7
+        )
+        assert etag == expected
+    # exactly one part when the size equals the threshold
+    assert calculate_etag(f"{path}", part_size=len(data)).endswith("-1")
+
+    with pytest.raises(ValueError):
+        calculate_etag(f"{path}", part_size=0)
+
+
+def test_calculate_etags(tmp_path):
+    path = tmp_path.joinpath("data.bin")
+    for size in [0, 1, 5 * MIB, 11 * MIB + 3]:
+        path.write_bytes(bytes(range(256)) * (size // 256) + b"x" * (size % 256))
+        part_sizes = [5 * MIB, 8 * MIB, 3 * MIB + 7]
+        assert calculate_etags(
+            f"{path}", part_sizes=part_sizes, concurrency=2, chunk_size=1000003
+        ) == [
+            calculate_etag(f"{path}", part_size=part_size, multipart_threshold=0)
+            for part_size in part_sizes
+        ]
+
+    with pytest.raises(ValueError):
+        calculate_etags(f"{path}", part_sizes=[0])
+
+
+def test_is_etag_match(tmp_path):
+    data = bytes(range(256)) * 40
+    path = tmp_path.joinpath("data.bin")
+    path.write_bytes(data)
+    assert is_etag_match(f"{path}", hashlib.md5(data).hexdigest()) is True
+    assert is_etag_match(f"{path}", "0" * 32) is False
+
+    # 11 MiB uploaded with 5 MiB part size
+    data = b"x" * (11 * MIB)
+    path.write_bytes(data)
+    etag = calculate_etag(f"{path}", part_size=5 * MIB)
+    assert etag.endswith("-3")
+    assert is_etag_match(f"{path}", f'"{etag}"') is True
+    assert is_etag_match(f"{path}", etag.replace("-3", "-4")) is False
+    assert is_etag_match(f"{path}", "0" * 32 + "-3") is False
+
+
+def test_is_etag_match_reads_once(tmp_path, monkeypatch):
+    path = tmp_path.joinpath("data.bin")
+    path.write_bytes(b"x" * (11 * MIB))
+    opened = list()
+
+    def _open(*args, **kwargs):
+        opened.append(args[0])
+        return open(*args, **kwargs)
+
+    monkeypatch.setattr(etag_module, "open", _open, raising=False)
+    # all candidate part sizes are checked with one read of the file
+    assert len(infer_part_sizes(11 * MIB, 3)) > 1
+    assert is_etag_match(f"{path}", "0" * 32 + "-3") is False
+    assert len(opened) == 1
+
+
+if __name__ == "__main__":
+    from s3pathlib.tests import run_cov_test
+
+    run_cov_test(__file__, module="s3pathlib.etag", preview=False)
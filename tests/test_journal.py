@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+
+from s3pathlib.journal import Journal
+
+
+def test_journal(tmp_path):
+    path = tmp_path.joinpath("journal.sqlite")
+
+    with Journal(f"{path}", job_id="job-1", flush_size=2) as journal:
+        assert journal.cursor is None
+        assert journal.is_finished is False
+        created_at = journal.created_at
+        for key in ["a", "b", "c", "d", "e"]:
+            assert journal.dispatch(key) is False
+        # out of order completion
+        journal.complete("b")
+        assert journal.cursor is None
+        journal.complete("a")
+        assert journal.cursor == "b"
+        journal.complete("d")
+        assert journal.cursor == "b"
+        assert "Journal(" in repr(journal)
+
+    # resume, "a" and "b" are before the cursor, "d" is done after the cursor
+    with Journal(f"{path}", job_id="job-1") as journal:
+        assert journal.created_at == created_at
+        assert journal.start_after == "b"
+        assert journal.is_done("a") is True
+        assert journal.is_done("c") is False
+        assert journal.is_done("d") is True
+        assert journal.dispatch("c") is False
+        assert journal.dispatch("d") is True
+        assert journal.dispatch("e") is False
+        journal.complete("c")
+        # the cursor moves over the "d" done by the previous run
+        assert journal.cursor == "d"
+        journal.complete("e")
+        assert journal.cursor == "e"
+        journal.finish()
+
+    with Journal(f"{path}", job_id="job-1") as journal:
+        assert journal.is_finished is True
+        assert journal.cursor == "e"
+        journal.reset()
+        assert journal.is_finished is False
+        assert journal.cursor is None
+
+    # the jobs in the same file are independent
+    with Journal(f"{path}", job_id="job-1") as journal:
+        assert journal.cursor is None
+    with Journal(f"{path}", job_id="job-2") as journal:
+        assert journal.cursor is None
+        assert journal.is_done("a") is False
+
+
+def test_journal_flush(tmp_path):
+    path = tmp_path.joinpath("journal.sqlite")
+    journal = Journal(f"{path}", job_id="job", flush_size=3, flush_interval=3600)
+    for key in ["a", "b", "c"]:
+        journal.dispatch(key)
+    journal.complete("c")
+    journal.complete("b")
+    # not flushed yet, a crash loses the progress
+    assert Journal(f"{path}", job_id="job").is_done("c") is False
+    journal.complete("a")
+    # flushed in one batch
+    assert Journal(f"{path}", job_id="job").start_after == "c"
+    journal.close()
+
+
+if __name__ == "__main__":
+    from s3pathlib.tests import run_cov_test
+
+    run_cov_test(__file__, module="s3pathlib.journal", preview=False)
@@ -2,6 +2,7 @@
 
 import pytest
 import os
+import hashlib
 from s3pathlib import utils
 from s3pathlib.tests import run_cov_test
 
@@ -108,5 +109,180 @@ def test_parse_data_size():
     assert utils.parse_data_size("2,512.4 MB") == 2634442342
 
 
+def test_iter_map_concurrently():
+    def double(x):
+        return x * 2
+
+    assert list(utils.iter_map_concurrently(double, range(10), max_workers=3)) == [
+        x * 2 for x in range(10)
+    ]
+    assert sorted(
+        utils.iter_map_concurrently(double, range(10), max_workers=3, ordered=False)
+    ) == [x * 2 for x in range(10)]
+    assert list(utils.iter_map_concurrently(double, [], max_workers=3)) == []
+
+    with pytest.raises(ValueError):
+        list(utils.iter_map_concurrently(double, range(10), max_workers=0))
+
+
+def test_iter_prefetch():
+    assert list(utils.iter_prefetch(range(10), prefetch=3)) == list(range(10))
+    assert list(utils.iter_prefetch([], prefetch=3)) == []
+
+    # consumer stops early, the background thread should exit
+    iterator = utils.iter_prefetch(iter(range(1000)), prefetch=2)
+    assert next(iterator) == 0
+    assert next(iterator) == 1
+    iterator.close()
+
+    # the error raised in the background thread is re-raised to the consumer
+    def gen():
+        yield 1
+        raise KeyError("boom")
+
+    iterator = utils.iter_prefetch(gen(), prefetch=2)
+    assert next(iterator) == 1
+    with pytest.raises(KeyError):
+        next(iterator)
+
+    with pytest.raises(ValueError):
+        list(utils.iter_prefetch(range(10), prefetch=0))
+
+
+def test_iter_chain_concurrently():
+    assert sorted(utils.iter_chain_concurrently(range, [1, 2, 3], max_workers=2)) == [
+        0,
+        0,
+        0,
+        1,
+        1,
+        2,
+    ]
+    assert list(utils.iter_chain_concurrently(range, [], max_workers=2)) == []
+
+    # ordered
+    for max_workers in [1, 2, 8]:
+        assert list(
+            utils.iter_chain_concurrently(
+                range, [3, 1000, 2], max_workers=max_workers, ordered=True
+            )
+        ) == list(range(3)) + list(range(1000)) + list(range(2))
+    iterator = utils.iter_chain_concurrently(
+        range, [1000, 1000, 1000], max_workers=2, buffer_size=1, ordered=True
+    )
+    next(iterator)
+    iterator.close()
+
+    # consumer stops early
+    iterator = utils.iter_chain_concurrently(
+        range, [1000, 1000, 1000], max_workers=2, buffer_size=1
+    )
+    next(iterator)
+    iterator.close()
+
+    # the iterable is consumed lazily
+    for ordered in [True, False]:
+        consumed = list()
+
+        def items():
+            for i in range(100):
+                consumed.append(i)
+                yield 1000
+
+        iterator = utils.iter_chain_concurrently(
+            range, items(), max_workers=2, buffer_size=1, ordered=ordered
+        )
+        next(iterator)
+        assert len(consumed) == 2
+        iterator.close()
+
+    def func(i):
+        yield i
+        raise KeyError("boom")
+
+    with pytest.raises(KeyError):
+        list(utils.iter_chain_concurrently(func, [1, 2], max_workers=2))
+    with pytest.raises(KeyError):
+        list(utils.iter_chain_concurrently(func, [1, 2], max_workers=2, ordered=True))
+
+    with pytest.raises(ValueError):
+        list(utils.iter_chain_concurrently(range, [1], max_workers=0))
+
+
+def test_iter_sorted_external():
+    data = [(i * 7) % 23 for i in range(23)]
+    for run_size in [1, 4, 23, 100]:
+        assert list(
+            utils.iter_sorted_external(data, key=lambda x: x, run_size=run_size)
+        ) == sorted(data)
+        assert list(
+            utils.iter_sorted_external(
+                data, key=lambda x: x, reverse=True, run_size=run_size
+            )
+        ) == sorted(data, reverse=True)
+
+    # stable sort
+    assert list(
+        utils.iter_sorted_external(range(10), key=lambda x: x % 3, run_size=4)
+    ) == [0, 3, 6, 9, 1, 4, 7, 2, 5, 8]
+    assert list(utils.iter_sorted_external([], key=lambda x: x)) == []
+
+    with pytest.raises(ValueError):
+        list(utils.iter_sorted_external([1], key=lambda x: x, run_size=0))
+
+
+def test_hash_file(tmp_path):
+    data = bytes(range(256)) * 100
+    path = tmp_path.joinpath("data.bin")
+    path.write_bytes(data)
+    abspath = f"{path}"
+
+    expected = hashlib.md5(data).hexdigest()
+    assert utils.hash_file(abspath, hashlib.md5) == expected
+    assert utils.hash_file(abspath, hashlib.md5, chunk_size=7) == expected
+    for nbytes in [1, 7, 100, len(data)]:
+        expected = hashlib.sha256(data[:nbytes]).hexdigest()
+        assert utils.hash_file(abspath, hashlib.sha256, nbytes=nbytes) == expected
+        assert (
+            utils.hash_file(abspath, hashlib.sha256, nbytes=nbytes, chunk_size=7)
+            == expected
+        )
+    with pytest.raises(ValueError):
+        utils.hash_file(abspath, hashlib.md5, nbytes=-1)
+    with pytest.raises(ValueError):
+        utils.hash_file(abspath, hashlib.md5, chunk_size=0)
+
+    assert utils.hash_file_multi(abspath, ["md5", "sha256"], chunk_size=1000) == {
+        "md5": hashlib.md5(data).hexdigest(),
+        "sha256": hashlib.sha256(data).hexdigest(),
+    }
+    assert utils.hash_file_multi(abspath, nbytes=10) == {
+        "md5": hashlib.md5(data[:10]).hexdigest(),
+    }
+
+
+def test_hash_files(tmp_path):
+    paths = list()
+    for i in range(5):
+        path = tmp_path.joinpath(f"{i}.bin")
+        path.write_bytes(str(i).encode("utf-8") * (i * 1000))
+        paths.append(path)
+    for use_process in [False, True]:
+        results = utils.hash_files(
+            paths,
+            algorithms=["md5", "sha1"],
+            concurrency=2,
+            use_process=use_process,
+        )
+        assert list(results) == [f"{path}" for path in paths]
+        for path in paths:
+            assert results[f"{path}"] == {
+                "md5": hashlib.md5(path.read_bytes()).hexdigest(),
+                "sha1": hashlib.sha1(path.read_bytes()).hexdigest(),
+            }
+    with pytest.raises(ValueError):
+        utils.hash_files(paths, concurrency=0)
+
+
 if __name__ == "__main__":
     run_cov_test(__file__, "s3pathlib.utils", preview=False)
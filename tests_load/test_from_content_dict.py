@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark the throughput of converting the list_objects_v2 result into
+:class:`~s3pathlib.core.s3path.S3Path` objects, for a synthetic listing.
+
+Usage::
+
+    # default 1M keys
+    python tests_load/test_from_content_dict.py
+    S3PATHLIB_N_KEYS=100000 python tests_load/test_from_content_dict.py
+"""
+
+import os
+import time
+from datetime import datetime, timezone
+
+from s3pathlib import S3Path
+
+N_KEYS = int(os.environ.get("S3PATHLIB_N_KEYS", 1_000_000))
+BUCKET = "my-bucket"
+
+
+def make_contents(n: int):
+    last_modified = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    return [
+        {
+            "Key": f"logs/2024-01-{i % 28 + 1:02d}/host-{i % 97}/app-{i:08d}.log.gz",
+            "LastModified": last_modified,
+            "ETag": '"d41d8cd98f00b204e9800998ecf8427e"',
+            "Size": i,
+            "StorageClass": "STANDARD",
+        }
+        for i in range(n)
+    ]
+
+
+def from_content_dict_before(bucket: str, dct: dict) -> S3Path:
+    """
+    The implementation before the trusted key constructor.
+    """
+    p = S3Path(bucket, dct["Key"])
+    p._meta = {
+        "Key": dct["Key"],
+        "LastModified": dct["LastModified"],
+        "ETag": dct["ETag"],
+        "ContentLength": dct["Size"],
+        "StorageClass": dct["StorageClass"],
+        "ChecksumAlgorithm": dct.get("ChecksumAlgorithm", []),
+        "Owner": dct.get("Owner", {}),
+    }
+    return p
+
+
+def measure(func, contents) -> float:
+    """
+    :return: objects per second, include the ``.key`` access of the consumer.
+    """
+    start = time.perf_counter()
+    for dct in contents:
+        func(BUCKET, dct).key
+    elapsed = time.perf_counter() - start
+    return len(contents) / elapsed
+
+
+def test():
+    contents = make_contents(N_KEYS)
+    before = measure(from_content_dict_before, contents)
+    after = measure(S3Path._from_content_dict, contents)
+    print(f"\n{N_KEYS} keys")
+    print(f"before: {before:,.0f} objects/sec")
+    print(f"after: {after:,.0f} objects/sec")
+    print(f"speedup: {after / before:.2f}x")
+    assert after > before
+
+
+if __name__ == "__main__":
+    test()
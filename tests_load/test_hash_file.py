@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark the throughput of hashing local files, compare the 64 bytes per
+read implementation before with the current hashing engine.
+
+Usage::
+
+    # default one 256 MB file and 64 files of 4 MB
+    python tests_load/test_hash_file.py
+    S3PATHLIB_FILE_SIZE=1073741824 python tests_load/test_hash_file.py
+"""
+
+import os
+import time
+import hashlib
+import tempfile
+
+from s3pathlib import utils
+
+FILE_SIZE = int(os.environ.get("S3PATHLIB_FILE_SIZE", 256 * 1024 * 1024))
+N_FILES = int(os.environ.get("S3PATHLIB_N_FILES", 64))
+SMALL_FILE_SIZE = int(os.environ.get("S3PATHLIB_SMALL_FILE_SIZE", 4 * 1024 * 1024))
+
+
+def hash_file_before(abspath: str, hash_meth: callable) -> str:
+    """
+    The implementation before the hashing engine, 64 bytes per read.
+    """
+    m = hash_meth()
+    with open(abspath, "rb") as f:
+        while True:
+            data = f.read(1 << 6)
+            if not data:
+                break
+            m.update(data)
+    return m.hexdigest()
+
+
+def write_file(path: str, size: int):
+    chunk = os.urandom(1024 * 1024)
+    with open(path, "wb") as f:
+        for _ in range(size // len(chunk)):
+            f.write(chunk)
+        f.write(chunk[: size % len(chunk)])
+
+
+def measure(func, *args) -> float:
+    """
+    :return: elapsed seconds.
+    """
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def report(title: str, n_bytes: int, before: float, after: float):
+    print(f"{title}")
+    print(f"before: {n_bytes / before / 1000000:,.1f} MB/sec")
+    print(f"after: {n_bytes / after / 1000000:,.1f} MB/sec")
+    print(f"speedup: {before / after:.2f}x")
+
+
+def test():
+    with tempfile.TemporaryDirectory() as dir_tmp:
+        # one large file, single algorithm
+        path = os.path.join(dir_tmp, "large.bin")
+        write_file(path, FILE_SIZE)
+        assert hash_file_before(path, hashlib.md5) == utils.hash_file(
+            path, hashlib.md5
+        )
+        before = measure(hash_file_before, path, hashlib.md5)
+        after = measure(utils.hash_file, path, hashlib.md5)
+        report(f"\none {FILE_SIZE} bytes file, md5", FILE_SIZE, before, after)
+        assert after < before
+
+        # one large file, two algorithms in one pass
+        def two_pass_before(path):
+            hash_file_before(path, hashlib.md5)
+            hash_file_before(path, hashlib.sha256)
+
+        before = measure(two_pass_before, path)
+        after = measure(utils.hash_file_multi, path, ["md5", "sha256"])
+        report(f"\none {FILE_SIZE} bytes file, md5 + sha256", FILE_SIZE, before, after)
+        assert after < before
+
+        # many files concurrently
+        paths = list()
+        for i in range(N_FILES):
+            path = os.path.join(dir_tmp, f"{i}.bin")
+            write_file(path, SMALL_FILE_SIZE)
+            paths.append(path)
+
+        def sequential_before(paths):
+            for path in paths:
+                hash_file_before(path, hashlib.md5)
+
+        n_bytes = N_FILES * SMALL_FILE_SIZE
+        before = measure(sequential_before, paths)
+        for use_process in [False, True]:
+            after = measure(
+                utils.hash_files, paths, ["md5"], os.cpu_count(), use_process
+            )
+            report(
+                f"\n{N_FILES} files of {SMALL_FILE_SIZE} bytes, md5, "
+                f"use_process={use_process}",
+                n_bytes,
+                before,
+                after,
+            )
+            assert after < before
+
+
+if __name__ == "__main__":
+    test()